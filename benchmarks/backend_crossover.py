@@ -0,0 +1,230 @@
+"""
+Crossover between the bitmask and cp-sat backends.
+
+Classic puzzles of several grid sizes are generated (a full grid with its digits, rows and columns shuffled,
+then givens removed in a random order as long as the solution stays unique) and the uniqueness of each one
+is checked with both backends. A puzzle is kept each time the givens go under one of the fractions, so the
+instances go from trivial to hard (the fewer the givens, the more the bitmask search branches). Random 9x9
+puzzles rarely need more than a few branches, so a few well known hard ones are added to the 9x9 instances. The
+table groups them by the number of branches of the bitmask search and compares the median time (build and
+solve) of both backends. The crossover is the number of branches from which cp-sat is faster, it's the value
+AUTO_MAX_BRANCHES of puzzlesolver/BitmaskSolver.py is taken from.
+
+    python benchmarks/backend_crossover.py
+    python benchmarks/backend_crossover.py --sizes 9 16 --samples 10 --output crossover.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import statistics
+import sys
+from typing import Any
+
+from puzzlesolver.BitmaskSolver import AUTO_MAX_BRANCHES, BitmaskPuzzle, BitmaskSearch
+from puzzlesolver.Puzzle.Cell import get_region_size
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.SolvePuzzle import SolverOptions, check_loaded_puzzle_unique_solution
+from puzzlesolver.SolverLog import PhaseTimes
+
+SIZES = (4, 6, 8, 9, 12, 16)
+GIVENS_FRACTIONS = (0.6, 0.45, 0.35, 0.3, 0.25, 0.2)
+SAMPLES = 5
+SEED = 0
+MAX_TIME = 30
+# AI Escargot, Easter Monster and Arto Inkala's 2012 puzzle, row by row with '.' for empty cells
+HARD_9X9 = (
+    '1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..',
+    '1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1',
+    '8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..',
+)
+# upper bounds of the branch buckets of the table
+BRANCH_BUCKETS = (0, 10, 100, 1000, 10000, 100000)
+
+
+def empty_puzzle_data(size: int) -> dict[str, Any]:
+    return {'nRows': size, 'nCols': size, 'puzzleInfo': {'title': f'Classic {size}x{size}'},
+            'grid': [[{} for _ in range(size)] for _ in range(size)],
+            'local_constraints': {}, 'bool_constraints': {}, 'valid_digits': list(range(1, size + 1))}
+
+
+def full_grid(size: int, rng: random.Random) -> list[list[int]]:
+    """A random solution of the empty size x size classic puzzle"""
+    puzzle = Puzzle.fromJsonData(empty_puzzle_data(size))
+    search = BitmaskSearch(BitmaskPuzzle.from_puzzle(puzzle), 1, MAX_TIME).run()
+    solution = search.solutions[0]
+    grid = [[solution[(i, j)] for j in range(size)] for i in range(size)]
+
+    region_w, region_h = get_region_size(size) or (size, 1)
+    digits = list(range(1, size + 1))
+    relabel = dict(zip(digits, rng.sample(digits, size)))
+    # rows within a band of regions, bands, and the same for columns, keep the regions valid
+    bands = rng.sample(range(size // region_h), size // region_h)
+    rows = [band * region_h + i for band in bands for i in rng.sample(range(region_h), region_h)]
+    stacks = rng.sample(range(size // region_w), size // region_w)
+    cols = [stack * region_w + j for stack in stacks for j in rng.sample(range(region_w), region_w)]
+    return [[relabel[grid[i][j]] for j in cols] for i in rows]
+
+
+def make_puzzle(grid: list[list[int]], givens: set[tuple[int, int]]) -> Puzzle:
+    data = empty_puzzle_data(len(grid))
+    for i, j in givens:
+        data['grid'][i][j] = {'value': grid[i][j], 'given': True}
+    return Puzzle.fromJsonData(data)
+
+
+def dig_puzzles(grid: list[list[int]], fractions: list[float], rng: random.Random,
+                max_time: int) -> list[tuple[float, Puzzle]]:
+    """(fraction of givens, puzzle) for each fraction, from the most givens to the fewest. Givens are removed
+    from the full grid in a random order, unless the puzzle would have several solutions (or isn't decided
+    within max_time), until there are fewer givens than the fraction. A fraction is skipped if no given
+    could be removed since the previous one."""
+    size = len(grid)
+    givens = {(i, j) for i in range(size) for j in range(size)}
+    order = rng.sample(sorted(givens), len(givens))
+    puzzles: list[tuple[float, Puzzle]] = []
+    for fraction in sorted(fractions, reverse=True):
+        while order and len(givens) > fraction * size * size:
+            cell = order.pop()
+            givens.remove(cell)
+            search = BitmaskSearch(BitmaskPuzzle.from_puzzle(make_puzzle(grid, givens)), 2, max_time).run()
+            if search.verdict() != 'unique':
+                givens.add(cell)
+        fraction_givens = len(givens) / (size * size)
+        if not puzzles or fraction_givens < puzzles[-1][0]:
+            puzzles.append((fraction_givens, make_puzzle(grid, givens)))
+    return puzzles
+
+
+def parse_puzzle(text: str) -> Puzzle:
+    size = round(len(text) ** 0.5)
+    data = empty_puzzle_data(size)
+    for k, char in enumerate(text):
+        if char != '.':
+            data['grid'][k // size][k % size] = {'value': int(char), 'given': True}
+    return Puzzle.fromJsonData(data)
+
+
+def run_backend(puzzle: Puzzle, backend: str, max_time: int) -> dict[str, Any]:
+    phase_times = PhaseTimes()
+    options = SolverOptions(max_time=max_time, num_workers=1, quiet=True, backend=backend)  # type: ignore
+    with contextlib.redirect_stdout(io.StringIO()):
+        verdict = check_loaded_puzzle_unique_solution(puzzle, puzzle.puzzle_meta.title, options,
+                                                      phase_times=phase_times)
+    return {'verdict': verdict.verdict, 'time': phase_times.build_time + phase_times.solve_time,
+            'branches': verdict.branches}
+
+
+def run_instances(sizes: list[int], fractions: list[float], samples: int, seed: int,
+                  max_time: int) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    puzzles: list[tuple[int, str, float, Puzzle]] = []
+    for size in sizes:
+        for sample in range(samples):
+            grid = full_grid(size, rng)
+            puzzles += [(size, str(sample), fraction, puzzle)
+                        for fraction, puzzle in dig_puzzles(grid, fractions, rng, max_time)]
+        if size == 9:
+            puzzles += [(size, f"hard-{i}", (len(text) - text.count('.')) / len(text), parse_puzzle(text))
+                        for i, text in enumerate(HARD_9X9)]
+
+    instances: list[dict[str, Any]] = []
+    for size, sample, fraction, puzzle in puzzles:
+        bitmask = run_backend(puzzle, 'bitmask', max_time)
+        cp_sat = run_backend(puzzle, 'cp-sat', max_time)
+        instances.append({'size': size, 'sample': sample, 'givens': fraction, 'bitmask': bitmask,
+                          'cp-sat': cp_sat})
+        print(f"{size}x{size} sample {sample} givens {fraction:.2f}: bitmask {bitmask['verdict']} "
+              f"{bitmask['time']:.4f} s ({bitmask['branches']} branches), cp-sat {cp_sat['verdict']} "
+              f"{cp_sat['time']:.4f} s", file=sys.stderr)
+    return instances
+
+
+def branch_bucket(branches: int) -> str:
+    lower = 0
+    for upper in BRANCH_BUCKETS:
+        if branches <= upper:
+            return f"{lower}-{upper}"
+        lower = upper + 1
+    return f">{BRANCH_BUCKETS[-1]}"
+
+
+def print_table(instances: list[dict[str, Any]]):
+    """Median times per grid size and branch bucket, instances not decided by both backends are left out"""
+    groups: dict[tuple[int, str], list[dict[str, Any]]] = {}
+    for instance in instances:
+        if 'unknown' in (instance['bitmask']['verdict'], instance['cp-sat']['verdict']):
+            continue
+        key = (instance['size'], branch_bucket(instance['bitmask']['branches']))
+        groups.setdefault(key, []).append(instance)
+
+    print(f"{'size':>5s} {'branches':>14s} {'n':>4s} {'bitmask':>10s} {'cp-sat':>10s} {'faster':>8s}")
+    for (size, bucket), group in sorted(groups.items(), key=lambda item: (item[0][0], item[1][0]['bitmask']['branches'])):
+        bitmask_time = statistics.median(instance['bitmask']['time'] for instance in group)
+        cp_sat_time = statistics.median(instance['cp-sat']['time'] for instance in group)
+        faster = 'bitmask' if bitmask_time < cp_sat_time else 'cp-sat'
+        print(f"{size:5d} {bucket:>14s} {len(group):4d} {bitmask_time:10.4f} {cp_sat_time:10.4f} {faster:>8s}")
+
+
+def crossover(instances: list[dict[str, Any]]) -> dict[int, float]:
+    """Per grid size, the number of branches the bitmask search does in the median time cp-sat takes on the
+    instances where the search branched (the ones that are not solved by propagation alone)"""
+    crossovers: dict[int, float] = {}
+    for size in sorted({instance['size'] for instance in instances}):
+        branched = [instance for instance in instances if instance['size'] == size
+                    and instance['bitmask']['branches'] > 0
+                    and 'unknown' not in (instance['bitmask']['verdict'], instance['cp-sat']['verdict'])]
+        if not branched:
+            continue
+        branch_rate = (sum(instance['bitmask']['branches'] for instance in branched)
+                       / sum(instance['bitmask']['time'] for instance in branched))
+        crossovers[size] = branch_rate * statistics.median(instance['cp-sat']['time'] for instance in branched)
+    return crossovers
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(description='Compares the bitmask and cp-sat backends on generated classic '
+                                                 'puzzles of increasing difficulty.')
+    parser.add_argument('--sizes', dest='sizes', default=list(SIZES), type=int, nargs='+',
+                        help=f'the grid sizes. Default is {" ".join(str(size) for size in SIZES)}.')
+    parser.add_argument('--givens', dest='fractions', default=list(GIVENS_FRACTIONS), type=float, nargs='+',
+                        help='the fractions of the cells kept as givens. '
+                             f'Default is {" ".join(str(fraction) for fraction in GIVENS_FRACTIONS)}.')
+    parser.add_argument('--samples', dest='samples', default=SAMPLES, type=int,
+                        help=f'full grids per size. Default is {SAMPLES}.')
+    parser.add_argument('--seed', dest='seed', default=SEED, type=int,
+                        help=f'the random seed of the grids and givens. Default is {SEED}.')
+    parser.add_argument('--max_time', dest='max_time', default=MAX_TIME, type=int,
+                        help=f'the time limit of each run. Default is {MAX_TIME} s.')
+    parser.add_argument('--output', dest='output', default=None, type=str,
+                        help='also write the instances to this JSON file')
+    return parser
+
+
+def main() -> int:
+    args = make_parser().parse_args()
+    instances = run_instances(args.sizes, args.fractions, args.samples, args.seed, args.max_time)
+    mismatches = [instance for instance in instances
+                  if 'unknown' not in (instance['bitmask']['verdict'], instance['cp-sat']['verdict'])
+                  and instance['bitmask']['verdict'] != instance['cp-sat']['verdict']]
+
+    print_table(instances)
+    crossovers = crossover(instances)
+    print("\nCrossover (bitmask branches in the median cp-sat time)")
+    for size, branches in crossovers.items():
+        print(f"  {size}x{size}: {branches:.0f} branches")
+    print(f"  AUTO_MAX_BRANCHES = {AUTO_MAX_BRANCHES}")
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump({'settings': vars(args), 'instances': instances, 'crossover': crossovers}, file, indent=2)
+
+    if mismatches:
+        print(f"\n{len(mismatches)} verdicts differ between the backends")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""
+Benchmark suite over a fixed stratified subset of data/Solved.
+
+Each puzzle of benchmarks/subset.json is checked for uniqueness `--repeats` times, run i with random seed
+`--seed + i`, recording build, presolve and solve times, conflicts, branches and model size. The medians
+are compared with benchmarks/baseline.json and the run fails (exit status 1) when a median time regresses by
+more than `--threshold` (relative) and `--min_delta` seconds, or when a verdict changes.
+
+    python benchmarks/run_benchmarks.py                    # compare with the baseline
+    python benchmarks/run_benchmarks.py --update-baseline  # write a new baseline
+    python benchmarks/run_benchmarks.py --select           # pick a new subset
+"""
+import argparse
+import collections
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from typing import Any
+
+import ortools
+
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.PuzzleFeatures import PuzzleFeatures
+from puzzlesolver.SolvePuzzle import SolverOptions, check_loaded_puzzle_unique_solution, check_unique_solution
+from puzzlesolver.SolverLog import PhaseTimes
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+SUBSET_FILE = os.path.join(BENCHMARKS_DIR, 'subset.json')
+BASELINE_FILE = os.path.join(BENCHMARKS_DIR, 'baseline.json')
+PUZZLES_DIR = 'data/Solved'
+
+MAX_TIME = 60
+REPEATS = 3
+SEED = 0
+PER_FAMILY = 2
+SELECT_MAX_TIME = 10  # puzzles slower than this are not selected
+THRESHOLD = 0.25  # relative regression of a median time
+MIN_DELTA = 0.05  # seconds, smaller differences are noise
+TIMED_METRICS = ('build_time', 'presolve_time', 'solve_time')
+COUNT_METRICS = ('conflicts', 'branches')
+
+
+def is_usable(filepath: str, max_time: int) -> bool:
+    """The puzzle builds and its uniqueness check finishes within max_time"""
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            verdict = check_unique_solution(filepath, SolverOptions(max_time=max_time, num_workers=1))
+    except Exception:
+        return False
+    return verdict.verdict != 'unknown'
+
+
+def select_subset(per_family: int, seed: int, max_time: int = SELECT_MAX_TIME) -> list[dict[str, str]]:
+    """per_family random puzzles of each family (category and grid size) of data/Solved, skipping puzzles
+    that fail to build or are not decided within max_time"""
+    puzzles_dir = os.path.join(REPO_DIR, PUZZLES_DIR)
+    filepaths = sorted(entry.path for entry in os.scandir(puzzles_dir) if entry.name.endswith('.json'))
+    families: dict[str, list[str]] = collections.defaultdict(list)
+    for filepath in filepaths:
+        try:
+            puzzle = Puzzle.fromJSON(filepath)
+        except Exception:
+            continue
+        families[PuzzleFeatures.from_puzzle(puzzle).family].append(filepath)
+
+    rng = random.Random(seed)
+    subset: list[dict[str, str]] = []
+    for family, family_filepaths in sorted(families.items()):
+        rng.shuffle(family_filepaths)
+        selected: list[str] = []
+        for filepath in family_filepaths:
+            if len(selected) == per_family:
+                break
+            if is_usable(filepath, max_time):
+                selected.append(filepath)
+        subset.extend({'file': os.path.relpath(filepath, REPO_DIR), 'family': family}
+                      for filepath in sorted(selected))
+    return subset
+
+
+def run_puzzle(filepath: str, options: SolverOptions, repeats: int, seed: int) -> dict[str, Any]:
+    runs: list[dict[str, Any]] = []
+    for repeat in range(repeats):
+        options.random_seed = seed + repeat
+        phase_times = PhaseTimes()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                load_start = time.perf_counter()
+                puzzle = Puzzle.fromJSON(filepath)
+                phase_times.load_time = time.perf_counter() - load_start
+                verdict = check_loaded_puzzle_unique_solution(puzzle, filepath, options, phase_times=phase_times)
+        except Exception as e:
+            return {'verdict': 'error', 'error': repr(e), 'median': None, 'runs': runs}
+        runs.append({
+            'seed': options.random_seed,
+            'verdict': verdict.verdict,
+            'load_time': phase_times.load_time,
+            'build_time': phase_times.build_time,
+            'propagation_time': phase_times.propagation_time,
+            'presolve_time': phase_times.presolve_time,
+            'solve_time': phase_times.solve_time,
+            'first_solution_time': phase_times.first_solution_time,
+            'conflicts': verdict.conflicts,
+            'branches': verdict.branches,
+        })
+
+    verdicts = {run['verdict'] for run in runs}
+    return {
+        'verdict': verdicts.pop() if len(verdicts) == 1 else 'inconsistent',
+        'variables': verdict.model_size[0],
+        'constraints': verdict.model_size[1],
+        'features': PuzzleFeatures.from_puzzle(puzzle).to_dict(),
+        'median': {metric: statistics.median(run[metric] for run in runs)
+                   for metric in ('load_time', *TIMED_METRICS, *COUNT_METRICS)},
+        'runs': runs,
+    }
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], threshold: float, min_delta: float) -> list[str]:
+    """Regressions of current against baseline, as printable lines"""
+    regressions: list[str] = []
+    for name, result in current['puzzles'].items():
+        base_result = baseline['puzzles'].get(name)
+        if base_result is None:
+            continue
+        if result['verdict'] != base_result['verdict']:
+            regressions.append(f"{name}: verdict {base_result['verdict']} -> {result['verdict']}")
+        if result['median'] is None or base_result['median'] is None:
+            continue
+        for metric in TIMED_METRICS:
+            base_value = base_result['median'][metric]
+            value = result['median'][metric]
+            if value > base_value * (1 + threshold) and value - base_value > min_delta:
+                regressions.append(f"{name}: {metric} {base_value:.3f} s -> {value:.3f} s "
+                                   f"(+{(value / base_value - 1) * 100 if base_value else float('inf'):.0f}%)")
+    return regressions
+
+
+def print_table(current: dict[str, Any], baseline: dict[str, Any] | None):
+    print(f"{'puzzle':45s} {'verdict':9s} {'build':>8s} {'presolve':>9s} {'solve':>8s} {'base':>8s} "
+          f"{'conflicts':>10s} {'vars':>7s} {'cons':>7s}")
+    for name, result in current['puzzles'].items():
+        median = result['median']
+        if median is None:
+            print(f"{name[:45]:45s} {result['verdict']:9s} {result['error']}")
+            continue
+        base_result = baseline['puzzles'].get(name) if baseline is not None else None
+        base_solve = f"{base_result['median']['solve_time']:8.3f}" if base_result and base_result['median'] else f"{'-':>8s}"
+        print(f"{name[:45]:45s} {result['verdict']:9s} {median['build_time']:8.3f} {median['presolve_time']:9.3f} "
+              f"{median['solve_time']:8.3f} {base_solve} {median['conflicts']:10.0f} {result['variables']:7d} "
+              f"{result['constraints']:7d}")
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(description='Runs the benchmark subset and compares it with the baseline.')
+    parser.add_argument('--select', dest='select', action='store_true',
+                        help=f'pick a new stratified subset of {PUZZLES_DIR} and write it to benchmarks/subset.json')
+    parser.add_argument('--per_family', dest='per_family', default=PER_FAMILY, type=int,
+                        help=f'puzzles per family with --select. Default is {PER_FAMILY}.')
+    parser.add_argument('--update-baseline', dest='update_baseline', action='store_true',
+                        help='write the results as the new baseline instead of comparing')
+    parser.add_argument('--baseline', dest='baseline', default=BASELINE_FILE, type=str,
+                        help='the baseline JSON. Default is benchmarks/baseline.json.')
+    parser.add_argument('--output', dest='output', default=None, type=str,
+                        help='also write the results to this JSON file')
+    parser.add_argument('--repeats', dest='repeats', default=REPEATS, type=int,
+                        help=f'runs of each puzzle, with seeds seed, seed + 1, ... Default is {REPEATS}.')
+    parser.add_argument('--seed', dest='seed', default=SEED, type=int,
+                        help=f'the first random seed. Default is {SEED}.')
+    parser.add_argument('--max_time', dest='max_time', default=MAX_TIME, type=int,
+                        help=f'the time limit of each run. Default is {MAX_TIME} s.')
+    parser.add_argument('--threshold', dest='threshold', default=THRESHOLD, type=float,
+                        help=f'the relative regression of a median time that fails the run. Default is {THRESHOLD}.')
+    parser.add_argument('--min_delta', dest='min_delta', default=MIN_DELTA, type=float,
+                        help=f'time differences below this are ignored. Default is {MIN_DELTA} s.')
+    parser.add_argument('-k', dest='filter', default=None, type=str,
+                        help='only run the puzzles whose file name contains this string')
+    return parser
+
+
+def main() -> int:
+    args = make_parser().parse_args()
+    if args.select:
+        subset = select_subset(args.per_family, args.seed)
+        with open(SUBSET_FILE, 'w') as file:
+            json.dump({'per_family': args.per_family, 'seed': args.seed, 'puzzles': subset}, file, indent=2)
+            file.write('\n')
+        print(f"{len(subset)} puzzles written to {SUBSET_FILE}")
+        return 0
+
+    with open(SUBSET_FILE) as file:
+        subset = json.load(file)['puzzles']
+    if args.filter is not None:
+        subset = [entry for entry in subset if args.filter in entry['file']]
+
+    # the baseline tracks the cp-sat model, classic puzzles stay off the bitmask backend
+    options = SolverOptions(max_time=args.max_time, num_workers=1, quiet=True, backend='cp-sat')
+    current: dict[str, Any] = {
+        'machine': {'platform': platform.platform(), 'python': platform.python_version(),
+                    'ortools': ortools.__version__, 'cpus': os.cpu_count()},
+        'settings': {'max_time': args.max_time, 'repeats': args.repeats, 'seed': args.seed, 'num_workers': 1},
+        'puzzles': {},
+    }
+    for entry in subset:
+        name = os.path.basename(entry['file'])
+        current['puzzles'][name] = run_puzzle(os.path.join(REPO_DIR, entry['file']), options, args.repeats,
+                                              args.seed)
+        result = current['puzzles'][name]
+        solve_time = f"{result['median']['solve_time']:.3f} s" if result['median'] else result['error']
+        print(f"{name}: {result['verdict']} {solve_time}", file=sys.stderr)
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(current, file, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(current, file, indent=2)
+            file.write('\n')
+        print_table(current, None)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = None
+    if os.path.isfile(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    print_table(current, baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}")
+        return 0
+    if baseline.get('machine') != current['machine']:
+        print(f"Warning: the baseline was recorded on another machine ({baseline.get('machine')})")
+
+    regressions = compare(baseline, current, args.threshold, args.min_delta)
+    compared = [name for name, result in current['puzzles'].items()
+                if result['median'] and baseline['puzzles'].get(name, {}).get('median')]
+    total = sum(current['puzzles'][name]['median']['solve_time'] for name in compared)
+    base_total = sum(baseline['puzzles'][name]['median']['solve_time'] for name in compared)
+    print(f"\nTotal median solve time: {total:.3f} s (baseline {base_total:.3f} s)")
+    if regressions:
+        print(f"\n{len(regressions)} regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
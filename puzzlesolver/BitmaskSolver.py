@@ -0,0 +1,311 @@
+import time
+from typing import Callable, Literal
+
+from puzzlesolver.Puzzle.ConstraintEnums import SimpleGlobalConstraintsE
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.PuzzleFeatures import PuzzleFeatures
+from puzzlesolver.SolveResultCache import CachedSolveResult
+
+# Classic sudoku and its variants made only of "these cells are all different" rules (antiknight, antiking,
+# diagonals, disjoint groups) don't need a cp-sat model: a backtracking search on bitmask candidates solves
+# them without building one. Every cell has a bitmask of candidates (bit i set if the cell can take
+# min_value + i) and a list of peers, the cells it must differ from. Placing a digit removes it from the
+# peers (naked singles), houses with a cell per digit also place digits that fit a single cell (hidden
+# singles), and the search branches on a cell with the fewest candidates.
+# The search results are CachedSolveResult records, so SolvePuzzle reports them through the same stand-ins
+# as cached results.
+
+Backend = Literal['auto', 'cp-sat', 'bitmask']
+BACKENDS: tuple[Backend, ...] = ('auto', 'cp-sat', 'bitmask')
+DEFAULT_BACKEND: Backend = 'auto'
+
+# bool constraints that only add all different groups or pairs of different cells
+BITMASK_BOOL_CONSTRAINTS = frozenset(key.value for key in (
+    SimpleGlobalConstraintsE.ANTIKNIGHT,
+    SimpleGlobalConstraintsE.ANTIKING,
+    SimpleGlobalConstraintsE.DISJOINT_GROUPS,
+    SimpleGlobalConstraintsE.POSITIVE_DIAGONAL,
+    SimpleGlobalConstraintsE.NEGATIVE_DIAGONAL,
+))
+
+# branches of the search before the auto backend gives up and builds the cp-sat model instead. The search
+# takes as long as cp-sat to build and solve the puzzle after ~240 branches on 9x9 grids and ~310 on 16x16
+# grids (benchmarks/backend_crossover.py), so the crossover hardly depends on the grid size.
+AUTO_MAX_BRANCHES = 250
+
+# branches between two checks of the time limit and the stop callback
+_CHECK_INTERVAL = 256
+
+
+def bitmask_supported(puzzle: Puzzle) -> bool:
+    """The puzzle only has sudoku rules (rows, columns, regions), givens and the bool constraints of
+    BITMASK_BOOL_CONSTRAINTS, over distinct consecutive digits"""
+    features = PuzzleFeatures.from_puzzle(puzzle)
+    if features.tool_constraints or not features.bool_constraints <= BITMASK_BOOL_CONSTRAINTS:
+        return False
+    digits = sorted(puzzle.valid_digits)
+    return len(digits) > 0 and len(set(digits)) == len(digits) and digits[-1] - digits[0] + 1 == len(digits)
+
+
+class BitmaskPuzzle:
+    """
+    The cells of a puzzle supported by the bitmask backend, by index, with their peers. groups are the all
+    different groups (rows, columns, regions, diagonals, disjoint groups) and pairs the other pairs of
+    different cells (antiknight, antiking).
+    """
+    cells: list[tuple[int, int]]
+    min_value: int
+    n_values: int
+    givens: list[int | None]
+    groups: list[tuple[int, ...]]
+    pairs: set[tuple[int, int]]
+    peers: list[tuple[int, ...]]
+    houses: list[tuple[int, ...]]  # groups with a cell per value, used for hidden singles
+
+    def __init__(self, cells: list[tuple[int, int]], min_value: int, n_values: int, givens: list[int | None],
+                 groups: list[tuple[int, ...]], pairs: set[tuple[int, int]]) -> None:
+        self.cells = cells
+        self.min_value = min_value
+        self.n_values = n_values
+        self.givens = givens
+        self.groups = groups
+        self.pairs = pairs
+
+        peers: list[set[int]] = [set() for _ in cells]
+        for group in groups:
+            for i in group:
+                peers[i].update(group)
+        for i, j in pairs:
+            peers[i].add(j)
+            peers[j].add(i)
+        for i, cell_peers in enumerate(peers):
+            cell_peers.discard(i)
+        self.peers = [tuple(sorted(cell_peers)) for cell_peers in peers]
+        self.houses = [group for group in groups if len(group) == n_values]
+
+    @staticmethod
+    def from_puzzle(puzzle: Puzzle) -> 'BitmaskPuzzle':
+        grid = puzzle.grid
+        all_cells = grid.getAllCells()
+        cells = [(cell.row, cell.col) for cell in all_cells]
+        index = {coords: i for i, coords in enumerate(cells)}
+        givens = [cell.value for cell in all_cells]
+
+        def cells_indices(group_cells) -> tuple[int, ...]:
+            return tuple(index[(cell.row, cell.col)] for cell in group_cells)
+
+        groups: list[tuple[int, ...]] = []
+        sudoku_rules_apply = not puzzle.bool_constraints.get(
+            SimpleGlobalConstraintsE.NORMAL_SUDOKU_RULES_DO_NOT_APPLY, False)
+        if sudoku_rules_apply:
+            groups += [cells_indices(grid.getRow(i)) for i in range(grid.nRows)]
+            groups += [cells_indices(grid.getCol(j)) for j in range(grid.nCols)]
+            groups += [cells_indices(grid.getRegionCells(i)) for i in grid.getUsedRegions()]
+        if puzzle.bool_constraints.get(SimpleGlobalConstraintsE.POSITIVE_DIAGONAL, False):
+            groups.append(cells_indices(grid.getPositiveDiagonal()))
+        if puzzle.bool_constraints.get(SimpleGlobalConstraintsE.NEGATIVE_DIAGONAL, False):
+            groups.append(cells_indices(grid.getNegativeDiagonal()))
+        if puzzle.bool_constraints.get(SimpleGlobalConstraintsE.DISJOINT_GROUPS, False):
+            groups += [cells_indices(grid.getCellsInDisjointGroup(idx))
+                       for idx in range(len(grid.getUsedRegions()))]
+        groups = [group for group in groups if len(group) > 1]
+
+        pairs: set[tuple[int, int]] = set()
+        for cell in all_cells:
+            others = []
+            if puzzle.bool_constraints.get(SimpleGlobalConstraintsE.ANTIKNIGHT, False):
+                others += grid.getKnigthMoveCells(cell)
+            if puzzle.bool_constraints.get(SimpleGlobalConstraintsE.ANTIKING, False):
+                others += grid.getNeighbourCells(cell)
+            i = index[(cell.row, cell.col)]
+            for other in others:
+                j = index[(other.row, other.col)]
+                pairs.add((min(i, j), max(i, j)))
+
+        digits = puzzle.valid_digits
+        return BitmaskPuzzle(cells, min(digits), len(digits), givens, groups, pairs)
+
+
+class _StopSearch(Exception):
+    pass
+
+
+class BitmaskSearch:
+    """
+    Depth first search of the solutions of a BitmaskPuzzle, stopped after max_sols solutions, max_time
+    seconds, max_branches branches (None for no limit) or when should_stop returns True. Only the first
+    max_stored_solutions solutions are kept (None keeps all). branches counts the digits tried on the cells
+    the search branched on and conflicts the branches that emptied a cell.
+    """
+    puzzle: BitmaskPuzzle
+    max_sols: int
+    max_time: float
+    max_branches: int | None
+    should_stop: Callable[[], bool] | None
+    max_stored_solutions: int | None
+    solution_count: int
+    solutions: list[dict[tuple[int, int], int]]
+    branches: int
+    conflicts: int
+    wall_time: float
+    first_solution_time: float | None
+    exhausted: bool  # every branch was explored
+    branch_limit_reached: bool
+    _full_mask: int
+    _start_time: float
+
+    def __init__(self, puzzle: BitmaskPuzzle, max_sols: int, max_time: float, max_branches: int | None = None,
+                 should_stop: Callable[[], bool] | None = None, max_stored_solutions: int | None = None) -> None:
+        self.puzzle = puzzle
+        self.max_sols = max_sols
+        self.max_time = max_time
+        self.max_branches = max_branches
+        self.should_stop = should_stop
+        self.max_stored_solutions = max_stored_solutions
+        self.solution_count = 0
+        self.solutions = []
+        self.branches = 0
+        self.conflicts = 0
+        self.wall_time = 0.0
+        self.first_solution_time = None
+        self.exhausted = False
+        self.branch_limit_reached = False
+        self._full_mask = (1 << puzzle.n_values) - 1
+        self._start_time = 0.0
+
+    def run(self) -> 'BitmaskSearch':
+        self._start_time = time.perf_counter()
+        try:
+            candidates = self._initial_candidates()
+            if candidates is not None:
+                self._search(candidates)
+            self.exhausted = True
+        except _StopSearch:
+            pass
+        self.wall_time = time.perf_counter() - self._start_time
+        return self
+
+    def status_name(self) -> str:
+        """The cp-sat status an enumeration with the same outcome ends with"""
+        if self.exhausted:
+            return 'OPTIMAL' if self.solution_count else 'INFEASIBLE'
+        return 'FEASIBLE' if self.solution_count else 'UNKNOWN'
+
+    def verdict(self) -> str:
+        if self.solution_count > 1:
+            return 'multiple'
+        if self.exhausted:
+            return 'unique' if self.solution_count else 'none'
+        return 'unknown'
+
+    def result(self) -> CachedSolveResult:
+        return CachedSolveResult(self.verdict(), self.status_name(), self.max_sols, self.solution_count,
+                                 self.solution_count, self.solutions, self.wall_time, self.conflicts,
+                                 self.branches)
+
+    def _initial_candidates(self) -> list[int] | None:
+        puzzle = self.puzzle
+        candidates = [self._full_mask] * len(puzzle.cells)
+        singles: list[int] = []
+        for i, value in enumerate(puzzle.givens):
+            if value is None:
+                continue
+            offset = value - puzzle.min_value
+            if not 0 <= offset < puzzle.n_values:
+                return None
+            candidates[i] = 1 << offset
+            singles.append(i)
+        if not self._propagate(candidates, singles):
+            return None
+        return candidates
+
+    def _propagate(self, candidates: list[int], singles: list[int]) -> bool:
+        """Removes the digits of the singles from their peers, then places the hidden singles of the houses,
+        until nothing changes. False if a cell has no candidates left."""
+        peers = self.puzzle.peers
+        while True:
+            while singles:
+                i = singles.pop()
+                bit = candidates[i]
+                for j in peers[i]:
+                    mask = candidates[j]
+                    if mask & bit:
+                        mask &= ~bit
+                        if not mask:
+                            return False
+                        candidates[j] = mask
+                        if not mask & (mask - 1):
+                            singles.append(j)
+
+            for house in self.puzzle.houses:
+                seen = 0
+                seen_twice = 0
+                for i in house:
+                    mask = candidates[i]
+                    seen_twice |= seen & mask
+                    seen |= mask
+                if seen != self._full_mask:
+                    return False
+                hidden = seen & ~seen_twice
+                if not hidden:
+                    continue
+                for i in house:
+                    mask = candidates[i]
+                    if mask & hidden and mask & (mask - 1):
+                        mask &= hidden
+                        if mask & (mask - 1):
+                            # two digits that only fit this cell
+                            return False
+                        candidates[i] = mask
+                        singles.append(i)
+            if not singles:
+                return True
+
+    def _search(self, candidates: list[int]):
+        # the unsolved cell with the fewest candidates
+        best = -1
+        best_count = self.puzzle.n_values + 1
+        for i, mask in enumerate(candidates):
+            if mask & (mask - 1):
+                count = mask.bit_count()
+                if count < best_count:
+                    best, best_count = i, count
+                    if count == 2:
+                        break
+        if best < 0:
+            self._add_solution(candidates)
+            return
+
+        mask = candidates[best]
+        while mask:
+            bit = mask & -mask
+            mask &= mask - 1
+            self._count_branch()
+            branch = candidates.copy()
+            branch[best] = bit
+            if self._propagate(branch, [best]):
+                self._search(branch)
+            else:
+                self.conflicts += 1
+
+    def _count_branch(self):
+        if self.max_branches is not None and self.branches >= self.max_branches:
+            self.branch_limit_reached = True
+            raise _StopSearch()
+        self.branches += 1
+        if self.branches % _CHECK_INTERVAL == 0:
+            if time.perf_counter() - self._start_time >= self.max_time:
+                raise _StopSearch()
+            if self.should_stop is not None and self.should_stop():
+                raise _StopSearch()
+
+    def _add_solution(self, candidates: list[int]):
+        self.solution_count += 1
+        if self.max_stored_solutions is None or len(self.solutions) < self.max_stored_solutions:
+            min_value = self.puzzle.min_value
+            self.solutions.append({coords: min_value + mask.bit_length() - 1
+                                   for coords, mask in zip(self.puzzle.cells, candidates)})
+        if self.first_solution_time is None:
+            self.first_solution_time = time.perf_counter() - self._start_time
+        if self.solution_count >= self.max_sols:
+            raise _StopSearch()
@@ -0,0 +1,98 @@
+import contextlib
+import os
+import time
+from typing import Generic, TypeVar
+
+T = TypeVar('T')
+
+
+class FileCache(Generic[T]):
+    """
+    On-disk cache with one file per key, the base of SolveResultCache and ModelCache. Entries are written to a
+    temporary file then moved in place, so readers never see a partial entry. Reading an entry refreshes its
+    modification time, and the least recently used entries are removed when the cache grows over max_size.
+    Subclasses set the file suffix and convert the values to and from bytes.
+
+    Args:
+        directory (str): the cache directory, created on the first put.
+        max_size (int): total size of the entries in bytes.
+    """
+    suffix: str = ''
+    directory: str
+    max_size: int
+
+    def __init__(self, directory: str, max_size: int) -> None:
+        self.directory = directory
+        self.max_size = max_size
+
+    def serialize(self, value: T) -> bytes:
+        raise NotImplementedError
+
+    def deserialize(self, data: bytes) -> T:
+        raise NotImplementedError
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> T | None:
+        filepath = self.entry_path(key)
+        try:
+            with open(filepath, 'rb') as file:
+                data = file.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            value = self.deserialize(data)
+        except Exception:
+            # truncated, corrupted or old entry
+            self.remove(key)
+            return None
+
+        now = time.time()
+        # another process may have evicted the entry since it was read
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(filepath, (now, now))
+        return value
+
+    def put(self, key: str, value: T):
+        os.makedirs(self.directory, exist_ok=True)
+        filepath = self.entry_path(key)
+        tmp_filepath = f"{filepath}.{os.getpid()}.tmp"
+        with open(tmp_filepath, 'wb') as file:
+            file.write(self.serialize(value))
+        os.replace(tmp_filepath, filepath)
+        self.evict()
+
+    def remove(self, key: str):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.entry_path(key))
+
+    def entries(self) -> list[os.DirEntry[str]]:
+        """Cache files, least recently used first"""
+        if not os.path.isdir(self.directory):
+            return []
+        files: list[os.DirEntry[str]] = []
+        for entry in os.scandir(self.directory):
+            if not (entry.is_file() and entry.name.endswith(self.suffix)):
+                continue
+            # stat() is cached by the entry, files evicted by another process meanwhile are skipped
+            with contextlib.suppress(FileNotFoundError):
+                entry.stat()
+                files.append(entry)
+        return sorted(files, key=lambda entry: entry.stat().st_mtime)
+
+    def evict(self):
+        files = self.entries()
+        total_size = sum(entry.stat().st_size for entry in files)
+        for entry in files:
+            if total_size <= self.max_size:
+                break
+            total_size -= entry.stat().st_size
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(entry.path)
+
+    def clear(self):
+        for entry in self.entries():
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(entry.path)
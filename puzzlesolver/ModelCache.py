@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import struct
+from typing import Any
+
+from puzzlesolver.FileCache import FileCache
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.connectivity_csp import DEFAULT_CONNECTIVITY_ENCODING, ConnectivityEncoding
+from puzzlesolver.Puzzle2model.puzzle2model import PROPAGATE_DOMAINS
+from puzzlesolver.SolveResultCache import puzzle_hash
+
+MODEL_CACHE_VERSION = 1
+DEFAULT_MODEL_CACHE_DIR = './.psolver_model_cache'
+DEFAULT_MODEL_CACHE_SIZE = 256 * 1024 * 1024  # bytes
+
+# file layout: header length (uint32, little endian), JSON header, serialized CpModelProto
+_HEADER_LENGTH = struct.Struct('<I')
+
+_builder_fingerprint: str | None = None
+
+
+def builder_fingerprint() -> str:
+    """
+    Hash of the sources of the whole puzzlesolver package, so cached models are rebuilt when anything the
+    build depends on changes: the constraint setters (Puzzle2model) but also the parsed puzzle, grid and
+    cells (Puzzle).
+    """
+    global _builder_fingerprint
+    if _builder_fingerprint is None:
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+        sha = hashlib.sha256()
+        for dirpath, dirnames, filenames in os.walk(package_dir):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if not filename.endswith('.py'):
+                    continue
+                filepath = os.path.join(dirpath, filename)
+                sha.update(os.path.relpath(filepath, package_dir).replace(os.sep, '/').encode())
+                with open(filepath, 'rb') as file:
+                    sha.update(file.read())
+        _builder_fingerprint = sha.hexdigest()
+    return _builder_fingerprint
+
+
+def model_cache_key(puzzle: Puzzle, connectivity_encoding: ConnectivityEncoding = DEFAULT_CONNECTIVITY_ENCODING,
+                    propagate_domains: bool = PROPAGATE_DOMAINS) -> str:
+    """Key of the model of a puzzle built with these puzzle2model options"""
+    key_str = (f"{MODEL_CACHE_VERSION}:{builder_fingerprint()}:{connectivity_encoding}:{propagate_domains}:"
+               f"{puzzle_hash(puzzle)}")
+    return hashlib.sha256(key_str.encode()).hexdigest()
+
+
+def _cell_key(cell: tuple[int, int]) -> str:
+    return f"{cell[0]},{cell[1]}"
+
+
+def _parse_cell_key(key: str) -> tuple[int, int]:
+    row, col = key.split(',')
+    return int(row), int(col)
+
+
+def model_index_mapping(puzzle_model: PuzzleModel) -> dict[str, Any]:
+    """Proto variable indices of the named variables of a puzzle model (everything solving needs besides the proto)"""
+    return {
+        'version': MODEL_CACHE_VERSION,
+        'connectivity_encoding': puzzle_model.connectivity_encoding,
+        'variable_counter': puzzle_model._variable_counter,
+        'grid_vars_dict': {name: {_cell_key(cell): var.Index() for cell, var in grid_vars.items()}
+                           for name, grid_vars in puzzle_model.grid_vars_dict.items()},
+        'adjacency_vars_dicts': {name: {_cell_key(node1): {_cell_key(node2): var.Index()
+                                                           for node2, var in edges_dict.items()}
+                                        for node1, edges_dict in adjacency_vars_dict.items()}
+                                 for name, adjacency_vars_dict in puzzle_model.adjacency_vars_dicts.items()},
+        'shared_vars_dict': {name: var.Index() for name, var in puzzle_model.shared_vars_dict.items()},
+        'variable_record': {name: var.Index() for name, var in puzzle_model.get_variable_record().items()},
+    }
+
+
+def model_to_bytes(puzzle_model: PuzzleModel) -> bytes:
+    header = json.dumps(model_index_mapping(puzzle_model)).encode()
+    return _HEADER_LENGTH.pack(len(header)) + header + puzzle_model.Proto().SerializeToString()
+
+
+def model_from_bytes(data: bytes) -> PuzzleModel:
+    (header_length,) = _HEADER_LENGTH.unpack_from(data)
+    header_end = _HEADER_LENGTH.size + header_length
+    mapping: dict[str, Any] = json.loads(data[_HEADER_LENGTH.size:header_end])
+    if mapping.get('version') != MODEL_CACHE_VERSION:
+        raise ValueError(f"Unsupported model cache version {mapping.get('version')}")
+
+    puzzle_model = PuzzleModel(mapping['connectivity_encoding'])
+    puzzle_model.Proto().ParseFromString(data[header_end:])
+    var = puzzle_model.GetIntVarFromProtoIndex
+
+    puzzle_model.grid_vars_dict = {name: {_parse_cell_key(cell): var(index) for cell, index in grid_vars.items()}
+                                   for name, grid_vars in mapping['grid_vars_dict'].items()}
+    puzzle_model.adjacency_vars_dicts = {name: {_parse_cell_key(node1): {_parse_cell_key(node2): var(index)
+                                                                         for node2, index in edges_dict.items()}
+                                                for node1, edges_dict in adjacency_vars_dict.items()}
+                                         for name, adjacency_vars_dict in mapping['adjacency_vars_dicts'].items()}
+    puzzle_model.shared_vars_dict = {name: var(index) for name, index in mapping['shared_vars_dict'].items()}
+    puzzle_model._variable_record = {name: var(index) for name, index in mapping['variable_record'].items()}
+    puzzle_model._variable_counter = mapping['variable_counter']
+    return puzzle_model
+
+
+class ModelCache(FileCache[PuzzleModel]):
+    """
+    On-disk cache of built puzzle models: the serialized CpModelProto and the indices of the named variables,
+    one binary file per puzzle hash, package sources and build options. Like SolveResultCache, reading an
+    entry refreshes its modification time, and the least recently used entries are removed when the cache
+    grows over max_size.
+
+    Args:
+        directory (str, optional): Defaults to DEFAULT_MODEL_CACHE_DIR = './.psolver_model_cache'.
+        max_size (int, optional): Defaults to DEFAULT_MODEL_CACHE_SIZE = 256 MiB.
+    """
+    suffix = '.model'
+
+    def __init__(self, directory: str = DEFAULT_MODEL_CACHE_DIR, max_size: int = DEFAULT_MODEL_CACHE_SIZE) -> None:
+        super().__init__(directory, max_size)
+
+    def serialize(self, value: PuzzleModel) -> bytes:
+        return model_to_bytes(value)
+
+    def deserialize(self, data: bytes) -> PuzzleModel:
+        return model_from_bytes(data)
@@ -0,0 +1,178 @@
+import argparse
+import collections
+import copy
+import os
+import random
+import statistics
+from typing import Any, Callable
+
+from puzzlesolver.PuzzleFeatures import CATEGORIES, DEFAULT_PROFILE_NAME, DEFAULT_PROFILE_TABLE, ProfileTable, PuzzleFeatures
+from puzzlesolver.SolvePuzzle import MAX_SOLS, SOLVE_MODES, SOLVER_PROFILES, BatchSolveResult, SolveMode, SolverOptions, apply_solver_profile, load_puzzle, solve_puzzle_result
+from puzzlesolver.SolveResultCache import EXHAUSTED_STATUSES
+
+CALIBRATION_PROFILES: tuple[str, ...] = (DEFAULT_PROFILE_NAME, *SOLVER_PROFILES)
+CALIBRATION_MAX_TIME = 30
+PUZZLES_PER_FAMILY = 5
+# unsolved runs count as this many times max_time (PAR2 score)
+TIMEOUT_PENALTY = 2
+
+
+def is_decided(result: BatchSolveResult, mode: SolveMode, max_sols: int) -> bool:
+    """The run reached an answer before the time limit"""
+    if result.error is not None:
+        return False
+    if mode == 'unique':
+        return result.verdict != 'unknown'
+    return result.status_name in EXHAUSTED_STATUSES or result.solution_count >= max_sols
+
+
+def penalized_time(result: BatchSolveResult, mode: SolveMode, options: SolverOptions) -> float:
+    if is_decided(result, mode, options.max_sols):
+        return result.wall_time
+    return TIMEOUT_PENALTY * options.max_time
+
+
+def profile_options(options: SolverOptions, profile: str) -> SolverOptions:
+    if profile == DEFAULT_PROFILE_NAME:
+        return options
+    return apply_solver_profile(options, profile)  # type: ignore
+
+
+def sample_families(filepaths: list[str], per_family: int, seed: int = 0) -> dict[str, list[str]]:
+    """Groups the puzzles by family and keeps at most per_family random puzzles of each one"""
+    families: dict[str, list[str]] = collections.defaultdict(list)
+    for filepath in sorted(filepaths):
+        try:
+            puzzle = load_puzzle(filepath)
+        except Exception:
+            continue
+        families[PuzzleFeatures.from_puzzle(puzzle).family].append(filepath)
+
+    rng = random.Random(seed)
+    return {family: sorted(rng.sample(family_filepaths, min(per_family, len(family_filepaths))))
+            for family, family_filepaths in sorted(families.items())}
+
+
+def best_profile(times: dict[str, float]) -> str:
+    """The fastest profile, the earliest one of CALIBRATION_PROFILES on ties"""
+    return min(times, key=lambda profile: (times[profile], CALIBRATION_PROFILES.index(profile)))
+
+
+def calibrate(filepaths: list[str], options: SolverOptions, mode: SolveMode = 'unique',
+              per_family: int = PUZZLES_PER_FAMILY, repeats: int = 1, seed: int = 0,
+              progress: Callable[[str], None] | None = print) -> ProfileTable:
+    """
+    Solves a sample of each puzzle family with every profile and keeps the fastest one of each family and
+    category. Runs are scored by their solver wall time (the median over repeats, each repeat with its own
+    random seed), unsolved runs by TIMEOUT_PENALTY * max_time.
+
+    Args:
+        filepaths (list[str]): the puzzle corpus.
+        options (SolverOptions): base options of every run. The result cache is disabled.
+        mode (SolveMode, optional): Defaults to 'unique'.
+        per_family (int, optional): Defaults to PUZZLES_PER_FAMILY = 5 puzzles per family.
+        repeats (int, optional): Defaults to 1.
+        seed (int, optional): Defaults to 0. Seeds the puzzle sample and the solver random seeds.
+        progress (Callable[[str], None] | None, optional): Defaults to print. Called after each run.
+
+    Returns:
+        ProfileTable:
+    """
+    base_options = copy.copy(options)
+    base_options.cache_dir = None
+    base_options.profile_table = None
+    base_options.quiet = True
+    base_options.log_solutions = False
+    # the profiles only change the cp-sat search
+    base_options.backend = 'cp-sat'
+    families = sample_families(filepaths, per_family, seed)
+
+    family_times: dict[str, dict[str, float]] = dict()
+    for family, family_filepaths in families.items():
+        totals = {profile: 0.0 for profile in CALIBRATION_PROFILES}
+        for filepath in family_filepaths:
+            for profile in CALIBRATION_PROFILES:
+                times: list[float] = []
+                for repeat in range(repeats):
+                    run_options = profile_options(base_options, profile)
+                    if repeats > 1:
+                        run_options = copy.copy(run_options)
+                        run_options.random_seed = seed + repeat
+                    result = solve_puzzle_result(filepath, run_options, mode)
+                    times.append(penalized_time(result, mode, run_options))
+                    if progress is not None:
+                        progress(f"{family} {profile} {os.path.basename(filepath)}: "
+                                 f"{result.wall_time:.3f} s {result.verdict}")
+                totals[profile] += statistics.median(times)
+        family_times[family] = totals
+
+    profiles: dict[str, str] = dict()
+    calibration_families: dict[str, Any] = dict()
+    category_times: dict[str, dict[str, float]] = dict()
+    for family, totals in family_times.items():
+        profiles[family] = best_profile(totals)
+        calibration_families[family] = {'puzzles': len(families[family]), 'times': totals}
+        category = family.rsplit('-', 1)[0]
+        category_totals = category_times.setdefault(category, {profile: 0.0 for profile in CALIBRATION_PROFILES})
+        for profile, time in totals.items():
+            category_totals[profile] += time
+    for category in CATEGORIES:
+        if category in category_times:
+            profiles[category] = best_profile(category_times[category])
+
+    calibration = {
+        'mode': mode,
+        'max_time': base_options.max_time,
+        'max_sols': base_options.max_sols,
+        'repeats': repeats,
+        'seed': seed,
+        'families': calibration_families,
+    }
+    return ProfileTable(profiles, calibration)
+
+
+def make_calibrate_parser():
+    parser = argparse.ArgumentParser(
+        prog='psolver calibrate',
+        description='Solves a sample of each puzzle family (category and grid size) with every solver profile '
+                    'and writes the fastest profile of each family to a table, used by --profile auto.')
+    parser.add_argument('filepath', type=str, nargs='+',
+                        help='a folder of puzzles or puzzle files')
+    parser.add_argument('-o', '--output', dest='output', default=DEFAULT_PROFILE_TABLE, type=str,
+                        help=f'the profile table to write. Default is {DEFAULT_PROFILE_TABLE}.')
+    parser.add_argument('--mode', dest='mode', default='unique', choices=SOLVE_MODES,
+                        help='the solve mode the profiles are tuned for. Default is unique.')
+    parser.add_argument('--max_time', dest='max_time', default=CALIBRATION_MAX_TIME, type=int,
+                        help=f'the time limit of each run. Default is {CALIBRATION_MAX_TIME} s.')
+    parser.add_argument('--max_sols', dest='max_sols', default=MAX_SOLS, type=int,
+                        help=f'max_sols of each run in enumerate mode. Default is {MAX_SOLS}.')
+    parser.add_argument('--per_family', dest='per_family', default=PUZZLES_PER_FAMILY, type=int,
+                        help=f'the number of puzzles sampled from each family. Default is {PUZZLES_PER_FAMILY}.')
+    parser.add_argument('--repeats', dest='repeats', default=1, type=int,
+                        help='runs of each puzzle and profile, with different random seeds. Default is 1.')
+    parser.add_argument('--seed', dest='seed', default=0, type=int,
+                        help='seeds the puzzle sample and the solver random seeds. Default is 0.')
+    parser.add_argument('--model_cache', dest='model_cache_dir', nargs='?', const='./.psolver_model_cache',
+                        default=None, type=str,
+                        help='build each model once and load it for the other profiles')
+    return parser
+
+
+def calibrate_main(argv: list[str] | None = None):
+    args = make_calibrate_parser().parse_args(argv)
+    filepaths: list[str] = []
+    for path in args.filepath:
+        if os.path.isdir(path):
+            filepaths.extend(entry.path for entry in os.scandir(path)
+                             if entry.is_file() and entry.name.endswith('.json'))
+        else:
+            filepaths.append(path)
+
+    options = SolverOptions(args.max_time, args.max_sols, model_cache_dir=args.model_cache_dir)
+    table = calibrate(filepaths, options, args.mode, args.per_family, args.repeats, args.seed)
+    table.save(args.output)
+
+    print()
+    for name, profile in table.profiles.items():
+        print(f"  {name:<24} : {profile}")
+    print(f"Profile table written to {args.output}")
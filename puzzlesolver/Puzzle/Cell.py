@@ -1,5 +1,8 @@
 from math import floor
-from typing import Union
+from typing import TYPE_CHECKING, Sequence, Union
+
+if TYPE_CHECKING:
+    from puzzlesolver.Puzzle.Grid import Grid
 
 grid_sizes = {3:  {'w': 3, 'h': 1},
               4:  {'w': 2, 'h': 2},
@@ -34,17 +37,26 @@ def get_region_index(row: int, col: int, size: int) -> Union[int, None]:
     return (floor(row / region_h) * region_h) + floor(col / region_w)
 
 
+# attributes that can be set from a puzzle's JSON grid, other keys are ignored
+CELL_JSON_ATTRIBUTES = ('value', 'region', 'given', 'outside', 'highlight', 'disabled')
+
+
 class Cell:
-    value: Union[int, None] = None
+    __slots__ = ('value', 'row', 'col', '_region', 'given', '_outside',
+                 'highlight', 'disabled', 'value_backup', '_grid')
+    value: Union[int, None]
     row: int
     col: int
-    region: Union[int, None] = None
+    _region: Union[int, None]
     given: bool
-    outside: bool
-    highlight: list[int] = []
-    disabled: bool = False
+    _outside: bool
+    highlight: Sequence[int]
+    disabled: bool
+    value_backup: Union[int, None]
+    _grid: Union['Grid', None]  # grid whose index tables depend on this cell
 
     def __init__(self, row: int, col: int, size: int | None = None, value: int | None = None, outside: bool = False):
+        self._grid = None
         self.row = row
         self.col = col
         self.value = value
@@ -53,6 +65,28 @@ class Cell:
             row, col, size)
         self.outside = outside
         self.given = False
+        self.highlight = ()
+        self.disabled = False
+
+    @property
+    def region(self) -> Union[int, None]:
+        return self._region
+
+    @region.setter
+    def region(self, region: Union[int, None]):
+        self._region = region
+        if self._grid is not None:
+            self._grid.invalidateIndexCache()
+
+    @property
+    def outside(self) -> bool:
+        return self._outside
+
+    @outside.setter
+    def outside(self, outside: bool):
+        self._outside = outside
+        if self._grid is not None:
+            self._grid.invalidateIndexCache()
 
     def __repr__(self):
         string = f"<Cell>: {self.format_cell()}: {self.value if self.value is not None else ''}"
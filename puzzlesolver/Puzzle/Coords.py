@@ -3,20 +3,24 @@ import re
 
 
 class GridCoords:
+    """Immutable (r, c) coordinates. The hash is computed once, since coords are used as dict keys in hot loops."""
+    __slots__ = ('_r', '_c', '_hash')
     _r: int | float
     _c: int | float
+    _hash: int
 
     def __init__(self, r: int | float, c: int | float) -> None:
         self._r = r
         self._c = c
+        self._hash = hash((r, c))
 
     def __eq__(self, other: Any) -> bool:
         if type(other) is type(self):
-            return self.r == other.r and self.c == other.c
+            return self._r == other._r and self._c == other._c
         return False
 
     def __hash__(self) -> int:
-        return hash((self.r, self.c))
+        return self._hash
 
     def __repr__(self) -> str:
         return str(self.toTuple())
@@ -1,29 +1,59 @@
 from collections import Counter
 from math import floor
-from typing import Any, Literal, Union
+from typing import Any, Callable, Hashable, Literal, Union
 
-from puzzlesolver.Puzzle.Cell import Cell
+from puzzlesolver.Puzzle.Cell import CELL_JSON_ATTRIBUTES, Cell
 from puzzlesolver.Puzzle.Coords import GridCoords
 from puzzlesolver.Puzzle.Directions import DIRECTIONS, DirectionToRCDict
 
 
 class Grid:
+    """
+    Rows, columns, regions, neighbours and diagonals are computed once and cached as immutable tables,
+    so the *2csp modules can query them inside nested loops. Every query still returns a new list.
+    The tables are dropped when a cell's region or outside flag changes.
+    """
     _grid: list[list[Cell]]
     nRows: int
     nCols: int
+    _indexCache: dict[Hashable, Any]
 
     def __init__(self, nrows: int, ncols: int):
         self.nRows = nrows
         self.nCols = ncols
         self._grid = []
+        self._indexCache = dict()
 
         for i in range(nrows):
             row: list[Cell] = []
             for j in range(ncols):
                 cell = Cell(i, j, nrows)
+                cell._grid = self
                 row.append(cell)
             self._grid.append(row)
 
+    def invalidateIndexCache(self):
+        self._indexCache.clear()
+
+    def _cachedCells(self, key: Hashable, build: Callable[[], list[Cell]]) -> list[Cell]:
+        cells: tuple[Cell, ...] | None = self._indexCache.get(key)
+        if cells is None:
+            cells = tuple(build())
+            self._indexCache[key] = cells
+        return list(cells)
+
+    def _regionTable(self) -> dict[int, tuple[Cell, ...]]:
+        table: dict[int, tuple[Cell, ...]] | None = self._indexCache.get('regions')
+        if table is None:
+            region_cells: dict[int, list[Cell]] = dict()
+            for row in self._grid:
+                for cell in row:
+                    if cell.region is not None:
+                        region_cells.setdefault(cell.region, []).append(cell)
+            table = {region: tuple(cells) for region, cells in sorted(region_cells.items())}
+            self._indexCache['regions'] = table
+        return table
+
     def getCell(self, row: int, col: int, get_outside: bool = False) -> Union[Cell, None]:
         if not (0 <= row < self.nRows):
             return None
@@ -41,6 +71,9 @@ class Grid:
         return self.getCell(coord.r, coord.c, get_outside)
 
     def getRow(self, row: int, getOutside: bool = False) -> list[Cell]:
+        return self._cachedCells(('row', row, getOutside), lambda: self._buildRow(row, getOutside))
+
+    def _buildRow(self, row: int, getOutside: bool) -> list[Cell]:
         cells: list[Cell] = []
         if 0 <= row < self.nRows:
             cells = list(self._grid[row])
@@ -51,6 +84,9 @@ class Grid:
         return cells
 
     def getCol(self, col: int, getOutside: bool = False) -> list[Cell]:
+        return self._cachedCells(('col', col, getOutside), lambda: self._buildCol(col, getOutside))
+
+    def _buildCol(self, col: int, getOutside: bool) -> list[Cell]:
         cells: list[Cell] = []
         if 0 <= col < self.nCols:
             cells = [row[col] for row in self._grid]
@@ -85,6 +121,10 @@ class Grid:
         return cells
 
     def getOrthogonallyAdjacentCells(self, cell: Cell, get_outside: bool = False) -> list[Cell]:
+        return self._cachedCells(('orthogonal', cell.row, cell.col, get_outside),
+                                 lambda: self._buildOrthogonallyAdjacentCells(cell, get_outside))
+
+    def _buildOrthogonallyAdjacentCells(self, cell: Cell, get_outside: bool) -> list[Cell]:
         cells: list[Cell] = []
         up = self.getCell(cell.row-1, cell.col, get_outside)
         down = self.getCell(cell.row+1, cell.col, get_outside)
@@ -103,6 +143,10 @@ class Grid:
         return cells
 
     def getDiagonallyAdjacentCells(self, cell: Cell, get_outside: bool = False) -> list[Cell]:
+        return self._cachedCells(('diagonal', cell.row, cell.col, get_outside),
+                                 lambda: self._buildDiagonallyAdjacentCells(cell, get_outside))
+
+    def _buildDiagonallyAdjacentCells(self, cell: Cell, get_outside: bool) -> list[Cell]:
         cells: list[Cell] = []
         nw = self.getCell(cell.row-1, cell.col-1, get_outside)
         ne = self.getCell(cell.row-1, cell.col+1, get_outside)
@@ -121,6 +165,10 @@ class Grid:
         return cells
 
     def getNeighbourCells(self, cell: Cell, get_outside: bool = False) -> list[Cell]:
+        return self._cachedCells(('king', cell.row, cell.col, get_outside),
+                                 lambda: self._buildNeighbourCells(cell, get_outside))
+
+    def _buildNeighbourCells(self, cell: Cell, get_outside: bool) -> list[Cell]:
         orth_adj = self.getOrthogonallyAdjacentCells(cell, get_outside)
         diag_adj = self.getDiagonallyAdjacentCells(cell, get_outside)
 
@@ -128,6 +176,9 @@ class Grid:
         return cells
 
     def getAllCells(self, getOutside: bool = False) -> list[Cell]:
+        return self._cachedCells(('all', getOutside), lambda: self._buildAllCells(getOutside))
+
+    def _buildAllCells(self, getOutside: bool) -> list[Cell]:
         cells: list[Cell] = []
         for row in self._grid:
             cells.extend(row)
@@ -140,17 +191,10 @@ class Grid:
     def getRegionCells(self, region: int | None) -> list[Cell]:
         if region is None:
             return []
-        regionCells: list[Cell] = [
-            cell for row in self._grid for cell in row if cell.region == region]
-        return regionCells
+        return list(self._regionTable().get(region, ()))
 
     def getUsedRegions(self) -> list[int]:
-        usedRegions: set[int] = set(
-            cell.region for row in self._grid for cell in row if cell.region != None)
-
-        usedRegionsList = list(usedRegions)
-        usedRegionsList.sort()
-        return usedRegionsList
+        return list(self._regionTable().keys())
 
     def getRegionCounts(self) -> Counter[int]:
         region_vals = [cell.region for cell in self.getAllCells()
@@ -161,7 +205,12 @@ class Grid:
     def getDisjointGroupIdx(self, cell: Cell) -> int:
         if cell.region is None:
             return -1
-        return self.getRegionCells(cell.region).index(cell)
+        group_idx: dict[tuple[int, int], int] | None = self._indexCache.get('disjoint_group_idx')
+        if group_idx is None:
+            group_idx = {(cell2.row, cell2.col): i for cells in self._regionTable().values()
+                         for i, cell2 in enumerate(cells)}
+            self._indexCache['disjoint_group_idx'] = group_idx
+        return group_idx[(cell.row, cell.col)]
 
     def getCellsInDisjointGroup(self, groupIdx: int) -> list[Cell]:
         usedRegions = self.getUsedRegions()
@@ -175,7 +224,11 @@ class Grid:
 
         return disjointGroup
 
-    def getCellsInDirection(self, cell: Cell, direction: DIRECTIONS):
+    def getCellsInDirection(self, cell: Cell, direction: DIRECTIONS) -> list[Cell]:
+        return self._cachedCells(('direction', cell.row, cell.col, direction),
+                                 lambda: self._buildCellsInDirection(cell, direction))
+
+    def _buildCellsInDirection(self, cell: Cell, direction: DIRECTIONS) -> list[Cell]:
         dr, dc = DirectionToRCDict[direction]
 
         cells: list[Cell] = []
@@ -229,6 +282,9 @@ class Grid:
         return self.getMainDiagonal(first_cell, direction)
 
     def getKnigthMoveCells(self, cell: Cell) -> list[Cell]:
+        return self._cachedCells(('knight', cell.row, cell.col), lambda: self._buildKnigthMoveCells(cell))
+
+    def _buildKnigthMoveCells(self, cell: Cell) -> list[Cell]:
         cells: list[Cell] = []
         r, c = cell.row, cell.col
         deltas = [(-2, -1), (-2, 1),
@@ -263,6 +319,21 @@ class Grid:
         return box
 
     def genAllPDiagonals(self):
+        for diag in self._cachedDiagonals('p_diagonals', self._buildAllPDiagonals):
+            yield list(diag)
+
+    def genAllNDiagonals(self):
+        for diag in self._cachedDiagonals('n_diagonals', self._buildAllNDiagonals):
+            yield list(diag)
+
+    def _cachedDiagonals(self, key: str, build: Callable[[], Any]) -> tuple[tuple[Cell, ...], ...]:
+        diagonals: tuple[tuple[Cell, ...], ...] | None = self._indexCache.get(key)
+        if diagonals is None:
+            diagonals = tuple(tuple(diag) for diag in build())
+            self._indexCache[key] = diagonals
+        return diagonals
+
+    def _buildAllPDiagonals(self):
         direction = DIRECTIONS.NE
         for cell in self.getCol(0):
             diag = [cell] + self.getCellsInDirection(cell, direction)
@@ -274,7 +345,7 @@ class Grid:
             diag = [cell] + self.getCellsInDirection(cell, direction)
             yield diag
 
-    def genAllNDiagonals(self):
+    def _buildAllNDiagonals(self):
         direction = DIRECTIONS.SE
         for cell in reversed(self.getCol(0)):
             diag = [cell] + self.getCellsInDirection(cell, direction)
@@ -371,7 +442,8 @@ class Grid:
             for j, data_cell in enumerate(data_row):
                 cell = grid._grid[i][j]
                 for key, value in data_cell.items():
-                    cell.__setattr__(key, value)
+                    if key in CELL_JSON_ATTRIBUTES:
+                        setattr(cell, key, value)
 
         return grid
 
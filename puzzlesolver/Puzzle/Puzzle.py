@@ -55,6 +55,10 @@ class Puzzle:
     @classmethod
     def fromJSON(cls, pathToFile: str):
         data = loadJSON(pathToFile)
+        return cls.fromJsonData(data)
+
+    @classmethod
+    def fromJsonData(cls, data: dict[str, Any]):
         nrows: int = data['nRows']
         ncols: int = data['nCols']
         puzzle_meta = PuzzleMeta.fromJson(data['puzzleInfo'])
@@ -1,13 +1,20 @@
 
 
+from puzzlesolver.Puzzle.ConstraintEnums import ArrowConstraintsE
 from puzzlesolver.Puzzle.Puzzle import Puzzle
 from puzzlesolver.Puzzle2model.ArrowConstraints.SimpleArrowConstraints2csp import set_average_arrow_constraints, set_doublers_multiplier_arrow_constraints, set_sum_arrow_constraints, set_vampire_prey_arrow_constraints, set_yin_yang_arrow_constraints
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry
+
+
+ARROW_CONSTRAINT_SETTERS = SetterRegistry([
+    (set_sum_arrow_constraints, [ArrowConstraintsE.ARROW]),
+    (set_average_arrow_constraints, [ArrowConstraintsE.AVERAGE_ARROW]),
+    (set_yin_yang_arrow_constraints, [ArrowConstraintsE.YIN_YANG_ARROW]),
+    (set_vampire_prey_arrow_constraints, [ArrowConstraintsE.VAMPIRE_PREY_ARROW]),
+    (set_doublers_multiplier_arrow_constraints, [ArrowConstraintsE.DOUBLERS_MULTIPLIER_ARROW]),
+])
 
 
 def set_arrow_constraints(model: PuzzleModel, puzzle: Puzzle):
-    set_sum_arrow_constraints(model, puzzle)
-    set_average_arrow_constraints(model, puzzle)
-    set_yin_yang_arrow_constraints(model, puzzle)
-    set_vampire_prey_arrow_constraints(model, puzzle)
-    set_doublers_multiplier_arrow_constraints(model, puzzle)
+    ARROW_CONSTRAINT_SETTERS.run(model, puzzle)
@@ -1,3 +1,4 @@
+from puzzlesolver.Puzzle.ConstraintEnums import GlobalRegionConstraintsE, SimpleGlobalConstraintsE, ValueModifierConstraintsE
 from puzzlesolver.Puzzle.Puzzle import Puzzle
 
 from puzzlesolver.Puzzle2model.BoolConstraints.OtherBoolConstraints2csp import set_cells_along_nurimisaki_path_have_a_diff_of_at_least_5_constraints, set_digits_dont_repeat_on_any_diagonal_constraints, set_digits_dont_repeat_on_columns_constraints, set_one_column_is_magic, set_one_of_each_digit_on_columns_constraints, set_yin_yang_unknown_regions_fully_shaded_or_fully_unshaded
@@ -10,73 +11,78 @@ from puzzlesolver.Puzzle2model.OtherConstraints.NorinoriColouringConstraints2csp
 from puzzlesolver.Puzzle2model.OtherConstraints.UnknownRegionsConstraints2csp import set_nine_3x3_unknown_regions_constraint, set_unknown_regions_constraint
 
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry
+
+
+BOOL_CONSTRAINT_SETTERS = SetterRegistry([
+    (set_unknown_regions_constraint, [
+        GlobalRegionConstraintsE.UNKNOWN_REGIONS,
+        GlobalRegionConstraintsE.UNKNOWN_NUMBERED_REGIONS,
+    ]),
+    (set_nine_3x3_unknown_regions_constraint, [GlobalRegionConstraintsE.UNKNOWN_NINE_3X3_REGIONS]),
+
+    (set_vampires_prey_constraint, [ValueModifierConstraintsE.VAMPIRE_AND_PREY]),
+    (set_doublers_constraint, [ValueModifierConstraintsE.DOUBLERS]),
+    (set_decrement_fountain_constraint, [ValueModifierConstraintsE.DECREMENT_FOUNTAINS]),
+    (set_marked_cells_constraint, [ValueModifierConstraintsE.MARKED_CELLS]),
+    (set_hot_cells_constraint, [ValueModifierConstraintsE.HOT_CELLS]),
+    (set_cold_cells_constraint, [ValueModifierConstraintsE.COLD_CELLS]),
+    (set_cell_cannot_be_both_hot_and_cold_constraint, [ValueModifierConstraintsE.CELL_CANNOT_BE_BOTH_HOT_AND_COLD]),
+    (set_l_shaped_regions_constraint, [GlobalRegionConstraintsE.L_SHAPED_REGIONS]),
+    (set_center_cell_loop_constraints, [GlobalRegionConstraintsE.CENTER_CELLS_LOOP]),
+    (set_ambiguous_entropy_constraint, [GlobalRegionConstraintsE.AMBIGUOUS_ENTROPY]),
+
+    (set_all_shaded_norinori_cells_are_odd_constraints, [GlobalRegionConstraintsE.ALL_SHADED_NORINORI_CELLS_ARE_ODD]),
+
+    (set_crossed_paths_constraints, [GlobalRegionConstraintsE.CROSSED_PATHS]),
+
+    (set_digits_dont_repeat_on_columns_constraints, [SimpleGlobalConstraintsE.DIGITS_DO_NOT_REPEAT_ON_COLUMNS]),
+    (set_one_of_each_digit_on_columns_constraints, [SimpleGlobalConstraintsE.ONE_OF_EACH_DIGIT_ON_COLUMNS]),
+    (set_digits_dont_repeat_on_any_diagonal_constraints, [SimpleGlobalConstraintsE.DIGITS_DO_NOT_REPEAT_ON_ANY_DIAGONALS]),
+
+    (set_pdiagonal_constraints, [SimpleGlobalConstraintsE.POSITIVE_DIAGONAL]),
+    (set_ndiagonal_constraints, [SimpleGlobalConstraintsE.NEGATIVE_DIAGONAL]),
+    (set_negative_antidiagonal_constraints, [SimpleGlobalConstraintsE.NEGATIVE_ANTIDIAGONAL]),
+    (set_positive_antidiagonal_constraints, [SimpleGlobalConstraintsE.POSITIVE_ANTIDIAGONAL]),
+
+    (set_antiknight_constraints, [SimpleGlobalConstraintsE.ANTIKNIGHT]),
+    (set_antiking_constraints, [SimpleGlobalConstraintsE.ANTIKING]),
+
+    (set_nonconsecutive_constraints, [SimpleGlobalConstraintsE.NONCONSECUTIVE]),
+    (set_nonratio_constraints, [SimpleGlobalConstraintsE.NONRATIO]),
+    (set_disjoint_groups_constraints, [SimpleGlobalConstraintsE.DISJOINT_GROUPS]),
+
+    (set_global_indexing_column_constraints, [SimpleGlobalConstraintsE.GLOBAL_INDEXING_COLUMN]),
+    (set_global_indexing_row_constraints, [SimpleGlobalConstraintsE.GLOBAL_INDEXING_ROW]),
+    (set_global_indexing_region_constraints, [SimpleGlobalConstraintsE.GLOBAL_INDEXING_REGION]),
+    (set_global_indexing_disjoint_groups_constraints, [SimpleGlobalConstraintsE.GLOBAL_INDEXING_DISJOINT_GROUPS]),
+    (set_two_by_two_box_global_entropy_constraints, [SimpleGlobalConstraintsE.TWO_BY_TWO_BOX_GLOBAL_ENTROPY]),
+
+    (set_consecutive_entanglement_constraints, [SimpleGlobalConstraintsE.CONSECUTIVE_ENTANGLEMENT]),
+    (set_consecutive_close_neighbours, [SimpleGlobalConstraintsE.CONSECUTIVE_CLOSE_NEIGHBORS]),
+
+    (set_odd_even_parity_mirror_along_negative_diagonal_constraint, [SimpleGlobalConstraintsE.ODD_EVEN_PARITY_MIRROR_ALONG_NEGATIVE_DIAGONAL]),
+    (set_odd_even_parity_mirror_along_positive_diagonal_constraint, [SimpleGlobalConstraintsE.ODD_EVEN_PARITY_MIRROR_ALONG_POSITIVE_DIAGONAL]),
+
+    (set_evens_must_see_identical_digit_by_knights_move_constraints, [SimpleGlobalConstraintsE.EVENS_MUST_SEE_IDENTICAL_DIGIT_BY_KNIGHTS_MOVE]),
+    (set_orthogonally_adjacent_cells_are_not_divisors_constraints, [SimpleGlobalConstraintsE.ORTHOGONALLY_ADJACENT_CELLS_ARE_NOT_DIVISORS]),
+    (set_at_least_one_ace_rule_constraints, [SimpleGlobalConstraintsE.AT_LEAST_ONE_ACE_RULE]),
+
+    (set_all_odd_digits_are_orthogonally_connected_constraints, [SimpleGlobalConstraintsE.ALL_ODD_DIGITS_ARE_ORTHOGONALLY_CONNECTED]),
+    (set_odd_digits_cannot_gather_in_2x2_square_constraints, [SimpleGlobalConstraintsE.ODD_DIGITS_CANNOT_GATHER_IN_A_2X2_SQUARE]),
+    (set_exactly_two_friendly_cells_every_row_col_box_constraints, [SimpleGlobalConstraintsE.EXACTLY_TWO_FRIENDLY_CELLS_IN_EVERY_ROW_COL_BOX]),
+    (set_exactly_one_region_is_magic_square_constraints, [SimpleGlobalConstraintsE.EXACTLY_ONE_REGION_IS_A_MAGIC_SQUARE]),
+    (set_three_in_the_corner_constraints, [SimpleGlobalConstraintsE.THREE_IN_THE_CORNER]),
+    (set_single_nadir_constraints, [SimpleGlobalConstraintsE.SINGLE_NADIR]),
+    (set_dutch_miracle_constraints, [SimpleGlobalConstraintsE.DUTCH_MIRACLE]),
+
+    (set_one_column_is_magic, [SimpleGlobalConstraintsE.ONE_COLUMN_IS_MAGIC]),
+
+    (set_cells_along_nurimisaki_path_have_a_diff_of_at_least_5_constraints, [GlobalRegionConstraintsE.CELLS_ALONG_NURIMISAKI_PATH_HAVE_A_DIFFERENCE_OF_AT_LEAST_5]),
+
+    (set_yin_yang_unknown_regions_fully_shaded_or_fully_unshaded, [GlobalRegionConstraintsE.YIN_YANG_UNKNOWN_REGIONS_FULLY_SHADED_OR_FULLY_UNSHADED]),
+])
 
 
 def set_bool_constraints(model: PuzzleModel, puzzle: Puzzle):
-    set_unknown_regions_constraint(model, puzzle)
-    set_nine_3x3_unknown_regions_constraint(model, puzzle)
-
-    set_vampires_prey_constraint(model, puzzle)
-    set_doublers_constraint(model, puzzle)
-    set_decrement_fountain_constraint(model, puzzle)
-    set_marked_cells_constraint(model, puzzle)
-    set_hot_cells_constraint(model, puzzle)
-    set_cold_cells_constraint(model, puzzle)
-    set_cell_cannot_be_both_hot_and_cold_constraint(model, puzzle)
-    set_l_shaped_regions_constraint(model, puzzle)
-    set_center_cell_loop_constraints(model, puzzle)
-    set_ambiguous_entropy_constraint(model, puzzle)
-
-    set_all_shaded_norinori_cells_are_odd_constraints(model, puzzle)
-
-    set_crossed_paths_constraints(model, puzzle)
-
-    set_digits_dont_repeat_on_columns_constraints(model, puzzle)
-    set_one_of_each_digit_on_columns_constraints(model, puzzle)
-    set_digits_dont_repeat_on_any_diagonal_constraints(model, puzzle)
-
-    set_pdiagonal_constraints(model, puzzle)
-    set_ndiagonal_constraints(model, puzzle)
-    set_negative_antidiagonal_constraints(model, puzzle)
-    set_positive_antidiagonal_constraints(model, puzzle)
-
-    set_antiknight_constraints(model, puzzle)
-    set_antiking_constraints(model, puzzle)
-
-    set_nonconsecutive_constraints(model, puzzle)
-    set_nonratio_constraints(model, puzzle)
-    set_disjoint_groups_constraints(model, puzzle)
-
-    set_global_indexing_column_constraints(model, puzzle)
-    set_global_indexing_row_constraints(model, puzzle)
-    set_global_indexing_region_constraints(model, puzzle)
-    set_global_indexing_disjoint_groups_constraints(model, puzzle)
-    set_two_by_two_box_global_entropy_constraints(model, puzzle)
-
-    set_consecutive_entanglement_constraints(model, puzzle)
-    set_consecutive_close_neighbours(model, puzzle)
-
-    set_odd_even_parity_mirror_along_negative_diagonal_constraint(
-        model, puzzle)
-    set_odd_even_parity_mirror_along_positive_diagonal_constraint(
-        model, puzzle)
-
-    set_evens_must_see_identical_digit_by_knights_move_constraints(
-        model, puzzle)
-    set_orthogonally_adjacent_cells_are_not_divisors_constraints(model, puzzle)
-    set_at_least_one_ace_rule_constraints(model, puzzle)
-
-    set_all_odd_digits_are_orthogonally_connected_constraints(model, puzzle)
-    set_odd_digits_cannot_gather_in_2x2_square_constraints(model, puzzle)
-    set_exactly_two_friendly_cells_every_row_col_box_constraints(model, puzzle)
-    set_exactly_one_region_is_magic_square_constraints(model, puzzle)
-    set_three_in_the_corner_constraints(model, puzzle)
-    set_single_nadir_constraints(model, puzzle)
-    set_dutch_miracle_constraints(model, puzzle)
-
-    set_one_column_is_magic(model, puzzle)
-
-    set_cells_along_nurimisaki_path_have_a_diff_of_at_least_5_constraints(
-        model, puzzle)
-
-    set_yin_yang_unknown_regions_fully_shaded_or_fully_unshaded(model, puzzle)
+    BOOL_CONSTRAINT_SETTERS.run(model, puzzle)
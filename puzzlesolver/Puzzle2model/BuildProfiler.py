@@ -0,0 +1,108 @@
+import contextlib
+import json
+import time
+from typing import Any, Iterator, Literal
+
+from ortools.sat.python import cp_model
+
+BuildProfileFormat = Literal['table', 'json']
+BUILD_PROFILE_FORMATS: tuple[BuildProfileFormat, ...] = ('table', 'json')
+
+
+class SetterProfile:
+    name: str
+    wall_time: float  # seconds
+    variables: int
+    constraints: int
+
+    def __init__(self, name: str, wall_time: float = 0.0, variables: int = 0, constraints: int = 0) -> None:
+        self.name = name
+        self.wall_time = wall_time
+        self.variables = variables
+        self.constraints = constraints
+
+    def is_empty(self) -> bool:
+        """The setter didn't add anything to the model (its constraint is not in the puzzle)"""
+        return self.variables == 0 and self.constraints == 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'name': self.name,
+            'wall_time': self.wall_time,
+            'variables': self.variables,
+            'constraints': self.constraints,
+        }
+
+
+class BuildProfiler:
+    """
+    Records, for every profiled step of the model build (usually a `set_*_constraints` function),
+    the wall time and the number of variables and proto constraints it added.
+    The variable count is read from `ModelWithRecord._variable_counter`, so variables created
+    through the base CpModel are not counted.
+    """
+    records: list[SetterProfile]
+
+    def __init__(self) -> None:
+        self.records = []
+
+    @contextlib.contextmanager
+    def measure(self, model: cp_model.CpModel, name: str) -> Iterator[SetterProfile]:
+        record = SetterProfile(name)
+        variables_before = getattr(model, '_variable_counter', 0)
+        constraints_before = len(model.Proto().constraints)
+        start_time = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall_time = time.perf_counter() - start_time
+            record.variables = getattr(
+                model, '_variable_counter', 0) - variables_before
+            record.constraints = len(
+                model.Proto().constraints) - constraints_before
+            self.records.append(record)
+
+    def total(self) -> SetterProfile:
+        total = SetterProfile('total')
+        for record in self.records:
+            total.wall_time += record.wall_time
+            total.variables += record.variables
+            total.constraints += record.constraints
+        return total
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'setters': [record.to_dict() for record in self.records],
+            'total': self.total().to_dict(),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_table(self, include_empty: bool = False) -> str:
+        """
+        Returns the records as a text table, most expensive (wall time) first.
+
+        Args:
+            include_empty (bool, optional): Defaults to False. Setters that didn't add variables or
+                constraints are summarized in a single line.
+        """
+        records = sorted(self.records, key=lambda r: r.wall_time, reverse=True)
+        shown = [r for r in records if include_empty or not r.is_empty()]
+        name_width = max([len(r.name) for r in shown] + [len('setter')])
+
+        lines = [f"{'setter':{name_width}s}  {'time (ms)':>10s}  {'variables':>10s}  {'constraints':>11s}"]
+        for record in shown + [self.total()]:
+            lines.append(f"{record.name:{name_width}s}  {record.wall_time * 1000:10.2f}  "
+                         f"{record.variables:10d}  {record.constraints:11d}")
+
+        empty_count = len(records) - len(shown)
+        if empty_count:
+            empty_time = sum(r.wall_time for r in records if r.is_empty())
+            lines.append(f"({empty_count} setters added nothing, {empty_time * 1000:.2f} ms)")
+        return '\n'.join(lines)
+
+    def report(self, profile_format: BuildProfileFormat) -> str:
+        if profile_format == 'json':
+            return self.to_json()
+        return self.to_table()
@@ -1,30 +1,36 @@
 from puzzlesolver.Puzzle2model.CageConstraints.RegionsCageConstraints2csp import set_doublers_killer_cage_constraints, set_fountain_killer_cage_constraints, set_hot_cold_killer_cage_constraints, set_multipliers_killer_cage_constraints, set_negators_killer_cage_constraints, set_yin_yang_antithesis_killer_cage_constraints, set_yin_yang_breakeven_killer_cage_constraints
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry
 from puzzlesolver.Puzzle2model.CageConstraints.SimpleCageConstraints2csp import set_aquarium_cage_constraints, set_cage_as_a_number_constraints, set_divisible_killer_cage_constraints, set_killer_cage_constraints, set_killer_cage_look_and_say_constraints, set_no_prime_dominos_cage_constraints, set_parity_balance_killer_cage_constraints, set_prime_dominos_cage_constraints, set_putteria_cage_constraints, set_spotlight_cage_constraints, set_sujiken_cage_constraints, set_sum_cage_constraints
+from puzzlesolver.Puzzle.ConstraintEnums import CageConstraintsE
 from puzzlesolver.Puzzle.Puzzle import Puzzle
 
 
-def set_cage_constraints(model: PuzzleModel, puzzle: Puzzle):
+CAGE_CONSTRAINT_SETTERS = SetterRegistry([
+    (set_killer_cage_constraints, [CageConstraintsE.KILLER_CAGE]),
+    (set_sum_cage_constraints, [CageConstraintsE.SUM_CAGE]),
+    (set_aquarium_cage_constraints, [CageConstraintsE.AQUARIUM_CAGE]),
+    (set_killer_cage_look_and_say_constraints, [CageConstraintsE.KILLER_CAGE_LOOK_AND_SAY]),
+    (set_spotlight_cage_constraints, [CageConstraintsE.SPOTLIGHT_CAGE]),
+    (set_putteria_cage_constraints, [CageConstraintsE.PUTTERIA_CAGE]),
+    (set_cage_as_a_number_constraints, [CageConstraintsE.CAGE_AS_A_NUMBER]),
+    (set_prime_dominos_cage_constraints, [CageConstraintsE.PRIME_DOMINOES_CAGE]),
+    (set_no_prime_dominos_cage_constraints, [CageConstraintsE.NO_PRIME_DOMINOES_CAGE]),
+    (set_divisible_killer_cage_constraints, [CageConstraintsE.DIVISIBLE_KILLER_CAGE]),
+    (set_parity_balance_killer_cage_constraints, [CageConstraintsE.PARITY_BALANCE_KILLER_CAGE]),
+    (set_sujiken_cage_constraints, [CageConstraintsE.SUJIKEN_REGION]),
+
+    (set_doublers_killer_cage_constraints, [CageConstraintsE.DOUBLERS_KILLER_CAGE]),
+    (set_negators_killer_cage_constraints, [CageConstraintsE.NEGATORS_KILLER_CAGE]),
 
-    set_killer_cage_constraints(model, puzzle)
-    set_sum_cage_constraints(model, puzzle)
-    set_aquarium_cage_constraints(model, puzzle)
-    set_killer_cage_look_and_say_constraints(model, puzzle)
-    set_spotlight_cage_constraints(model, puzzle)
-    set_putteria_cage_constraints(model, puzzle)
-    set_cage_as_a_number_constraints(model, puzzle)
-    set_prime_dominos_cage_constraints(model, puzzle)
-    set_no_prime_dominos_cage_constraints(model, puzzle)
-    set_divisible_killer_cage_constraints(model, puzzle)
-    set_parity_balance_killer_cage_constraints(model, puzzle)
-    set_sujiken_cage_constraints(model, puzzle)
+    (set_yin_yang_antithesis_killer_cage_constraints, [CageConstraintsE.YIN_YANG_ANTITHESIS_KILLER_CAGE]),
+    (set_yin_yang_breakeven_killer_cage_constraints, [CageConstraintsE.YIN_YANG_BREAKEVEN_KILLER_CAGE]),
 
-    set_doublers_killer_cage_constraints(model, puzzle)
-    set_negators_killer_cage_constraints(model, puzzle)
+    (set_multipliers_killer_cage_constraints, [CageConstraintsE.MULTIPLIERS_KILLER_CAGE]),
+    (set_fountain_killer_cage_constraints, [CageConstraintsE.FOUNTAIN_KILLER_CAGE]),
+    (set_hot_cold_killer_cage_constraints, [CageConstraintsE.HOT_COLD_KILLER_CAGE]),
+])
 
-    set_yin_yang_antithesis_killer_cage_constraints(model, puzzle)
-    set_yin_yang_breakeven_killer_cage_constraints(model, puzzle)
 
-    set_multipliers_killer_cage_constraints(model, puzzle)
-    set_fountain_killer_cage_constraints(model, puzzle)
-    set_hot_cold_killer_cage_constraints(model, puzzle)
+def set_cage_constraints(model: PuzzleModel, puzzle: Puzzle):
+    CAGE_CONSTRAINT_SETTERS.run(model, puzzle)
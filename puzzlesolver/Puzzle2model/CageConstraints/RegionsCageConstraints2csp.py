@@ -3,6 +3,7 @@ from puzzlesolver.Puzzle.Puzzle import Puzzle
 from puzzlesolver.Puzzle2model.CageConstraints.utils import genCageConstraintProperties
 from puzzlesolver.Puzzle2model.OtherConstraints.YinYangConstraints2csp import get_or_set_yin_yang_constraint
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.cage_combinations import cage_combinations_csp
 from puzzlesolver.Puzzle2model.custom_constraints import masked_sum_csp, is_even_csp, multiplication_csp
 from puzzlesolver.Puzzle2model.puzzle_csp_utils import cells2vars
 from puzzlesolver.Puzzle2model.BoolConstraints.puzzle_values_modifiers import get_or_set_cold_cells_constraint, get_or_set_decrement_fountain_constraint, get_or_set_doublers_grid, get_or_set_hot_cells_constraint, get_or_set_multipliers_constraint, get_or_set_negators_grid
@@ -220,6 +221,8 @@ def set_yin_yang_breakeven_killer_cage_constraints(model: PuzzleModel, puzzle: P
             model.Add(yin_yang_cage_vars[j] == 0).OnlyEnforceIf(is_even.Not())
 
         model.Add(sum(cells_vars) == sum_var)
+        if isinstance(sum_var, int):
+            cage_combinations_csp(model, cells_vars, sum_var, f"{prefix}_{i}")
 
 
 def set_multipliers_killer_cage_constraints(model: PuzzleModel, puzzle: Puzzle):
@@ -11,6 +11,7 @@ from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
 from ortools.sat.python.cp_model import IntVar
 from ortools.sat.python import cp_model
 
+from puzzlesolver.Puzzle2model.cage_combinations import cage_combinations_csp
 from puzzlesolver.Puzzle2model.custom_constraints import all_equal, are_all_true_csp, masked_sum_csp, consecutive_csp, count_vars, distance_csp, is_even_csp, is_member_of, member_of, palindrome_csp, renban_csp
 from puzzlesolver.Puzzle2model.puzzle_csp_utils import PRIME_LIST, GridVars, bool_vars_grid_dict_from_puzzle_grid, cell2var, cells2vars, int_vars_grid_dict_from_puzzle_grid
 from puzzlesolver.utils.ParsingUtils import look_and_say_parse_string, parse_int
@@ -249,6 +250,8 @@ def set_killer_cage_constraints(model: PuzzleModel, puzzle: Puzzle):
             cage_sum_vars[i] = sum_var
 
         model.Add(sum(cells_vars) == sum_var)
+        if isinstance(sum_var, int):
+            cage_combinations_csp(model, cells_vars, sum_var, f"{prefix}_{i}")
 
     all_cage_totals_are_unique = puzzle.bool_constraints.get(
         LocalConstraintsModifiersE.ALL_CAGE_TOTALS_ARE_UNIQUE, False)
@@ -448,6 +451,8 @@ def set_parity_balance_killer_cage_constraints(model: PuzzleModel, puzzle: Puzzl
         model.Add(masked_sum2 == sum_odds)
 
         model.Add(sum(cells_vars) == sum_total_var)
+        if isinstance(sum_total_var, int):
+            cage_combinations_csp(model, cells_vars, sum_total_var, f"{prefix} {i}")
         model.Add(sum_odds == sum_evens)
         model.Add(sum_total_var == sum_odds + sum_evens)
 
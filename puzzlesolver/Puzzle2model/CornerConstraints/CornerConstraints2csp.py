@@ -7,6 +7,7 @@ from puzzlesolver.Puzzle2model.CornerConstraints.utils import genCornerConstrain
 from puzzlesolver.Puzzle2model.OtherConstraints.CellEdgeLoopConstraints2csp import get_or_set_edge_loop_constraint
 from puzzlesolver.Puzzle2model.OtherConstraints.UnknownRegionsConstraints2csp import get_or_set_unknown_regions_grid
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry
 from puzzlesolver.Puzzle2model.custom_constraints import all_equal, count_unique_values, count_vars, modulo_count_csp
 from puzzlesolver.Puzzle2model.puzzle_csp_utils import cells2vars, \
     tuples2vars
@@ -396,18 +397,29 @@ def set_edge_loop_turns_on_corner_and_does_not_turn_after_constraints(model: Puz
             horiz_left_or_right_bool)
 
 
-def set_corner_constraints(model: PuzzleModel,
-                           puzzle: Puzzle):
-    set_quadruple_constraints(model, puzzle)
-    set_corner_x_constraints(model, puzzle)
-    set_corner_sum_of_three_equals_the_other_constraints(model, puzzle)
-    set_corner_sum_constraints(model, puzzle)
-    set_corner_count_even_constraints(model, puzzle)
-    set_corner_count_odd_constraints(model, puzzle)
-    set_border_square_diagonals_sum_not_equal_constraints(model, puzzle)
-    set_corner_cells_belong_to_the_same_region_constraints(model, puzzle)
-    set_corner_cells_belong_to_three_regions_constraints(model, puzzle)
-    set_edge_loop_straight_on_corner_and_turns_at_least_once_constraints(
-        model, puzzle)
-    set_edge_loop_turns_on_corner_and_does_not_turn_after_constraints(
-        model, puzzle)
+CORNER_CONSTRAINT_SETTERS = SetterRegistry([
+    (set_quadruple_constraints, [CornerConstraintsE.QUADRUPLE]),
+    (set_corner_x_constraints, [CornerConstraintsE.CORNER_X]),
+    (set_corner_sum_of_three_equals_the_other_constraints, [CornerConstraintsE.CORNER_SUM_OF_THREE_EQUALS_THE_OTHER]),
+    (set_corner_sum_constraints, [CornerConstraintsE.CORNER_SUM]),
+    (set_corner_count_even_constraints, [CornerConstraintsE.CORNER_EVEN_COUNT]),
+    (set_corner_count_odd_constraints, [CornerConstraintsE.CORNER_ODD_COUNT]),
+    (set_border_square_diagonals_sum_not_equal_constraints, [
+        CornerConstraintsE.BORDER_SQUARE_DIAGONALS_SUM_NOT_EQUAL,
+        LocalConstraintsModifiersE.ALL_BORDER_SQUARE_DIAGONALS_SUM_NOT_EQUAL_GIVEN,
+    ]),
+    (set_corner_cells_belong_to_the_same_region_constraints, [
+        CornerConstraintsE.CORNER_CELLS_BELONG_TO_SAME_REGION,
+        LocalConstraintsModifiersE.ALL_CORNER_CELLS_BELONG_TO_THE_SAME_REGION_GIVEN,
+    ]),
+    (set_corner_cells_belong_to_three_regions_constraints, [
+        CornerConstraintsE.CORNER_CELLS_BELONG_TO_EXACTLY_THREE_REGIONS,
+        LocalConstraintsModifiersE.ALL_CORNER_CELLS_BELONG_TO_EXACLT_THREE_REGIONS_GIVEN,
+    ]),
+    (set_edge_loop_straight_on_corner_and_turns_at_least_once_constraints, [CornerConstraintsE.EDGE_LOOP_PASSES_STRAIGHT_ON_CORNER_AND_TURNS_AFTER_AT_LEAST_ONCE]),
+    (set_edge_loop_turns_on_corner_and_does_not_turn_after_constraints, [CornerConstraintsE.EDGE_LOOP_TURNS_ON_CORNER_AND_DOES_NOT_TURN_AFTER]),
+])
+
+
+def set_corner_constraints(model: PuzzleModel, puzzle: Puzzle):
+    CORNER_CONSTRAINT_SETTERS.run(model, puzzle)
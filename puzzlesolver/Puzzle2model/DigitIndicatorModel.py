@@ -0,0 +1,76 @@
+from ortools.sat.python import cp_model
+from ortools.sat.python.cp_model import IntVar
+
+# variables with larger domains (sums, products, ...) only get the requested indicators,
+# instead of one indicator per value in the domain
+MAX_CHANNELLED_DOMAIN_SIZE = 32
+
+
+def domain_values(var: IntVar) -> list[int]:
+    domain = var.Proto().domain
+    values: list[int] = []
+    for lb, ub in zip(domain[::2], domain[1::2]):
+        values.extend(range(lb, ub + 1))
+    return values
+
+
+def domain_size(var: IntVar) -> int:
+    domain = var.Proto().domain
+    return sum(ub - lb + 1 for lb, ub in zip(domain[::2], domain[1::2]))
+
+
+class DigitIndicatorModel(cp_model.CpModel):
+    """
+    CpModel with a lazily filled cache of `var == digit` literals.
+    The first time an indicator is requested for a variable with a small domain, one literal is created for
+    every value in its domain and they are channelled to the variable:
+        var == d <= b_d, for all d in domain(var)
+        exactly_one(b_d for d in domain(var))
+    Every constraint builder asking for `var == d` then shares the same literal.
+    """
+    _digit_indicators: dict[int, dict[int, IntVar]]
+
+    def __init__(self):
+        super().__init__()
+        self._digit_indicators = dict()
+
+    def _channel_digit_indicators(self, var: IntVar) -> dict[int, IntVar]:
+        indicators: dict[int, IntVar] = dict()
+        if domain_values(var) == [0, 1]:
+            # a bool var is its own indicator
+            indicators[1] = var
+            return indicators
+
+        for value in domain_values(var):
+            b = self.NewBoolVar(f"{var.Name()} == {value}")
+            self.Add(var == value).OnlyEnforceIf(b)
+            indicators[value] = b
+        self.AddExactlyOne(indicators.values())
+        return indicators
+
+    def get_or_set_digit_indicator(self, var: IntVar, digit: int) -> IntVar:
+        """
+        Returns the bool var b <=> var == digit, creating it only the first time it's requested.
+        """
+        idx = var.Index()
+        indicators = self._digit_indicators.get(idx)
+        if indicators is None:
+            if domain_size(var) <= MAX_CHANNELLED_DOMAIN_SIZE:
+                indicators = self._channel_digit_indicators(var)
+            else:
+                indicators = dict()
+            self._digit_indicators[idx] = indicators
+
+        b = indicators.get(digit)
+        if b is not None:
+            return b
+
+        # value outside a channelled domain, or variable with a large domain
+        b = self.NewBoolVar(f"{var.Name()} == {digit}")
+        self.Add(var == digit).OnlyEnforceIf(b)
+        self.Add(var != digit).OnlyEnforceIf(b.Not())
+        indicators[digit] = b
+        return b
+
+    def digit_indicators_count(self) -> int:
+        return sum(len(indicators) for indicators in self._digit_indicators.values())
@@ -1,30 +1,47 @@
+from puzzlesolver.Puzzle.ConstraintEnums import EdgeConstraintsE, LocalConstraintsModifiersE
 from puzzlesolver.Puzzle.Puzzle import Puzzle
 
 from puzzlesolver.Puzzle2model.EdgeConstraints.OtherEdgeConstraints2csp import set_different_ambiguous_entropy_border_constraints, set_same_ambiguous_entropy_border_constraints, set_unknown_region_border_constraints, set_yin_yang_kropki_constraints
 from puzzlesolver.Puzzle2model.EdgeConstraints.SimpleEdgeConstraints2csp import set_difference_constraints, set_edge_exactly_one_friendly_cell_constraints, set_edge_inequality_constraints, set_edge_modulo_constraints, set_edge_multiples_constraints, set_edge_product_constraints, set_edge_square_number_constraints, set_edge_sum_constraints, set_factor_dot_constraints, set_ratio_constraints, set_x_or_v_constraints, set_xv_constraints, set_xy_differences_constraints
 
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry
 
 
-def set_edge_constraints(model: PuzzleModel, puzzle: Puzzle):
+EDGE_CONSTRAINT_SETTERS = SetterRegistry([
+    (set_ratio_constraints, [EdgeConstraintsE.RATIO, LocalConstraintsModifiersE.ALL_RATIOS_GIVEN]),
+    (set_difference_constraints, [EdgeConstraintsE.DIFFERENCE, LocalConstraintsModifiersE.ALL_DIFFERENCES_GIVEN]),
+    (set_xv_constraints, [
+        EdgeConstraintsE.XV,
+        LocalConstraintsModifiersE.ALL_XV_GIVEN,
+        LocalConstraintsModifiersE.ALL_X_GIVEN,
+        LocalConstraintsModifiersE.ALL_V_GIVEN,
+    ]),
+    (set_x_or_v_constraints, [EdgeConstraintsE.X_OR_V]),
+    (set_edge_multiples_constraints, [EdgeConstraintsE.TWO_DIGIT_MULTIPLES]),
+    (set_edge_sum_constraints, [EdgeConstraintsE.EDGE_SUM]),
+    (set_edge_product_constraints, [EdgeConstraintsE.EDGE_PRODUCT]),
+    (set_edge_inequality_constraints, [EdgeConstraintsE.EDGE_INEQUALITY]),
+    (set_edge_modulo_constraints, [EdgeConstraintsE.EDGE_MODULO]),
+    (set_factor_dot_constraints, [EdgeConstraintsE.EDGE_FACTOR]),
+    (set_xy_differences_constraints, [
+        EdgeConstraintsE.XY_DIFFERENCES,
+        LocalConstraintsModifiersE.ALL_XY_DIFFERENCES_GIVEN,
+    ]),
+    (set_edge_square_number_constraints, [EdgeConstraintsE.EDGE_SQUARE_NUMBER]),
+
+    (set_edge_exactly_one_friendly_cell_constraints, [EdgeConstraintsE.EDGE_EXACTLY_ONE_FRIENDLY_CELL]),
 
-    set_ratio_constraints(model, puzzle)
-    set_difference_constraints(model, puzzle)
-    set_xv_constraints(model,  puzzle)
-    set_x_or_v_constraints(model,  puzzle)
-    set_edge_multiples_constraints(model,  puzzle)
-    set_edge_sum_constraints(model, puzzle)
-    set_edge_product_constraints(model, puzzle)
-    set_edge_inequality_constraints(model,  puzzle)
-    set_edge_modulo_constraints(model, puzzle)
-    set_factor_dot_constraints(model, puzzle)
-    set_xy_differences_constraints(model, puzzle)
-    set_edge_square_number_constraints(model, puzzle)
-
-    set_edge_exactly_one_friendly_cell_constraints(model, puzzle)
-
-    set_yin_yang_kropki_constraints(model, puzzle)
-    set_unknown_region_border_constraints(model, puzzle)
+    (set_yin_yang_kropki_constraints, [
+        EdgeConstraintsE.YIN_YANG_KROPKI,
+        LocalConstraintsModifiersE.ALL_YIN_YANG_KROPKI_GIVEN,
+    ]),
+    (set_unknown_region_border_constraints, [EdgeConstraintsE.UNKNOWN_REGION_BORDER]),
     # set_two_snakes_border_constraints(model, grid_vars_dict, puzzle)
-    set_same_ambiguous_entropy_border_constraints(model, puzzle)
-    set_different_ambiguous_entropy_border_constraints(model, puzzle)
+    (set_same_ambiguous_entropy_border_constraints, [EdgeConstraintsE.SAME_AMBIGUOUS_ENTROPY_EDGE]),
+    (set_different_ambiguous_entropy_border_constraints, [EdgeConstraintsE.DIFFERENT_AMBIGUOUS_ENTROPY_EDGE]),
+])
+
+
+def set_edge_constraints(model: PuzzleModel, puzzle: Puzzle):
+    EDGE_CONSTRAINT_SETTERS.run(model, puzzle)
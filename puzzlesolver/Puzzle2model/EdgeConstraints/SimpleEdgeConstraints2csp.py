@@ -5,6 +5,7 @@ from puzzlesolver.Puzzle2model.EdgeConstraints.utils import genEdgeConstraintPro
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
 from puzzlesolver.Puzzle2model.custom_constraints import distance_csp, factors_csp, is_member_of, is_ratio_1_r_csp, member_of
 from puzzlesolver.Puzzle2model.puzzle_csp_utils import SQUARE_NUMBERS_LIST2, GridVars, cell2var
+from puzzlesolver.Puzzle2model.table_constraints import add_table_constraint, fits_table
 from puzzlesolver.utils.ParsingUtils import parse_int
 
 
@@ -31,6 +32,10 @@ def set_ratio_constraints(model: PuzzleModel, puzzle: Puzzle):
         ratio_var = model.get_or_set_shared_var(
             value_id, 1, max_digit, f"{prefix}_{i}")
 
+        if fits_table([cell1_var, cell2_var, ratio_var]):
+            add_table_constraint(model, [cell1_var, cell2_var, ratio_var], 'ratio')
+            continue
+
         is_ratio = is_ratio_1_r_csp(
             model, cell1_var, cell2_var, ratio_var, f"{prefix}_{i}")
         model.Add(is_ratio == 1)
@@ -83,6 +88,10 @@ def set_difference_constraints(model: PuzzleModel, puzzle: Puzzle):
                                                f"difference_{i}")
         used_values.add(diff_var)
 
+        if fits_table([cell1_var, cell2_var, diff_var]):
+            add_table_constraint(model, [cell1_var, cell2_var, diff_var], 'distance')
+            continue
+
         dist_var = distance_csp(model, cell1_var, cell2_var, f"{prefix}_{i}")
         model.Add(dist_var == diff_var)
 
@@ -156,6 +165,10 @@ def set_edge_product_constraints(model: PuzzleModel, puzzle: Puzzle):
         product_var = model.get_or_set_shared_var(value, lb ** 2, ub ** 2,
                                                   f"{prefix}_{i}: product")
 
+        if fits_table([cell1_var, cell2_var, product_var]):
+            add_table_constraint(model, [cell1_var, cell2_var, product_var], 'product')
+            continue
+
         model.AddMultiplicationEquality(product_var, [cell1_var, cell2_var])
 
 
@@ -183,7 +196,9 @@ def set_edge_modulo_constraints(model: PuzzleModel, puzzle: Puzzle):
         # modulo_var = get_or_set_shared_var(model, value_id, shared_vars, 0, max_digit,
         #                                    f"{prefix}_{i}: modulo")
 
-        if value2 is not None:
+        if value2 is not None and fits_table([cell1_var, cell2_var]):
+            add_table_constraint(model, [cell1_var, cell2_var], 'modulo', (value2,))
+        elif value2 is not None:
 
             modulo_val_0 = model.NewIntVar(
                 0, max_digit, f"{prefix}_{i} - value_0")
@@ -286,6 +301,10 @@ def set_x_or_v_constraints(model: PuzzleModel,  puzzle: Puzzle):
     for i, (_, cells_vars, value) in enumerate(genEdgeConstraintProperties(model, puzzle, EdgeConstraintsE.X_OR_V)):
         cell1_var, cell2_var = cells_vars
 
+        if fits_table([cell1_var, cell2_var]):
+            add_table_constraint(model, [cell1_var, cell2_var], 'sum_in', (5, 10))
+            continue
+
         value = model.NewIntVar(5, 10, f'{prefix}_{i} - value')
         model.Add(cell1_var + cell2_var == value)
         member_of(model, [5, 10], value, f"{prefix}_{i} - value")
@@ -1,70 +1,76 @@
+from puzzlesolver.Puzzle.ConstraintEnums import LineConstraintsE
 from puzzlesolver.Puzzle.Puzzle import Puzzle
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry
 
 from puzzlesolver.Puzzle2model.LineConstraints.DoubleEndedLineConstraints2csp import set_between_line_constraints, set_double_arrow_constraints, set_doublers_between_line_constraints, set_doublers_double_arrow_constraints, set_lockout_line_constraints, set_parity_count_line_constraints, set_product_of_ends_equals_sum_of_line_constraints, set_tightrope_line_constraints
 
 from puzzlesolver.Puzzle2model.LineConstraints.SimpleLineConstraints2csp import set_adjacent_cells_are_consecutive_or_ratio_line_constraints, set_adjacent_diff_at_least_x_or_sum_at_most_x_constraints, set_adjacent_multiples_line_constraints, set_adjacent_sum_is_prime_line_constraints, set_arithmetic_sequence_line_constraints, set_at_least_x_line_constraints, set_californian_mountain_snake_constraints, set_double_renban_line_constraints, set_doublers_region_sum_line_constraints, set_doublers_thermometer_constraints, set_entropic_line_constraints, set_entropic_or_modular_line_constraints, set_high_low_oscillator_line_constraints, set_hot_cold_thermometer_constraints, set_indexing_column_is_x_line_constraints, set_indexing_row_is_x_line_constraints, set_knabner_line_constraints, set_maximum_adjacent_difference_line_constraints, set_modular_line_constraints, set_modular_or_unimodular_line_constraints, set_n_consecutive_fuzzy_sum_line_constraints, set_n_consecutive_renban_line_constraints, set_n_repeated_digits_line_constraints, set_odd_even_oscillator_line_constraints, set_palindrome_constraints, set_product_line_constraints, set_red_carpet_constraints, set_region_sum_line_constraints, set_renban_line_constraints, set_renban_or_german_whispers_line_constraints, set_renrenbanban_constraints, set_repeated_digits_line_constraints, set_row_cycle_order_thermometers_constraints, set_sum_line_constraints, set_superfuzzy_arrow_constraints, set_thermometer_constraints, set_two_digit_sum_line_constraints, set_two_digit_thermometer_constraints, set_unimodular_line_constraints, set_unique_values_line_constraints, set_whispers_line_constraints, set_xv_line_constraints, set_yin_yang_region_sum_line_constraints
 
 
-def set_line_constraints(model: PuzzleModel, puzzle: Puzzle):
+LINE_CONSTRAINT_SETTERS = SetterRegistry([
+    (set_superfuzzy_arrow_constraints, [LineConstraintsE.SUPERFUZZY_ARROW]),
+
+    (set_double_arrow_constraints, [LineConstraintsE.DOUBLE_ARROW_LINE]),
+    (set_between_line_constraints, [LineConstraintsE.BETWEEN_LINE]),
 
-    set_superfuzzy_arrow_constraints(model, puzzle)
+    (set_doublers_between_line_constraints, [LineConstraintsE.DOUBLERS_BETWEEN_LINE]),
+    (set_doublers_double_arrow_constraints, [LineConstraintsE.DOUBLERS_DOUBLE_ARROW_LINE]),
 
-    set_double_arrow_constraints(model, puzzle)
-    set_between_line_constraints(model, puzzle)
+    (set_product_of_ends_equals_sum_of_line_constraints, [LineConstraintsE.PRODUCT_OF_ENDS_EQUALS_SUM_OF_LINE]),
+    (set_lockout_line_constraints, [LineConstraintsE.LOCKOUT_LINE]),
+    (set_tightrope_line_constraints, [LineConstraintsE.TIGHTROPE_LINE]),
+    (set_parity_count_line_constraints, [LineConstraintsE.PARITY_COUNT_LINE]),
 
-    set_doublers_between_line_constraints(model, puzzle)
-    set_doublers_double_arrow_constraints(model, puzzle)
+    (set_renban_line_constraints, [LineConstraintsE.RENBAN_LINE]),
+    (set_double_renban_line_constraints, [LineConstraintsE.DOUBLE_RENBAN_LINE]),
+    (set_n_consecutive_renban_line_constraints, [LineConstraintsE.N_CONSECUTIVE_RENBAN_LINE]),
+    (set_whispers_line_constraints, [LineConstraintsE.WHISPERS_LINE]),
+    (set_unique_values_line_constraints, [LineConstraintsE.UNIQUE_VALUES_LINE]),
+    (set_maximum_adjacent_difference_line_constraints, [LineConstraintsE.MAXIMUM_ADJACENT_DIFFERENCE_LINE]),
+    (set_palindrome_constraints, [LineConstraintsE.PALINDROME]),
+    (set_thermometer_constraints, [LineConstraintsE.THERMOMETER]),
+    (set_two_digit_thermometer_constraints, [LineConstraintsE.TWO_DIGIT_THERMOMETER]),
+    (set_row_cycle_order_thermometers_constraints, [LineConstraintsE.ROW_CYCLE_THERMOMETER]),
 
-    set_product_of_ends_equals_sum_of_line_constraints(model, puzzle)
-    set_lockout_line_constraints(model, puzzle)
-    set_tightrope_line_constraints(model, puzzle)
-    set_parity_count_line_constraints(model, puzzle)
+    (set_doublers_thermometer_constraints, [LineConstraintsE.DOUBLERS_THERMOMETER]),
+    (set_hot_cold_thermometer_constraints, [LineConstraintsE.HOT_COLD_THERMOMETER]),
 
-    set_renban_line_constraints(model, puzzle)
-    set_double_renban_line_constraints(model, puzzle)
-    set_n_consecutive_renban_line_constraints(model, puzzle)
-    set_whispers_line_constraints(model, puzzle)
-    set_unique_values_line_constraints(model, puzzle)
-    set_maximum_adjacent_difference_line_constraints(model, puzzle)
-    set_palindrome_constraints(model,  puzzle)
-    set_thermometer_constraints(model, puzzle)
-    set_two_digit_thermometer_constraints(model, puzzle)
-    set_row_cycle_order_thermometers_constraints(model, puzzle)
+    (set_region_sum_line_constraints, [LineConstraintsE.REGION_SUM_LINE]),
+    (set_doublers_region_sum_line_constraints, [LineConstraintsE.DOUBLERS_REGION_SUM_LINE]),
 
-    set_doublers_thermometer_constraints(model, puzzle)
-    set_hot_cold_thermometer_constraints(model, puzzle)
+    (set_red_carpet_constraints, [LineConstraintsE.RED_CARPET]),
+    (set_repeated_digits_line_constraints, [LineConstraintsE.REPEATED_DIGITS_LINE]),
+    (set_n_repeated_digits_line_constraints, [LineConstraintsE.N_REPEATED_DIGITS_LINE]),
+    (set_entropic_line_constraints, [LineConstraintsE.ENTROPIC_LINE]),
+    (set_entropic_or_modular_line_constraints, [LineConstraintsE.ENTROPIC_OR_MODULAR_LINE]),
+    (set_high_low_oscillator_line_constraints, [LineConstraintsE.HIGH_LOW_OSCILLATOR_LINE]),
+    (set_odd_even_oscillator_line_constraints, [LineConstraintsE.ODD_EVEN_OSCILLATOR_LINE]),
+    (set_at_least_x_line_constraints, [LineConstraintsE.AT_LEAST_X_LINE]),
+    (set_sum_line_constraints, [LineConstraintsE.SUM_LINE]),
+    (set_two_digit_sum_line_constraints, [LineConstraintsE.TWO_DIGIT_SUM_LINE]),
+    (set_product_line_constraints, [LineConstraintsE.PRODUCT_LINE]),
+    (set_adjacent_multiples_line_constraints, [LineConstraintsE.ADJACENT_MULTIPLES_LINE]),
+    (set_renrenbanban_constraints, [LineConstraintsE.RENRENBANBAN_LINE]),
+    (set_knabner_line_constraints, [LineConstraintsE.KNABNER_LINE]),
+    (set_arithmetic_sequence_line_constraints, [LineConstraintsE.ARITHMETIC_SEQUENCE_LINE]),
+    (set_modular_line_constraints, [LineConstraintsE.MODULAR_LINE]),
+    (set_unimodular_line_constraints, [LineConstraintsE.UNIMODULAR_LINE]),
+    (set_modular_or_unimodular_line_constraints, [LineConstraintsE.MODULAR_OR_UNIMODULAR_LINE]),
+    (set_xv_line_constraints, [LineConstraintsE.XV_LINE]),
+    (set_renban_or_german_whispers_line_constraints, [LineConstraintsE.RENBAN_OR_WHISPERS_LINE]),
+    (set_n_consecutive_fuzzy_sum_line_constraints, [LineConstraintsE.N_CONSECUTIVE_FUZZY_SUM_LINE]),
+    (set_adjacent_cells_are_consecutive_or_ratio_line_constraints, [LineConstraintsE.ADJACENT_CELLS_ARE_CONSECUTIVE_OR_RATIO_LINE]),
+    (set_adjacent_sum_is_prime_line_constraints, [LineConstraintsE.ADJACENT_CELL_SUM_IS_PRIME_LINE]),
+    (set_adjacent_diff_at_least_x_or_sum_at_most_x_constraints, [LineConstraintsE.ADJACENT_DIFF_IS_AT_LEAST_X_OR_ADJACENT_SUM_IS_AT_MOST_X_LINE]),
 
-    set_region_sum_line_constraints(model, puzzle)
-    set_doublers_region_sum_line_constraints(model, puzzle)
+    (set_indexing_column_is_x_line_constraints, [LineConstraintsE.INDEXING_COLUMN_IS_X_LINE]),
+    (set_indexing_row_is_x_line_constraints, [LineConstraintsE.INDEXING_ROW_IS_X_LINE]),
 
-    set_red_carpet_constraints(model, puzzle)
-    set_repeated_digits_line_constraints(model, puzzle)
-    set_n_repeated_digits_line_constraints(model, puzzle)
-    set_entropic_line_constraints(model, puzzle)
-    set_entropic_or_modular_line_constraints(model, puzzle)
-    set_high_low_oscillator_line_constraints(model, puzzle)
-    set_odd_even_oscillator_line_constraints(model, puzzle)
-    set_at_least_x_line_constraints(model, puzzle)
-    set_sum_line_constraints(model, puzzle)
-    set_two_digit_sum_line_constraints(model, puzzle)
-    set_product_line_constraints(model, puzzle)
-    set_adjacent_multiples_line_constraints(model, puzzle)
-    set_renrenbanban_constraints(model, puzzle)
-    set_knabner_line_constraints(model, puzzle)
-    set_arithmetic_sequence_line_constraints(model, puzzle)
-    set_modular_line_constraints(model, puzzle)
-    set_unimodular_line_constraints(model, puzzle)
-    set_modular_or_unimodular_line_constraints(model, puzzle)
-    set_xv_line_constraints(model, puzzle)
-    set_renban_or_german_whispers_line_constraints(model, puzzle)
-    set_n_consecutive_fuzzy_sum_line_constraints(model, puzzle)
-    set_adjacent_cells_are_consecutive_or_ratio_line_constraints(model, puzzle)
-    set_adjacent_sum_is_prime_line_constraints(model, puzzle)
-    set_adjacent_diff_at_least_x_or_sum_at_most_x_constraints(model, puzzle)
+    (set_yin_yang_region_sum_line_constraints, [LineConstraintsE.YIN_YANG_REGION_SUM_LINE]),
+    (set_californian_mountain_snake_constraints, [LineConstraintsE.YIN_YANG_CALIFORNIAN_MOUNTAIN_SNAKE]),
+])
 
-    set_indexing_column_is_x_line_constraints(model, puzzle)
-    set_indexing_row_is_x_line_constraints(model, puzzle)
 
-    set_yin_yang_region_sum_line_constraints(model, puzzle)
-    set_californian_mountain_snake_constraints(model, puzzle)
+def set_line_constraints(model: PuzzleModel, puzzle: Puzzle):
+    LINE_CONSTRAINT_SETTERS.run(model, puzzle)
@@ -11,6 +11,7 @@ from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
 from puzzlesolver.Puzzle2model.custom_constraints import are_all_equal_csp, are_consecutive_csp, compare_multisets_csp, compute_multiplication_domain, count_transitions_csp, count_unique_values, count_vars, cycle_order_csp, distance_csp, factors_csp, increasing_strict, is_entropic_line_csp, is_modular_line_csp, is_ratio_1_r_csp, is_renban_csp, is_unimodular_csp, is_whispers_csp, member_of, multiplication_csp, nonconsecutive_csp, palindrome_csp, region_sum_with_unknown_regions_csp, regular_distance_csp, reif2, renban_csp, segment_by_transitions_csp, whispers_csp
 from puzzlesolver.Puzzle2model.puzzle_csp_utils import PRIME_LIST, cell2var, cells2vars
 from puzzlesolver.Puzzle2model.puzzle_model_types import GridVars
+from puzzlesolver.Puzzle2model.table_constraints import add_table_constraint, fits_table
 from puzzlesolver.Puzzle2model.BoolConstraints.puzzle_values_modifiers import get_or_set_cold_cells_constraint, get_or_set_doublers_grid, get_or_set_hot_cells_constraint
 from puzzlesolver.utils.ListUtils import generate_list_kmers, get_left_side, get_right_side
 from ortools.sat.python.cp_model import IntVar
@@ -670,7 +671,7 @@ def set_product_line_constraints(model: PuzzleModel, puzzle: Puzzle):
 
         domains: list[tuple[int, int]] = []
         for var in cells_vars:
-            (lb, ub) = var.Proto().domain
+            (lb, ub) = (min(var.Proto().domain), max(var.Proto().domain))
             domains.append((lb, ub))
 
         (plb, pub) = compute_multiplication_domain(domains)
@@ -914,12 +915,17 @@ def set_adjacent_sum_is_prime_line_constraints(model: PuzzleModel,
 
     max_digit = max(puzzle.valid_digits)
     prefix = f"adjacent_sum_is_prime_line"
+    prime_sums = tuple(prime for prime in PRIME_LIST if prime <= max_digit * 2)
 
     for i, (cells, cells_vars, _) in enumerate(genLineConstraintProperties(model, puzzle, LineConstraintsE.ADJACENT_CELL_SUM_IS_PRIME_LINE)):
 
         is_closed = cells[0] == cells[-1]
 
         for j, (var1, var2) in enumerate(generate_list_kmers(cells_vars, 2, is_closed)):
+            if fits_table([var1, var2]):
+                add_table_constraint(model, [var1, var2], 'sum_in', prime_sums)
+                continue
+
             sum_var_name = f"{prefix}_{i} - sum_{j}"
             sum_var = model.NewIntVar(0, max_digit * 2, sum_var_name)
             model.Add(var1 + var2 == sum_var)
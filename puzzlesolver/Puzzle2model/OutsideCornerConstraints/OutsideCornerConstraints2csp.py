@@ -4,6 +4,7 @@ from puzzlesolver.Puzzle.ConstraintEnums import OutsideCornerConstraintsE
 from puzzlesolver.Puzzle.Puzzle import Puzzle
 from puzzlesolver.Puzzle2model.OutsideCornerConstraints.utils import genOutsideCornerConstraintProperties
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry
 from puzzlesolver.Puzzle2model.custom_constraints import compute_multiplication_domain, masked_sum_csp, count_vars, multiplication_csp
 from puzzlesolver.Puzzle2model.puzzle_csp_utils import GridVars, cells2vars
 from ortools.sat.python.cp_model import IntVar
@@ -233,10 +234,15 @@ def set_negators_little_killer_sum_constraints(model: PuzzleModel,
         model.Add(sum(t) == sum_var)
 
 
-def set_outside_corner_constraints(model: PuzzleModel, puzzle: Puzzle):
-    set_little_killer_sum_constraints(model, puzzle)
-    set_x_omit_little_killer_sum_constraints(model, puzzle)
-    set_little_killer_region_sum_product_constraints(model, puzzle)
-    set_little_killer_look_and_say_constraints(model, puzzle)
+OUTSIDE_CORNER_CONSTRAINT_SETTERS = SetterRegistry([
+    (set_little_killer_sum_constraints, [OutsideCornerConstraintsE.LITTLE_KILLER_SUM]),
+    (set_x_omit_little_killer_sum_constraints, [OutsideCornerConstraintsE.X_OMIT_LITTLE_KILLER_SUM]),
+    (set_little_killer_region_sum_product_constraints, [OutsideCornerConstraintsE.LITTLE_KILLER_REGION_SUM_PRODUCT]),
+    (set_little_killer_look_and_say_constraints, [OutsideCornerConstraintsE.LITTLE_KILLER_LOOK_AND_SAY]),
+
+    (set_negators_little_killer_sum_constraints, [OutsideCornerConstraintsE.NEGATORS_LITTLE_KILLER_SUM]),
+])
 
-    set_negators_little_killer_sum_constraints(model, puzzle)
+
+def set_outside_corner_constraints(model: PuzzleModel, puzzle: Puzzle):
+    OUTSIDE_CORNER_CONSTRAINT_SETTERS.run(model, puzzle)
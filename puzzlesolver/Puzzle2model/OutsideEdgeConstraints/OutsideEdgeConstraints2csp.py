@@ -6,6 +6,7 @@ from puzzlesolver.Puzzle2model.OtherConstraints.UnknownRegionsConstraints2csp im
 from puzzlesolver.Puzzle2model.OtherConstraints.YinYangConstraints2csp import get_or_set_yin_yang_constraint
 from puzzlesolver.Puzzle2model.OutsideEdgeConstraints.utils import genOutsideEdgeConstraintProperties
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry
 from puzzlesolver.Puzzle2model.custom_constraints import battlefield_csp, broken_x_sum_csp, masked_sum_csp, count_transitions_csp, find_first_mod_target, rising_streak_csp, sandwich_sum_csp, shifted_x_sum_csp, shortsighted_x_sum_csp, skyscraper_csp, x_sum_csp
 from puzzlesolver.Puzzle2model.puzzle_csp_utils import GridVars, cells2vars
 from ortools.sat.python.cp_model import IntVar
@@ -590,21 +591,26 @@ def set_yin_yang_sum_of_shaded_constraints(model: PuzzleModel, puzzle: Puzzle):
         model.Add(masked_sum == sum_var)
 
 
+OUTSIDE_EDGE_CONSTRAINT_SETTERS = SetterRegistry([
+    (set_sandwich_sum_constraints, [OutsideEdgeConstraintsE.SANDWICH_SUM]),
+    (set_x_sums_constraints, [OutsideEdgeConstraintsE.X_SUM]),
+    (set_shortsighted_x_sum_constraints, [OutsideEdgeConstraintsE.SHORTSIGHTED_X_SUM]),
+    (set_shifted_x_sum_constraints, [OutsideEdgeConstraintsE.SHIFTED_X_SUM]),
+    (set_battlefield_constraints, [OutsideEdgeConstraintsE.BATTLEFIELD]),
+    (set_x_sum_skyscrapers_constraints, [OutsideEdgeConstraintsE.X_SUM_SKYSCRAPERS]),
+    (set_skyscrapers_constraints, [OutsideEdgeConstraintsE.SKYSCRAPERS]),
+    (set_broken_x_sum_constraints, [OutsideEdgeConstraintsE.BROKEN_X_SUM]),
+    (set_x_index_constraints, [OutsideEdgeConstraintsE.X_INDEX]),
+
+    (set_first_seen_odd_even_constraints, [OutsideEdgeConstraintsE.FIRST_SEEN_ODD_EVEN]),
+    (set_rising_streak_constraints, [OutsideEdgeConstraintsE.RISING_STREAK]),
+    (set_row_or_column_rank_constraints, [OutsideEdgeConstraintsE.ROW_OR_COLUMN_RANK]),
+
+    (set_x_sum_region_borders_constraints, [OutsideEdgeConstraintsE.X_SUM_REGION_BORDERS]),
+    (set_yin_yang_sum_of_shaded_constraints, [OutsideEdgeConstraintsE.OUTSIDE_EDGE_YIN_YANG_SUM_OF_SHADED]),
+    # set_skycagers_skyscrapers_constraints
+])
+
+
 def set_outside_edge_constraints(model: PuzzleModel, puzzle: Puzzle):
-    set_sandwich_sum_constraints(model, puzzle)
-    set_x_sums_constraints(model, puzzle)
-    set_shortsighted_x_sum_constraints(model, puzzle)
-    set_shifted_x_sum_constraints(model, puzzle)
-    set_battlefield_constraints(model, puzzle)
-    set_x_sum_skyscrapers_constraints(model, puzzle)
-    set_skyscrapers_constraints(model, puzzle)
-    set_broken_x_sum_constraints(model, puzzle)
-    set_x_index_constraints(model, puzzle)
-
-    set_first_seen_odd_even_constraints(model, puzzle)
-    set_rising_streak_constraints(model, puzzle)
-    set_row_or_column_rank_constraints(model, puzzle)
-
-    set_x_sum_region_borders_constraints(model, puzzle)
-    set_yin_yang_sum_of_shaded_constraints(model, puzzle)
-    # set_skycagers_skyscrapers_constraints(model, puzzle)
+    OUTSIDE_EDGE_CONSTRAINT_SETTERS.run(model, puzzle)
@@ -1,15 +1,20 @@
+import contextlib
 import time
-from typing import Any
+from typing import Any, Callable, ContextManager
 
 from ortools.sat.python import cp_model
 from ortools.sat.python.cp_model import IntVar
 
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.Puzzle2model.BuildProfiler import BuildProfiler
+from puzzlesolver.Puzzle2model.DigitIndicatorModel import DigitIndicatorModel
+from puzzlesolver.Puzzle2model.connectivity_csp import DEFAULT_CONNECTIVITY_ENCODING, ConnectivityEncoding
 from puzzlesolver.Puzzle2model.custom_constraints import member_of
 from puzzlesolver.Puzzle2model.puzzle_model_types import AdjacencyVarsDict, GridVars
 from puzzlesolver.utils.ParsingUtils import Interval, parse_value
 
 
-class ModelWithRecord(cp_model.CpModel):
+class ModelWithRecord(DigitIndicatorModel):
     _variable_counter: int
     _variable_record: dict[str, IntVar]
 
@@ -32,6 +37,13 @@ class ModelWithRecord(cp_model.CpModel):
         self._variable_counter += 1
         return new_var
 
+    def NewIntVarFromDomain(self, domain: cp_model.Domain, name: str) -> IntVar:
+        new_var = super().NewIntVarFromDomain(domain, name)
+        record_name = f"{self._variable_counter} - {str(name)}"
+        self._variable_record[record_name] = new_var
+        self._variable_counter += 1
+        return new_var
+
     def get_variable_record(self):
         return self._variable_record
 
@@ -70,12 +82,29 @@ class PuzzleModel(ModelWithRecord):
     shared_vars_dict: dict[str, IntVar]
     grid_vars_dict: dict[str, GridVars]
     adjacency_vars_dicts: dict[str, AdjacencyVarsDict]
+    connectivity_encoding: ConnectivityEncoding
+    build_profiler: BuildProfiler | None
+    propagation_time: float  # the domain propagation pass of puzzle2model, 0 for loaded models
 
-    def __init__(self):
+    def __init__(self, connectivity_encoding: ConnectivityEncoding = DEFAULT_CONNECTIVITY_ENCODING,
+                 build_profiler: BuildProfiler | None = None):
         super().__init__()
         self.shared_vars_dict = dict()
         self.grid_vars_dict = dict()
         self.adjacency_vars_dicts = dict()
+        self.connectivity_encoding = connectivity_encoding
+        self.build_profiler = build_profiler
+        self.propagation_time = 0.0
+
+    def profile_section(self, name: str) -> ContextManager[Any]:
+        """Measures the enclosed build step if the model has a build profiler"""
+        if self.build_profiler is None:
+            return contextlib.nullcontext()
+        return self.build_profiler.measure(self, name)
+
+    def run_setter(self, setter: Callable[['PuzzleModel', Puzzle], None], puzzle: Puzzle):
+        with self.profile_section(setter.__name__):
+            setter(self, puzzle)
 
     def get_or_set_shared_var(self, value: str | int | None, min_val: int,
                               max_val: int, name: str) -> int | IntVar:
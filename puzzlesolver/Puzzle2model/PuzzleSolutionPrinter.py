@@ -3,6 +3,7 @@ from ortools.sat.python import cp_model
 
 from puzzlesolver.Puzzle.Puzzle import Puzzle
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SolutionLogWriter import SolutionLogLayout, SolutionLogWriter
 from puzzlesolver.Puzzle2model.puzzle_model_types import AdjacencyDict, AdjacencyVarsDict, GridVars, build_adjacency_dict
 
 MAX_SOLS = 20
@@ -115,23 +116,47 @@ def are_solutions_equal(solution1: dict[tuple[int, int], int], solution2: dict[t
     return True
 
 
+SolutionKey = tuple[int, ...]
+
+
+def solution_key(solution: dict[tuple[int, int], int], cells: list[tuple[int, int]]) -> SolutionKey:
+    """
+    Canonical hashable key of a solution: its values in the given (fixed) cell order.
+    Two solutions over the same cells have the same key iff are_solutions_equal.
+    """
+    return tuple(solution[cell] for cell in cells)
+
+
 class SolutionPrinterOptions:
     solution_filename: str = ""
     log_solutions: bool = True
     max_sols: int = MAX_SOLS
+    max_stored_solutions: int | None = None  # None stores every unique solution
+    quiet: bool = False  # only read the cells in the callback, print after the search
+    log_writer: SolutionLogWriter | None = None  # log through a background writer instead of one file per solution
 
     def __init__(self, max_sols: int = MAX_SOLS, log_solutions: bool = True,
-                 solution_filename: str = "") -> None:
+                 solution_filename: str = "", max_stored_solutions: int | None = None,
+                 quiet: bool = False, log_writer: SolutionLogWriter | None = None) -> None:
         self.max_sols = max_sols
         self.log_solutions = log_solutions
         self.solution_filename = solution_filename
+        self.max_stored_solutions = max_stored_solutions
+        self.quiet = quiet
+        self.log_writer = log_writer
 
 
 DEFAULT_OPTIONS = SolutionPrinterOptions()
 
 
 class PuzzleSolutionPrinter(cp_model.CpSolverSolutionCallback):
-    """Print intermediate solutions."""
+    """
+    Print intermediate solutions.
+
+    In quiet mode the callback only copies the cells_grid_vars values into a preallocated buffer
+    and records the solution key, so the search isn't blocked by string building. The stored
+    solutions are printed (and logged, cells only) by print_stored_solutions after Solve returns.
+    """
     _start_time: float
     _grid_vars_dict: dict[str, GridVars]
     _adjacency_vars_dicts: dict[str, AdjacencyVarsDict]
@@ -141,6 +166,17 @@ class PuzzleSolutionPrinter(cp_model.CpSolverSolutionCallback):
     _unique_solution_count: int
     _log_solutions: bool
     _solution_filename: str
+    _max_stored_solutions: int | None
+    _solution_cells: list[tuple[int, int]]
+    _solution_keys: set[SolutionKey]
+    _quiet: bool
+    _cell_var_indices: list[int]
+    _values_buffer: list[int]
+    _stored_keys: list[tuple[int, float, SolutionKey]]  # (solution number, time, key), quiet mode
+    _log_writer: SolutionLogWriter | None
+    _log_layout: SolutionLogLayout | None
+    _model_size: tuple[int, int]  # (variables, constraints) of the proto
+    _first_solution_time: float | None  # solver wall time of the first solution
 
     def __init__(self, puzzle_model: PuzzleModel, puzzle: Puzzle,
                  options: SolutionPrinterOptions = DEFAULT_OPTIONS):
@@ -155,8 +191,34 @@ class PuzzleSolutionPrinter(cp_model.CpSolverSolutionCallback):
         self._max_sols = options.max_sols
         self._solution_count = 0
         self._unique_solution_count = 0
+        self._first_solution_time = None
         self._solution_filename = options.solution_filename
         self._log_solutions = options.log_solutions
+        self._max_stored_solutions = options.max_stored_solutions
+        self._solution_cells = sorted(
+            self._grid_vars_dict['cells_grid_vars'].keys())
+        self._solution_keys = set()
+        self._quiet = options.quiet
+        cells_grid_vars = self._grid_vars_dict['cells_grid_vars']
+        self._cell_var_indices = [cells_grid_vars[cell].Index()
+                                  for cell in self._solution_cells]
+        self._values_buffer = [0] * len(self._cell_var_indices)
+        self._stored_keys = []
+        proto = puzzle_model.Proto()
+        self._model_size = (len(proto.variables), len(proto.constraints))
+        self._log_writer = options.log_writer if options.log_solutions else None
+        self._log_layout = None
+        if self._log_writer is not None:
+            title = self._solution_filename or puzzle.puzzle_meta.title
+            if self._quiet:
+                # only the cells are read in quiet mode, in solution key order
+                sorted_cells_vars = {cell: cells_grid_vars[cell]
+                                     for cell in self._solution_cells}
+                self._log_layout = SolutionLogLayout(
+                    title, {'cells_grid_vars': sorted_cells_vars})
+            else:
+                self._log_layout = SolutionLogLayout.from_puzzle_model(
+                    title, puzzle_model)
 
     def var_grid_dict_to_value_grid_dict(self, grid_var_dict: GridVars) -> dict[tuple[int, int], int]:
         value_grid_dict: dict[tuple[int, int], int] = dict()
@@ -227,12 +289,22 @@ class PuzzleSolutionPrinter(cp_model.CpSolverSolutionCallback):
 
         return True
 
+    def solution_filepath(self, solution_number: int) -> str:
+        return f"./Logs/{self._solution_filename}_{solution_number}.sol" if len(
+            self._solution_filename) else f"./Logs/solution_{solution_number}.sol"
+
     def log_solution(self):
         if not self._log_solutions:
             return
 
-        filepath = f"./Logs/{self._solution_filename}_{self.solution_count()}.sol" if len(
-            self._solution_filename) else f"./Logs/solution_{self.solution_count()}.sol"
+        if self._log_writer is not None and self._log_layout is not None:
+            values = tuple(self.SolutionIntegerValue(index)
+                           for index in self._log_layout.indices)
+            self._log_writer.submit(
+                self._log_layout, self._solution_count, time.time() - self._start_time, values)
+            return
+
+        filepath = self.solution_filepath(self.solution_count())
 
         with open(filepath, 'w') as file:
             current_time = time.time()
@@ -291,7 +363,53 @@ class PuzzleSolutionPrinter(cp_model.CpSolverSolutionCallback):
             print(adjacencies_str)
             print()
 
+    def on_solution_quiet(self):
+        values = self._values_buffer
+        for i, index in enumerate(self._cell_var_indices):
+            values[i] = self.SolutionIntegerValue(index)
+        key = tuple(values)
+        if key in self._solution_keys:
+            return
+
+        self._solution_keys.add(key)
+        self._unique_solution_count += 1
+        if self._max_stored_solutions is None or len(self._stored_keys) < self._max_stored_solutions:
+            self._stored_keys.append(
+                (self._solution_count, time.time() - self._start_time, key))
+
+    def print_stored_solutions(self):
+        """Prints (and logs) the solutions stored in quiet mode. Only the cells grid is available."""
+        for solution_number, solution_time, key in self._stored_keys:
+            solution = dict(zip(self._solution_cells, key))
+            grid_str = get_grid_str(solution)
+            print(f'Solution {solution_number}, time = {solution_time} s')
+            print(grid_str)
+            print()
+
+            if not self._log_solutions:
+                continue
+            if self._log_writer is not None and self._log_layout is not None:
+                self._log_writer.submit(
+                    self._log_layout, solution_number, solution_time, key)
+                continue
+            with open(self.solution_filepath(solution_number), 'w') as file:
+                file.write(
+                    f'Solution {solution_number}, time = {solution_time} s\n')
+                file.write(grid_str)
+                file.write('\n')
+                file.write(
+                    '+--------------------------------------------------------------+\n\n')
+
     def OnSolutionCallback(self):
+        if self._first_solution_time is None:
+            self._first_solution_time = self.WallTime()
+        if self._quiet:
+            self._solution_count += 1
+            self.on_solution_quiet()
+            if self._solution_count >= self._max_sols:
+                self.StopSearch()
+            return
+
         # satisfied = self.verify_orthogonally_connected_constraints()
         # if not satisfied:
         #     return
@@ -309,15 +427,12 @@ class PuzzleSolutionPrinter(cp_model.CpSolverSolutionCallback):
 
         self.log_solution()
 
-        if self._solution_count > 1:
-            already_in_store = any([are_solutions_equal(
-                solution, solution2) for solution2 in self.__solution_store])
-            if not already_in_store:
-                self.__solution_store.append(solution)
-                self._unique_solution_count += 1
-        else:
-            self.__solution_store.append(solution)
+        key = solution_key(solution, self._solution_cells)
+        if key not in self._solution_keys:
+            self._solution_keys.add(key)
             self._unique_solution_count += 1
+            if self._max_stored_solutions is None or len(self.__solution_store) < self._max_stored_solutions:
+                self.__solution_store.append(solution)
 
         if self._solution_count >= self._max_sols:
             self.StopSearch()
@@ -328,7 +443,18 @@ class PuzzleSolutionPrinter(cp_model.CpSolverSolutionCallback):
     def unique_solution_count(self):
         return self._unique_solution_count
 
+    def first_solution_time(self) -> float | None:
+        """Solver wall time when the first solution was found, None if there was none"""
+        return self._first_solution_time
+
+    def model_size(self) -> tuple[int, int]:
+        """(variables, constraints) of the model when the printer was created"""
+        return self._model_size
+
     def solution_store(self):
+        """The first unique solutions found (at most max_stored_solutions of them)"""
+        if self._quiet:
+            return [dict(zip(self._solution_cells, key)) for _, _, key in self._stored_keys]
         return self.__solution_store
 
 
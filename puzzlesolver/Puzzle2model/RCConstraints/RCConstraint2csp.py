@@ -11,6 +11,7 @@ from puzzlesolver.Puzzle.Puzzle import Puzzle
 from puzzlesolver.Puzzle2model.OtherConstraints.BattlestarConstraints2csp import get_or_set_battlestar_constraint
 from puzzlesolver.Puzzle2model.OtherConstraints.CenterCellsLoopConstraints2csp import get_or_set_cell_center_loop_constraint
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry
 from puzzlesolver.Puzzle2model.RCConstraints.utils import genRCConstraintProperties
 from puzzlesolver.Puzzle2model.puzzle_csp_utils import bool_vars_grid_dict_from_puzzle_grid, cell2var, cells2vars, edge_from_cells, int_vars_grid_dict_from_puzzle_grid, orthogonally_connected_region_csp
 from puzzlesolver.Puzzle2model.puzzle_model_types import AdjacencyDict, AdjacencyVarsDict, GridVars
@@ -413,6 +414,11 @@ def set_balanced_loop_cell_or_border_constraints(model: PuzzleModel, puzzle: Puz
             model.Add(sum1 != sum2).OnlyEnforceIf(consider_both)
 
 
+RC_CONSTRAINT_SETTERS = SetterRegistry([
+    (set_balanced_loop_cell_or_border_constraints, [RCConstraintsE.BALANCED_LOOP_CELL_OR_BORDER]),
+    (set_rotationally_symmetric_galaxy_constraints, [RCConstraintsE.ROTATIONALLY_SYMMETRIC_GALAXY]),
+])
+
+
 def set_rc_constraints(model: PuzzleModel, puzzle: Puzzle):
-    set_balanced_loop_cell_or_border_constraints(model, puzzle)
-    set_rotationally_symmetric_galaxy_constraints(model, puzzle)
+    RC_CONSTRAINT_SETTERS.run(model, puzzle)
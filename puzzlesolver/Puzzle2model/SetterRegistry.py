@@ -0,0 +1,60 @@
+from typing import Callable, Iterable
+
+from puzzlesolver.Puzzle.ConstraintEnums import ToolEnum
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+
+ConstraintSetter = Callable[[PuzzleModel, Puzzle], None]
+SetterEntry = tuple[ConstraintSetter, list[ToolEnum]]
+
+
+def active_tool_keys(puzzle: Puzzle) -> set[ToolEnum]:
+    """Tool keys with at least one constraint, and bool constraints that are enabled"""
+    keys: set[ToolEnum] = {key for key in puzzle.tool_constraints.keys()
+                           if puzzle.tool_constraints.get(key)}
+    keys.update(key for key, value in puzzle.bool_constraints.items() if value)
+    return keys
+
+
+class SetterRegistry:
+    """
+    Constraint setters in build order, each one with the tool keys that can make it add something to the model.
+    A setter is only called if one of its keys is active in the puzzle (see active_tool_keys),
+    so the build time depends on the rules the puzzle uses instead of on the number of setters.
+    Setters registered without keys are always called.
+    """
+    entries: list[SetterEntry]
+    setters_by_key: dict[ToolEnum, list[ConstraintSetter]]
+
+    def __init__(self, entries: Iterable[SetterEntry] = ()) -> None:
+        self.entries = []
+        self.setters_by_key = dict()
+        for setter, keys in entries:
+            self.register(setter, keys)
+
+    def register(self, setter: ConstraintSetter, keys: list[ToolEnum]):
+        self.entries.append((setter, keys))
+        for key in keys:
+            self.setters_by_key.setdefault(key, []).append(setter)
+
+    def extend(self, registry: 'SetterRegistry'):
+        for setter, keys in registry.entries:
+            self.register(setter, keys)
+
+    @staticmethod
+    def merge(registries: Iterable['SetterRegistry']) -> 'SetterRegistry':
+        merged = SetterRegistry()
+        for registry in registries:
+            merged.extend(registry)
+        return merged
+
+    def setters_for_keys(self, keys: set[ToolEnum]) -> list[ConstraintSetter]:
+        return [setter for setter, setter_keys in self.entries
+                if not setter_keys or any(key in keys for key in setter_keys)]
+
+    def setters_for_puzzle(self, puzzle: Puzzle) -> list[ConstraintSetter]:
+        return self.setters_for_keys(active_tool_keys(puzzle))
+
+    def run(self, model: PuzzleModel, puzzle: Puzzle):
+        for setter in self.setters_for_puzzle(puzzle):
+            model.run_setter(setter, puzzle)
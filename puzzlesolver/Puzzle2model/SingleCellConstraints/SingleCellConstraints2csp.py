@@ -1,5 +1,7 @@
+from puzzlesolver.Puzzle.ConstraintEnums import LocalConstraintsModifiersE, SingleCellArrowConstraintsE, SingleCellConstraintsE, SingleCellMultiArrowConstraintsE
 from puzzlesolver.Puzzle.Puzzle import Puzzle
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry
 
 from puzzlesolver.Puzzle2model.SingleCellConstraints.LoopSingleCellConstraints2csp import set_cell_inside_edge_loop_constraints, set_cell_outside_edge_loop_constraints, set_count_cell_edges_belonging_to_edge_loop_constraints, set_count_seen_cells_inside_edge_loop_constraints
 
@@ -10,69 +12,81 @@ from puzzlesolver.Puzzle2model.SingleCellConstraints.SimpleSingleCellConstraints
 from puzzlesolver.Puzzle2model.SingleCellConstraints.YinYangSingleCellConstraints2csp import set_yin_yang_minesweeper_constraints, set_yin_yang_same_color_adjacent_count_constraints, set_yin_yang_seen_shaded_cells_constraints, set_yin_yang_seen_unshaded_cells_constraints, set_yin_yang_shaded_cell_constraints, set_yin_yang_shaded_cell_count_in_directions_except_itself_constraints, set_yin_yang_unshaded_cell_constraints
 
 
-def set_single_cell_constraints(model: PuzzleModel,
-                                puzzle: Puzzle):
-
-    set_orthogonal_sum_constraints(model, puzzle)
-    set_odd_constraints(model, puzzle)
-    set_even_constraints(model, puzzle)
-    set_odd_minesweeper_constraints(model, puzzle)
-    set_maximum_constraints(model, puzzle)
-    set_minimum_constraints(model, puzzle)
-    set_indexing_column_constraints(model, puzzle)
-    set_indexing_row_constraints(model, puzzle)
-    set_radar_constraints(model, puzzle)
-    set_watchtower_constraints(model, puzzle)
-    set_not_watchtower_constraints(model, puzzle)
-    set_low_digit_constraints(model, puzzle)
-    set_high_digit_constraints(model, puzzle)
-    set_friendly_cell_constraints(model, puzzle)
-    set_diagonally_adjacent_sum_constraints(model, puzzle)
-    set_farsight_constraints(model, puzzle)
-    set_adjacent_cells_in_diff_directions_have_opposite_parity_constraints(
-        model, puzzle)
-    set_snowball_constraints(model, puzzle)
-    set_count_same_parity_neighbour_cells_constraints(model, puzzle)
-    set_sandwich_row_col_count_constraints(model, puzzle)
-
-    # set_surround_snake_cells_count_constraints(model, puzzle)
-    # set_snake_start_constraints(model, puzzle)
-    # set_snake_end_constraints(model, puzzle)
-    # set_snake_cell_constraints(model, puzzle)
-    # set_not_snake_cell_constraints(model, puzzle)
-
-    set_cell_inside_edge_loop_constraints(model, puzzle)
-    set_cell_outside_edge_loop_constraints(model, puzzle)
-    set_count_seen_cells_inside_edge_loop_constraints(model, puzzle)
-    set_count_cell_edges_belonging_to_edge_loop_constraints(model, puzzle)
-
-    set_yin_yang_seen_unshaded_cells_constraints(model, puzzle)
-    set_yin_yang_seen_shaded_cells_constraints(model, puzzle)
-    set_yin_yang_minesweeper_constraints(model, puzzle)
-    set_yin_yang_same_color_adjacent_count_constraints(model, puzzle)
-    set_yin_yang_shaded_cell_constraints(model, puzzle)
-    set_yin_yang_unshaded_cell_constraints(model, puzzle)
-    set_yin_yang_shaded_cell_count_in_directions_except_itself_constraints(
-        model, puzzle)
-
-    set_two_contiguous_regions_row_col_opposite_set_count_constraints(
-        model, puzzle)
-
-    set_count_region_sum_line_cells_in_region_constraints(model, puzzle)
-
-    set_l_shaped_region_bend_count_constraints(model, puzzle)
-    set_l_shaped_region_arrow_points_to_bend_constraints(model, puzzle)
-    set_l_shaped_region_sum_constraints(model, puzzle)
-
-    set_nurimisaki_unshaded_endpoints_constraints(model, puzzle)
-
-    set_galaxy_sum_except_star_constraints(model, puzzle)
-    set_seen_region_borders_count_constraints(model, puzzle)
-    set_neighbour_cells_same_region_count_except_itself_constraints(
-        model, puzzle)
-    set_next_numbered_region_distance_arrows_constraints(model, puzzle)
-    set_count_cells_not_in_the_same_region_arrows_constraints(model, puzzle)
+SINGLE_CELL_CONSTRAINT_SETTERS = SetterRegistry([
+    (set_orthogonal_sum_constraints, [SingleCellConstraintsE.ORTHOGONAL_SUM]),
+    (set_odd_constraints, [SingleCellConstraintsE.ODD]),
+    (set_even_constraints, [SingleCellConstraintsE.EVEN]),
+    (set_odd_minesweeper_constraints, [SingleCellConstraintsE.ODD_MINESWEEPER]),
+    (set_maximum_constraints, [SingleCellConstraintsE.MAXIMUM]),
+    (set_minimum_constraints, [SingleCellConstraintsE.MINIMUM]),
+    (set_indexing_column_constraints, [
+        SingleCellConstraintsE.INDEXING_COLUMN,
+        LocalConstraintsModifiersE.ALL_INDEXING_COLUMN_GIVEN,
+        LocalConstraintsModifiersE.ALL_INDEXING_COLUMN_IN_USED_COLUMNS_GIVEN,
+    ]),
+    (set_indexing_row_constraints, [
+        SingleCellConstraintsE.INDEXING_ROW,
+        LocalConstraintsModifiersE.ALL_INDEXING_ROW_GIVEN,
+    ]),
+    (set_radar_constraints, [SingleCellConstraintsE.RADAR, LocalConstraintsModifiersE.ALL_RADARS_GIVEN]),
+    (set_watchtower_constraints, [SingleCellConstraintsE.WATCHTOWER]),
+    (set_not_watchtower_constraints, [SingleCellConstraintsE.NOT_WATCHTOWER]),
+    (set_low_digit_constraints, [SingleCellConstraintsE.LOW_DIGIT]),
+    (set_high_digit_constraints, [SingleCellConstraintsE.HIGH_DIGIT]),
+    (set_friendly_cell_constraints, [SingleCellConstraintsE.FRIENDLY_CELL]),
+    (set_diagonally_adjacent_sum_constraints, [SingleCellConstraintsE.DIAGONALLY_ADJACENT_SUM]),
+    (set_farsight_constraints, [SingleCellConstraintsE.FARSIGHT]),
+    (set_adjacent_cells_in_diff_directions_have_opposite_parity_constraints, [SingleCellConstraintsE.ADJACENT_CELLS_IN_DIFFERENT_DIRECTIONS_HAVE_OPPOSITE_PARITY]),
+    (set_snowball_constraints, [SingleCellConstraintsE.SNOWBALL]),
+    (set_count_same_parity_neighbour_cells_constraints, [SingleCellConstraintsE.COUNT_SAME_PARITY_NEIGHBOUR_CELLS]),
+    (set_sandwich_row_col_count_constraints, [SingleCellConstraintsE.SANDWICH_ROW_COL_COUNT]),
+
+    # set_surround_snake_cells_count_constraints
+    # set_snake_start_constraints
+    # set_snake_end_constraints
+    # set_snake_cell_constraints
+    # set_not_snake_cell_constraints
+
+    (set_cell_inside_edge_loop_constraints, [SingleCellConstraintsE.CELL_INSIDE_EDGE_LOOP]),
+    (set_cell_outside_edge_loop_constraints, [SingleCellConstraintsE.CELL_OUTSIDE_EDGE_LOOP]),
+    (set_count_seen_cells_inside_edge_loop_constraints, [SingleCellConstraintsE.COUNT_SEEN_CELLS_INSIDE_EDGE_LOOP]),
+    (set_count_cell_edges_belonging_to_edge_loop_constraints, [SingleCellConstraintsE.COUNT_CELL_EDGES_BELONGING_TO_EDGE_LOOP]),
+
+    (set_yin_yang_seen_unshaded_cells_constraints, [SingleCellConstraintsE.YIN_YANG_SEEN_UNSHADED_CELLS]),
+    (set_yin_yang_seen_shaded_cells_constraints, [SingleCellConstraintsE.YIN_YANG_SEEN_SHADED_CELLS]),
+    (set_yin_yang_minesweeper_constraints, [SingleCellConstraintsE.YIN_YANG_MINESWEEPER]),
+    (set_yin_yang_same_color_adjacent_count_constraints, [SingleCellConstraintsE.YIN_YANG_SAME_COLOR_ADJACENT_COUNT]),
+    (set_yin_yang_shaded_cell_constraints, [SingleCellConstraintsE.YIN_YANG_SHADED_CELL]),
+    (set_yin_yang_unshaded_cell_constraints, [SingleCellConstraintsE.YIN_YANG_UNSHADED_CELL]),
+    (set_yin_yang_shaded_cell_count_in_directions_except_itself_constraints, [SingleCellMultiArrowConstraintsE.YIN_YANG_SHADED_CELL_COUNT_IN_DIRECTIONS_EXCEPT_ITSELF]),
+
+    (set_two_contiguous_regions_row_col_opposite_set_count_constraints, [SingleCellConstraintsE.TWO_CONTIGUOUS_REGIONS_ROW_COLUMN_OPPOSITE_SET_COUNT]),
+
+    (set_count_region_sum_line_cells_in_region_constraints, [SingleCellConstraintsE.COUNT_REGION_SUM_LINE_CELLS_IN_REGION]),
+
+    (set_l_shaped_region_bend_count_constraints, [SingleCellConstraintsE.L_SHAPED_REGION_BEND_COUNT]),
+    (set_l_shaped_region_arrow_points_to_bend_constraints, [SingleCellArrowConstraintsE.L_SHAPED_REGION_ARROW_POINTS_TO_BEND]),
+    (set_l_shaped_region_sum_constraints, [SingleCellConstraintsE.L_SHAPED_REGION_SUM]),
+
+    (set_nurimisaki_unshaded_endpoints_constraints, [
+        SingleCellConstraintsE.NURIMISAKI_UNSHADED_ENDPOINTS,
+        LocalConstraintsModifiersE.ALL_NURIMISAKI_UNSHADED_ENDPOINTS_GIVEN,
+    ]),
+
+    (set_galaxy_sum_except_star_constraints, [SingleCellConstraintsE.GALAXY_SUM_EXCEPT_STAR]),
+    (set_seen_region_borders_count_constraints, [SingleCellConstraintsE.SEEN_REGION_BORDERS_COUNT]),
+    (set_neighbour_cells_same_region_count_except_itself_constraints, [
+        SingleCellConstraintsE.UNKNOWN_REGIONS_NEIGHBOUR_CELLS_SAME_REGION_COUNT_EXCEPT_ITSELF,
+        LocalConstraintsModifiersE.ALL_UNKNOWN_REGIONS_NEIGHBOUR_CELLS_SAME_REGION_COUNT_EXCEPT_ITSELF_GIVEN,
+    ]),
+    (set_next_numbered_region_distance_arrows_constraints, [SingleCellMultiArrowConstraintsE.NEXT_NUMBERED_REGION_DISTANCE_ARROWS]),
+    (set_count_cells_not_in_the_same_region_arrows_constraints, [SingleCellMultiArrowConstraintsE.COUNT_CELLS_NOT_IN_THE_SAME_REGION_ARROWS]),
     # set_same_colored_region_distance_arrows_constraints(
     #     model, puzzle)
 
-    set_region_loop_sum_cell_constraints(model, puzzle)
+    (set_region_loop_sum_cell_constraints, [SingleCellConstraintsE.REGION_LOOP_SUM_CELL]),
+])
+
+
+def set_single_cell_constraints(model: PuzzleModel, puzzle: Puzzle):
+    SINGLE_CELL_CONSTRAINT_SETTERS.run(model, puzzle)
@@ -0,0 +1,170 @@
+import os
+import queue
+import threading
+from typing import IO
+
+from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.puzzle_model_types import AdjacencyVarsDict, GridVars
+
+SOLUTION_SEPARATOR = '+--------------------------------------------------------------+\n\n'
+LOG_QUEUE_SIZE = 256
+
+
+class SolutionLogLayout:
+    """
+    Fixed order of the logged variables of a puzzle model, so a solution can be captured in the solver
+    callback as a flat tuple of values (read by variable index) and formatted later.
+    """
+    title: str
+    grids: list[tuple[str, list[tuple[int, int]]]]
+    adjacencies: list[tuple[str, list[tuple[tuple[int, int], list[tuple[int, int]]]]]]
+    records: list[str]
+    indices: list[int]  # proto variable indices, in grids, adjacencies, records order
+
+    def __init__(self, title: str, grid_vars_dict: dict[str, GridVars],
+                 adjacency_vars_dicts: dict[str, AdjacencyVarsDict] | None = None,
+                 variables_record: dict[str, object] | None = None) -> None:
+        self.title = title
+        self.grids = []
+        self.adjacencies = []
+        self.records = []
+        self.indices = []
+
+        # cells first, like PuzzleSolutionPrinter.log_solution
+        grid_names = sorted(grid_vars_dict.keys(),
+                            key=lambda name: name != 'cells_grid_vars')
+        for grid_name in grid_names:
+            grid_var_dict = grid_vars_dict[grid_name]
+            cells = list(grid_var_dict.keys())
+            self.grids.append((grid_name, cells))
+            self.indices.extend(grid_var_dict[cell].Index() for cell in cells)
+
+        for dict_name, adjacency_dict in (adjacency_vars_dicts or {}).items():
+            nodes = [(node1, list(edges_dict.keys()))
+                     for node1, edges_dict in adjacency_dict.items()]
+            self.adjacencies.append((dict_name, nodes))
+            for node1, nodes2 in nodes:
+                self.indices.extend(
+                    adjacency_dict[node1][node2].Index() for node2 in nodes2)
+
+        for key, var in (variables_record or {}).items():
+            self.records.append(key)
+            self.indices.append(var.Index())  # type: ignore
+
+    @staticmethod
+    def from_puzzle_model(title: str, puzzle_model: PuzzleModel) -> 'SolutionLogLayout':
+        return SolutionLogLayout(title, puzzle_model.grid_vars_dict, puzzle_model.adjacency_vars_dicts,
+                                 puzzle_model.get_variable_record())
+
+    def format(self, solution_number: int, solution_time: float, values: tuple[int, ...]) -> str:
+        # imported here: PuzzleSolutionPrinter imports this module
+        from puzzlesolver.Puzzle2model.PuzzleSolutionPrinter import get_adjacencies_grid_str, get_grid_str
+
+        lines = [f'Solution {solution_number}, time = {solution_time} s\n']
+        i = 0
+        for grid_name, cells in self.grids:
+            grid_value_dict = dict(zip(cells, values[i:i + len(cells)]))
+            i += len(cells)
+            if grid_name != 'cells_grid_vars':
+                lines.append(grid_name + '\n')
+            lines.append(get_grid_str(grid_value_dict))
+            lines.append('\n')
+
+        for dict_name, nodes in self.adjacencies:
+            adjacency_values_dict: dict[tuple[int, int], dict[tuple[int, int], int]] = dict()
+            for node1, nodes2 in nodes:
+                adjacency_values_dict[node1] = dict(
+                    zip(nodes2, values[i:i + len(nodes2)]))
+                i += len(nodes2)
+            lines.append(dict_name + '\n')
+            lines.append(get_adjacencies_grid_str(adjacency_values_dict))
+            lines.append('\n')
+
+        for key, value in zip(self.records, values[i:]):
+            lines.append(f"{key} = {value}\n")
+
+        lines.append(SOLUTION_SEPARATOR)
+        return ''.join(lines)
+
+
+class SolutionLogWriter:
+    """
+    Appends solutions to a single log file from a background thread. The solver callback only puts a
+    (layout, solution number, time, values) snapshot on a bounded queue; formatting and disk writes happen
+    in the writer thread. If the queue is full, submit blocks until the writer catches up.
+
+    A writer can be shared by the puzzles of a batch (one file per batch) or used for a single puzzle.
+    It must be closed to flush the queue. If a write failed (disk full, ...), the writer thread stops writing
+    but keeps draining the queue so the solver never blocks, and close raises the error.
+
+    Args:
+        filepath (str): the log file. It is truncated when the writer starts.
+        max_queue_size (int, optional): Defaults to LOG_QUEUE_SIZE = 256 solutions.
+    """
+    filepath: str
+    _queue: 'queue.Queue[tuple[SolutionLogLayout, int, float, tuple[int, ...]] | None]'
+    _thread: threading.Thread | None
+    _current_layout: SolutionLogLayout | None
+    error: BaseException | None
+
+    def __init__(self, filepath: str, max_queue_size: int = LOG_QUEUE_SIZE) -> None:
+        self.filepath = filepath
+        self._queue = queue.Queue(max_queue_size)
+        self._thread = None
+        self._current_layout = None
+        self.error = None
+
+    def start(self) -> 'SolutionLogWriter':
+        if self._thread is None:
+            directory = os.path.dirname(self.filepath)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            open(self.filepath, 'w').close()
+            self._thread = threading.Thread(
+                target=self._run, name='SolutionLogWriter', daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, layout: SolutionLogLayout, solution_number: int, solution_time: float,
+               values: tuple[int, ...]):
+        self._queue.put((layout, solution_number, solution_time, values))
+
+    def close(self):
+        """Flushes the queue and stops the writer thread. Raises the error of a failed write, the log file
+        is then incomplete."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self) -> 'SolutionLogWriter':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write(self, file: IO[str], item: tuple[SolutionLogLayout, int, float, tuple[int, ...]]):
+        layout, solution_number, solution_time, values = item
+        if layout is not self._current_layout:
+            file.write(f'Puzzle {layout.title}\n\n')
+            self._current_layout = layout
+        file.write(layout.format(solution_number, solution_time, values))
+
+    def _run(self):
+        closed = False
+        try:
+            with open(self.filepath, 'a') as file:
+                while not closed:
+                    item = self._queue.get()
+                    if item is None:
+                        closed = True
+                    else:
+                        self._write(file, item)
+        except BaseException as e:
+            # also the errors of the final flush, when the file is closed
+            self.error = e
+        # keep draining the queue so the solver never blocks on a dead writer
+        while not closed:
+            closed = self._queue.get() is None
@@ -5,6 +5,7 @@ from puzzlesolver.Puzzle.ConstraintEnums import TwoRegionsConstraintsE
 from puzzlesolver.Puzzle.Constraints import CloneConstraint
 from puzzlesolver.Puzzle.Puzzle import Puzzle
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry
 from puzzlesolver.Puzzle2model.puzzle_csp_utils import coord2var
 from puzzlesolver.Puzzle2model.puzzle_model_types import GridVars
 
@@ -54,5 +55,10 @@ def set_clones_constraints(model: PuzzleModel, puzzle: Puzzle):
             model.Add(cell1_var == cell2_var)
 
 
+TWO_REGIONS_CONSTRAINT_SETTERS = SetterRegistry([
+    (set_clones_constraints, [TwoRegionsConstraintsE.CLONES]),
+])
+
+
 def set_two_regions_constraints(model: PuzzleModel, puzzle: Puzzle):
-    set_clones_constraints(model, puzzle)
+    TWO_REGIONS_CONSTRAINT_SETTERS.run(model, puzzle)
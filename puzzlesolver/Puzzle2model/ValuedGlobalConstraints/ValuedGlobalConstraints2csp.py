@@ -4,6 +4,7 @@ from puzzlesolver.Puzzle.ConstraintEnums import DoubleValuedGlobalConstraintsE,
 from puzzlesolver.Puzzle.Puzzle import Puzzle
 from puzzlesolver.Puzzle2model.OtherConstraints.UnknownEmptyCellsConstraints2csp import get_or_set_unknown_empty_cells_constraint
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry
 from puzzlesolver.Puzzle2model.ValuedGlobalConstraints.utils import genDoubleValuedGlobalConstraint, genValuedGlobalConstraint
 from puzzlesolver.Puzzle2model.custom_constraints import are_all_true_csp, distance_csp
 from puzzlesolver.Puzzle2model.puzzle_csp_utils import GridVars, cell2var
@@ -206,11 +207,16 @@ def set_forbidden_adjacencies_constraints(model: PuzzleModel, puzzle: Puzzle):
                 model.Add(cell2_var != value1).OnlyEnforceIf(cell1_is_val2)
 
 
-def set_valued_global_constraints(model: PuzzleModel, puzzle: Puzzle):
-    set_forbidden_adjacent_sum_constraints(model, puzzle)
-    set_forbidden_adjacent_sum_multiple_constraints(model, puzzle)
+VALUED_GLOBAL_CONSTRAINT_SETTERS = SetterRegistry([
+    (set_forbidden_adjacent_sum_constraints, [ValuedGlobalConstraintsE.FORBIDDEN_ORTHOGONALLY_ADJACENT_SUM]),
+    (set_forbidden_adjacent_sum_multiple_constraints, [ValuedGlobalConstraintsE.FORBIDDEN_ORTHOGONALLY_ADJACENT_SUM_MULTIPLE]),
+
+    (set_forbidden_adjacencies_constraints, [DoubleValuedGlobalConstraintsE.FORBIDDEN_ORTHOGONAL_ADJACENCIES]),
 
-    set_forbidden_adjacencies_constraints(model, puzzle)
+    (set_minimum_diagonally_adjacent_difference_constraints, [ValuedGlobalConstraintsE.MINIMUM_DIAGONALLY_ADJACENT_DIFFERENCE]),
+    (set_maximum_orthogonally_adjacent_difference_constraints, [ValuedGlobalConstraintsE.MAXIMUM_ORTHOGONALLY_ADJACENT_DIFFERENCE]),
+])
 
-    set_minimum_diagonally_adjacent_difference_constraints(model, puzzle)
-    set_maximum_orthogonally_adjacent_difference_constraints(model, puzzle)
+
+def set_valued_global_constraints(model: PuzzleModel, puzzle: Puzzle):
+    VALUED_GLOBAL_CONSTRAINT_SETTERS.run(model, puzzle)
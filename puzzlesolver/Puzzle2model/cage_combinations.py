@@ -0,0 +1,115 @@
+from functools import lru_cache
+from itertools import permutations
+
+from ortools.sat.python import cp_model
+from ortools.sat.python.cp_model import IntVar
+
+from puzzlesolver.Puzzle2model.DigitIndicatorModel import domain_values
+from puzzlesolver.Puzzle2model.custom_constraints import is_equal_csp
+from puzzlesolver.Puzzle2model.table_constraints import MAX_TABLE_SIZE
+
+# Cages whose digits don't repeat and sum to a fixed total (killer cages and their variants) only accept a few
+# sets of digits, e.g. a 2 cell cage of 3 is {1, 2}. The sets are enumerated once per (size, total, digits)
+# and the most recent ones are memoized for the whole process (a batch of puzzles, a worker of the solver
+# service). A cage restricts the
+# domains of its cells to the digits of its sets and requires the digits shared by all of them. The
+# permutations of the sets can also be added as a table of allowed assignments, but on the killer puzzles of
+# data/Solved the table makes the search slower than the domains alone, so it is off by default.
+
+# cages with more sets than this are left to the sum and all different constraints
+MAX_CAGE_COMBINATIONS = 4096
+
+# memoized sets and tables, bounded since the keys (cell domains for the tables) vary without limit over the
+# puzzles of a long-lived solver process
+CAGE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CAGE_CACHE_SIZE)
+def cage_combinations(size: int, total: int, digits: tuple[int, ...]) -> tuple[tuple[int, ...], ...] | None:
+    """
+    Sets of size distinct digits (sorted) summing to total, None if there are more than MAX_CAGE_COMBINATIONS.
+        cage_combinations(3, 7, (1, 2, ..., 9)) = ((1, 2, 4),)
+    """
+    digits = tuple(sorted(set(digits)))
+    combinations: list[tuple[int, ...]] = []
+
+    def extend(start: int, chosen: list[int], remaining: int) -> bool:
+        left = size - len(chosen)
+        if left == 0:
+            if remaining == 0:
+                combinations.append(tuple(chosen))
+            return len(combinations) <= MAX_CAGE_COMBINATIONS
+        # the largest sum of left digits
+        if sum(digits[-left:]) < remaining:
+            return True
+        for i in range(start, len(digits) - left + 1):
+            # the smallest sum of left digits from i
+            if sum(digits[i:i + left]) > remaining:
+                break
+            chosen.append(digits[i])
+            complete = extend(i + 1, chosen, remaining - digits[i])
+            chosen.pop()
+            if not complete:
+                return False
+        return True
+
+    if not extend(0, [], total):
+        return None
+    return tuple(combinations)
+
+
+@lru_cache(maxsize=CAGE_CACHE_SIZE)
+def cage_table(total: int, domains: tuple[tuple[int, ...], ...]) -> tuple[tuple[int, ...], ...] | None:
+    """
+    Assignments of the cells of a cage (one domain per cell) with distinct digits summing to total, None if they
+    can't be enumerated or there are more than MAX_TABLE_SIZE.
+    """
+    combinations = cage_combinations(len(domains), total, tuple(sorted(set().union(*domains))))
+    if combinations is None:
+        return None
+    n_permutations = 1
+    for i in range(2, len(domains) + 1):
+        n_permutations *= i
+    if len(combinations) * n_permutations > MAX_TABLE_SIZE:
+        return None
+
+    domain_sets = [set(domain) for domain in domains]
+    return tuple(sorted(assignment for combination in combinations for assignment in permutations(combination)
+                        if all(value in domain for value, domain in zip(assignment, domain_sets))))
+
+
+def cage_combinations_csp(model: cp_model.CpModel, cells_vars: list[IntVar], total: int, prefix: str,
+                          use_table: bool = False):
+    """
+    Enforces the digit sets of a cage of distinct digits summing to total (the sum and the all different
+    constraints are added by the caller):
+        - every cell takes a digit of one of the sets
+        - the digits of every set are in the cage
+        - if use_table and the assignments are few, the cells take one of them
+    """
+    prefix = f"{prefix} - cage_combinations_csp"
+
+    domains = tuple(tuple(domain_values(var)) for var in cells_vars)
+    combinations = cage_combinations(len(cells_vars), total, tuple(sorted(set().union(*domains))))
+    if combinations is None:
+        return
+    if not combinations:
+        model.AddBoolOr([])
+        return
+
+    cage_digits = set().union(*combinations)
+    for var, domain in zip(cells_vars, domains):
+        allowed = [value for value in domain if value in cage_digits]
+        if len(allowed) < len(domain):
+            model.AddLinearExpressionInDomain(var, cp_model.Domain.FromValues(allowed))
+
+    required_digits = set(combinations[0]).intersection(*combinations[1:])
+    for digit in sorted(required_digits):
+        model.AddBoolOr([is_equal_csp(model, var, digit, f"{prefix} - {digit}")
+                         for var, domain in zip(cells_vars, domains) if digit in domain])
+
+    if not use_table:
+        return
+    table = cage_table(total, domains)
+    if table is not None:
+        model.AddAllowedAssignments(cells_vars, table)
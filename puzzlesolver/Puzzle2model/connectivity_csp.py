@@ -0,0 +1,174 @@
+from typing import Literal
+
+from ortools.sat.python import cp_model
+from ortools.sat.python.cp_model import IntVar
+
+from puzzlesolver.Puzzle2model.custom_constraints import are_any_true_csp
+from puzzlesolver.Puzzle2model.puzzle_model_types import AdjacencyDict, AdjacencyVarsDict, GridVars
+
+# 'floodfill': layered floodfill, cells x region_max_size bool vars
+# 'tree': rooted shortest path tree, one distance var per cell (and per edge, for adjacency vars), so the model
+#   is linear in the number of edges. Much smaller and faster on most puzzles, but cp-sat times out on some
+#   puzzles that it solves with floodfill, so it's opt-in
+ConnectivityEncoding = Literal['floodfill', 'tree']
+CONNECTIVITY_ENCODINGS: tuple[ConnectivityEncoding, ...] = ('floodfill', 'tree')
+DEFAULT_CONNECTIVITY_ENCODING: ConnectivityEncoding = 'floodfill'
+
+
+def first_true_bools_csp(model: cp_model.CpModel, variables: list[IntVar], prefix: str) -> list[IntVar]:
+    """
+    Returns a list of bools where only the first true variable is true (linear version of only_first_of_bools):
+        bools[i] = variables[i] and not any(variables[:i])
+    """
+    prefix = f"{prefix} - first_true_bools"
+    bools: list[IntVar] = []
+    any_before: IntVar | None = None
+    for i, var in enumerate(variables):
+        if any_before is None:
+            bools.append(var)
+            any_before = var
+            continue
+
+        first = model.NewBoolVar(f"{prefix} - first_{i}")
+        model.AddBoolAnd(var, any_before.Not()).OnlyEnforceIf(first)
+        model.AddBoolOr(var.Not(), any_before).OnlyEnforceIf(first.Not())
+        bools.append(first)
+
+        any_until = model.NewBoolVar(f"{prefix} - any_until_{i}")
+        model.AddBoolOr(var, any_before).OnlyEnforceIf(any_until)
+        model.AddBoolAnd(var.Not(), any_before.Not()
+                         ).OnlyEnforceIf(any_until.Not())
+        any_before = any_until
+    return bools
+
+
+def _root_bools_csp(model: cp_model.CpModel, nodes: list[tuple[int, int]], region_vars_dict: GridVars,
+                    seed: list[tuple[int, int]] | None, prefix: str) -> dict[tuple[int, int], IntVar]:
+    """
+    The root is the first cell (in row, col order) of the region, among the seed cells if given.
+    If the region is not empty there's exactly one root.
+    """
+    candidates = nodes if seed is None else [node for node in nodes if node in set(seed)]
+    candidates = sorted(candidates)
+    candidate_vars = [region_vars_dict[node] for node in candidates]
+    first_bools = first_true_bools_csp(model, candidate_vars, prefix)
+
+    all_region_vars = [region_vars_dict[node] for node in nodes]
+    any_region_var = are_any_true_csp(
+        model, all_region_vars, f"{prefix} - any_region_var")
+    model.Add(sum(first_bools) == 1).OnlyEnforceIf(any_region_var)
+
+    return dict(zip(candidates, first_bools))
+
+
+def tree_connected_region_csp(model: cp_model.CpModel, adjacency_dict: AdjacencyDict,
+                              region_vars_dict: GridVars, region_max_size: int,
+                              seed: list[tuple[int, int]] | None = None):
+    """
+    Given a grid of bool vars (region), and an adjacency dictionary,
+    all the 1's in the grid must be orthogonally connected.
+
+    Each region cell gets its distance to the root cell, inside the region:
+        dist[root] = 0
+        dist[v] = 1 + min(dist[u] for u adjacent to v), if v in region
+        dist[v] = region_max_size, if v not in region
+    so every region cell has a path of decreasing distances to the root. The distances are the shortest
+    paths, so they are fully determined by the region (no extra solutions when enumerating).
+    """
+    prefix = f"tree_connected_region"
+    nodes = sorted(set(adjacency_dict.keys()) & set(region_vars_dict.keys()))
+    if not nodes:
+        return
+
+    outside = region_max_size
+    root_bools = _root_bools_csp(
+        model, nodes, region_vars_dict, seed, prefix)
+
+    dist_vars: dict[tuple[int, int], IntVar] = {
+        node: model.NewIntVar(0, outside, f"{prefix} - dist {node}") for node in nodes}
+
+    for node in nodes:
+        region_var = region_vars_dict[node]
+        dist_var = dist_vars[node]
+        root_bool = root_bools.get(node)
+        neighbours = [adj for adj in adjacency_dict[node] if adj in dist_vars]
+
+        model.Add(dist_var == outside).OnlyEnforceIf(region_var.Not())
+        model.Add(dist_var < outside).OnlyEnforceIf(region_var)
+        if root_bool is not None:
+            model.Add(dist_var == 0).OnlyEnforceIf(root_bool)
+
+        if not neighbours:
+            if root_bool is not None:
+                model.AddImplication(region_var, root_bool)
+            else:
+                model.Add(region_var == 0)
+            continue
+
+        min_adj_dist = model.NewIntVar(
+            0, outside, f"{prefix} - min_adj_dist {node}")
+        model.AddMinEquality(
+            min_adj_dist, [dist_vars[adj] for adj in neighbours])
+
+        enforce = [region_var] if root_bool is None else [
+            region_var, root_bool.Not()]
+        model.Add(dist_var == min_adj_dist + 1).OnlyEnforceIf(enforce)
+
+
+def tree_connected_region_adjacency_vars_csp(model: cp_model.CpModel, adjacency_dict: AdjacencyVarsDict,
+                                             region_vars_dict: GridVars, region_max_size: int,
+                                             seed: list[tuple[int, int]] | None = None):
+    """
+    Given a grid of bool vars (region), and an adjacency variables dictionary,
+    all the 1's in the grid must be connected through the edges that are 1.
+
+    Same as tree_connected_region_csp, but the distance through an edge only counts if the edge var is 1:
+        dist[v] = 1 + min(dist[u] if edge(u, v) else region_max_size for u adjacent to v), if v in region
+    """
+    prefix = f"tree_connected_region_adjacency_vars"
+    nodes = sorted(set(adjacency_dict.keys()) & set(region_vars_dict.keys()))
+    if not nodes:
+        return
+
+    outside = region_max_size
+    root_bools = _root_bools_csp(
+        model, nodes, region_vars_dict, seed, prefix)
+
+    dist_vars: dict[tuple[int, int], IntVar] = {
+        node: model.NewIntVar(0, outside, f"{prefix} - dist {node}") for node in nodes}
+
+    for node in nodes:
+        region_var = region_vars_dict[node]
+        dist_var = dist_vars[node]
+        root_bool = root_bools.get(node)
+        edges_dict = adjacency_dict[node]
+
+        model.Add(dist_var == outside).OnlyEnforceIf(region_var.Not())
+        model.Add(dist_var < outside).OnlyEnforceIf(region_var)
+        if root_bool is not None:
+            model.Add(dist_var == 0).OnlyEnforceIf(root_bool)
+
+        through_edge_vars: list[IntVar] = []
+        for adj, edge_var in edges_dict.items():
+            if adj not in dist_vars:
+                continue
+            through_edge = model.NewIntVar(
+                0, outside, f"{prefix} - dist {adj} through edge to {node}")
+            model.Add(through_edge == dist_vars[adj]).OnlyEnforceIf(edge_var)
+            model.Add(through_edge == outside).OnlyEnforceIf(edge_var.Not())
+            through_edge_vars.append(through_edge)
+
+        if not through_edge_vars:
+            if root_bool is not None:
+                model.AddImplication(region_var, root_bool)
+            else:
+                model.Add(region_var == 0)
+            continue
+
+        min_adj_dist = model.NewIntVar(
+            0, outside, f"{prefix} - min_adj_dist {node}")
+        model.AddMinEquality(min_adj_dist, through_edge_vars)
+
+        enforce = [region_var] if root_bool is None else [
+            region_var, root_bool.Not()]
+        model.Add(dist_var == min_adj_dist + 1).OnlyEnforceIf(enforce)
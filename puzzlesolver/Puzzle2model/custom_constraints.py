@@ -4,7 +4,9 @@ from typing import Iterable
 from ortools.sat.python import cp_model
 from ortools.sat.python.cp_model import IntVar, BoundedLinearExpression, IntervalVar, BoundedLinearExprT, LinearExprT
 
+from puzzlesolver.Puzzle2model.DigitIndicatorModel import DigitIndicatorModel
 from puzzlesolver.Puzzle2model.puzzle_model_types import AdjacencyDict
+from puzzlesolver.Puzzle2model.table_constraints import add_table_constraint, fits_table, table_bool_csp
 from puzzlesolver.utils.ListUtils import get_left_side, get_right_side
 
 
@@ -137,6 +139,21 @@ def are_any_true_csp(model: cp_model.CpModel, variables: list[IntVar], prefix: s
     return any_true_bool
 
 
+def is_equal_csp(model: cp_model.CpModel, var: int | IntVar, val: LinearExprT, prefix: str) -> IntVar:
+    """
+    Returns a bool_var indicating if var is equal to val:
+        bool_var = var == val
+    If the model has a digit indicator cache and val is a constant, the cached literal is reused.
+    """
+    if isinstance(model, DigitIndicatorModel) and isinstance(var, IntVar) and isinstance(val, int):
+        return model.get_or_set_digit_indicator(var, val)
+
+    b = model.NewBoolVar(f"{prefix} - is_equal_bool")
+    model.Add(var == val).OnlyEnforceIf(b)
+    model.Add(var != val).OnlyEnforceIf(b.Not())
+    return b
+
+
 def count_vars(model: cp_model.CpModel, variables: VarList, val: LinearExprT, prefix: str) -> IntVar:
     """
     Counts the number of occurrences of `val` in array `variables`:
@@ -149,11 +166,8 @@ def count_vars(model: cp_model.CpModel, variables: VarList, val: LinearExprT, pr
         model.Add(count == 0)
         return count
 
-    b = [model.NewBoolVar(f"{prefix} - b_{i}")
-         for i, _ in enumerate(variables)]
-    for i in range(n):
-        model.Add(variables[i] == val).OnlyEnforceIf(b[i])
-        model.Add(variables[i] != val).OnlyEnforceIf(b[i].Not())
+    b = [is_equal_csp(model, var, val, f"{prefix} - b_{i}")
+         for i, var in enumerate(variables)]
     model.Add(count == sum(b))
     return count
 
@@ -204,8 +218,7 @@ def masked_count_vars(model: cp_model.CpModel, variables: VarList,
 
     equal_and_count_bools: list[IntVar] = []
     for i, (var, mask) in enumerate(zip(variables, mask_bools)):
-        is_equal = are_all_equal_csp(
-            model, [var, val], f"{prefix} - is_equal {i}")
+        is_equal = is_equal_csp(model, var, val, f"{prefix} - is_equal {i}")
         equal_and_count_bool = are_all_true_csp(
             model, [is_equal, mask], f"{prefix}_{i} - equal_and_count_bool")
 
@@ -467,6 +480,17 @@ def compare_multisets_csp(model: cp_model.CpModel, set1: VarList,
     return is_equal
 
 
+def forbid_assignment_csp(model: cp_model.CpModel, variables: list[IntVar], values: list[int], prefix: str):
+    """
+    Ensures that the variables do not take all the given values at the same time:
+        any(var != val for var, val in zip(variables, values))
+    """
+    prefix = f"{prefix} - forbid_assignment"
+    diff_bools = [reif(model, var != val, prefix)
+                  for var, val in zip(variables, values)]
+    model.AddBoolOr(diff_bools)
+
+
 def is_inside_interval_2_csp(model: cp_model.CpModel, interval_var: IntervalVar, val: int | IntVar, prefix: str):
     """
     Returns a bool_var indicating if val is inside the interval represented by interval_var:
@@ -546,13 +570,20 @@ def masked_sum_csp(model: cp_model.CpModel, x: VarList,
         sum_var = sum(var for var, mask in zip(variables, mask_bools) if mask)
             or
         sum_var = sum(var*mask for var, mask in zip(variables, mask_bools))
+    Fixed masks (constants or vars with a single value) add their variable, or nothing, to the sum directly.
     """
     prefix = f"{prefix} - masked_sum_csp"
 
     assert len(x) == len(mask_bools)
 
-    ts: list[IntVar] = []
+    ts: list[int | IntVar] = []
     for i, (x_i, mask) in enumerate(zip(x, mask_bools)):
+        # negated literals are not IntVars, they are never treated as fixed
+        mask_lb, mask_ub = get_domain(mask) if isinstance(mask, (int, IntVar)) else (0, 1)
+        if mask_lb == mask_ub:
+            if mask_lb:
+                ts.append(x_i)
+            continue
         domains = varlist_domain([x_i, mask])
         lb, ub = compute_multiplication_domain(domains)
         t_i = model.NewIntVar(lb, ub, f"{prefix} - t_{i}")
@@ -745,7 +776,11 @@ def are_consecutive_csp(model: cp_model.CpModel, var1: IntVar, var2: IntVar, pre
     """
         Returns a bool var indicating if the var1 and var2 are consecutive
             are_consecutive = abs(var2 - var1) == 1
+        Small domains use a table constraint.
     """
+    if fits_table([var1, var2]):
+        return table_bool_csp(model, [var1, var2], 'consecutive', (), f"{prefix} - are_consecutive_csp")
+
     domain1, domain2 = get_domain(var1), get_domain(var2)
     lb = min(min(domain1), min(domain2))
     ub = max(max(domain1), max(domain2))
@@ -769,8 +804,11 @@ def is_ratio_1_r_csp(model: cp_model.CpModel, var1: IntVar | int, var2: IntVar |
         [1, 2], [4, 2], [8, 4], [8, 16] are in a 1:2 ratio
         [2, 6], [12, 4] are in a 1:3 ratio
         [2, 3], [5, 3] are not a 1:2 ratio or 1:3 ratio
-
+    Small domains use a table constraint.
     """
+    if fits_table([var1, var2, r]):
+        return table_bool_csp(model, [var1, var2, r], 'ratio', (), f"{prefix} - is_ratio_1/x_csp")
+
     domain1 = get_domain(var1)
     domain2 = get_domain(var2)
     # lb = min(min(var.Proto().domain) for var in [var1, var2])
@@ -850,6 +888,30 @@ def is_sandwiched_csp(model: cp_model.CpModel, variables: VarList, idx: int,
     return is_sandwiched
 
 
+def seen_before_bools_csp(model: cp_model.CpModel, bools: list[IntVar], prefix: str) -> list[IntVar]:
+    """
+    Returns a list of bool vars indicating if any of the previous bools is true:
+        seen = [any(bools[:i]) for i in range(len(bools))]
+    These are the states of a left to right scan that remembers if it has seen a true bool, so the encoding is
+    linear: seen[i+1] = seen[i] or bools[i].
+        For example [0, 1, 0, 1] -> [0, 0, 1, 1]
+    """
+    prefix = f"{prefix} - seen_before_bools_csp"
+
+    seen: list[IntVar] = []
+    for i in range(len(bools)):
+        seen_i = model.NewBoolVar(f"{prefix} - seen_{i}")
+        if i == 0:
+            model.Add(seen_i == 0)
+        else:
+            model.AddBoolOr(seen[i - 1], bools[i - 1]).OnlyEnforceIf(seen_i)
+            model.AddImplication(seen[i - 1], seen_i)
+            model.AddImplication(bools[i - 1], seen_i)
+        seen.append(seen_i)
+
+    return seen
+
+
 def sandwich_bools_csp(model: cp_model.CpModel, variables: VarList,
                        a: int | IntVar, b: int | IntVar, prefix: str) -> list[IntVar]:
     """
@@ -862,14 +924,33 @@ def sandwich_bools_csp(model: cp_model.CpModel, variables: VarList,
             [5, 1, 3, 5, 4, 9, 6, 5] -> [0, 0, 1, 1, 1, 0, 0, 0]
             [5, 7, 3, 1, 9, 6, 5, 2] -> [0, 0, 0, 0, 0, 0, 0, 0]
             [4, 0, 1, 7, 3, 5, 6, 8] -> [0, 0, 0, 0, 0, 0, 0, 0]
+
+        The memberships (a in variables[:i], ...) are computed for every index by a single scan with
+        seen_before_bools_csp, instead of once per index as in is_sandwiched_csp, so the encoding is linear in
+        the length of variables.
     """
 
     prefix = f"{prefix} - sandwich_bools_csp"
 
+    is_a = [is_equal_csp(model, var, a, f"{prefix} - is_a_{j}")
+            for j, var in enumerate(variables)]
+    is_b = [is_equal_csp(model, var, b, f"{prefix} - is_b_{j}")
+            for j, var in enumerate(variables)]
+    a_left = seen_before_bools_csp(model, is_a, f"{prefix} - a_left")
+    b_left = seen_before_bools_csp(model, is_b, f"{prefix} - b_left")
+    a_right = seen_before_bools_csp(
+        model, is_a[::-1], f"{prefix} - a_right")[::-1]
+    b_right = seen_before_bools_csp(
+        model, is_b[::-1], f"{prefix} - b_right")[::-1]
+
     is_middle_bools: list[IntVar] = []
     for j, _ in enumerate(variables):
-        is_sandwiched = is_sandwiched_csp(
-            model, variables, j, a, b, f"{prefix} - idx={j}")
+        is_middle_bool_1 = are_all_true_csp(model, [a_left[j], b_right[j]],
+                                            f"{prefix} - idx={j} - is_middle_bool_1")
+        is_middle_bool_2 = are_all_true_csp(model, [b_left[j], a_right[j]],
+                                            f"{prefix} - idx={j} - is_middle_bool_2")
+        is_sandwiched = are_any_true_csp(model, [is_middle_bool_1, is_middle_bool_2],
+                                         f"{prefix} - idx={j} - is_sandwiched")
         is_middle_bools.append(is_sandwiched)
 
     return is_middle_bools
@@ -1415,10 +1496,14 @@ def cycle_order_csp(model: cp_model.CpModel, variables: list[IntVar], start_idx:
 def factors_csp(model: cp_model.CpModel, var1: IntVar, var2: IntVar, prefix: str):
     """
     Enforces the constraint: var1 % var2 == 0 or var2 % vars1 == 0, i.e., one variable must be divisile by the other
+    Small domains use a table constraint.
     """
+    if fits_table([var1, var2]):
+        add_table_constraint(model, [var1, var2], 'factors')
+        return
 
-    [_, ub1] = var1.Proto().domain
-    [_, ub2] = var2.Proto().domain
+    _, ub1 = get_domain(var1)
+    _, ub2 = get_domain(var2)
     prefix = f"{prefix} - factors_csp"
 
     b = model.NewBoolVar(f'{prefix} - bool_{var1.Name()}_{var2.Name()}')
@@ -1973,12 +2058,8 @@ def index_of_first_target_csp(model: cp_model.CpModel, variables: list[IntVar],
         model.Add(idx_var == -1)
         return idx_var
 
-    match_bools = [model.NewBoolVar(f"{prefix} - bools_{i}")
-                   for i, _ in enumerate(variables)]
-    for i, var in enumerate(variables):
-        bool_var = match_bools[i]
-        model.Add(var == target).OnlyEnforceIf(bool_var)
-        model.Add(var != target).OnlyEnforceIf(bool_var.Not())
+    match_bools = [is_equal_csp(model, var, target, f"{prefix} - bools_{i}")
+                   for i, var in enumerate(variables)]
 
     idx_var = index_of_first_bools_csp(model, match_bools)
     return idx_var
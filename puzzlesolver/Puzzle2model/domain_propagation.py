@@ -0,0 +1,234 @@
+from puzzlesolver.Puzzle.ConstraintEnums import ArrowConstraintsE, CageConstraintsE, LineConstraintsE, SimpleGlobalConstraintsE
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.Puzzle.Constraints import ArrowConstraint, CageConstraint, LineConstraint
+from puzzlesolver.Puzzle2model.cage_combinations import cage_combinations
+from puzzlesolver.utils.ParsingUtils import parse_value
+
+# A pass over the puzzle, before the model is built, narrowing the candidates of every cell with the rules that
+# are cheap to propagate in python: givens, sudoku rows/columns/regions (naked and hidden singles), killer cages
+# with a total (their digit combinations), thermometers and arrows (bounds). The candidates of a cell are a
+# bitmask, bit i set if the cell can take min_value + i, and the rules are applied until nothing changes.
+# The cells variables are then created with these domains instead of min_value..max_value.
+# Only constraints whose model is exactly the rule are used (a killer cage is AllDifferent plus its sum, a
+# thermometer is strictly increasing, ...), so the pass never removes a value of a solution.
+
+Coords = tuple[int, int]
+Candidates = dict[Coords, int]
+
+
+def mask_values(mask: int, min_value: int) -> list[int]:
+    values: list[int] = []
+    i = 0
+    while mask:
+        if mask & 1:
+            values.append(min_value + i)
+        mask >>= 1
+        i += 1
+    return values
+
+
+def mask_min(mask: int, min_value: int) -> int:
+    return min_value + (mask & -mask).bit_length() - 1
+
+
+def mask_max(mask: int, min_value: int) -> int:
+    return min_value + mask.bit_length() - 1
+
+
+def values_mask(values: set[int] | list[int], min_value: int, max_value: int) -> int:
+    mask = 0
+    for value in values:
+        if min_value <= value <= max_value:
+            mask |= 1 << (value - min_value)
+    return mask
+
+
+def bounds_mask(lb: int, ub: int, min_value: int, max_value: int) -> int:
+    """The values of min_value..max_value between lb and ub"""
+    lb = max(lb, min_value)
+    ub = min(ub, max_value)
+    if lb > ub:
+        return 0
+    return ((1 << (ub - lb + 1)) - 1) << (lb - min_value)
+
+
+def _coords(cell_coords, candidates: Candidates) -> list[Coords] | None:
+    """The coords of the cells of a constraint, None if one of them has no cell variable"""
+    coords: list[Coords] = []
+    for coord in cell_coords:
+        if not isinstance(coord.r, int) or not isinstance(coord.c, int) or (coord.r, coord.c) not in candidates:
+            return None
+        coords.append((coord.r, coord.c))
+    return coords
+
+
+def _houses(puzzle: Puzzle) -> list[list[Coords]]:
+    grid = puzzle.grid
+    houses = [grid.getRow(i) for i in range(grid.nRows)]
+    houses += [grid.getCol(j) for j in range(grid.nCols)]
+    houses += [grid.getRegionCells(i) for i in grid.getUsedRegions()]
+    return [[(cell.row, cell.col) for cell in house] for house in houses if len(house) > 1]
+
+
+def _killer_cages(puzzle: Puzzle, candidates: Candidates) -> list[tuple[list[Coords], int]]:
+    cages: list[tuple[list[Coords], int]] = []
+    for constraint in puzzle.tool_constraints.get(CageConstraintsE.KILLER_CAGE):
+        if not isinstance(constraint, CageConstraint):
+            continue
+        total = parse_value(constraint.value)
+        coords = _coords(constraint.cells, candidates)
+        if isinstance(total, int) and coords:
+            cages.append((coords, total))
+    return cages
+
+
+def _thermometers(puzzle: Puzzle, candidates: Candidates) -> list[list[Coords]]:
+    thermometers: list[list[Coords]] = []
+    for constraint in puzzle.tool_constraints.get(LineConstraintsE.THERMOMETER):
+        if not isinstance(constraint, LineConstraint):
+            continue
+        coords = _coords(constraint.cells, candidates)
+        if coords is not None and len(coords) > 1:
+            thermometers.append(coords)
+    return thermometers
+
+
+def _arrows(puzzle: Puzzle, candidates: Candidates) -> list[tuple[Coords, list[Coords]]]:
+    """(circle, arrow cells) of the arrows with a single cell circle"""
+    arrows: list[tuple[Coords, list[Coords]]] = []
+    for constraint in puzzle.tool_constraints.get(ArrowConstraintsE.ARROW):
+        if not isinstance(constraint, ArrowConstraint):
+            continue
+        circle = _coords(constraint.cells, candidates)
+        if circle is None or len(circle) != 1:
+            continue
+        for line in constraint.lines:
+            # the first cell of a line is in the circle, like the arrow setter
+            line_coords = [(coord.r, coord.c) for coord in line
+                           if puzzle.grid.getCellFromCoords(coord) is not None]
+            if len(line_coords) > 1 and all(coords in candidates for coords in line_coords):
+                arrows.append((circle[0], line_coords[1:]))
+    return arrows
+
+
+def _propagate_house(candidates: Candidates, house: list[Coords], full_mask: int) -> bool:
+    changed = False
+    # naked singles
+    for coords in house:
+        mask = candidates[coords]
+        if mask & (mask - 1):
+            continue
+        for other in house:
+            if other != coords and candidates[other] & mask:
+                candidates[other] &= ~mask
+                changed = True
+    # hidden singles, only when the house has a cell per value
+    if len(house) != full_mask.bit_length():
+        return changed
+    bit = 1
+    while bit <= full_mask:
+        cells = [coords for coords in house if candidates[coords] & bit]
+        if len(cells) == 1 and candidates[cells[0]] != bit:
+            candidates[cells[0]] = bit
+            changed = True
+        bit <<= 1
+    return changed
+
+
+def _propagate_cage(candidates: Candidates, cage: list[Coords], total: int, min_value: int,
+                    max_value: int) -> bool:
+    union = 0
+    for coords in cage:
+        union |= candidates[coords]
+    combinations = cage_combinations(len(cage), total, tuple(mask_values(union, min_value)))
+    if combinations is None:
+        return False
+    # the sets with a candidate in every cell
+    digits: set[int] = set()
+    for combination in combinations:
+        combination_mask = values_mask(combination, min_value, max_value)
+        if all(candidates[coords] & combination_mask for coords in cage):
+            digits.update(combination)
+    return _restrict(candidates, cage, values_mask(digits, min_value, max_value))
+
+
+def _propagate_thermometer(candidates: Candidates, thermometer: list[Coords], min_value: int,
+                           max_value: int) -> bool:
+    changed = False
+    for previous, coords in zip(thermometer, thermometer[1:]):
+        if candidates[previous]:
+            lb = mask_min(candidates[previous], min_value) + 1
+            changed |= _restrict(candidates, [coords], bounds_mask(lb, max_value, min_value, max_value))
+    for coords, following in zip(reversed(thermometer[:-1]), reversed(thermometer[1:])):
+        if candidates[following]:
+            ub = mask_max(candidates[following], min_value) - 1
+            changed |= _restrict(candidates, [coords], bounds_mask(min_value, ub, min_value, max_value))
+    return changed
+
+
+def _propagate_arrow(candidates: Candidates, circle: Coords, arrow: list[Coords], min_value: int,
+                     max_value: int) -> bool:
+    if not all(candidates[coords] for coords in [circle, *arrow]):
+        return False
+    mins = [mask_min(candidates[coords], min_value) for coords in arrow]
+    maxs = [mask_max(candidates[coords], min_value) for coords in arrow]
+    changed = _restrict(candidates, [circle], bounds_mask(sum(mins), sum(maxs), min_value, max_value))
+    if not candidates[circle]:
+        return True
+    circle_min = mask_min(candidates[circle], min_value)
+    circle_max = mask_max(candidates[circle], min_value)
+    for j, coords in enumerate(arrow):
+        lb = circle_min - (sum(maxs) - maxs[j])
+        ub = circle_max - (sum(mins) - mins[j])
+        changed |= _restrict(candidates, [coords], bounds_mask(lb, ub, min_value, max_value))
+    return changed
+
+
+def _restrict(candidates: Candidates, cells: list[Coords], mask: int) -> bool:
+    changed = False
+    for coords in cells:
+        if candidates[coords] & ~mask:
+            candidates[coords] &= mask
+            changed = True
+    return changed
+
+
+def propagate_cell_domains(puzzle: Puzzle, min_value: int, max_value: int) -> dict[Coords, list[int]] | None:
+    """
+    The candidates of every cell of the grid, a subset of min_value..max_value, after propagating the givens,
+    the sudoku rules, killer cages, thermometers and arrows. None if a cell has no candidates left (the model
+    is infeasible, the solver proves it with the full domains).
+    """
+    grid = puzzle.grid
+    full_mask = bounds_mask(min_value, max_value, min_value, max_value)
+    candidates: Candidates = {(cell.row, cell.col): full_mask for cell in grid.getAllCells()}
+
+    for cell in grid.getAllCells():
+        if cell.value is not None:
+            candidates[(cell.row, cell.col)] &= values_mask([cell.value], min_value, max_value)
+
+    # empty cells can repeat, only the givens are used
+    unknown_empty_cells = puzzle.bool_constraints.get(SimpleGlobalConstraintsE.UNKNOWN_EMPTY_CELLS, False)
+    sudoku_rules_apply = not puzzle.bool_constraints.get(
+        SimpleGlobalConstraintsE.NORMAL_SUDOKU_RULES_DO_NOT_APPLY, False)
+    if not unknown_empty_cells:
+        houses = _houses(puzzle) if sudoku_rules_apply else []
+        cages = _killer_cages(puzzle, candidates)
+        thermometers = _thermometers(puzzle, candidates)
+        arrows = _arrows(puzzle, candidates)
+
+        changed = True
+        while changed and all(candidates.values()):
+            changed = False
+            for house in houses:
+                changed |= _propagate_house(candidates, house, full_mask)
+            for cage, total in cages:
+                changed |= _propagate_cage(candidates, cage, total, min_value, max_value)
+            for thermometer in thermometers:
+                changed |= _propagate_thermometer(candidates, thermometer, min_value, max_value)
+            for circle, arrow in arrows:
+                changed |= _propagate_arrow(candidates, circle, arrow, min_value, max_value)
+
+    if not all(candidates.values()):
+        return None
+    return {coords: mask_values(mask, min_value) for coords, mask in candidates.items()}
@@ -1,19 +1,29 @@
+import time
+
 from puzzlesolver.Puzzle.ConstraintEnums import SimpleGlobalConstraintsE
 from puzzlesolver.Puzzle.Puzzle import Puzzle
 from puzzlesolver.Puzzle2model.BoolConstraints.SimpleBoolConstraints2csp import set_permitted_digits_constraints, set_sudoku_constraints, set_sudoku_constraints_with_unknown_empty_cells_constraints
 from puzzlesolver.Puzzle2model.BoolConstraints.boolConstraints2csp import set_bool_constraints
 from puzzlesolver.Puzzle2model.OtherConstraints.UnknownEmptyCellsConstraints2csp import get_or_set_unknown_empty_cells_constraint
+from puzzlesolver.Puzzle2model.BuildProfiler import BuildProfiler
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.connectivity_csp import DEFAULT_CONNECTIVITY_ENCODING, ConnectivityEncoding
+from puzzlesolver.Puzzle2model.domain_propagation import propagate_cell_domains
 from puzzlesolver.Puzzle2model.constraintTools2csp import set_tool_constraints
 from puzzlesolver.Puzzle2model.puzzle_csp_utils import cell2var, \
     int_vars_grid_dict_from_puzzle_grid
 from puzzlesolver.Puzzle2model.puzzle_model_types import GridVars
 
 MAX_SOLS = 20
+PROPAGATE_DOMAINS = True
 
 
-def puzzle2model(puzzle: Puzzle) -> PuzzleModel:
-    puzzle_model: PuzzleModel = PuzzleModel()
+def puzzle2model(puzzle: Puzzle,
+                 connectivity_encoding: ConnectivityEncoding = DEFAULT_CONNECTIVITY_ENCODING,
+                 build_profiler: BuildProfiler | None = None,
+                 propagate_domains: bool = PROPAGATE_DOMAINS) -> PuzzleModel:
+    puzzle_model: PuzzleModel = PuzzleModel(
+        connectivity_encoding, build_profiler)
     grid = puzzle.grid
     min_valid = min(puzzle.valid_digits)
     max_valid = max(puzzle.valid_digits)
@@ -28,26 +38,36 @@ def puzzle2model(puzzle: Puzzle) -> PuzzleModel:
 
     grid_vars_dict = puzzle_model.grid_vars_dict
 
-    cells_grid_vars: GridVars = int_vars_grid_dict_from_puzzle_grid(
-        puzzle_model, grid, min_cell_value, max_valid, "")
-    grid_vars_dict['cells_grid_vars'] = cells_grid_vars
+    cell_domains = None
+    if propagate_domains:
+        with puzzle_model.profile_section('domain_propagation'):
+            propagation_start = time.perf_counter()
+            cell_domains = propagate_cell_domains(puzzle, min_cell_value, max_valid)
+            puzzle_model.propagation_time = time.perf_counter() - propagation_start
+
+    with puzzle_model.profile_section('cells_grid_vars'):
+        cells_grid_vars: GridVars = int_vars_grid_dict_from_puzzle_grid(
+            puzzle_model, grid, min_cell_value, max_valid, "", cell_domains)
+        grid_vars_dict['cells_grid_vars'] = cells_grid_vars
 
     if unknown_empty_cells:
-        get_or_set_unknown_empty_cells_constraint(puzzle_model, puzzle)
+        with puzzle_model.profile_section('get_or_set_unknown_empty_cells_constraint'):
+            get_or_set_unknown_empty_cells_constraint(puzzle_model, puzzle)
 
     if sudoku_rules_apply and not unknown_empty_cells:
-        set_sudoku_constraints(puzzle_model, puzzle)
+        puzzle_model.run_setter(set_sudoku_constraints, puzzle)
     elif sudoku_rules_apply and unknown_empty_cells:
-        set_sudoku_constraints_with_unknown_empty_cells_constraints(
-            puzzle_model, puzzle)
+        puzzle_model.run_setter(
+            set_sudoku_constraints_with_unknown_empty_cells_constraints, puzzle)
     elif len(set(puzzle.valid_digits)) != len(puzzle.valid_digits) and not unknown_empty_cells:
-        set_permitted_digits_constraints(puzzle_model, puzzle)
+        puzzle_model.run_setter(set_permitted_digits_constraints, puzzle)
 
     # initial values
-    for cell in all_cells:
-        if cell.value is not None:
-            cell_var = cell2var(cells_grid_vars, cell)
-            puzzle_model.Add(cell_var == cell.value)
+    with puzzle_model.profile_section('initial_values'):
+        for cell in all_cells:
+            if cell.value is not None:
+                cell_var = cell2var(cells_grid_vars, cell)
+                puzzle_model.Add(cell_var == cell.value)
 
     set_bool_constraints(puzzle_model, puzzle)
     set_tool_constraints(puzzle_model, puzzle)
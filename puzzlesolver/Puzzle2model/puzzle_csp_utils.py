@@ -11,8 +11,9 @@ from puzzlesolver.Puzzle.Grid import Grid
 
 from puzzlesolver.Puzzle.Puzzle import Puzzle
 from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.connectivity_csp import DEFAULT_CONNECTIVITY_ENCODING, ConnectivityEncoding, tree_connected_region_adjacency_vars_csp, tree_connected_region_csp
 from puzzlesolver.Puzzle2model.puzzle_model_types import AdjacencyDict, AdjacencyVarsDict, GridVars
-from puzzlesolver.Puzzle2model.custom_constraints import are_all_equal_csp, are_all_true_csp, are_any_true_csp, count_vars, only_first_of_bools, expand
+from puzzlesolver.Puzzle2model.custom_constraints import are_all_equal_csp, are_all_true_csp, are_any_true_csp, count_vars, is_equal_csp, only_first_of_bools, expand
 
 PRIME_LIST = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97, 101, 103,
               107, 109, 113, 127, 131, 137, 139, 149, 151, 157, 163, 167, 173, 179, 181, 191, 193, 197, 199, 211, 223,
@@ -182,7 +183,8 @@ def bool_vars_grid_dict_from_puzzle_grid(model: cp_model.CpModel,
 
 
 def int_vars_grid_dict_from_puzzle_grid(model: cp_model.CpModel, grid: Grid, lb: int, ub: int,
-                                        prefix: str) -> GridVars:
+                                        prefix: str,
+                                        domains: dict[tuple[int, int], list[int]] | None = None) -> GridVars:
     """Creates a dictionary of IntVar with for every cell in the puzzle grid, with keys (cell.row, cell.col)
 
     Args:
@@ -191,6 +193,8 @@ def int_vars_grid_dict_from_puzzle_grid(model: cp_model.CpModel, grid: Grid, lb:
         lb (int): 
         ub (int): 
         prefix (str): 
+        domains (dict[tuple[int, int], list[int]] | None, optional): Defaults to None. The values of each
+            cell, replacing lb..ub
 
     Returns:
         GridVars: 
@@ -199,8 +203,12 @@ def int_vars_grid_dict_from_puzzle_grid(model: cp_model.CpModel, grid: Grid, lb:
     all_cells = grid.getAllCells()
     prefix = f"{prefix} - " if len(prefix) else ""
     for cell in all_cells:
-        grid_dict[(cell.row, cell.col)] = model.NewIntVar(
-            lb, ub, f"{prefix}{cell.format_cell()}")
+        name = f"{prefix}{cell.format_cell()}"
+        if domains is not None:
+            grid_dict[(cell.row, cell.col)] = model.NewIntVarFromDomain(
+                cp_model.Domain.FromValues(domains[(cell.row, cell.col)]), name)
+        else:
+            grid_dict[(cell.row, cell.col)] = model.NewIntVar(lb, ub, name)
 
     return grid_dict
 
@@ -241,9 +249,9 @@ def exactly_n_per_row_col_region(model: cp_model.CpModel, grid: Grid, bools_grid
 
 def one_of_each_digit(model: cp_model.CpModel, valid_digits: List[int], int_vars_list: List[IntVar], prefix: str):
     for value in valid_digits:
-        digit_count = count_vars(model, int_vars_list,
-                                 value, f"{prefix} - count_(digit={value})")
-        model.Add(digit_count == 1)
+        digit_bools = [is_equal_csp(model, var, value, f"{prefix} - (digit={value}, var={i})")
+                       for i, var in enumerate(int_vars_list)]
+        model.AddExactlyOne(digit_bools)
 
 
 def get_masked_vars_grid_dict(model: cp_model.CpModel, valid_digits: List[int], grid: Grid,
@@ -339,8 +347,8 @@ def _set_marked_cells_constraint(model: PuzzleModel,
         first_cell_var = cells_vars[0]
         for i, cell in enumerate(cells, 1):
             marked_cell_var = cell2var(marked_cells_bools_grid, cell)
-            model.Add(first_cell_var == i).OnlyEnforceIf(marked_cell_var)
-            model.Add(first_cell_var != i).OnlyEnforceIf(marked_cell_var.Not())
+            model.Add(marked_cell_var == is_equal_csp(
+                model, first_cell_var, i, f"{prefix} - first_cell_var == {i}"))
 
     for col in range(n_cols):
         cells = grid.getCol(col)
@@ -348,8 +356,8 @@ def _set_marked_cells_constraint(model: PuzzleModel,
         first_cell_var = cells_vars[0]
         for i, cell in enumerate(cells, 1):
             marked_cell_var = cell2var(marked_cells_bools_grid, cell)
-            model.Add(first_cell_var == i).OnlyEnforceIf(marked_cell_var)
-            model.Add(first_cell_var != i).OnlyEnforceIf(marked_cell_var.Not())
+            model.Add(marked_cell_var == is_equal_csp(
+                model, first_cell_var, i, f"{prefix} - first_cell_var == {i}"))
 
     for region in grid.getUsedRegions():
         cells = grid.getRegionCells(region)
@@ -357,8 +365,8 @@ def _set_marked_cells_constraint(model: PuzzleModel,
         first_cell_var = cells_vars[0]
         for i, cell in enumerate(cells, 1):
             marked_cell_var = cell2var(marked_cells_bools_grid, cell)
-            model.Add(first_cell_var == i).OnlyEnforceIf(marked_cell_var)
-            model.Add(first_cell_var != i).OnlyEnforceIf(marked_cell_var.Not())
+            model.Add(marked_cell_var == is_equal_csp(
+                model, first_cell_var, i, f"{prefix} - first_cell_var == {i}"))
 
     grid_vars_dict["marked_digits_grid"] = marked_digits_grid
     grid_vars_dict["marked_cells_bools_grid"] = marked_cells_bools_grid
@@ -381,12 +389,41 @@ def get_or_set_marked_cells_constraint(model: PuzzleModel, puzzle: Puzzle):
 # -------------------------------------------------------------------------------------------------------------------- #
 # region Orthogonally Connected Regions ------------------------------------------------------------------------------ #
 
+def get_connectivity_encoding(model: cp_model.CpModel) -> ConnectivityEncoding:
+    if isinstance(model, PuzzleModel):
+        return model.connectivity_encoding
+    return DEFAULT_CONNECTIVITY_ENCODING
+
+
 def orthogonally_connected_region_csp(model: cp_model.CpModel, adjacency_dict: AdjacencyDict,
                                       region_vars_dict: GridVars, region_max_size: int,
                                       seed: list[tuple[int, int]] | None = None):
     """
     Given a grid of bool vars (region), and an adjacency dictionary,
     all the 1's in the grid must be orthogonally connected.
+    The encoding is chosen by the model connectivity_encoding ('floodfill' for plain CpModels).
+
+    :param model:
+    :param adjacency_dict:
+    :param region_vars_dict:
+    :param region_max_size:
+    :param seed:
+    :return:
+    """
+    if get_connectivity_encoding(model) == 'floodfill':
+        floodfill_connected_region_csp(
+            model, adjacency_dict, region_vars_dict, region_max_size, seed)
+    else:
+        tree_connected_region_csp(
+            model, adjacency_dict, region_vars_dict, region_max_size, seed)
+
+
+def floodfill_connected_region_csp(model: cp_model.CpModel, adjacency_dict: AdjacencyDict,
+                                   region_vars_dict: GridVars, region_max_size: int,
+                                   seed: list[tuple[int, int]] | None = None):
+    """
+    Given a grid of bool vars (region), and an adjacency dictionary,
+    all the 1's in the grid must be orthogonally connected (layered floodfill encoding).
 
     :param model:
     :param adjacency_dict:
@@ -526,6 +563,29 @@ def orthogonally_connected_region_adjacency_vars_csp(model: cp_model.CpModel, ad
     """
     Given a grid of bool vars (region), and an adjacency variables dictionary,
     all the 1's in the grid must be orthogonally connected.
+    The encoding is chosen by the model connectivity_encoding ('floodfill' for plain CpModels).
+
+    :param model:
+    :param adjacency_dict:
+    :param region_vars_dict:
+    :param region_max_size:
+    :param seed:
+    :return:
+    """
+    if get_connectivity_encoding(model) == 'floodfill':
+        floodfill_connected_region_adjacency_vars_csp(
+            model, adjacency_dict, region_vars_dict, region_max_size, seed)
+    else:
+        tree_connected_region_adjacency_vars_csp(
+            model, adjacency_dict, region_vars_dict, region_max_size, seed)
+
+
+def floodfill_connected_region_adjacency_vars_csp(model: cp_model.CpModel, adjacency_dict: AdjacencyVarsDict,
+                                                  region_vars_dict: GridVars, region_max_size: int,
+                                                  seed: list[tuple[int, int]] | None = None):
+    """
+    Given a grid of bool vars (region), and an adjacency variables dictionary,
+    all the 1's in the grid must be orthogonally connected (layered floodfill encoding).
 
     :param model:
     :param adjacency_dict:
@@ -0,0 +1,142 @@
+from functools import lru_cache
+from itertools import product
+from typing import Callable, Literal
+
+from ortools.sat.python import cp_model
+from ortools.sat.python.cp_model import IntVar
+
+from puzzlesolver.Puzzle2model.DigitIndicatorModel import domain_size, domain_values
+
+# Predicates over a few cells (dots, small line pairs) compiled to tables of allowed tuples. The tables are
+# enumerated in python once per (predicate, params, domains) and added with AddAllowedAssignments, which
+# propagates every value of every domain instead of the bounds of several reified linear constraints.
+#   'ratio': (a, b, r), one is r times the other
+#   'distance': (a, b, d), |a - b| == d
+#   'consecutive': (a, b), |a - b| == 1
+#   'factors': (a, b), one divides the other
+#   'modulo': (a, b, m), the bigger one modulo the smaller one is m
+#   'product': (a, b, p), a * b == p
+#   'sum_in': (a, b), a + b is one of the params
+TablePredicate = Literal['ratio', 'distance', 'consecutive', 'factors', 'modulo', 'product', 'sum_in']
+
+# tables larger than this (product of the domain sizes) are not built, the callers fall back to their
+# linear encodings
+MAX_TABLE_SIZE = 4096
+
+# memoized tables, bounded since the keys (the propagated cell domains) vary without limit over the puzzles of a
+# long-lived solver process
+TABLE_CACHE_SIZE = 4096
+
+
+def _ratio(a: int, b: int, r: int) -> bool:
+    return r * a == b or r * b == a
+
+
+def _distance(a: int, b: int, d: int) -> bool:
+    return abs(a - b) == d
+
+
+def _consecutive(a: int, b: int) -> bool:
+    return abs(a - b) == 1
+
+
+def _factors(a: int, b: int) -> bool:
+    return (b != 0 and a % b == 0) or (a != 0 and b % a == 0)
+
+
+def _modulo(a: int, b: int, m: int) -> bool:
+    # same order as the edge modulo constraint: a < b -> b % a, otherwise a % b
+    divisor, dividend = (a, b) if a < b else (b, a)
+    return divisor != 0 and dividend % divisor == m
+
+
+def _product(a: int, b: int, p: int) -> bool:
+    return a * b == p
+
+
+def _sum_in(a: int, b: int, *values: int) -> bool:
+    return a + b in values
+
+
+TABLE_PREDICATES: dict[TablePredicate, Callable[..., bool]] = {
+    'ratio': _ratio,
+    'distance': _distance,
+    'consecutive': _consecutive,
+    'factors': _factors,
+    'modulo': _modulo,
+    'product': _product,
+    'sum_in': _sum_in,
+}
+
+Term = int | IntVar
+
+
+def term_values(term: Term) -> tuple[int, ...]:
+    if isinstance(term, IntVar):
+        return tuple(domain_values(term))
+    return (term,)
+
+
+def table_size(terms: list[Term]) -> int:
+    """Product of the domain sizes, without enumerating the domains"""
+    size = 1
+    for term in terms:
+        size *= domain_size(term) if isinstance(term, IntVar) else 1
+    return size
+
+
+def fits_table(terms: list[Term]) -> bool:
+    """The table of terms has at most MAX_TABLE_SIZE rows (the reified table has twice as many)"""
+    return table_size(terms) <= MAX_TABLE_SIZE
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def allowed_tuples(predicate: TablePredicate, params: tuple[int, ...], domains: tuple[tuple[int, ...], ...],
+                   reified: bool = False) -> tuple[tuple[int, ...], ...]:
+    """
+    Tuples of values of the domains satisfying the predicate (followed by params). If reified, every tuple of
+    values is allowed and the truth value of the predicate (0 or 1) is appended to it.
+    The TABLE_CACHE_SIZE most recent tables are memoized for the whole process, models of the same puzzle family
+    share them.
+    """
+    check = TABLE_PREDICATES[predicate]
+    if reified:
+        return tuple((*values, int(check(*values, *params))) for values in product(*domains))
+    return tuple(values for values in product(*domains) if check(*values, *params))
+
+
+def _table(terms: list[Term], predicate: TablePredicate, params: tuple[int, ...],
+           reified: bool) -> tuple[list[IntVar], list[tuple[int, ...]]]:
+    """The variables of terms and the allowed tuples, without the columns of the constant terms"""
+    domains = tuple(term_values(term) for term in terms)
+    tuples = allowed_tuples(predicate, params, domains, reified)
+    columns = [i for i, term in enumerate(terms) if isinstance(term, IntVar)]
+    variables: list[IntVar] = [terms[i] for i in columns]  # type: ignore
+    n_terms = len(terms)
+    return variables, [tuple(row[i] for i in columns) + row[n_terms:] for row in tuples]
+
+
+def add_table_constraint(model: cp_model.CpModel, terms: list[Term], predicate: TablePredicate,
+                         params: tuple[int, ...] = ()):
+    """
+    Enforces predicate(*terms, *params) with a table of allowed assignments.
+    """
+    variables, tuples = _table(terms, predicate, params, False)
+    if not variables:
+        if not tuples:
+            model.AddBoolOr([])
+        return
+    model.AddAllowedAssignments(variables, tuples)
+
+
+def table_bool_csp(model: cp_model.CpModel, terms: list[Term], predicate: TablePredicate,
+                   params: tuple[int, ...], prefix: str) -> IntVar:
+    """
+    Returns a bool var equal to predicate(*terms, *params), with a table over the variables and the bool var.
+    """
+    prefix = f"{prefix} - table_bool_csp"
+
+    table_bool = model.NewBoolVar(f"{prefix} - {predicate}")
+    variables, tuples = _table(terms, predicate, params, True)
+    model.AddAllowedAssignments([*variables, table_bool], tuples)
+    return table_bool
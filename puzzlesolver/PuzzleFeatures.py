@@ -0,0 +1,137 @@
+import json
+import os
+from typing import Any
+
+from puzzlesolver.Puzzle.ConstraintEnums import ArrowConstraintsE, BoolToolEnum, CageConstraintsE, CosmeticToolsE, GlobalRegionConstraintsE, LineConstraintsE, ToolEnum, ValueModifierConstraintsE
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+
+PROFILE_TABLE_VERSION = 1
+DEFAULT_PROFILE_TABLE = './psolver_profiles.json'
+DEFAULT_PROFILE_NAME = 'default'  # table entry for the cp-sat defaults (no profile)
+
+# puzzle categories, in priority order: the first one matching a puzzle is its category
+# 'regions': unknown regions, loops, yin yang, ... (connectivity heavy models)
+# 'value-modifiers': doublers, negators, vampires, ... (cell values differ from digits)
+# 'cages': killer cages and other cages
+# 'lines': lines and arrows
+# 'classic': everything else (givens, single cell, edge and global rules)
+CATEGORIES = ('regions', 'value-modifiers', 'cages', 'lines', 'classic')
+
+
+class PuzzleFeatures:
+    """
+    Features of a parsed puzzle used to pick solver parameters: grid size, the kinds of local constraints,
+    the active bool constraints, and the category and family (category and grid size) derived from them.
+    """
+    n_rows: int
+    n_cols: int
+    n_digits: int
+    tool_constraints: frozenset[str]  # non cosmetic tool constraint kinds with at least one constraint
+    bool_constraints: frozenset[str]  # active bool constraints
+    n_local_constraints: int
+    category: str
+    family: str
+
+    def __init__(self, n_rows: int, n_cols: int, n_digits: int, tool_keys: set[ToolEnum],
+                 bool_keys: set[BoolToolEnum], n_local_constraints: int) -> None:
+        self.n_rows = n_rows
+        self.n_cols = n_cols
+        self.n_digits = n_digits
+        self.tool_constraints = frozenset(key.value for key in tool_keys)
+        self.bool_constraints = frozenset(key.value for key in bool_keys)
+        self.n_local_constraints = n_local_constraints
+        self.category = puzzle_category(tool_keys, bool_keys)
+        self.family = f"{self.category}-{n_rows}x{n_cols}"
+
+    @staticmethod
+    def from_puzzle(puzzle: Puzzle) -> 'PuzzleFeatures':
+        tool_keys = {key for key, constraint_list in puzzle.tool_constraints.items()
+                     if constraint_list and not isinstance(key, CosmeticToolsE)}
+        bool_keys = {key for key, value in puzzle.bool_constraints.items() if value}
+        n_local_constraints = sum(len(puzzle.tool_constraints.get(key)) for key in tool_keys)
+        return PuzzleFeatures(puzzle.grid.nRows, puzzle.grid.nCols, len(puzzle.valid_digits), tool_keys, bool_keys,
+                              n_local_constraints)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'nRows': self.n_rows,
+            'nCols': self.n_cols,
+            'n_digits': self.n_digits,
+            'tool_constraints': sorted(self.tool_constraints),
+            'bool_constraints': sorted(self.bool_constraints),
+            'n_local_constraints': self.n_local_constraints,
+            'category': self.category,
+            'family': self.family,
+        }
+
+
+def puzzle_category(tool_keys: set[ToolEnum], bool_keys: set[BoolToolEnum]) -> str:
+    if any(isinstance(key, GlobalRegionConstraintsE) for key in bool_keys):
+        return 'regions'
+    if any(isinstance(key, ValueModifierConstraintsE) for key in bool_keys):
+        return 'value-modifiers'
+    if any(isinstance(key, CageConstraintsE) for key in tool_keys):
+        return 'cages'
+    if any(isinstance(key, (LineConstraintsE, ArrowConstraintsE)) for key in tool_keys):
+        return 'lines'
+    return 'classic'
+
+
+class ProfileTable:
+    """
+    Solver profile of each puzzle family and category, as written by `psolver calibrate`. A puzzle gets the
+    profile of its family (category and grid size), else the profile of its category, else no profile.
+
+    Args:
+        profiles (dict[str, str]): family or category -> profile name (DEFAULT_PROFILE_NAME for cp-sat defaults).
+        calibration (dict[str, Any] | None, optional): Defaults to None. Calibration settings and timings,
+            kept in the file for reference.
+    """
+    profiles: dict[str, str]
+    calibration: dict[str, Any]
+
+    def __init__(self, profiles: dict[str, str], calibration: dict[str, Any] | None = None) -> None:
+        self.profiles = profiles
+        self.calibration = calibration or {}
+
+    def select(self, features: PuzzleFeatures) -> str | None:
+        """The profile name of a puzzle, None for the cp-sat defaults"""
+        profile = self.profiles.get(features.family, self.profiles.get(features.category))
+        if profile is None or profile == DEFAULT_PROFILE_NAME:
+            return None
+        return profile
+
+    def to_dict(self) -> dict[str, Any]:
+        return {'version': PROFILE_TABLE_VERSION, 'profiles': self.profiles, 'calibration': self.calibration}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'ProfileTable':
+        if data.get('version') != PROFILE_TABLE_VERSION:
+            raise ValueError(f"Unsupported profile table version {data.get('version')}")
+        return ProfileTable(dict(data['profiles']), data.get('calibration'))
+
+    def save(self, filepath: str):
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filepath, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+            file.write('\n')
+
+    @classmethod
+    def load(cls, filepath: str) -> 'ProfileTable':
+        with open(filepath) as file:
+            return cls.from_dict(json.load(file))
+
+
+_loaded_tables: dict[str, tuple[float, ProfileTable]] = dict()
+
+
+def load_profile_table(filepath: str) -> ProfileTable:
+    """ProfileTable.load, kept in memory until the file changes"""
+    mtime = os.path.getmtime(filepath)
+    loaded = _loaded_tables.get(filepath)
+    if loaded is None or loaded[0] != mtime:
+        loaded = (mtime, ProfileTable.load(filepath))
+        _loaded_tables[filepath] = loaded
+    return loaded[1]
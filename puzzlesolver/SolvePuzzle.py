@@ -1,38 +1,259 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import contextlib
+import copy
+import io
+import json
 import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, Literal, Protocol
 
+from google.protobuf import text_format
+from ortools.sat import sat_parameters_pb2
 from ortools.sat.python import cp_model
 import argparse
 
-from puzzlesolver.Puzzle.Puzzle import Puzzle
-from puzzlesolver.Puzzle2model.PuzzleSolutionPrinter import PuzzleSolutionPrinter, SolutionPrinterOptions, puzzle_print_statistics
+from puzzlesolver.BitmaskSolver import AUTO_MAX_BRANCHES, BACKENDS, DEFAULT_BACKEND, Backend, BitmaskPuzzle, BitmaskSearch, bitmask_supported
+from puzzlesolver.ModelCache import DEFAULT_MODEL_CACHE_DIR, DEFAULT_MODEL_CACHE_SIZE, ModelCache, model_cache_key
+from puzzlesolver.Puzzle.Puzzle import Puzzle, PuzzleMeta
+from puzzlesolver.Puzzle2model.BuildProfiler import BUILD_PROFILE_FORMATS, BuildProfileFormat, BuildProfiler
+from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.PuzzleSolutionPrinter import PuzzleSolutionPrinter, SolutionPrinterOptions, get_grid_str, puzzle_print_statistics
+from puzzlesolver.Puzzle2model.SolutionLogWriter import SolutionLogWriter
+from puzzlesolver.Puzzle2model.connectivity_csp import CONNECTIVITY_ENCODINGS, DEFAULT_CONNECTIVITY_ENCODING, ConnectivityEncoding
+from puzzlesolver.Puzzle2model.custom_constraints import forbid_assignment_csp
 from puzzlesolver.Puzzle2model.puzzle2model import puzzle2model
+from puzzlesolver.PuzzleFeatures import DEFAULT_PROFILE_TABLE, PuzzleFeatures, load_profile_table
+from puzzlesolver.SolverLog import PhaseTimes, print_phase_times
+from puzzlesolver.SolveResultCache import DEFAULT_CACHE_DIR, DEFAULT_CACHE_SIZE, CachedSolutionPrinter, CachedSolveResult, CachedSolver, EXHAUSTED_STATUSES, SolveResultCache, result_cache_key
+from puzzlesolver.utils.fileUtils import loadJSON
 
 MAX_TIME = 240
 MAX_SOLS = 20
 LOG_SOLUTIONS = False
+NUM_WORKERS = 0
+CANCEL_POLL_INTERVAL = 0.05  # seconds
+
+# 0: no presolve, 1: a single presolve pass without probing, 2: cp-sat's full presolve
+PRESOLVE_LEVELS = (0, 1, 2)
 
 
 class SolverOptions:
     max_time: int  # time in seconds
     max_sols: int
     log_solutions: bool
+    num_workers: int  # cp-sat workers, 0 lets cp-sat decide
+    connectivity_encoding: ConnectivityEncoding
+    profile_build: BuildProfileFormat | None  # print a per-setter build profile
+    max_stored_solutions: int | None  # full solution grids kept in memory, None keeps all
+    quiet: bool  # print the solutions after the search instead of in the solution callback
+    async_log: bool  # log solutions to one file per puzzle from a background thread
+    cache_dir: str | None  # on-disk solve result cache, None disables it
+    cache_size: int  # bytes
+    model_cache_dir: str | None  # on-disk built model cache, None disables it
+    model_cache_size: int  # bytes
+    # cp-sat search parameters, None keeps the cp-sat default
+    presolve_level: int | None
+    random_seed: int | None
+    symmetry_level: int | None
+    linearization_level: int | None
+    sat_params: dict[str, str]  # any other SatParameters field, as text format values
+    profile_table: str | None  # pick a profile per puzzle from this ProfileTable file, None disables it
+    time_presolve: bool  # time presolve from the cp-sat search log
+    backend: Backend  # 'auto' sends the puzzles supported by the bitmask backend to it
 
     def __init__(self, max_time: int = MAX_TIME, max_sols: int = MAX_SOLS,
-                 log_solutions: bool = LOG_SOLUTIONS) -> None:
+                 log_solutions: bool = LOG_SOLUTIONS, num_workers: int = NUM_WORKERS,
+                 connectivity_encoding: ConnectivityEncoding = DEFAULT_CONNECTIVITY_ENCODING,
+                 profile_build: BuildProfileFormat | None = None,
+                 max_stored_solutions: int | None = None, quiet: bool = False,
+                 async_log: bool = False, cache_dir: str | None = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE, model_cache_dir: str | None = None,
+                 presolve_level: int | None = None, random_seed: int | None = None,
+                 symmetry_level: int | None = None, linearization_level: int | None = None,
+                 sat_params: dict[str, str] | None = None, profile_table: str | None = None,
+                 time_presolve: bool = True, backend: Backend = DEFAULT_BACKEND,
+                 model_cache_size: int = DEFAULT_MODEL_CACHE_SIZE) -> None:
         """
 
         Args:
             max_time (int, optional): Defaults to MAX_TIME = 240.
             max_sols (int, optional): Defaults to MAX_SOLS = 20.
             log_solutions (bool, optional): Defaults to LOG_SOLUTIONS = False.
+            num_workers (int, optional): Defaults to NUM_WORKERS = 0 (cp-sat default).
+            connectivity_encoding (ConnectivityEncoding, optional): Defaults to DEFAULT_CONNECTIVITY_ENCODING = 'floodfill'.
+            profile_build (BuildProfileFormat | None, optional): Defaults to None (no profiling).
+            max_stored_solutions (int | None, optional): Defaults to None (every unique solution is stored).
+                Unique solutions are still counted past this limit.
+            quiet (bool, optional): Defaults to False. The solution callback only reads the cells grid,
+                the solutions are printed after the search and auxiliary grids are not printed.
+            async_log (bool, optional): Defaults to False. With log_solutions, the solutions of a puzzle are
+                appended to ./Logs/<puzzle>.sol by a background writer thread instead of one file per solution.
+            cache_dir (str | None, optional): Defaults to None (no cache). Folder of the solve result cache.
+                Puzzles already solved (same canonical puzzle hash) are not solved again.
+            cache_size (int, optional): Defaults to DEFAULT_CACHE_SIZE = 64 MiB. Least recently used results
+                are evicted over this size.
+            model_cache_dir (str | None, optional): Defaults to None (no cache). Folder of the built model
+                cache. Models are loaded from it instead of running puzzle2model, unless profile_build is set.
+            model_cache_size (int, optional): Defaults to DEFAULT_MODEL_CACHE_SIZE = 256 MiB. Least recently
+                used models are evicted over this size.
+            presolve_level (int | None, optional): Defaults to None (cp-sat default). One of PRESOLVE_LEVELS.
+            random_seed (int | None, optional): Defaults to None (cp-sat default).
+            symmetry_level (int | None, optional): Defaults to None (cp-sat default). 0 to 4.
+            linearization_level (int | None, optional): Defaults to None (cp-sat default). 0 to 2.
+            sat_params (dict[str, str] | None, optional): Defaults to None. Other SatParameters fields, applied
+                last, e.g. {'search_branching': 'FIXED_SEARCH'}.
+            profile_table (str | None, optional): Defaults to None. A ProfileTable file (psolver calibrate).
+                Each puzzle gets the profile of its family, which only sets the parameters that are still unset.
+            time_presolve (bool, optional): Defaults to True. Sends the cp-sat search log to a callback to time
+                presolve. The log has a line per solution, which slows down long enumerations a little.
+            backend (Backend, optional): Defaults to DEFAULT_BACKEND = 'auto'. 'cp-sat' always builds the model.
+                'bitmask' solves the puzzle with the backtracking search of BitmaskSolver, which only supports
+                sudoku rules, givens, antiknight, antiking, diagonals and disjoint groups. 'auto' uses the
+                bitmask backend for the puzzles it supports, unless solutions are logged, the build is
+                profiled or a hint is given, and falls back to cp-sat when the search takes more than
+                BitmaskSolver.AUTO_MAX_BRANCHES branches.
         """
         self.max_time = max_time
         self.max_sols = max_sols
         self.log_solutions = log_solutions
+        self.num_workers = num_workers
+        self.connectivity_encoding = connectivity_encoding
+        self.profile_build = profile_build
+        self.max_stored_solutions = max_stored_solutions
+        self.quiet = quiet
+        self.async_log = async_log
+        self.cache_dir = cache_dir
+        self.cache_size = cache_size
+        self.model_cache_dir = model_cache_dir
+        self.model_cache_size = model_cache_size
+        self.presolve_level = presolve_level
+        self.random_seed = random_seed
+        self.symmetry_level = symmetry_level
+        self.linearization_level = linearization_level
+        self.sat_params = dict(sat_params or {})
+        self.profile_table = profile_table
+        self.time_presolve = time_presolve
+        self.backend = backend
 
 
 DEFAULT_OPTIONS = SolverOptions()
 
+SolverProfile = Literal['fast-unique', 'enumerate', 'hard']
+SOLVER_PROFILES: tuple[SolverProfile, ...] = ('fast-unique', 'enumerate', 'hard')
+
+# SolverOptions fields set by each profile
+# 'fast-unique': parallel portfolio with full presolve, for --mode unique (enumeration runs on a single worker)
+# 'enumerate': one worker with a light presolve and no symmetry detection, for listing many solutions
+# 'hard': parallel portfolio with full presolve, symmetries and the full LP relaxation, for long searches
+SOLVER_PROFILE_OPTIONS: dict[SolverProfile, dict[str, Any]] = {
+    'fast-unique': {'num_workers': 0, 'presolve_level': 2, 'linearization_level': 0},
+    'enumerate': {'num_workers': 1, 'presolve_level': 1, 'symmetry_level': 0, 'linearization_level': 0},
+    'hard': {'num_workers': 0, 'presolve_level': 2, 'symmetry_level': 4, 'linearization_level': 2},
+}
+
+
+def apply_solver_profile(options: SolverOptions, profile: SolverProfile, only_unset: bool = False) -> SolverOptions:
+    """Returns a copy of options with the search parameters of profile. With only_unset, parameters already
+    set in options (not None, num_workers not NUM_WORKERS) are kept."""
+    if profile not in SOLVER_PROFILE_OPTIONS:
+        raise ValueError(f"Unknown solver profile '{profile}'. Must be one of {SOLVER_PROFILES}.")
+    profile_options = copy.copy(options)
+    profile_options.sat_params = dict(options.sat_params)
+    for name, value in SOLVER_PROFILE_OPTIONS[profile].items():
+        current = getattr(options, name)
+        if only_unset and current is not None and not (name == 'num_workers' and current == NUM_WORKERS):
+            continue
+        setattr(profile_options, name, value)
+    return profile_options
+
+
+def select_solver_options(puzzle: Puzzle, options: SolverOptions) -> SolverOptions:
+    """Applies the profile of the puzzle family from options.profile_table, if any"""
+    if options.profile_table is None:
+        return options
+    features = PuzzleFeatures.from_puzzle(puzzle)
+    profile = load_profile_table(options.profile_table).select(features)
+    if profile is None:
+        return options
+    print(f"Solver profile {profile} ({features.family})")
+    return apply_solver_profile(options, profile, only_unset=True)  # type: ignore
+
+
+def parse_sat_param(text: str) -> tuple[str, str]:
+    """Parses and checks a 'name=value' SatParameters assignment"""
+    name, sep, value = text.partition('=')
+    name, value = name.strip(), value.strip()
+    if not sep or not name:
+        raise ValueError(f"Invalid sat parameter '{text}', expected name=value")
+    try:
+        text_format.Merge(f"{name}: {value}", sat_parameters_pb2.SatParameters())
+    except text_format.ParseError as e:
+        raise ValueError(f"Invalid sat parameter '{text}': {e}") from e
+    return name, value
+
+
+def configure_solver(solver: cp_model.CpSolver, options: SolverOptions, max_time: float,
+                     enumerate_all_solutions: bool = False):
+    """Sets the time limit and the search parameters of options on solver. cp-sat can't enumerate
+    solutions in parallel, so enumeration always runs on a single worker."""
+    parameters = solver.parameters
+    parameters.max_time_in_seconds = max_time
+    if enumerate_all_solutions:
+        parameters.enumerate_all_solutions = True
+        parameters.num_workers = 1
+    elif options.num_workers > 0:
+        parameters.num_workers = options.num_workers
+
+    if options.presolve_level is not None:
+        if options.presolve_level not in PRESOLVE_LEVELS:
+            raise ValueError(f"Invalid presolve level {options.presolve_level}. Must be one of {PRESOLVE_LEVELS}.")
+        parameters.cp_model_presolve = options.presolve_level > 0
+        if options.presolve_level == 1:
+            parameters.max_presolve_iterations = 1
+            parameters.cp_model_probing_level = 0
+    if options.random_seed is not None:
+        parameters.random_seed = options.random_seed
+    if options.symmetry_level is not None:
+        parameters.symmetry_level = options.symmetry_level
+    if options.linearization_level is not None:
+        parameters.linearization_level = options.linearization_level
+    for name, value in options.sat_params.items():
+        text_format.Merge(f"{name}: {value}", parameters)
+
+
+CorePolicy = Literal['pool', 'balanced', 'solver']
+CORE_POLICIES: tuple[CorePolicy, ...] = ('pool', 'balanced', 'solver')
+
+SolveMode = Literal['enumerate', 'unique']
+SOLVE_MODES: tuple[SolveMode, ...] = ('enumerate', 'unique')
+
+OutputFormat = Literal['text', 'ndjson']
+OUTPUT_FORMATS: tuple[OutputFormat, ...] = ('text', 'ndjson')
+
+Verdict = Literal['unique', 'multiple', 'none', 'unknown']
+
+SolutionHint = dict[tuple[int, int], int]  # known cell values
+
+
+def use_bitmask_backend(puzzle: Puzzle, options: SolverOptions, hint: SolutionHint | None = None) -> bool:
+    """Whether options.backend sends the puzzle to the bitmask backend. Raises ValueError if the bitmask
+    backend is forced on a puzzle it doesn't support. The bitmask search has no use for a hint, so 'auto'
+    keeps cp-sat for a puzzle solved with an explicit hint."""
+    if options.backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{options.backend}'. Must be one of {BACKENDS}.")
+    if options.backend == 'cp-sat':
+        return False
+    supported = bitmask_supported(puzzle)
+    if options.backend == 'bitmask':
+        if not supported:
+            raise ValueError("The bitmask backend only supports sudoku rules, givens, antiknight, antiking, "
+                             "diagonals and disjoint groups")
+        return True
+    # logged solutions, build profiles and hints need the cp-sat model
+    return supported and not options.log_solutions and options.profile_build is None and hint is None
+
 
 def load_puzzle(str_fp: str):
     try:
@@ -46,34 +267,697 @@ def load_puzzle(str_fp: str):
         raise e
 
 
-def solve_puzzle(str_fp: str, options: SolverOptions = DEFAULT_OPTIONS):
-    puzzle = load_puzzle(str_fp)
-
+def build_puzzle_model(puzzle: Puzzle, options: SolverOptions = DEFAULT_OPTIONS) -> PuzzleModel:
     puzzle_meta = puzzle.puzzle_meta
     print(
         f"Building puzzle model for {puzzle_meta.title} by {', '.join(puzzle_meta.authors)}\n")
-    puzzle_model = puzzle2model(puzzle)
 
+    model_cache = (ModelCache(options.model_cache_dir, options.model_cache_size)
+                   if options.model_cache_dir and not options.profile_build else None)
+    model_key = model_cache_key(
+        puzzle, options.connectivity_encoding) if model_cache is not None else ""
+    if model_cache is not None:
+        cached_model = model_cache.get(model_key)
+        if cached_model is not None:
+            print("Loaded cached puzzle model\n")
+            return cached_model
+
+    build_profiler = BuildProfiler() if options.profile_build else None
+    puzzle_model = puzzle2model(
+        puzzle, options.connectivity_encoding, build_profiler)
+    if model_cache is not None:
+        model_cache.put(model_key, puzzle_model)
+
+    if build_profiler is not None and options.profile_build:
+        print('Build profile')
+        print(build_profiler.report(options.profile_build))
+        print()
+    return puzzle_model
+
+
+def load_solution_hint(str_fp: str) -> SolutionHint:
+    """
+    Loads a solution grid to use as hint: a JSON list of rows of cell values, null for cells without hint.
+    """
+    with open(str_fp) as file:
+        rows: list[list[int | None]] = json.load(file)
+    return {(i, j): value for i, row in enumerate(rows) for j, value in enumerate(row) if value is not None}
+
+
+def cached_solution_hint(puzzle: Puzzle, options: SolverOptions) -> SolutionHint | None:
+    """First solution of the cached result of the puzzle, if the result cache is enabled and has one"""
+    if not options.cache_dir:
+        return None
+    cached_result = SolveResultCache(
+        options.cache_dir, options.cache_size).get(result_cache_key(puzzle))
+    if cached_result is None or not cached_result.solutions:
+        return None
+    return cached_result.solutions[0]
+
+
+def add_solution_hint(puzzle_model: PuzzleModel, hint: SolutionHint):
+    """Hints every cells_grid_vars variable with its value in the hint grid"""
+    cells_grid_vars = puzzle_model.grid_vars_dict['cells_grid_vars']
+    for cell, value in hint.items():
+        var = cells_grid_vars.get(cell)
+        if var is not None:
+            puzzle_model.AddHint(var, value)
+
+
+def verify_solution_hint(puzzle_model: PuzzleModel, hint: SolutionHint,
+                         solver: cp_model.CpSolver) -> dict[tuple[int, int], int] | None:
+    """
+    Solves a copy of the model with the hinted cells fixed. Returns the full cells grid if the hint is
+    (part of) a solution. With a complete hint this is only propagation.
+    """
+    cells_grid_vars = puzzle_model.grid_vars_dict['cells_grid_vars']
+    fixed_model = puzzle_model.Clone()
+    for cell, value in hint.items():
+        var = cells_grid_vars.get(cell)
+        if var is not None:
+            fixed_model.Add(fixed_model.GetIntVarFromProtoIndex(var.Index()) == value)
+
+    status = solver.Solve(fixed_model)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+    return {cell: solver.Value(var) for cell, var in cells_grid_vars.items()}
+
+
+class CancelEvent(Protocol):
+    """threading.Event or multiprocessing.Event"""
+
+    def is_set(self) -> bool: ...
+
+    def wait(self, timeout: float | None = None) -> bool: ...
+
+
+@contextlib.contextmanager
+def stop_search_on(cancel_event: CancelEvent | None, stop_search: Callable[[], None]) -> Iterator[None]:
+    """Calls stop_search (StopSearch of the running solution callback or solver) from a watcher thread
+    if cancel_event is set while the block runs. It is called again every poll interval until the block
+    exits, since a stop requested before the search has started is not kept by cp-sat."""
+    if cancel_event is None:
+        yield
+        return
+
+    done = threading.Event()
+
+    def watch():
+        while not cancel_event.wait(CANCEL_POLL_INTERVAL):
+            if done.is_set():
+                return
+        while not done.is_set():
+            stop_search()
+            done.wait(CANCEL_POLL_INTERVAL)
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    try:
+        yield
+    finally:
+        done.set()
+        watcher.join()
+
+
+def puzzle_filename(str_fp: str) -> str:
     (_, tail) = os.path.split(str_fp)
     (filename, _) = os.path.splitext(tail)
+    return filename
+
+
+def solve_puzzle(str_fp: str, options: SolverOptions = DEFAULT_OPTIONS,
+                 log_writer: SolutionLogWriter | None = None, hint: SolutionHint | None = None,
+                 cancel_event: CancelEvent | None = None, phase_times: PhaseTimes | None = None):
+    """
+    Args:
+        str_fp (str):
+        options (SolverOptions, optional): Defaults to DEFAULT_OPTIONS.
+        log_writer (SolutionLogWriter | None, optional): Defaults to None. A started writer shared by
+            several puzzles (one log file per batch). Solutions are logged through it if log_solutions is set.
+        hint (SolutionHint | None, optional): Defaults to None. Known solution, added as solver hints.
+            If None, the first solution of a cached result of the puzzle is used.
+        cancel_event (CancelEvent | None, optional): Defaults to None. Setting it stops the search.
+        phase_times (PhaseTimes | None, optional): Defaults to None. Filled with the time of each phase,
+            which is also printed after the statistics.
+    """
+    phase_times = phase_times if phase_times is not None else PhaseTimes()
+    load_start = time.perf_counter()
+    puzzle = load_puzzle(str_fp)
+    phase_times.load_time = time.perf_counter() - load_start
+    return solve_loaded_puzzle(puzzle, puzzle_filename(str_fp), options, log_writer, hint, cancel_event,
+                               phase_times)
+
+
+def solve_loaded_puzzle(puzzle: Puzzle, filename: str, options: SolverOptions = DEFAULT_OPTIONS,
+                        log_writer: SolutionLogWriter | None = None, hint: SolutionHint | None = None,
+                        cancel_event: CancelEvent | None = None, phase_times: PhaseTimes | None = None):
+    """solve_puzzle for an already parsed puzzle. filename names the solution logs. phase_times, if given,
+    gets the times of the phases after loading."""
+    phase_times = phase_times if phase_times is not None else PhaseTimes()
+    options = select_solver_options(puzzle, options)
+    bitmask_backend = use_bitmask_backend(puzzle, options, hint)
+    cache = SolveResultCache(
+        options.cache_dir, options.cache_size) if options.cache_dir else None
+    cache_key = result_cache_key(puzzle) if cache is not None else ""
+    if cache is not None:
+        cached_result = cache.get(cache_key)
+        if cached_result is not None and cached_result.covers(options.max_sols):
+            cached = print_cached_result(puzzle, cached_result.truncated(options.max_sols))
+            print_phase_times(phase_times)
+            return cached
+        if hint is None and cached_result is not None and cached_result.solutions:
+            hint = cached_result.solutions[0]
+
+    puzzle_meta = puzzle.puzzle_meta
+    if bitmask_backend:
+        print(f"Solving {puzzle_meta.title} by {', '.join(puzzle_meta.authors)} with the bitmask backend")
+        bitmask_result = solve_with_bitmask(puzzle, options, options.max_sols, cancel_event, phase_times)
+        if bitmask_result is not None:
+            bitmask_solver, bitmask_printer = print_result_solutions(bitmask_result)
+            print_phase_times(phase_times)
+            if cache is not None and bitmask_result.is_cacheable():
+                cache.put(cache_key, bitmask_result)
+            return bitmask_solver, bitmask_printer
+
+    build_start = time.perf_counter()
+    puzzle_model = build_puzzle_model(puzzle, options)
+    phase_times.build_time = time.perf_counter() - build_start
+    phase_times.propagation_time = puzzle_model.propagation_time
+    if hint is not None:
+        add_solution_hint(puzzle_model, hint)
+
+    puzzle_log_writer: SolutionLogWriter | None = None
+    if log_writer is None and options.log_solutions and options.async_log:
+        puzzle_log_writer = SolutionLogWriter(
+            f"./Logs/{filename}.sol").start()
+        log_writer = puzzle_log_writer
+
     printer_options = SolutionPrinterOptions(
-        options.max_sols, options.log_solutions, filename)
+        options.max_sols, options.log_solutions, filename, options.max_stored_solutions, options.quiet,
+        log_writer)
 
     solution_printer = PuzzleSolutionPrinter(
         puzzle_model, puzzle, printer_options)
 
-    max_time = options.max_time
+    # a bitmask search that gave up already used part of max_time
+    max_time = max(0.0, options.max_time - phase_times.bitmask_time)
     solver = cp_model.CpSolver()
-    solver.parameters.enumerate_all_solutions = True
-    solver.parameters.max_time_in_seconds = max_time
+    configure_solver(solver, options, max_time, enumerate_all_solutions=True)
+    if options.time_presolve:
+        phase_times.attach(solver)
     print(f"Solving {puzzle_meta.title} by {', '.join(puzzle_meta.authors)}")
-    solver.Solve(puzzle_model, solution_printer)
+    try:
+        with stop_search_on(cancel_event, solution_printer.StopSearch):
+            solver.Solve(puzzle_model, solution_printer)
+        if options.quiet:
+            solution_printer.print_stored_solutions()
+    finally:
+        if puzzle_log_writer is not None:
+            puzzle_log_writer.close()
 
+    phase_times.solve_time = solver.WallTime()
+    phase_times.first_solution_time = solution_printer.first_solution_time()
+    if solver.StatusName() in EXHAUSTED_STATUSES:
+        phase_times.exhaustion_time = solver.WallTime()
     puzzle_print_statistics(solver, solution_printer)
+    print_phase_times(phase_times)
+
+    if cache is not None:
+        result = CachedSolveResult(enumeration_verdict(solver, solution_printer), solver.StatusName(),
+                                   options.max_sols, solution_printer.solution_count(),
+                                   solution_printer.unique_solution_count(), solution_printer.solution_store(),
+                                   solver.WallTime(), solver.NumConflicts(), solver.NumBranches(),
+                                   solution_printer.model_size())
+        if result.is_cacheable():
+            cache.put(cache_key, result)
 
     return solver, solution_printer
 
 
+def solve_with_bitmask(puzzle: Puzzle, options: SolverOptions, max_sols: int,
+                       cancel_event: CancelEvent | None, phase_times: PhaseTimes) -> CachedSolveResult | None:
+    """Searches up to max_sols solutions with the bitmask backend. With the 'auto' backend, the search gives
+    up after AUTO_MAX_BRANCHES branches and None is returned, the caller then solves the puzzle
+    with cp-sat in what is left of max_time. phase_times.bitmask_time is set in both cases, the build and solve
+    times only when the search answers."""
+    build_start = time.perf_counter()
+    bitmask_puzzle = BitmaskPuzzle.from_puzzle(puzzle)
+    build_time = time.perf_counter() - build_start
+
+    max_branches = AUTO_MAX_BRANCHES if options.backend == 'auto' else None
+    should_stop = cancel_event.is_set if cancel_event is not None else None
+    search = BitmaskSearch(bitmask_puzzle, max_sols, options.max_time, max_branches, should_stop,
+                           options.max_stored_solutions).run()
+    phase_times.bitmask_time = build_time + search.wall_time
+    if search.branch_limit_reached:
+        print(f"Bitmask search stopped after {max_branches} branches, solving with cp-sat")
+        return None
+
+    phase_times.build_time = build_time
+    phase_times.solve_time = search.wall_time
+    phase_times.first_solution_time = search.first_solution_time
+    if search.exhausted:
+        phase_times.exhaustion_time = search.wall_time
+    return search.result()
+
+
+def print_cached_result(puzzle: Puzzle, result: CachedSolveResult) -> tuple[CachedSolver, CachedSolutionPrinter]:
+    """Prints a cached result like solve_puzzle would and returns stand-ins for the solver and printer"""
+    puzzle_meta = puzzle.puzzle_meta
+    print(f"Cached result for {puzzle_meta.title} by {', '.join(puzzle_meta.authors)}")
+    return print_result_solutions(result)
+
+
+def print_result_solutions(result: CachedSolveResult) -> tuple[CachedSolver, CachedSolutionPrinter]:
+    """Prints the solutions and statistics of a result and returns stand-ins for the solver and printer"""
+    for i, solution in enumerate(result.solutions, 1):
+        print(f'Solution {i}')
+        print(get_grid_str(solution))
+        print()
+
+    solver, solution_printer = CachedSolver(result), CachedSolutionPrinter(result)
+    puzzle_print_statistics(solver, solution_printer)  # type: ignore
+    return solver, solution_printer
+
+
+def enumeration_verdict(solver: cp_model.CpSolver, solution_printer: PuzzleSolutionPrinter) -> Verdict:
+    """Verdict of an enumeration run. The search is only exhausted if the status is OPTIMAL
+    (or INFEASIBLE when there are no solutions)."""
+    unique_solution_count = solution_printer.unique_solution_count()
+    status_name = solver.StatusName()
+    if unique_solution_count > 1:
+        return 'multiple'
+    if status_name == 'INFEASIBLE':
+        return 'none'
+    if status_name == 'OPTIMAL' and unique_solution_count == 1:
+        return 'unique'
+    return 'unknown'
+
+
+class UniquenessVerdict:
+    filepath: str
+    verdict: Verdict
+    solutions: list[dict[tuple[int, int], int]]
+    wall_time: float
+    conflicts: int
+    branches: int
+    status_name: str  # cp-sat status of the last solve
+    model_size: tuple[int, int] | None  # (variables, constraints) of the cp-sat model, None without one
+    phase_times: PhaseTimes
+
+    def __init__(self, filepath: str, verdict: Verdict = 'unknown') -> None:
+        self.filepath = filepath
+        self.verdict = verdict
+        self.solutions = []
+        self.wall_time = 0.0
+        self.conflicts = 0
+        self.branches = 0
+        self.status_name = 'UNKNOWN'
+        self.model_size = None
+        self.phase_times = PhaseTimes()
+
+    def add_solve_stats(self, solver: cp_model.CpSolver):
+        self.wall_time += solver.WallTime()
+        self.conflicts += solver.NumConflicts()
+        self.branches += solver.NumBranches()
+        self.status_name = solver.StatusName()
+        self.phase_times.solve_time = self.wall_time
+
+
+def check_unique_solution(str_fp: str, options: SolverOptions = DEFAULT_OPTIONS,
+                          hint: SolutionHint | None = None,
+                          cancel_event: CancelEvent | None = None,
+                          phase_times: PhaseTimes | None = None) -> UniquenessVerdict:
+    """Checks if a puzzle has a unique solution without enumerating all of them. The model is solved once,
+    then solved again forbidding the grid of the first solution, so the search stops at the second
+    distinct solution. max_time is shared by both solves.
+
+    With a known solution (hint, or the first solution of a cached result) the first solve is replaced by a
+    check of the hint with every hinted cell fixed, so only the proof that there's no different solution is
+    searched. The cells are also hinted to the solver. If the hint is not a solution, the first solve runs as usual.
+
+    Args:
+        str_fp (str):
+        options (SolverOptions, optional): Defaults to DEFAULT_OPTIONS. max_sols and log_solutions are ignored.
+        hint (SolutionHint | None, optional): Defaults to None.
+        cancel_event (CancelEvent | None, optional): Defaults to None. Setting it stops the search,
+            the verdict is then unknown unless already decided.
+        phase_times (PhaseTimes | None, optional): Defaults to None. Filled with the time of each phase,
+            also available as the phase_times of the verdict.
+
+    Returns:
+        UniquenessVerdict:
+    """
+    phase_times = phase_times if phase_times is not None else PhaseTimes()
+    load_start = time.perf_counter()
+    puzzle = load_puzzle(str_fp)
+    phase_times.load_time = time.perf_counter() - load_start
+    return check_loaded_puzzle_unique_solution(puzzle, str_fp, options, hint, cancel_event, phase_times)
+
+
+def check_loaded_puzzle_unique_solution(puzzle: Puzzle, str_fp: str, options: SolverOptions = DEFAULT_OPTIONS,
+                                        hint: SolutionHint | None = None,
+                                        cancel_event: CancelEvent | None = None,
+                                        phase_times: PhaseTimes | None = None) -> UniquenessVerdict:
+    """check_unique_solution for an already parsed puzzle. phase_times, if given, gets the times of the
+    phases after loading."""
+    options = select_solver_options(puzzle, options)
+    bitmask_backend = use_bitmask_backend(puzzle, options, hint)
+    if hint is None:
+        hint = cached_solution_hint(puzzle, options)
+
+    puzzle_meta = puzzle.puzzle_meta
+    result = UniquenessVerdict(str_fp)
+    if phase_times is not None:
+        result.phase_times = phase_times
+    if bitmask_backend:
+        print(f"Checking uniqueness of {puzzle_meta.title} by {', '.join(puzzle_meta.authors)} "
+              "with the bitmask backend")
+        bitmask_result = solve_with_bitmask(puzzle, options, 2, cancel_event, result.phase_times)
+        if bitmask_result is not None:
+            result.verdict = bitmask_result.verdict  # type: ignore
+            result.solutions = bitmask_result.solutions
+            result.wall_time = bitmask_result.wall_time
+            result.conflicts = bitmask_result.conflicts
+            result.branches = bitmask_result.branches
+            # the status of the last cp-sat solve, the one looking for a second solution
+            result.status_name = {'unique': 'INFEASIBLE', 'none': 'INFEASIBLE',
+                                  'multiple': 'OPTIMAL'}.get(result.verdict, 'UNKNOWN')
+            return result
+
+    build_start = time.perf_counter()
+    puzzle_model = build_puzzle_model(puzzle, options)
+    result.phase_times.build_time = time.perf_counter() - build_start
+    result.phase_times.propagation_time = puzzle_model.propagation_time
+
+    proto = puzzle_model.Proto()
+    result.model_size = (len(proto.variables), len(proto.constraints))
+    # a bitmask search that gave up already used part of max_time
+    max_time = max(0.0, options.max_time - result.phase_times.bitmask_time)
+    solver = cp_model.CpSolver()
+    configure_solver(solver, options, max_time)
+    if options.time_presolve:
+        result.phase_times.attach(solver)
+
+    print(
+        f"Checking uniqueness of {puzzle_meta.title} by {', '.join(puzzle_meta.authors)}")
+    if hint is not None:
+        add_solution_hint(puzzle_model, hint)
+    with stop_search_on(cancel_event, solver.StopSearch):
+        _search_second_solution(puzzle_model, solver, result, max_time, hint, cancel_event)
+    if result.verdict in ('unique', 'none'):
+        result.phase_times.exhaustion_time = result.wall_time
+    return result
+
+
+def _search_second_solution(puzzle_model: PuzzleModel, solver: cp_model.CpSolver, result: UniquenessVerdict,
+                            max_time: float, hint: SolutionHint | None, cancel_event: CancelEvent | None):
+    cells_grid_vars = puzzle_model.grid_vars_dict['cells_grid_vars']
+
+    def cancelled() -> bool:
+        return cancel_event is not None and cancel_event.is_set()
+
+    first_solution: dict[tuple[int, int], int] | None = None
+    if hint is not None:
+        first_solution = verify_solution_hint(puzzle_model, hint, solver)
+        result.add_solve_stats(solver)
+        if cancelled():
+            return
+        if first_solution is None:
+            print("The hint is not a solution, solving without it")
+            solver.parameters.max_time_in_seconds = max(
+                0.0, max_time - result.wall_time)
+
+    if first_solution is None:
+        status = solver.Solve(puzzle_model)
+        result.add_solve_stats(solver)
+        if status == cp_model.INFEASIBLE:
+            result.verdict = 'none'
+            return
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return
+        first_solution = {key: solver.Value(var) for key, var in cells_grid_vars.items()}
+
+    result.phase_times.first_solution_time = result.wall_time
+    keys = list(cells_grid_vars.keys())
+    variables = [cells_grid_vars[key] for key in keys]
+    values = [first_solution[key] for key in keys]
+    result.solutions.append(dict(zip(keys, values)))
+    if cancelled():
+        return
+
+    forbid_assignment_csp(puzzle_model, variables, values, "first_solution")
+    solver.parameters.max_time_in_seconds = max(
+        0.0, max_time - result.wall_time)
+    status = solver.Solve(puzzle_model)
+    result.add_solve_stats(solver)
+    if status == cp_model.INFEASIBLE:
+        result.verdict = 'unique'
+    elif status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        result.verdict = 'multiple'
+        result.solutions.append(
+            {key: solver.Value(var) for key, var in cells_grid_vars.items()})
+
+
+def print_uniqueness_verdict(result: UniquenessVerdict):
+    for i, solution in enumerate(result.solutions, 1):
+        print(f'Solution {i}')
+        print(get_grid_str(solution))
+
+    print('\nVerdict')
+    print(f'  verdict        : {result.verdict}')
+    print(f'  conflicts      : {result.conflicts}')
+    print(f'  branches       : {result.branches}')
+    print(f'  wall time      : {result.wall_time} s')
+    print()
+    print_phase_times(result.phase_times)
+
+
+def solution_to_str(solution: dict[tuple[int, int], int]) -> str:
+    """
+    Flat string of the cell values, row by row. Single digits are concatenated ("123..."),
+    grids with values outside 0-9 are comma separated ("10,2,-1,...").
+    """
+    values = [solution[cell] for cell in sorted(solution.keys())]
+    if all(0 <= value <= 9 for value in values):
+        return ''.join(str(value) for value in values)
+    return ','.join(str(value) for value in values)
+
+
+def load_puzzle_title(str_fp: str) -> str:
+    with contextlib.suppress(Exception):
+        return PuzzleMeta.fromJson(loadJSON(str_fp)['puzzleInfo']).title
+    return ""
+
+
+class BatchSolveResult:
+    filepath: str
+    title: str
+    output: str
+    solution_count: int
+    unique_solution_count: int
+    solutions: list[dict[tuple[int, int], int]]
+    wall_time: float
+    conflicts: int
+    branches: int
+    status_name: str
+    verdict: Verdict
+    model_size: tuple[int, int] | None  # (variables, constraints) of the cp-sat model, None without one
+    phase_times: PhaseTimes
+    error: str | None
+
+    def __init__(self, filepath: str, output: str = "") -> None:
+        self.filepath = filepath
+        self.title = ""
+        self.output = output
+        self.solution_count = 0
+        self.unique_solution_count = 0
+        self.solutions = []
+        self.wall_time = 0.0
+        self.conflicts = 0
+        self.branches = 0
+        self.status_name = 'UNKNOWN'
+        self.verdict = 'unknown'
+        self.model_size = None
+        self.phase_times = PhaseTimes()
+        self.error = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Structured record of the result (--output ndjson), without the captured text output"""
+        return {
+            'file': self.filepath,
+            'title': self.title,
+            'status': self.status_name,
+            'verdict': self.verdict,
+            'solution_count': self.solution_count,
+            'unique_solution_count': self.unique_solution_count,
+            'solutions': [solution_to_str(solution) for solution in self.solutions],
+            'wall_time': self.wall_time,
+            'conflicts': self.conflicts,
+            'branches': self.branches,
+            'variables': self.model_size[0] if self.model_size is not None else None,
+            'constraints': self.model_size[1] if self.model_size is not None else None,
+            'phases': self.phase_times.to_dict(),
+            'error': self.error,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+
+def split_cores(jobs: int, policy: CorePolicy = 'balanced', n_cores: int | None = None,
+                parallel_search: bool = False) -> tuple[int, int]:
+    """Splits the available cores between the process pool and the cp-sat workers of each puzzle.
+    The pool gets up to one process per core with every policy.
+
+    Args:
+        jobs (int): number of puzzles to solve in parallel.
+        policy (CorePolicy, optional): Defaults to 'balanced'.
+            'pool': one cp-sat worker per puzzle.
+            'balanced': each puzzle gets an even share of the cores.
+            'solver': cp-sat chooses its number of workers.
+        n_cores (int | None, optional): Defaults to os.cpu_count().
+        parallel_search (bool, optional): Defaults to False. Whether the search can use several cp-sat
+            workers. cp-sat can't enumerate solutions in parallel, so without it every puzzle gets a
+            single worker whatever the policy.
+
+    Returns:
+        tuple[int, int]: (pool processes, cp-sat workers per puzzle). 0 cp-sat workers means cp-sat decides.
+    """
+    if policy not in CORE_POLICIES:
+        raise ValueError(f"Unknown core policy '{policy}'. Must be one of {CORE_POLICIES}.")
+
+    n_cores = n_cores if n_cores else (os.cpu_count() or 1)
+    jobs = max(1, jobs)
+
+    pool_workers = min(jobs, n_cores)
+    if not parallel_search:
+        return pool_workers, 1
+    if policy == 'solver':
+        return pool_workers, 0
+    if policy == 'pool':
+        return pool_workers, 1
+    return pool_workers, max(1, n_cores // pool_workers)
+
+
+def solve_puzzle_result(str_fp: str, options: SolverOptions = DEFAULT_OPTIONS, mode: SolveMode = 'enumerate',
+                        log_writer: SolutionLogWriter | None = None,
+                        hint: SolutionHint | None = None, puzzle: Puzzle | None = None,
+                        cancel_event: CancelEvent | None = None) -> BatchSolveResult:
+    """Solves a puzzle (enumeration or uniqueness check) capturing its printed output. Errors are
+    reported in the result instead of raised.
+
+    If puzzle is given, it's solved instead of loading str_fp (str_fp only names the result).
+    """
+    output = io.StringIO()
+    result = BatchSolveResult(str_fp)
+    result.title = puzzle.puzzle_meta.title if puzzle is not None else load_puzzle_title(str_fp)
+    with contextlib.redirect_stdout(output):
+        try:
+            if puzzle is None:
+                load_start = time.perf_counter()
+                puzzle = load_puzzle(str_fp)
+                result.phase_times.load_time = time.perf_counter() - load_start
+            if mode == 'unique':
+                verdict = check_loaded_puzzle_unique_solution(
+                    puzzle, str_fp, options, hint, cancel_event, result.phase_times)
+                print_uniqueness_verdict(verdict)
+                result.solution_count = len(verdict.solutions)
+                result.unique_solution_count = len(verdict.solutions)
+                result.solutions = verdict.solutions
+                result.wall_time = verdict.wall_time
+                result.conflicts = verdict.conflicts
+                result.branches = verdict.branches
+                result.status_name = verdict.status_name
+                result.verdict = verdict.verdict
+                result.model_size = verdict.model_size
+            else:
+                solver, solution_printer = solve_loaded_puzzle(
+                    puzzle, puzzle_filename(str_fp), options, log_writer, hint, cancel_event, result.phase_times)
+                result.solution_count = solution_printer.solution_count()
+                result.unique_solution_count = solution_printer.unique_solution_count()
+                result.solutions = solution_printer.solution_store()
+                result.wall_time = solver.WallTime()
+                result.conflicts = solver.NumConflicts()
+                result.branches = solver.NumBranches()
+                result.status_name = solver.StatusName()
+                result.verdict = enumeration_verdict(solver, solution_printer)  # type: ignore
+                result.model_size = solution_printer.model_size()
+        except Exception as e:
+            result.error = repr(e)
+    result.output = output.getvalue()
+    return result
+
+
+def _solve_puzzle_worker(str_fp: str, options: SolverOptions, mode: SolveMode = 'enumerate') -> BatchSolveResult:
+    return solve_puzzle_result(str_fp, options, mode)
+
+
+def solve_puzzles_parallel(filepaths: Iterable[str], options: SolverOptions = DEFAULT_OPTIONS,
+                           jobs: int = 1, policy: CorePolicy = 'balanced',
+                           mode: SolveMode = 'enumerate') -> Iterator[BatchSolveResult]:
+    """Solves whole puzzles in a process pool. Each puzzle is built and solved in a single process,
+    its printed output is captured, and results are yielded in completion order.
+
+    Args:
+        filepaths (Iterable[str]):
+        options (SolverOptions, optional): Defaults to DEFAULT_OPTIONS. num_workers is overridden by the core policy.
+        jobs (int, optional): Defaults to 1.
+        policy (CorePolicy, optional): Defaults to 'balanced'.
+        mode (SolveMode, optional): Defaults to 'enumerate'.
+
+    Yields:
+        Iterator[BatchSolveResult]:
+    """
+    pool_workers, solver_workers = split_cores(jobs, policy, parallel_search=mode == 'unique')
+    worker_options = copy.copy(options)
+    worker_options.num_workers = solver_workers
+
+    with ProcessPoolExecutor(max_workers=pool_workers) as executor:
+        futures = [executor.submit(_solve_puzzle_worker, _fp, worker_options, mode)
+                   for _fp in filepaths]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def print_batch_result(result: BatchSolveResult):
+    print(result.output, end='')
+    if result.error is not None:
+        print(f"Error solving {result.filepath}: {result.error}\n")
+
+
+def print_result_record(result: BatchSolveResult):
+    print(result.to_json(), flush=True)
+
+
+def sat_param_arg(text: str) -> tuple[str, str]:
+    try:
+        return parse_sat_param(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def options_from_args(args: argparse.Namespace) -> SolverOptions:
+    options = SolverOptions(args.max_time, args.max_sols, args.log_solutions or args.log_file is not None,
+                            connectivity_encoding=args.connectivity_encoding,
+                            profile_build=args.profile_build,
+                            max_stored_solutions=args.max_stored_solutions,
+                            quiet=args.quiet, async_log=args.async_log,
+                            cache_dir=args.cache_dir, cache_size=args.cache_size * 1024 * 1024,
+                            model_cache_dir=args.model_cache_dir, time_presolve=not args.no_presolve_time,
+                            backend=args.backend, model_cache_size=args.model_cache_size * 1024 * 1024)
+    if args.profile == 'auto':
+        options.profile_table = args.profile_table
+    elif args.profile is not None:
+        options = apply_solver_profile(options, args.profile)
+    for name in ('num_workers', 'presolve_level', 'random_seed', 'symmetry_level', 'linearization_level'):
+        value = getattr(args, name)
+        if value is not None:
+            setattr(options, name, value)
+    options.sat_params.update(args.sat_params)
+    return options
+
+
 def make_parser():
     description = """
     A CP-SAT solver for sudoku variants.
@@ -90,24 +974,167 @@ def make_parser():
                         help='the maximum number of solution the solver will search for. '
                              f'After the solver reaches the maximum, '
                              f'it will stop. Default is {MAX_SOLS}.')
+    parser.add_argument('--max_stored_solutions', dest='max_stored_solutions', default=None, type=int,
+                        help='the maximum number of full solution grids kept in memory. Unique solutions '
+                             'past this limit are still counted. Default is to keep all of them.')
+    parser.add_argument('-q', '--quiet', dest='quiet', action="store_true",
+                        help='only read the cells grid while searching and print the solutions once the '
+                             'search is over. Faster when enumerating many solutions; auxiliary grids '
+                             'are not printed.')
     parser.add_argument('-l', '--log_solutions', dest='log_solutions', action="store_true",
                         help=f'flag indicating if solutions should be logged')
+    parser.add_argument('--async_log', dest='async_log', action="store_true",
+                        help='with --log_solutions, append the solutions of each puzzle to ./Logs/<puzzle>.sol '
+                             'from a background thread instead of writing one file per solution')
+    parser.add_argument('--log_file', dest='log_file', default=None, type=str,
+                        help='append the solutions of every puzzle to this file, from a background thread. '
+                             'Implies --log_solutions. Not available with --jobs.')
+    parser.add_argument('--cache', dest='cache_dir', nargs='?', const=DEFAULT_CACHE_DIR, default=None, type=str,
+                        help='reuse the results of puzzles already solved, stored in this folder '
+                             f'(default {DEFAULT_CACHE_DIR}). Results that hit the time limit are not cached.')
+    parser.add_argument('--cache_size', dest='cache_size', default=DEFAULT_CACHE_SIZE // (1024 * 1024), type=int,
+                        help='the maximum size of the result cache in MiB. Least recently used results are '
+                             f'evicted. Default is {DEFAULT_CACHE_SIZE // (1024 * 1024)} MiB.')
+    parser.add_argument('--model_cache', dest='model_cache_dir', nargs='?', const=DEFAULT_MODEL_CACHE_DIR, default=None,
+                        type=str,
+                        help='save built models in this folder (default '
+                             f'{DEFAULT_MODEL_CACHE_DIR}) and load them on later solves of the same puzzle, '
+                             'instead of building them again.')
+    parser.add_argument('--model_cache_size', dest='model_cache_size',
+                        default=DEFAULT_MODEL_CACHE_SIZE // (1024 * 1024), type=int,
+                        help='the maximum size of the model cache in MiB. Least recently used models are '
+                             f'evicted. Default is {DEFAULT_MODEL_CACHE_SIZE // (1024 * 1024)} MiB.')
+    parser.add_argument('--hint', dest='hint', default=None, type=str,
+                        help='a JSON file with a known solution grid (list of rows, null for unknown cells). '
+                             'The cells are hinted to the solver and, with --mode unique, only the proof that '
+                             'there is no different solution is searched. With --cache, the cached solution '
+                             'of a puzzle is used as hint. Only for a single puzzle. The bitmask backend has '
+                             'no use for a hint: with --backend auto a hinted puzzle is solved with cp-sat, '
+                             '--backend bitmask ignores the hint.')
+    parser.add_argument('-j', '--jobs', dest='jobs', default=1, type=int,
+                        help='the number of puzzles solved in parallel, each one in its own process. '
+                             'Default is 1 (puzzles are solved one after another).')
+    parser.add_argument('--core_policy', dest='core_policy', default='balanced', choices=CORE_POLICIES,
+                        help='how the available cores are split between parallel puzzles and the '
+                             'cp-sat workers of each puzzle, when using --jobs. The pool never runs more '
+                             'puzzles than there are cores. '
+                             '"pool" gives one cp-sat worker to each puzzle, '
+                             '"balanced" divides the cores evenly between the running puzzles and '
+                             '"solver" leaves the number of cp-sat workers to cp-sat. cp-sat enumerates '
+                             'solutions with a single worker, so the policy only changes the workers of '
+                             '--mode unique. Default is balanced.')
+    parser.add_argument('--mode', dest='mode', default='enumerate', choices=SOLVE_MODES,
+                        help='"enumerate" prints every solution up to max_sols. '
+                             '"unique" only checks if the solution is unique, stopping at the second '
+                             'distinct solution. Default is enumerate.')
+    parser.add_argument('--output', dest='output', default='text', choices=OUTPUT_FORMATS,
+                        help='"text" prints grids and statistics. "ndjson" prints one JSON record per puzzle, '
+                             'as soon as it is solved (file, title, status, verdict, solutions as flat digit '
+                             'strings, wall time, conflicts, branches, model size and phase times). Default is text.')
+    parser.add_argument('--connectivity', dest='connectivity_encoding', default=DEFAULT_CONNECTIVITY_ENCODING,
+                        choices=CONNECTIVITY_ENCODINGS,
+                        help='the encoding used for orthogonally connected regions (unknown regions, yin yang, ...). '
+                             '"floodfill" is the layered floodfill encoding. "tree" is linear in the number of '
+                             'cells and edges, smaller and faster on most puzzles, but some puzzles only '
+                             f'solved with floodfill time out with it. Default is {DEFAULT_CONNECTIVITY_ENCODING}.')
+    parser.add_argument('--backend', dest='backend', default=DEFAULT_BACKEND, choices=BACKENDS,
+                        help='"cp-sat" builds and solves a cp-sat model. "bitmask" runs a backtracking search on '
+                             'candidate bitmasks, for puzzles with only sudoku rules, givens, antiknight, antiking, '
+                             'diagonals and disjoint groups. "auto" uses the bitmask search for these puzzles and '
+                             'switches to cp-sat when it branches too much for the size of the grid. '
+                             f'Default is {DEFAULT_BACKEND}.')
+    parser.add_argument('--profile', dest='profile', default=None, choices=(*SOLVER_PROFILES, 'auto'),
+                        help='a named set of search parameters. "fast-unique" runs the cp-sat parallel portfolio '
+                             'with full presolve, for --mode unique. "enumerate" runs one worker with a light '
+                             'presolve, for listing solutions. "hard" adds symmetry detection and the full LP '
+                             'relaxation to the portfolio. "auto" picks the profile of each puzzle family from '
+                             '--profile_table (see psolver calibrate). The flags below override the profile.')
+    parser.add_argument('--profile_table', dest='profile_table', default=DEFAULT_PROFILE_TABLE, type=str,
+                        help=f'the profile table used by --profile auto. Default is {DEFAULT_PROFILE_TABLE}.')
+    parser.add_argument('--num_workers', dest='num_workers', default=None, type=int,
+                        help='the number of cp-sat workers. 0 lets cp-sat decide. Enumeration always runs on a '
+                             'single worker and --jobs sets it from the core policy.')
+    parser.add_argument('--presolve', dest='presolve_level', default=None, type=int, choices=PRESOLVE_LEVELS,
+                        help='0 disables presolve, 1 runs a single presolve pass without probing, '
+                             '2 is the full cp-sat presolve (the cp-sat default).')
+    parser.add_argument('--random_seed', dest='random_seed', default=None, type=int,
+                        help='the cp-sat random seed')
+    parser.add_argument('--symmetry', dest='symmetry_level', default=None, type=int, choices=range(5),
+                        help='the cp-sat symmetry level, 0 (off) to 4')
+    parser.add_argument('--linearization', dest='linearization_level', default=None, type=int, choices=range(3),
+                        help='the cp-sat linearization level, 0 (no LP relaxation) to 2')
+    parser.add_argument('--sat-param', dest='sat_params', default=[], action='append', type=sat_param_arg,
+                        metavar='NAME=VALUE',
+                        help='set any other cp-sat parameter (SatParameters text format value), '
+                             'e.g. --sat-param search_branching=FIXED_SEARCH. Can be repeated.')
+    parser.add_argument('--no_presolve_time', dest='no_presolve_time', action='store_true',
+                        help='do not time presolve. The presolve time is read from the cp-sat search log, which '
+                             'has a line per solution and slows down long enumerations a little.')
+    parser.add_argument('--profile-build', dest='profile_build', nargs='?', const='table', default=None,
+                        choices=BUILD_PROFILE_FORMATS,
+                        help='print the wall time, variables and constraints added by each constraint setter '
+                             'while building the model, as a "table" (default) or as "json".')
     return parser
 
 
-def main():
+def main() -> int:
+    # imported here: SolverServer and ProfileCalibration import this module
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from puzzlesolver.SolverServer import serve_main
+        serve_main(sys.argv[2:])
+        return 0
+    if len(sys.argv) > 1 and sys.argv[1] == 'calibrate':
+        from puzzlesolver.ProfileCalibration import calibrate_main
+        calibrate_main(sys.argv[2:])
+        return 0
+
     parser = make_parser()
     args = parser.parse_args()
     fpath = args.filepath
-    _max_time = args.max_time
-    _max_sols = args.max_sols
-    _log_solutions = args.log_solutions
-    options = SolverOptions(_max_time, _max_sols, _log_solutions)
+    _jobs = args.jobs
+    _mode = args.mode
+    options = options_from_args(args)
 
     if len(fpath) == 1 and os.path.isdir(fpath[0]):
         obj = os.scandir(fpath[0])
         fpath = [entry.path for entry in obj if entry.is_file(
         ) and os.path.splitext(entry.name)[1] == ".json"]
 
-    for _fp in fpath:
-        solve_puzzle(_fp, options)
+    if options.profile_table is not None and not os.path.isfile(options.profile_table):
+        parser.error(f'--profile auto needs a profile table, {options.profile_table} not found '
+                     '(run psolver calibrate)')
+    if args.hint is not None and len(fpath) > 1:
+        parser.error('--hint is only available for a single puzzle')
+    hint = load_solution_hint(args.hint) if args.hint is not None else None
+
+    print_result = print_batch_result if args.output == 'text' else print_result_record
+
+    if _jobs > 1 and len(fpath) > 1:
+        if args.log_file is not None:
+            parser.error('--log_file is not available with --jobs, use --async_log instead')
+        failed = False
+        for result in solve_puzzles_parallel(fpath, options, _jobs, args.core_policy, _mode):
+            print_result(result)
+            failed |= result.error is not None
+        return 1 if failed else 0
+
+    failed = False
+    log_writer = SolutionLogWriter(
+        args.log_file).start() if args.log_file is not None else None
+    try:
+        for _fp in fpath:
+            if args.output == 'ndjson':
+                result = solve_puzzle_result(_fp, options, _mode, log_writer, hint)
+                print_result_record(result)
+                failed |= result.error is not None
+            elif _mode == 'unique':
+                print_uniqueness_verdict(check_unique_solution(_fp, options, hint))
+            else:
+                solve_puzzle(_fp, options, log_writer, hint)
+    finally:
+        if log_writer is not None:
+            try:
+                log_writer.close()
+            except OSError as e:
+                sys.exit(f"Error writing the solution log {log_writer.filepath}: {e}")
+    return 1 if failed else 0
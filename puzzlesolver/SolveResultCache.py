@@ -0,0 +1,199 @@
+import hashlib
+import json
+from typing import Any
+
+from puzzlesolver.FileCache import FileCache
+from puzzlesolver.Puzzle.Cell import CELL_JSON_ATTRIBUTES
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = './.psolver_cache'
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024  # bytes
+
+# cells attributes that change the model (highlight is cosmetic)
+HASHED_CELL_ATTRIBUTES = tuple(
+    attr for attr in CELL_JSON_ATTRIBUTES if attr != 'highlight')
+
+EXHAUSTED_STATUSES = ('OPTIMAL', 'INFEASIBLE')
+
+
+def canonical_puzzle_data(puzzle: Puzzle) -> dict[str, Any]:
+    """
+    Everything in a parsed puzzle that can change its solutions: grid cells, tool constraints
+    (toJsonData and constraint props), bool constraints and valid digits. Titles, authors and cosmetic
+    attributes are left out, so a renamed copy of a puzzle has the same hash.
+    """
+    grid = puzzle.grid
+    cells = [[getattr(cell, attr) for attr in HASHED_CELL_ATTRIBUTES]
+             for cell in grid.getAllCells(getOutside=True)]
+
+    tool_constraints: dict[str, list[Any]] = dict()
+    for key, constraint_list in puzzle.tool_constraints.items():
+        if not constraint_list:
+            continue
+        tool_constraints[key.value] = [[constraint.toJsonData(), getattr(constraint, 'constraint_props', None)]
+                                       for constraint in constraint_list]
+
+    bool_constraints = {key.value: value for key, value in puzzle.bool_constraints.items() if value}
+
+    return {
+        'version': CACHE_VERSION,
+        'nRows': grid.nRows,
+        'nCols': grid.nCols,
+        'cells': cells,
+        'tool_constraints': tool_constraints,
+        'bool_constraints': bool_constraints,
+        'valid_digits': list(puzzle.valid_digits),
+    }
+
+
+def puzzle_hash(puzzle: Puzzle) -> str:
+    data = canonical_puzzle_data(puzzle)
+    canonical_str = json.dumps(data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical_str.encode()).hexdigest()
+
+
+def result_cache_key(puzzle: Puzzle) -> str:
+    """Key of the cached result of a puzzle: its hash and the package sources, so results computed by an
+    older (possibly buggy) model builder are not reused"""
+    # imported here: ModelCache imports this module
+    from puzzlesolver.ModelCache import builder_fingerprint
+
+    key_str = f"{CACHE_VERSION}:{builder_fingerprint()}:{puzzle_hash(puzzle)}"
+    return hashlib.sha256(key_str.encode()).hexdigest()
+
+
+class CachedSolveResult:
+    """Verdict, solutions and cp-sat stats of an enumeration run, as stored in the cache."""
+    verdict: str
+    status_name: str
+    max_sols: int  # max_sols of the run that produced the result
+    solution_count: int
+    unique_solution_count: int
+    solutions: list[dict[tuple[int, int], int]]
+    wall_time: float
+    conflicts: int
+    branches: int
+    model_size: tuple[int, int] | None  # (variables, constraints) of the cp-sat model, None without one
+
+    def __init__(self, verdict: str, status_name: str, max_sols: int, solution_count: int,
+                 unique_solution_count: int, solutions: list[dict[tuple[int, int], int]],
+                 wall_time: float = 0.0, conflicts: int = 0, branches: int = 0,
+                 model_size: tuple[int, int] | None = None) -> None:
+        self.verdict = verdict
+        self.status_name = status_name
+        self.max_sols = max_sols
+        self.solution_count = solution_count
+        self.unique_solution_count = unique_solution_count
+        self.solutions = solutions
+        self.wall_time = wall_time
+        self.conflicts = conflicts
+        self.branches = branches
+        self.model_size = model_size
+
+    def is_exhausted(self) -> bool:
+        """The search space was fully explored, so the result holds for any max_sols"""
+        return self.status_name in EXHAUSTED_STATUSES
+
+    def is_cacheable(self) -> bool:
+        """Results of runs that stopped on the time limit depend on the machine and are not cached, nor
+        results whose stored solutions were cut off by max_stored_solutions"""
+        if len(self.solutions) != self.unique_solution_count:
+            return False
+        return self.is_exhausted() or self.solution_count >= self.max_sols
+
+    def covers(self, max_sols: int) -> bool:
+        return self.is_exhausted() or self.max_sols >= max_sols
+
+    def truncated(self, max_sols: int) -> 'CachedSolveResult':
+        """The result a run with a lower max_sols would have stopped at"""
+        if self.solution_count <= max_sols:
+            return self
+        return CachedSolveResult(self.verdict, 'FEASIBLE', max_sols, max_sols,
+                                 min(self.unique_solution_count, max_sols), self.solutions[:max_sols],
+                                 self.wall_time, self.conflicts, self.branches, self.model_size)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'verdict': self.verdict,
+            'status_name': self.status_name,
+            'max_sols': self.max_sols,
+            'solution_count': self.solution_count,
+            'unique_solution_count': self.unique_solution_count,
+            'solutions': [[[row, col, value] for (row, col), value in sorted(solution.items())]
+                          for solution in self.solutions],
+            'wall_time': self.wall_time,
+            'conflicts': self.conflicts,
+            'branches': self.branches,
+            'model_size': list(self.model_size) if self.model_size is not None else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'CachedSolveResult':
+        solutions = [{(row, col): value for row, col, value in solution}
+                     for solution in data['solutions']]
+        return CachedSolveResult(data['verdict'], data['status_name'], data['max_sols'],
+                                 data['solution_count'], data['unique_solution_count'], solutions,
+                                 data['wall_time'], data['conflicts'], data['branches'],
+                                 tuple(data['model_size']) if data.get('model_size') is not None else None)
+
+
+class CachedSolver:
+    """Read-only stand-in for the cp_model.CpSolver of a cached run (the statistics used by SolvePuzzle)"""
+    _result: CachedSolveResult
+
+    def __init__(self, result: CachedSolveResult) -> None:
+        self._result = result
+
+    def StatusName(self, status: Any = None) -> str:
+        return self._result.status_name
+
+    def WallTime(self) -> float:
+        return self._result.wall_time
+
+    def NumConflicts(self) -> int:
+        return self._result.conflicts
+
+    def NumBranches(self) -> int:
+        return self._result.branches
+
+
+class CachedSolutionPrinter:
+    """Read-only stand-in for the PuzzleSolutionPrinter of a cached run"""
+    _result: CachedSolveResult
+
+    def __init__(self, result: CachedSolveResult) -> None:
+        self._result = result
+
+    def solution_count(self):
+        return self._result.solution_count
+
+    def unique_solution_count(self):
+        return self._result.unique_solution_count
+
+    def model_size(self) -> tuple[int, int] | None:
+        return self._result.model_size
+
+    def solution_store(self):
+        return self._result.solutions
+
+
+class SolveResultCache(FileCache[CachedSolveResult]):
+    """
+    On-disk cache of solve results, one JSON file per puzzle hash. Reading an entry refreshes its
+    modification time, and the least recently used entries are removed when the cache grows over max_size.
+
+    Args:
+        directory (str, optional): Defaults to DEFAULT_CACHE_DIR = './.psolver_cache'.
+        max_size (int, optional): Defaults to DEFAULT_CACHE_SIZE = 64 MiB.
+    """
+    suffix = '.json'
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        super().__init__(directory, max_size)
+
+    def serialize(self, value: CachedSolveResult) -> bytes:
+        return json.dumps(value.to_dict()).encode()
+
+    def deserialize(self, data: bytes) -> CachedSolveResult:
+        return CachedSolveResult.from_dict(json.loads(data))
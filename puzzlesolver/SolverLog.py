@@ -0,0 +1,91 @@
+import time
+from typing import Any
+
+from ortools.sat.python import cp_model
+
+# log lines that start and end presolve. The times printed in the log are rounded to 10 ms, so lines are
+# timed when they reach the callback (cp-sat calls it synchronously).
+_PRESOLVE_START = 'Starting presolve at'
+_LOAD_START = 'Starting to load the model at'
+
+
+class PhaseTimes:
+    """
+    Wall time of the phases of a solve, carried through a solve and filled by each phase:
+
+    - load_time: parsing the puzzle file, set by the caller.
+    - build_time: puzzle2model (or loading a cached model).
+    - propagation_time: the domain propagation pass of puzzle2model, included in build_time (0 for cached
+      models).
+    - presolve_time: read from the cp-sat search log of one or more solves (sent to a callback instead of
+      stdout), from 'Starting presolve' to 'Starting to load the model', summed over the solves.
+    - solve_time: cp-sat wall time of the solves, presolve included.
+    - first_solution_time: solve time when the first solution was found, None without solutions.
+    - exhaustion_time: solve time when the search proved there are no other solutions, None if it was stopped
+      before (time limit, max_sols or the second solution of a uniqueness check).
+    - bitmask_time: the bitmask backend, its build and search. When the search gives up and cp-sat takes over,
+      build_time and solve_time are the ones of cp-sat and this is the time spent before.
+    """
+    load_time: float
+    build_time: float
+    propagation_time: float
+    presolve_time: float
+    solve_time: float
+    first_solution_time: float | None
+    exhaustion_time: float | None
+    bitmask_time: float
+    _presolve_start: float | None
+
+    def __init__(self) -> None:
+        self.load_time = 0.0
+        self.build_time = 0.0
+        self.propagation_time = 0.0
+        self.presolve_time = 0.0
+        self.solve_time = 0.0
+        self.first_solution_time = None
+        self.exhaustion_time = None
+        self.bitmask_time = 0.0
+        self._presolve_start = None
+
+    def attach(self, solver: cp_model.CpSolver):
+        solver.parameters.log_search_progress = True
+        solver.parameters.log_to_stdout = False
+        solver.log_callback = self.on_log_line
+
+    def on_log_line(self, line: str):
+        if self._presolve_start is None:
+            if line.startswith(_PRESOLVE_START):
+                self._presolve_start = time.perf_counter()
+            return
+        if line.startswith(_LOAD_START):
+            self.presolve_time += time.perf_counter() - self._presolve_start
+            self._presolve_start = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'load_time': self.load_time,
+            'build_time': self.build_time,
+            'propagation_time': self.propagation_time,
+            'presolve_time': self.presolve_time,
+            'solve_time': self.solve_time,
+            'first_solution_time': self.first_solution_time,
+            'exhaustion_time': self.exhaustion_time,
+            'bitmask_time': self.bitmask_time,
+        }
+
+
+def print_phase_times(phase_times: PhaseTimes):
+    def optional_time(value: float | None) -> str:
+        return f'{value} s' if value is not None else '-'
+
+    print('Phases')
+    print(f'  load           : {phase_times.load_time} s')
+    print(f'  build          : {phase_times.build_time} s')
+    print(f'    propagation  : {phase_times.propagation_time} s')
+    print(f'  presolve       : {phase_times.presolve_time} s')
+    print(f'  first solution : {optional_time(phase_times.first_solution_time)}')
+    print(f'  exhaustion     : {optional_time(phase_times.exhaustion_time)}')
+    print(f'  solve          : {phase_times.solve_time} s')
+    if phase_times.bitmask_time:
+        print(f'  bitmask        : {phase_times.bitmask_time} s')
+    print()
@@ -0,0 +1,540 @@
+import argparse
+import collections
+import copy
+import itertools
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import socket
+import socketserver
+import stat
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Literal
+from urllib.parse import parse_qs, urlparse
+
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.SolvePuzzle import DEFAULT_OPTIONS, MAX_SOLS, MAX_TIME, SOLVE_MODES, BatchSolveResult, SolveMode, SolverOptions, apply_solver_profile, solve_puzzle_result
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MAX_FINISHED_JOBS = 1000  # finished jobs kept for GET /jobs/<id>
+DISPATCH_TIMEOUT = 0.5  # seconds
+
+JobState = Literal['queued', 'running', 'done', 'cancelled']
+
+# the warm-up puzzle: an empty 4x4 grid, so a worker has built and solved a model before its first request
+WARM_UP_PUZZLE: dict[str, Any] = {'nRows': 4, 'nCols': 4, 'puzzleInfo': {'title': 'warm up'},
+                                  'grid': [[{} for _ in range(4)] for _ in range(4)],
+                                  'local_constraints': {}, 'bool_constraints': {}}
+
+
+def solve_puzzle_data(name: str, puzzle_data: dict[str, Any], options: SolverOptions, mode: SolveMode,
+                      cancel_event: Any = None) -> dict[str, Any]:
+    """Solves a puzzle given as parsed JSON (the Puzzle.fromJSON format) and returns its result record"""
+    try:
+        puzzle = Puzzle.fromJsonData(puzzle_data)
+    except Exception as e:
+        result = BatchSolveResult(name)
+        result.error = f"Invalid puzzle: {e!r}"
+        return result.to_dict()
+    return solve_puzzle_result(name, options, mode, puzzle=puzzle, cancel_event=cancel_event).to_dict()
+
+
+def _worker_main(conn: multiprocessing.connection.Connection, cancel_event: Any):
+    """Worker process loop: receives (job id, puzzle data, options, mode), sends back (job id, record)."""
+    solve_puzzle_data('warm up', WARM_UP_PUZZLE, SolverOptions(max_time=10, max_sols=1, quiet=True), 'enumerate')
+    conn.send(('ready', None))
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if message is None:
+            return
+        job_id, puzzle_data, options, mode = message
+        record = solve_puzzle_data(f"request {job_id}", puzzle_data, options, mode, cancel_event)
+        conn.send((job_id, record))
+
+
+class SolveJob:
+    id: str
+    puzzle_data: dict[str, Any]
+    options: SolverOptions
+    mode: SolveMode
+    state: JobState
+    result: dict[str, Any] | None
+    submitted_time: float
+    start_time: float | None
+    end_time: float | None
+    finished: threading.Event
+
+    def __init__(self, job_id: str, puzzle_data: dict[str, Any], options: SolverOptions,
+                 mode: SolveMode = 'enumerate') -> None:
+        self.id = job_id
+        self.puzzle_data = puzzle_data
+        self.options = options
+        self.mode = mode
+        self.state = 'queued'
+        self.result = None
+        self.submitted_time = time.time()
+        self.start_time = None
+        self.end_time = None
+        self.finished = threading.Event()
+
+    def queue_time(self) -> float:
+        end = self.start_time if self.start_time is not None else (self.end_time or time.time())
+        return end - self.submitted_time
+
+    def run_time(self) -> float:
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time or time.time()) - self.start_time
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'id': self.id,
+            'state': self.state,
+            'mode': self.mode,
+            'max_time': self.options.max_time,
+            'max_sols': self.options.max_sols,
+            'queue_time': self.queue_time(),
+            'run_time': self.run_time(),
+            'result': self.result,
+        }
+
+
+class WorkerHandle:
+    process: multiprocessing.process.BaseProcess
+    conn: multiprocessing.connection.Connection
+    cancel_event: Any  # multiprocessing.Event
+    ready: bool
+    job: SolveJob | None
+
+    def __init__(self, context: Any) -> None:
+        self.conn, child_conn = context.Pipe()
+        self.cancel_event = context.Event()
+        self.process = context.Process(target=_worker_main, args=(child_conn, self.cancel_event), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.job = None
+
+    def is_idle(self) -> bool:
+        return self.ready and self.job is None
+
+
+class SolverPool:
+    """
+    A pool of warm solver processes fed from a FIFO request queue. Each worker imports ortools and solves a
+    small warm-up puzzle when it starts, then solves one job at a time. Running jobs are cancelled by setting
+    their worker's cancel event, which calls StopSearch on the running search; queued jobs are just removed.
+
+    Args:
+        n_workers (int, optional): Defaults to os.cpu_count().
+    """
+    n_workers: int
+    _workers: list[WorkerHandle]
+    _pending: collections.deque[SolveJob]
+    _jobs: collections.OrderedDict[str, SolveJob]
+    _counters: collections.Counter[str]
+    _finished_times: collections.deque[tuple[float, float]]  # (queue time, run time) of recent jobs
+
+    def __init__(self, n_workers: int | None = None) -> None:
+        self.n_workers = max(1, n_workers or os.cpu_count() or 1)
+        self._context = multiprocessing.get_context('spawn')
+        self._workers = []
+        self._pending = collections.deque()
+        self._jobs = collections.OrderedDict()
+        self._counters = collections.Counter()
+        self._finished_times = collections.deque(maxlen=100)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._wake_reader, self._wake_writer = multiprocessing.Pipe(duplex=False)
+        self._closed = False
+        self._dispatcher: threading.Thread | None = None
+
+    def start(self) -> 'SolverPool':
+        self._workers = [WorkerHandle(self._context) for _ in range(self.n_workers)]
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='SolverPool', daemon=True)
+        self._dispatcher.start()
+        return self
+
+    def close(self):
+        self._closed = True
+        self._wake()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        for worker in self._workers:
+            worker.cancel_event.set()
+            try:
+                worker.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self._workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+        with self._lock:
+            for job in self._pending:
+                self._finish(job, 'cancelled', None)
+            self._pending.clear()
+            for worker in self._workers:
+                if worker.job is not None:
+                    self._finish(worker.job, 'cancelled', None)
+                    worker.job = None
+
+    def __enter__(self) -> 'SolverPool':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, puzzle_data: dict[str, Any], options: SolverOptions = DEFAULT_OPTIONS,
+               mode: SolveMode = 'enumerate') -> SolveJob:
+        """Queues a job. Once the pool is closed, the job is returned already cancelled."""
+        with self._lock:
+            job = SolveJob(str(next(self._ids)), puzzle_data, options, mode)
+            self._jobs[job.id] = job
+            self._counters['submitted'] += 1
+            if self._closed:
+                self._finish(job, 'cancelled', None)
+                return job
+            self._pending.append(job)
+        self._wake()
+        return job
+
+    def get(self, job_id: str) -> SolveJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> SolveJob | None:
+        """Removes a queued job or stops a running one. Returns None if the job is unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished.is_set():
+                return job
+            if job.state == 'queued':
+                self._pending.remove(job)
+                self._finish(job, 'cancelled', None)
+                return job
+            job.state = 'cancelled'
+            for worker in self._workers:
+                if worker.job is job:
+                    worker.cancel_event.set()
+        return job
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            finished_times = list(self._finished_times)
+            return {
+                'workers': len(self._workers),
+                'ready_workers': sum(worker.ready for worker in self._workers),
+                'busy_workers': sum(worker.job is not None for worker in self._workers),
+                'queue_depth': len(self._pending),
+                'submitted': self._counters['submitted'],
+                'completed': self._counters['done'],
+                'cancelled': self._counters['cancelled'],
+                'failed': self._counters['failed'],
+                'worker_restarts': self._counters['worker_restarts'],
+                'avg_queue_time': sum(q for q, _ in finished_times) / len(finished_times) if finished_times else 0.0,
+                'avg_run_time': sum(r for _, r in finished_times) / len(finished_times) if finished_times else 0.0,
+            }
+
+    def _wake(self):
+        self._wake_writer.send(None)
+
+    def _finish(self, job: SolveJob, state: JobState, result: dict[str, Any] | None):
+        """Must be called with the lock held"""
+        job.state = state
+        job.result = result
+        job.end_time = time.time()
+        self._counters[state] += 1
+        if result is not None and result.get('error'):
+            self._counters['failed'] += 1
+        if job.start_time is not None:
+            self._finished_times.append((job.queue_time(), job.run_time()))
+        job.finished.set()
+
+        finished_jobs = [j for j in self._jobs.values() if j.finished.is_set()]
+        for old_job in finished_jobs[:max(0, len(finished_jobs) - MAX_FINISHED_JOBS)]:
+            del self._jobs[old_job.id]
+
+    def _assign_jobs(self):
+        """Must be called with the lock held"""
+        for worker in self._workers:
+            if not self._pending:
+                return
+            if not worker.is_idle():
+                continue
+            job = self._pending.popleft()
+            worker.cancel_event.clear()
+            worker.job = job
+            job.state = 'running'
+            job.start_time = time.time()
+            worker.conn.send((job.id, job.puzzle_data, job.options, job.mode))
+
+    def _restart_worker(self, index: int):
+        """Must be called with the lock held"""
+        worker = self._workers[index]
+        if worker.job is not None:
+            result = BatchSolveResult(f"request {worker.job.id}")
+            result.error = "Worker process died"
+            self._finish(worker.job, 'done', result.to_dict())
+        worker.process.join(timeout=1)
+        self._workers[index] = WorkerHandle(self._context)
+        self._counters['worker_restarts'] += 1
+
+    def _handle_message(self, index: int):
+        """Must be called with the lock held"""
+        worker = self._workers[index]
+        try:
+            job_id, record = worker.conn.recv()
+        except (EOFError, OSError):
+            self._restart_worker(index)
+            return
+
+        if job_id == 'ready':
+            worker.ready = True
+            return
+        job = worker.job
+        worker.job = None
+        if job is None or job.id != job_id:
+            return
+        state: JobState = 'cancelled' if job.state == 'cancelled' else 'done'
+        self._finish(job, state, record)
+
+    def _dispatch_loop(self):
+        while not self._closed:
+            with self._lock:
+                self._assign_jobs()
+                conns = {worker.conn: i for i, worker in enumerate(self._workers)}
+
+            ready = multiprocessing.connection.wait(
+                [*conns.keys(), self._wake_reader], timeout=DISPATCH_TIMEOUT)
+            with self._lock:
+                for conn in ready:
+                    if conn is self._wake_reader:
+                        while self._wake_reader.poll():
+                            self._wake_reader.recv()
+                        continue
+                    if self._closed:
+                        break
+                    self._handle_message(conns[conn])  # type: ignore
+
+
+class SolverRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API:
+        POST /solve?max_time=&max_sols=&mode=&profile=&wait=  body: puzzle JSON. Returns the job, with its result
+            if wait (default true), else 202 with the job id.
+        GET /jobs/<id>                 the job state and result
+        DELETE /jobs/<id>, POST /jobs/<id>/cancel   cancels the job
+        GET /metrics                   queue depth, workers and counters
+    """
+    server: 'SolverHTTPServer | SolverUnixHTTPServer'  # type: ignore
+    protocol_version = 'HTTP/1.1'
+
+    def address_string(self) -> str:
+        # unix socket client addresses are empty strings
+        return str(self.client_address[0]) if self.client_address else 'unix'
+
+    def log_message(self, format: str, *args: Any):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status: HTTPStatus, data: Any):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status: HTTPStatus, message: str):
+        self.send_json(status, {'error': message})
+
+    def read_json_body(self) -> Any:
+        length = int(self.headers.get('Content-Length', 0))
+        return json.loads(self.rfile.read(length))
+
+    def request_options(self, query: dict[str, list[str]]) -> SolverOptions:
+        options = copy.copy(self.server.default_options)
+        if 'profile' in query:
+            options = apply_solver_profile(options, query['profile'][0])  # type: ignore
+        if 'max_time' in query:
+            options.max_time = min(int(query['max_time'][0]), self.server.max_time_limit)
+        if 'max_sols' in query:
+            options.max_sols = int(query['max_sols'][0])
+        if options.max_time <= 0 or options.max_sols <= 0:
+            raise ValueError("max_time and max_sols must be positive")
+        return options
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+        pool = self.server.pool
+        if parts == ['metrics']:
+            self.send_json(HTTPStatus.OK, pool.metrics())
+        elif parts == ['health']:
+            self.send_json(HTTPStatus.OK, {'ok': True})
+        elif len(parts) == 2 and parts[0] == 'jobs':
+            job = pool.get(parts[1])
+            if job is None:
+                self.send_error_json(HTTPStatus.NOT_FOUND, f"Unknown job {parts[1]}")
+            else:
+                self.send_json(HTTPStatus.OK, job.to_dict())
+        else:
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"Unknown path {url.path}")
+
+    def do_DELETE(self):
+        parts = urlparse(self.path).path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] == 'jobs':
+            self.cancel_job(parts[1])
+        else:
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"Unknown path {self.path}")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        parts = url.path.strip('/').split('/')
+        if len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'cancel':
+            self.cancel_job(parts[1])
+        elif parts == ['solve']:
+            self.solve(parse_qs(url.query))
+        else:
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"Unknown path {url.path}")
+
+    def cancel_job(self, job_id: str):
+        job = self.server.pool.cancel(job_id)
+        if job is None:
+            self.send_error_json(HTTPStatus.NOT_FOUND, f"Unknown job {job_id}")
+            return
+        job.finished.wait()
+        self.send_json(HTTPStatus.OK, job.to_dict())
+
+    def solve(self, query: dict[str, list[str]]):
+        try:
+            options = self.request_options(query)
+            mode = query.get('mode', ['enumerate'])[0]
+            if mode not in SOLVE_MODES:
+                raise ValueError(f"Unknown mode '{mode}'. Must be one of {SOLVE_MODES}.")
+            puzzle_data = self.read_json_body()
+            if not isinstance(puzzle_data, dict):
+                raise ValueError("The body must be a puzzle JSON object")
+        except ValueError as e:
+            self.send_error_json(HTTPStatus.BAD_REQUEST, str(e))
+            return
+
+        job = self.server.pool.submit(puzzle_data, options, mode)  # type: ignore
+        if query.get('wait', ['true'])[0].lower() in ('0', 'false', 'no'):
+            self.send_json(HTTPStatus.ACCEPTED, job.to_dict())
+            return
+        job.finished.wait()
+        self.send_json(HTTPStatus.OK, job.to_dict())
+
+
+class SolverServerMixin:
+    pool: SolverPool
+    default_options: SolverOptions
+    max_time_limit: int
+    verbose: bool
+
+    def setup_solver(self, pool: SolverPool, default_options: SolverOptions, max_time_limit: int,
+                     verbose: bool = False):
+        self.pool = pool
+        self.default_options = default_options
+        self.max_time_limit = max_time_limit
+        self.verbose = verbose
+
+
+class SolverHTTPServer(SolverServerMixin, ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class SolverUnixHTTPServer(SolverServerMixin, socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self) -> tuple[socket.socket, Any]:
+        request, _ = super().get_request()
+        return request, ('unix', 0)
+
+
+def make_server(pool: SolverPool, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_socket: str | None = None,
+                default_options: SolverOptions | None = None, max_time_limit: int = MAX_TIME,
+                verbose: bool = False) -> SolverHTTPServer | SolverUnixHTTPServer:
+    """
+    Args:
+        pool (SolverPool): a started pool.
+        host (str, optional): Defaults to DEFAULT_HOST = '127.0.0.1'.
+        port (int, optional): Defaults to DEFAULT_PORT = 8765. 0 picks a free port.
+        unix_socket (str | None, optional): Defaults to None. Listen on this unix socket instead of host:port.
+            A socket already at this path is replaced, raises FileExistsError if another kind of file is.
+        default_options (SolverOptions | None, optional): Defaults to None (SolverOptions with quiet output).
+            Options of every request, max_time and max_sols can be overridden per request.
+        max_time_limit (int, optional): Defaults to MAX_TIME = 240. Upper bound of the per-request max_time.
+        verbose (bool, optional): Defaults to False. Log every request.
+    """
+    if default_options is None:
+        default_options = SolverOptions(max_time=min(MAX_TIME, max_time_limit), max_sols=MAX_SOLS)
+    default_options = copy.copy(default_options)
+    default_options.quiet = True
+    default_options.log_solutions = False
+
+    server: SolverHTTPServer | SolverUnixHTTPServer
+    if unix_socket is not None:
+        if os.path.exists(unix_socket):
+            # a stale socket of an earlier run is replaced, any other file is left alone
+            if not stat.S_ISSOCK(os.stat(unix_socket).st_mode):
+                raise FileExistsError(f"{unix_socket} exists and is not a unix socket")
+            os.remove(unix_socket)
+        server = SolverUnixHTTPServer(unix_socket, SolverRequestHandler)
+    else:
+        server = SolverHTTPServer((host, port), SolverRequestHandler)
+    server.setup_solver(pool, default_options, max_time_limit, verbose)
+    return server
+
+
+def make_serve_parser():
+    parser = argparse.ArgumentParser(
+        prog='psolver serve',
+        description='Runs a local JSON solver service with a pool of warm solver processes.')
+    parser.add_argument('--host', dest='host', default=DEFAULT_HOST, type=str,
+                        help=f'the address to listen on. Default is {DEFAULT_HOST}.')
+    parser.add_argument('--port', dest='port', default=DEFAULT_PORT, type=int,
+                        help=f'the port to listen on. Default is {DEFAULT_PORT}.')
+    parser.add_argument('--unix', dest='unix_socket', default=None, type=str,
+                        help='listen on this unix socket instead of host and port')
+    parser.add_argument('--workers', dest='workers', default=None, type=int,
+                        help='the number of solver processes. Default is the number of cores.')
+    parser.add_argument('--max_time', dest='max_time', default=MAX_TIME, type=int,
+                        help=f'the default and maximum max_time of a request. Default is {MAX_TIME} s.')
+    parser.add_argument('--max_sols', dest='max_sols', default=MAX_SOLS, type=int,
+                        help=f'the default max_sols of a request. Default is {MAX_SOLS}.')
+    parser.add_argument('--solver_workers', dest='num_workers', default=1, type=int,
+                        help='the number of cp-sat workers of each solve. Default is 1.')
+    parser.add_argument('-v', '--verbose', dest='verbose', action='store_true',
+                        help='log every request')
+    return parser
+
+
+def serve_main(argv: list[str] | None = None):
+    args = make_serve_parser().parse_args(argv)
+    options = SolverOptions(args.max_time, args.max_sols, num_workers=args.num_workers)
+
+    with SolverPool(args.workers) as pool:
+        try:
+            server = make_server(pool, args.host, args.port, args.unix_socket, options, args.max_time, args.verbose)
+        except FileExistsError as e:
+            sys.exit(f"Error: {e}")
+        address = args.unix_socket if args.unix_socket else f"http://{args.host}:{server.server_address[1]}"
+        print(f"Serving on {address} with {pool.n_workers} solver processes", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
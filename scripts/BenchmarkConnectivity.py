@@ -0,0 +1,114 @@
+import argparse
+import contextlib
+import io
+import os
+import time
+
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.Puzzle2model.connectivity_csp import CONNECTIVITY_ENCODINGS, ConnectivityEncoding
+from puzzlesolver.Puzzle2model.puzzle2model import puzzle2model
+from puzzlesolver.SolvePuzzle import SolverOptions, check_unique_solution
+
+MAX_TIME = 60
+
+
+class EncodingResult:
+    variables: int
+    constraints: int
+    build_time: float
+    solve_time: float
+    verdict: str
+
+    def __init__(self, variables: int, constraints: int, build_time: float) -> None:
+        self.variables = variables
+        self.constraints = constraints
+        self.build_time = build_time
+        self.solve_time = 0.0
+        self.verdict = ""
+
+
+def build_with_encoding(puzzle: Puzzle, encoding: ConnectivityEncoding) -> EncodingResult:
+    start_time = time.perf_counter()
+    puzzle_model = puzzle2model(puzzle, encoding)
+    build_time = time.perf_counter() - start_time
+    proto = puzzle_model.Proto()
+    return EncodingResult(len(proto.variables), len(proto.constraints), build_time)
+
+
+def benchmark_puzzle(filepath: str, max_time: int, solve: bool) -> dict[ConnectivityEncoding, EncodingResult] | None:
+    """Builds the puzzle with every connectivity encoding. Puzzles that don't use connectivity
+    constraints (same model size for every encoding) are skipped."""
+    puzzle = Puzzle.fromJSON(filepath)
+    results = {encoding: build_with_encoding(puzzle, encoding)
+               for encoding in CONNECTIVITY_ENCODINGS}
+    if len(set(result.variables for result in results.values())) == 1:
+        return None
+
+    if solve:
+        for encoding, result in results.items():
+            options = SolverOptions(
+                max_time=max_time, connectivity_encoding=encoding)
+            with contextlib.redirect_stdout(io.StringIO()):
+                verdict = check_unique_solution(filepath, options)
+            result.solve_time = verdict.wall_time
+            result.verdict = verdict.verdict
+    return results
+
+
+def print_row(name: str, results: dict[ConnectivityEncoding, EncodingResult]):
+    cols = [f"{name[:40]:40s}"]
+    for encoding in CONNECTIVITY_ENCODINGS:
+        result = results[encoding]
+        cols.append(f"{result.variables:8d} {result.constraints:8d} {result.build_time:7.2f} "
+                    f"{result.solve_time:7.2f} {result.verdict:8s}")
+    print(' | '.join(cols), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compares the connectivity encodings on the puzzles that use them.')
+    parser.add_argument('path', type=str, nargs='?', default='./data/Solved/',
+                        help='folder with the puzzles. Default is ./data/Solved/')
+    parser.add_argument('--max_time', dest='max_time', default=MAX_TIME, type=int,
+                        help=f'maximum solve time per puzzle and encoding. Default is {MAX_TIME} s.')
+    parser.add_argument('--build_only', dest='build_only', action="store_true",
+                        help='only compare model sizes and build times')
+    args = parser.parse_args()
+
+    filepaths = sorted(entry.path for entry in os.scandir(args.path)
+                       if entry.is_file() and entry.name.endswith('.json'))
+
+    header = [f"{'puzzle':40s}"] + [f"{encoding + ' (vars, cons, build s, solve s, verdict)':50s}"
+                                     for encoding in CONNECTIVITY_ENCODINGS]
+    print(' | '.join(header))
+
+    totals: dict[ConnectivityEncoding, list[float]] = {
+        encoding: [0, 0, 0.0, 0.0] for encoding in CONNECTIVITY_ENCODINGS}
+    n = 0
+    for filepath in filepaths:
+        try:
+            results = benchmark_puzzle(
+                filepath, args.max_time, not args.build_only)
+        except Exception as e:
+            print(f"Error in {filepath}: {e}")
+            continue
+        if results is None:
+            continue
+
+        n += 1
+        print_row(os.path.basename(filepath), results)
+        for encoding, result in results.items():
+            total = totals[encoding]
+            total[0] += result.variables
+            total[1] += result.constraints
+            total[2] += result.build_time
+            total[3] += result.solve_time
+
+    print(f"\nTotals over {n} puzzles using connectivity constraints")
+    for encoding, (variables, constraints, build_time, solve_time) in totals.items():
+        print(f"  {encoding:10s}: variables {int(variables)}, constraints {int(constraints)}, "
+              f"build time {build_time:.2f} s, solve time {solve_time:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
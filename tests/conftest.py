@@ -0,0 +1,36 @@
+import json
+import os
+from typing import Any
+
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+
+
+def puzzle_data(size: int = 9, givens: dict[tuple[int, int], int] | None = None,
+                local_constraints: dict | None = None, bool_constraints: dict | None = None,
+                valid_digits: list[int] | None = None) -> dict[str, Any]:
+    """Puzzle JSON (the Puzzle.fromJSON format) of a size x size grid with givens and constraints"""
+    grid: list[list[dict[str, Any]]] = [[{} for _ in range(size)] for _ in range(size)]
+    for (r, c), value in (givens or {}).items():
+        grid[r][c] = {'value': value, 'given': True}
+    data = {'nRows': size, 'nCols': size, 'puzzleInfo': {'title': 'Test'}, 'grid': grid,
+            'local_constraints': local_constraints or {}, 'bool_constraints': bool_constraints or {}}
+    if valid_digits is not None:
+        data['valid_digits'] = valid_digits
+    return data
+
+
+def write_puzzle(path, size: int = 9, givens: dict[tuple[int, int], int] | None = None,
+                 local_constraints: dict | None = None, bool_constraints: dict | None = None,
+                 valid_digits: list[int] | None = None) -> str:
+    """Writes the puzzle_data to path/puzzle.json and returns the file path"""
+    filepath = os.path.join(path, 'puzzle.json')
+    with open(filepath, 'w') as file:
+        json.dump(puzzle_data(size, givens, local_constraints, bool_constraints, valid_digits), file)
+    return filepath
+
+
+def load_puzzle(path, size: int = 9, givens: dict[tuple[int, int], int] | None = None,
+                local_constraints: dict | None = None, bool_constraints: dict | None = None,
+                valid_digits: list[int] | None = None) -> Puzzle:
+    """The parsed Puzzle of write_puzzle"""
+    return Puzzle.fromJSON(write_puzzle(path, size, givens, local_constraints, bool_constraints, valid_digits))
@@ -0,0 +1,106 @@
+import json
+import sys
+
+import pytest
+
+from puzzlesolver.SolvePuzzle import SolverOptions, main, solution_to_str, solve_puzzle, solve_puzzle_result, \
+    solve_puzzles_parallel, split_cores
+
+
+class TestSplitCores:
+
+    @pytest.mark.parametrize("jobs, policy, n_cores, output", [
+        (4, 'pool', 8, (4, 1)),
+        (16, 'pool', 8, (8, 1)),
+        (4, 'balanced', 8, (4, 2)),
+        (3, 'balanced', 8, (3, 2)),
+        (16, 'balanced', 8, (8, 1)),
+        (1, 'balanced', 8, (1, 8)),
+        (4, 'solver', 8, (4, 0)),
+        (16, 'solver', 8, (8, 0)),
+        (0, 'pool', 8, (1, 1)),
+    ])
+    def test_split(self, jobs: int, policy, n_cores: int, output: tuple[int, int]):
+        assert split_cores(jobs, policy, n_cores, parallel_search=True) == output
+
+    @pytest.mark.parametrize("jobs, policy, output", [
+        (4, 'pool', (4, 1)),
+        (4, 'balanced', (4, 1)),
+        (1, 'balanced', (1, 1)),
+        (16, 'solver', (8, 1)),
+    ])
+    def test_split_enumeration(self, jobs: int, policy, output: tuple[int, int]):
+        assert split_cores(jobs, policy, 8) == output
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError):
+            split_cores(2, 'unknown', 8)  # type: ignore
+
+
+class TestSolvePuzzlesParallel:
+
+    def test_batch(self):
+        filepaths = ['./data/Solved/400kSubscribers_by_PjotrV.json',
+                     './data/Solved/DoesNotExist.json']
+        options = SolverOptions(max_time=60)
+
+        results = list(solve_puzzles_parallel(filepaths, options, 2, 'pool'))
+        by_file = {result.filepath: result for result in results}
+
+        assert len(results) == 2
+        solved = by_file[filepaths[0]]
+        assert solved.error is None
+        assert solved.solution_count == 1
+        assert solved.verdict == 'unique'
+        assert "Statistics" in solved.output
+        assert by_file[filepaths[1]].error is not None
+
+    def test_enumeration_workers(self):
+        # several workers make cp-sat reject an enumeration as MODEL_INVALID
+        solver, solution_printer = solve_puzzle('./data/Solved/400kSubscribers_by_PjotrV.json',
+                                                SolverOptions(max_time=60, num_workers=2))
+        assert solver.StatusName() == 'OPTIMAL'
+        assert solution_printer.solution_count() == 1
+
+    def test_batch_unique_mode(self):
+        filepaths = ['./data/Solved/400kSubscribers_by_PjotrV.json']
+        options = SolverOptions(max_time=60)
+
+        results = list(solve_puzzles_parallel(
+            filepaths, options, 2, 'pool', 'unique'))
+
+        assert len(results) == 1
+        assert results[0].error is None
+        assert results[0].verdict == 'unique'
+        assert "Verdict" in results[0].output
+
+
+class TestResultRecord:
+
+    def test_solution_to_str(self):
+        assert solution_to_str({(1, 0): 3, (0, 1): 2, (0, 0): 1, (1, 1): 4}) == '1234'
+        assert solution_to_str({(0, 0): 10, (0, 1): -1}) == '10,-1'
+
+    def test_record(self):
+        filepath = './data/Solved/400kSubscribers_by_PjotrV.json'
+        record = solve_puzzle_result(filepath, SolverOptions(max_time=60)).to_dict()
+
+        assert record['file'] == filepath
+        assert record['title'] == '400k Subscribers'
+        assert (record['status'], record['verdict']) == ('OPTIMAL', 'unique')
+        assert len(record['solutions']) == 1 and len(record['solutions'][0]) == 81
+        assert record['variables'] > 0 and record['constraints'] > 0
+        assert record['error'] is None
+        assert record['phases']['load_time'] > 0
+        assert record['phases']['exhaustion_time'] == record['wall_time']
+
+    def test_ndjson_output(self, monkeypatch, capsys):
+        filepaths = ['./data/Solved/400kSubscribers_by_PjotrV.json', './data/Solved/DoesNotExist.json']
+        monkeypatch.setattr(sys, 'argv', ['psolver', *filepaths, '--output', 'ndjson', '--mode', 'unique'])
+        # a puzzle failed
+        assert main() == 1
+
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert [record['file'] for record in records] == filepaths
+        assert records[0]['verdict'] == 'unique'
+        assert records[1]['error'] is not None
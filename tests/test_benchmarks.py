@@ -0,0 +1,62 @@
+import importlib.util
+import json
+import os
+
+import pytest
+
+from puzzlesolver.SolvePuzzle import SolverOptions
+
+BENCHMARKS_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 'benchmarks', 'run_benchmarks.py')
+
+
+@pytest.fixture(scope='module')
+def run_benchmarks():
+    spec = importlib.util.spec_from_file_location('run_benchmarks', BENCHMARKS_SCRIPT)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def puzzle_result(verdict: str = 'unique', build_time: float = 0.1, presolve_time: float = 0.1,
+                  solve_time: float = 1.0):
+    return {'verdict': verdict, 'median': {'build_time': build_time, 'presolve_time': presolve_time,
+                                           'solve_time': solve_time}}
+
+
+class TestBenchmarks:
+
+    def test_run_puzzle(self, run_benchmarks):
+        result = run_benchmarks.run_puzzle('./data/Solved/400kSubscribers_by_PjotrV.json',
+                                           SolverOptions(max_time=60, num_workers=1), 2, 0)
+        assert result['verdict'] == 'unique'
+        assert [run['seed'] for run in result['runs']] == [0, 1]
+        assert result['median']['solve_time'] > 0
+        assert result['median']['presolve_time'] > 0
+        assert result['variables'] > 0
+
+    def test_run_puzzle_error(self, run_benchmarks):
+        result = run_benchmarks.run_puzzle('./data/Solved/DoesNotExist.json', SolverOptions(), 1, 0)
+        assert result['verdict'] == 'error'
+        assert result['median'] is None
+
+    def test_compare(self, run_benchmarks):
+        baseline = {'puzzles': {'a': puzzle_result(), 'b': puzzle_result(), 'c': puzzle_result()}}
+        current = {'puzzles': {'a': puzzle_result(solve_time=1.1),
+                               'b': puzzle_result(solve_time=2.0),
+                               'c': puzzle_result(verdict='unknown', build_time=0.12)}}
+        regressions = run_benchmarks.compare(baseline, current, 0.25, 0.05)
+        assert len(regressions) == 2
+        assert regressions[0].startswith('b: solve_time')
+        assert regressions[1] == 'c: verdict unique -> unknown'
+
+    def test_subset_files_exist(self, run_benchmarks):
+        with open(run_benchmarks.SUBSET_FILE) as file:
+            subset = json.load(file)['puzzles']
+        with open(run_benchmarks.BASELINE_FILE) as file:
+            baseline = json.load(file)
+        assert subset
+        for entry in subset:
+            assert os.path.isfile(os.path.join(run_benchmarks.REPO_DIR, entry['file']))
+            assert os.path.basename(entry['file']) in baseline['puzzles']
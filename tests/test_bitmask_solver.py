@@ -0,0 +1,168 @@
+import pytest
+from ortools.sat.python import cp_model
+
+import puzzlesolver.SolvePuzzle as SolvePuzzle
+from puzzlesolver.BitmaskSolver import BitmaskPuzzle, BitmaskSearch, bitmask_supported
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.Puzzle2model.puzzle2model import puzzle2model
+from puzzlesolver.SolvePuzzle import SolverOptions, check_unique_solution, solve_puzzle, solve_puzzle_result, \
+    use_bitmask_backend
+from conftest import load_puzzle
+
+CLASSIC_PUZZLE = './data/Solved/ClassicSudokuHard-1.json'
+
+
+def cp_sat_solutions(puzzle: Puzzle) -> set[tuple[int, ...]]:
+    model = puzzle2model(puzzle)
+    cells_vars = model.grid_vars_dict['cells_grid_vars']
+    keys = sorted(cells_vars.keys())
+    solutions: set[tuple[int, ...]] = set()
+
+    class Collector(cp_model.CpSolverSolutionCallback):
+        def on_solution_callback(self):
+            solutions.add(tuple(self.value(cells_vars[key]) for key in keys))
+
+    solver = cp_model.CpSolver()
+    solver.parameters.enumerate_all_solutions = True
+    solver.solve(model, Collector())
+    return solutions
+
+
+def bitmask_solutions(puzzle: Puzzle, max_sols: int = 100000) -> set[tuple[int, ...]]:
+    search = BitmaskSearch(BitmaskPuzzle.from_puzzle(puzzle), max_sols, 60).run()
+    assert search.exhausted
+    return {tuple(solution[key] for key in sorted(solution)) for solution in search.solutions}
+
+
+class TestBitmaskSupported:
+
+    @pytest.mark.parametrize("bool_constraints, supported", [
+        ({}, True),
+        ({'Antiknight': True, 'Antiking': True}, True),
+        ({'Positive Diagonal': True, 'Negative Diagonal': True, 'Disjoint Groups': True}, True),
+        ({'Antiknight': False, 'Nonconsecutive': False}, True),
+        ({'Nonconsecutive': True}, False),
+        ({'Normal Sudoku Rules Do Not Apply': True}, False),
+    ])
+    def test_bool_constraints(self, tmp_path, bool_constraints: dict, supported: bool):
+        assert bitmask_supported(load_puzzle(tmp_path, 4, bool_constraints=bool_constraints)) == supported
+
+    def test_local_constraints(self, tmp_path):
+        cages = {'Killer Cage': [{'cells': ['R1C1', 'R1C2'], 'value': '3'}]}
+        assert not bitmask_supported(load_puzzle(tmp_path, 4, local_constraints=cages))
+
+    @pytest.mark.parametrize("valid_digits, supported", [([0, 1, 2, 3], True), ([1, 1, 2, 2], False),
+                                                          ([1, 2, 4, 5], False)])
+    def test_valid_digits(self, tmp_path, valid_digits: list[int], supported: bool):
+        assert bitmask_supported(load_puzzle(tmp_path, 4, valid_digits=valid_digits)) == supported
+
+    def test_classic(self):
+        assert bitmask_supported(Puzzle.fromJSON(CLASSIC_PUZZLE))
+
+
+class TestBitmaskSearch:
+
+    @pytest.mark.parametrize("bool_constraints", [
+        {}, {'Antiknight': True}, {'Antiking': True}, {'Positive Diagonal': True, 'Negative Diagonal': True},
+        {'Disjoint Groups': True},
+    ])
+    def test_same_solutions(self, tmp_path, bool_constraints: dict):
+        puzzle = load_puzzle(tmp_path, 4, bool_constraints=bool_constraints)
+        assert bitmask_solutions(puzzle) == cp_sat_solutions(puzzle)
+
+    def test_same_solutions_6x6(self, tmp_path):
+        puzzle = load_puzzle(tmp_path, 6, {(0, 0): 1, (1, 4): 2, (3, 3): 5, (5, 1): 6},
+                             bool_constraints={'Negative Diagonal': True})
+        solutions = bitmask_solutions(puzzle)
+        assert len(solutions) > 1
+        assert solutions == cp_sat_solutions(puzzle)
+
+    def test_all_4x4_grids(self, tmp_path):
+        assert len(bitmask_solutions(load_puzzle(tmp_path, 4))) == 288
+
+    def test_contradiction(self, tmp_path):
+        search = BitmaskSearch(BitmaskPuzzle.from_puzzle(load_puzzle(tmp_path, 4, givens={(0, 0): 1, (0, 3): 1})),
+                               20, 60).run()
+        assert (search.verdict(), search.status_name(), search.branches) == ('none', 'INFEASIBLE', 0)
+
+    def test_max_sols(self, tmp_path):
+        search = BitmaskSearch(BitmaskPuzzle.from_puzzle(load_puzzle(tmp_path, 4)), 5, 60).run()
+        assert len(search.solutions) == 5
+        assert not search.exhausted
+        assert (search.verdict(), search.status_name()) == ('multiple', 'FEASIBLE')
+
+    def test_max_stored_solutions(self, tmp_path):
+        search = BitmaskSearch(BitmaskPuzzle.from_puzzle(load_puzzle(tmp_path, 4)), 30, 60,
+                               max_stored_solutions=5).run()
+        assert (search.solution_count, len(search.solutions)) == (30, 5)
+        assert search.result().unique_solution_count == 30
+
+    def test_max_branches(self, tmp_path):
+        search = BitmaskSearch(BitmaskPuzzle.from_puzzle(load_puzzle(tmp_path, 4)), 1000, 60, max_branches=3).run()
+        assert search.branch_limit_reached and not search.exhausted
+        assert search.branches == 3
+
+    def test_should_stop(self, tmp_path):
+        search = BitmaskSearch(BitmaskPuzzle.from_puzzle(load_puzzle(tmp_path, 9)), 100000, 60,
+                               should_stop=lambda: True).run()
+        assert not search.exhausted
+        assert search.status_name() == 'FEASIBLE'
+
+    def test_result(self):
+        search = BitmaskSearch(BitmaskPuzzle.from_puzzle(Puzzle.fromJSON(CLASSIC_PUZZLE)), 20, 60).run()
+        result = search.result()
+        assert (result.verdict, result.status_name, result.solution_count) == ('unique', 'OPTIMAL', 1)
+        assert result.model_size is None
+        assert result.is_exhausted()
+
+
+class TestBackendSelection:
+
+    def test_same_verdict(self):
+        bitmask = check_unique_solution(CLASSIC_PUZZLE, SolverOptions(max_time=60, backend='bitmask'))
+        cp_sat = check_unique_solution(CLASSIC_PUZZLE, SolverOptions(max_time=60, backend='cp-sat'))
+        assert (bitmask.verdict, bitmask.status_name) == (cp_sat.verdict, cp_sat.status_name) == \
+            ('unique', 'INFEASIBLE')
+        assert bitmask.solutions == cp_sat.solutions
+        assert bitmask.model_size is None
+        assert bitmask.phase_times.exhaustion_time == bitmask.wall_time
+
+    def test_enumeration(self):
+        solver, solution_printer = solve_puzzle(CLASSIC_PUZZLE, SolverOptions(max_time=60))
+        assert solver.StatusName() == 'OPTIMAL'
+        assert solution_printer.solution_count() == solution_printer.unique_solution_count() == 1
+        assert solution_printer.model_size() is None
+
+    def test_auto(self, tmp_path):
+        puzzle = Puzzle.fromJSON(CLASSIC_PUZZLE)
+        assert use_bitmask_backend(puzzle, SolverOptions())
+        assert not use_bitmask_backend(puzzle, SolverOptions(backend='cp-sat'))
+        assert not use_bitmask_backend(puzzle, SolverOptions(log_solutions=True))
+        assert not use_bitmask_backend(puzzle, SolverOptions(), hint={(0, 0): 1})
+        assert use_bitmask_backend(puzzle, SolverOptions(backend='bitmask'), hint={(0, 0): 1})
+        assert not use_bitmask_backend(load_puzzle(tmp_path, 4, bool_constraints={'Nonratio': True}), SolverOptions())
+
+    def test_unsupported(self):
+        result = solve_puzzle_result('./data/Solved/400kSubscribers_by_PjotrV.json',
+                                     SolverOptions(max_time=60, backend='bitmask'), 'unique')
+        assert result.error is not None and 'bitmask' in result.error
+
+    def test_fallback(self, monkeypatch):
+        # a branch limit of 1 on a puzzle that needs more branches
+        monkeypatch.setattr(SolvePuzzle, 'AUTO_MAX_BRANCHES', 1)
+        max_times: list[float] = []
+        configure_solver = SolvePuzzle.configure_solver
+
+        def recording_configure_solver(solver, options, max_time, *args, **kwargs):
+            max_times.append(max_time)
+            configure_solver(solver, options, max_time, *args, **kwargs)
+
+        monkeypatch.setattr(SolvePuzzle, 'configure_solver', recording_configure_solver)
+        for mode in ('unique', 'enumerate'):
+            result = solve_puzzle_result(CLASSIC_PUZZLE, SolverOptions(max_time=60), mode)  # type: ignore
+            assert result.verdict == 'unique'
+            assert 'solving with cp-sat' in result.output
+            assert result.model_size is not None
+            # cp-sat gets what the search left of max_time
+            assert result.phase_times.bitmask_time > 0
+            assert max_times[-1] == 60 - result.phase_times.bitmask_time
@@ -0,0 +1,47 @@
+import json
+
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.Puzzle2model.BuildProfiler import BuildProfiler
+from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.puzzle2model import puzzle2model
+
+
+class TestBuildProfiler:
+
+    def test_measure(self):
+        model = PuzzleModel()
+        profiler = BuildProfiler()
+
+        with profiler.measure(model, 'step'):
+            x = model.NewIntVar(0, 9, 'x')
+            y = model.NewIntVar(0, 9, 'y')
+            model.Add(x + y == 9)
+            model.Add(x != y)
+        with profiler.measure(model, 'empty step'):
+            pass
+
+        step, empty_step = profiler.records
+        assert (step.name, step.variables, step.constraints) == ('step', 2, 2)
+        assert empty_step.is_empty()
+        assert profiler.total().variables == 2
+        assert 'empty step' not in profiler.to_table()
+        assert 'empty step' in profiler.to_table(include_empty=True)
+
+    def test_puzzle2model(self):
+        puzzle = Puzzle.fromJSON('./data/Solved/400kSubscribers_by_PjotrV.json')
+        profiler = BuildProfiler()
+        model = puzzle2model(puzzle, build_profiler=profiler)
+
+        total = profiler.total()
+        assert total.variables == model._variable_counter
+        assert total.constraints == len(model.Proto().constraints)
+        assert any(r.name == 'set_sudoku_constraints' for r in profiler.records)
+
+        report = json.loads(profiler.report('json'))
+        assert report['total']['variables'] == total.variables
+        assert len(report['setters']) == len(profiler.records)
+
+    def test_no_profiler(self):
+        puzzle = Puzzle.fromJSON('./data/Solved/400kSubscribers_by_PjotrV.json')
+        model = puzzle2model(puzzle)
+        assert model.build_profiler is None
@@ -0,0 +1,123 @@
+import itertools
+
+import pytest
+from ortools.sat.python import cp_model
+
+from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.cage_combinations import CAGE_CACHE_SIZE, cage_combinations, cage_combinations_csp, \
+    cage_table
+from puzzlesolver.Puzzle2model.custom_constraints import masked_sum_csp
+
+DIGITS = tuple(range(1, 10))
+
+
+def brute_force_combinations(size: int, total: int, digits: tuple[int, ...]) -> tuple[tuple[int, ...], ...]:
+    return tuple(combination for combination in itertools.combinations(sorted(digits), size)
+                 if sum(combination) == total)
+
+
+def count_solutions(model: cp_model.CpModel) -> int:
+    class Counter(cp_model.CpSolverSolutionCallback):
+        def __init__(self):
+            super().__init__()
+            self.count = 0
+
+        def on_solution_callback(self):
+            self.count += 1
+
+    solver = cp_model.CpSolver()
+    solver.parameters.enumerate_all_solutions = True
+    counter = Counter()
+    solver.solve(model, counter)
+    return counter.count
+
+
+def cage_model(size: int, total: int, use_table: bool) -> tuple[PuzzleModel, list[cp_model.IntVar]]:
+    model = PuzzleModel()
+    cells_vars = [model.NewIntVar(1, 9, f"cell_{i}") for i in range(size)]
+    model.AddAllDifferent(cells_vars)
+    model.Add(sum(cells_vars) == total)
+    cage_combinations_csp(model, cells_vars, total, "", use_table)
+    return model, cells_vars
+
+
+class TestCageCombinations:
+
+    @pytest.mark.parametrize("size, total", [(1, 5), (2, 3), (2, 10), (3, 7), (3, 24), (4, 20), (5, 25),
+                                             (9, 45), (2, 18), (3, 5)])
+    def test_brute_force(self, size: int, total: int):
+        assert cage_combinations(size, total, DIGITS) == brute_force_combinations(size, total, DIGITS)
+
+    @pytest.mark.parametrize("digits", [(0, 1, 2, 3, 4, 5, 6, 7, 8), (2, 4, 6, 8), (1, 3, 3, 5, 7)])
+    def test_other_digits(self, digits: tuple[int, ...]):
+        for size, total in itertools.product(range(1, 4), range(0, 20)):
+            assert cage_combinations(size, total, digits) == brute_force_combinations(size, total,
+                                                                                      tuple(set(digits)))
+
+    def test_memoized(self):
+        cage_combinations.cache_clear()
+        first = cage_combinations(3, 15, DIGITS)
+        assert cage_combinations(3, 15, DIGITS) is first
+        assert cage_combinations.cache_info().hits == 1
+        # bounded in long-lived solver processes
+        assert cage_combinations.cache_info().maxsize == cage_table.cache_info().maxsize == CAGE_CACHE_SIZE
+
+    def test_too_many(self):
+        assert cage_combinations(12, 160, tuple(range(1, 26))) is None
+
+    def test_table(self):
+        # the permutations of {1, 2, 3} allowed by the domains of the cells
+        assert cage_table(6, ((1, 2, 3), (1, 3), (1, 2, 3))) == ((1, 3, 2), (2, 1, 3), (2, 3, 1), (3, 1, 2))
+        assert cage_table(4, ((1, 2, 3), (1, 3))) == ((1, 3), (3, 1))
+        # 9! permutations of the only set
+        assert cage_table(45, (DIGITS,) * 9) is None
+
+
+class TestCageCombinationsCSP:
+
+    @pytest.mark.parametrize("size, total", [(2, 3), (2, 10), (3, 7), (3, 15), (4, 11), (4, 20), (5, 35)])
+    @pytest.mark.parametrize("use_table", [True, False])
+    def test_same_solutions(self, size: int, total: int, use_table: bool):
+        model, _ = cage_model(size, total, use_table)
+        expected = sum(len(list(itertools.permutations(combination)))
+                       for combination in brute_force_combinations(size, total, DIGITS))
+        assert count_solutions(model) == expected
+
+    def test_impossible_total(self):
+        model, _ = cage_model(2, 18, True)
+        solver = cp_model.CpSolver()
+        assert solver.solve(model) == cp_model.INFEASIBLE
+
+    def test_domains(self):
+        # 3 cells summing to 23 only use {6, 8, 9}
+        model, cells_vars = cage_model(3, 23, False)
+        cells_indices = {var.Index() for var in cells_vars}
+        domains = [list(constraint.linear.domain) for constraint in model.Proto().constraints
+                   if constraint.HasField('linear') and len(constraint.linear.vars) == 1
+                   and constraint.linear.vars[0] in cells_indices and not constraint.enforcement_literal]
+        assert domains == [[6, 6, 8, 9]] * 3
+
+    def test_table_size(self):
+        model, _ = cage_model(3, 15, True)
+        tables = [constraint for constraint in model.Proto().constraints if constraint.HasField('table')]
+        assert len(tables) == 1
+        assert len(tables[0].table.values) == 3 * 8 * 6
+
+
+class TestMaskedSumFixedMask:
+
+    @pytest.mark.parametrize("mask", [[1, 0, 1], [0, 0, 0], [1, 1, 1]])
+    def test_constant_mask(self, mask: list[int]):
+        model = cp_model.CpModel()
+        variables = [model.NewIntVar(1, 9, f"var_{i}") for i in range(3)]
+        mask_bools = [model.NewConstant(value) for value in mask]
+        for var, value in zip(variables, [2, 5, 7]):
+            model.Add(var == value)
+        n_vars = len(model.Proto().variables)
+        masked_sum = masked_sum_csp(model, variables, mask_bools, "")
+        # only the sum var is added
+        assert len(model.Proto().variables) == n_vars + 1
+
+        solver = cp_model.CpSolver()
+        solver.solve(model)
+        assert solver.value(masked_sum) == sum(value for value, bit in zip([2, 5, 7], mask) if bit)
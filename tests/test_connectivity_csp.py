@@ -0,0 +1,133 @@
+import itertools
+import pytest
+from ortools.sat.python import cp_model
+
+from puzzlesolver.Puzzle.Grid import Grid
+from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.connectivity_csp import CONNECTIVITY_ENCODINGS, ConnectivityEncoding, \
+    first_true_bools_csp
+from puzzlesolver.Puzzle2model.puzzle_csp_utils import bool_vars_grid_dict_from_puzzle_grid, \
+    orthogonally_connected_region_adjacency_vars_csp, orthogonally_connected_region_csp
+from puzzlesolver.Puzzle2model.puzzle_model_types import AdjacencyVarsDict, build_adjacency_dict
+
+
+def is_connected(cells: set[tuple[int, int]]) -> bool:
+    if not cells:
+        return True
+    start = next(iter(cells))
+    visited = {start}
+    stack = [start]
+    while stack:
+        r, c = stack.pop()
+        for adj in [(r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1)]:
+            if adj in cells and adj not in visited:
+                visited.add(adj)
+                stack.append(adj)
+    return len(visited) == len(cells)
+
+
+class SolutionCollector(cp_model.CpSolverSolutionCallback):
+
+    def __init__(self, region_vars):
+        cp_model.CpSolverSolutionCallback.__init__(self)
+        self._region_vars = region_vars
+        self.solutions: list[frozenset[tuple[int, int]]] = []
+
+    def on_solution_callback(self):
+        region = frozenset(key for key, var in self._region_vars.items()
+                           if self.Value(var))
+        self.solutions.append(region)
+
+
+def enumerate_regions(model: PuzzleModel, region_vars) -> list[frozenset[tuple[int, int]]]:
+    solver = cp_model.CpSolver()
+    solver.parameters.enumerate_all_solutions = True
+    collector = SolutionCollector(region_vars)
+    solver.Solve(model, collector)
+    return collector.solutions
+
+
+class TestFirstTrueBools:
+
+    @pytest.mark.parametrize("inputs", [list(p) for p in itertools.product([0, 1], repeat=4)])
+    def test_all(self, inputs: list[int]):
+        model = cp_model.CpModel()
+        variables = [model.NewBoolVar(f"{i}") for i, _ in enumerate(inputs)]
+        for var, val in zip(variables, inputs):
+            model.Add(var == val)
+        bools = first_true_bools_csp(model, variables, "")
+        solver = cp_model.CpSolver()
+        solver.Solve(model)
+
+        expected = [0] * len(inputs)
+        if 1 in inputs:
+            expected[inputs.index(1)] = 1
+        assert [solver.Value(b) for b in bools] == expected
+
+
+class TestOrthogonallyConnectedRegion:
+
+    @pytest.mark.parametrize("encoding", CONNECTIVITY_ENCODINGS)
+    def test_enumerate_3x3(self, encoding: ConnectivityEncoding):
+        grid = Grid(3, 3)
+        model = PuzzleModel(encoding)
+        region_vars = bool_vars_grid_dict_from_puzzle_grid(model, grid, "region")
+        orthogonally_connected_region_csp(
+            model, build_adjacency_dict(grid), region_vars, 9)
+
+        solutions = enumerate_regions(model, region_vars)
+        all_cells = list(region_vars.keys())
+        expected = set()
+        for n in range(len(all_cells) + 1):
+            for cells in itertools.combinations(all_cells, n):
+                if is_connected(set(cells)):
+                    expected.add(frozenset(cells))
+
+        # every connected region exactly once (auxiliary vars are fully determined)
+        assert len(solutions) == len(set(solutions))
+        assert set(solutions) == expected
+
+    @pytest.mark.parametrize("encoding", CONNECTIVITY_ENCODINGS)
+    def test_max_size(self, encoding: ConnectivityEncoding):
+        grid = Grid(1, 5)
+        model = PuzzleModel(encoding)
+        region_vars = bool_vars_grid_dict_from_puzzle_grid(model, grid, "region")
+        orthogonally_connected_region_csp(
+            model, build_adjacency_dict(grid), region_vars, 3)
+        solutions = enumerate_regions(model, region_vars)
+        assert max(len(region) for region in solutions) == 3
+
+    @pytest.mark.parametrize("encoding", CONNECTIVITY_ENCODINGS)
+    def test_seed(self, encoding: ConnectivityEncoding):
+        grid = Grid(2, 2)
+        model = PuzzleModel(encoding)
+        region_vars = bool_vars_grid_dict_from_puzzle_grid(model, grid, "region")
+        orthogonally_connected_region_csp(
+            model, build_adjacency_dict(grid), region_vars, 4, [(1, 1)])
+        solutions = enumerate_regions(model, region_vars)
+        assert all((1, 1) in region for region in solutions if region)
+        assert len(solutions) == len(set(solutions))
+
+
+class TestOrthogonallyConnectedRegionAdjacencyVars:
+
+    @pytest.mark.parametrize("encoding", CONNECTIVITY_ENCODINGS)
+    def test_fixed_edges(self, encoding: ConnectivityEncoding):
+        # 1x4 line, edges (0,0)-(0,1) and (0,2)-(0,3) on, (0,1)-(0,2) off
+        grid = Grid(1, 4)
+        model = PuzzleModel(encoding)
+        region_vars = bool_vars_grid_dict_from_puzzle_grid(model, grid, "region")
+        adjacency_vars: AdjacencyVarsDict = {key: {} for key in region_vars}
+        for c in range(3):
+            edge = model.NewBoolVar(f"edge {c}")
+            model.Add(edge == int(c != 1))
+            adjacency_vars[(0, c)][(0, c + 1)] = edge
+            adjacency_vars[(0, c + 1)][(0, c)] = edge
+        orthogonally_connected_region_adjacency_vars_csp(
+            model, adjacency_vars, region_vars, 4)
+
+        solutions = set(enumerate_regions(model, region_vars))
+        assert frozenset([(0, 0), (0, 1)]) in solutions
+        assert frozenset([(0, 2), (0, 3)]) in solutions
+        assert frozenset([(0, 1), (0, 2)]) not in solutions
+        assert frozenset([(0, 0), (0, 1), (0, 2), (0, 3)]) not in solutions
@@ -1,7 +1,9 @@
 import pytest
 
-from puzzlesolver.Puzzle2model.custom_constraints import are_all_diferent_csp, are_all_equal_csp, are_all_true_csp, are_any_true_csp, are_consecutive_csp, count_different_vars, count_in_set, count_transitions_csp, count_unique_values, count_vars, distance_csp, first_x_bools_csp, greater_than_all_csp, is_even_csp, is_increasing_strict_csp, is_inside_interval_2_csp, is_member_of, is_not_member_of, is_odd_csp, is_renban_csp, is_sandwiched_csp, is_whispers_csp, masked_count_vars, masked_sum_csp, modulo_count_csp, multiplication_csp, same_remainder_csp, sandwich_bools_csp, sandwich_sum_csp, scalar_product_csp, is_ratio_1_r_csp, shifted_first_x_bools_csp, x_sum_csp, xor_csp
+from puzzlesolver.Puzzle2model.custom_constraints import are_all_diferent_csp, are_all_equal_csp, are_all_true_csp, are_any_true_csp, are_consecutive_csp, count_different_vars, count_in_set, count_transitions_csp, count_unique_values, count_vars, distance_csp, forbid_assignment_csp, first_x_bools_csp, greater_than_all_csp, is_even_csp, is_increasing_strict_csp, is_equal_csp, is_inside_interval_2_csp, is_member_of, is_not_member_of, is_odd_csp, is_renban_csp, is_sandwiched_csp, is_whispers_csp, masked_count_vars, masked_sum_csp, modulo_count_csp, multiplication_csp, same_remainder_csp, sandwich_bools_csp, sandwich_sum_csp, scalar_product_csp, seen_before_bools_csp, is_ratio_1_r_csp, shifted_first_x_bools_csp, x_sum_csp, xor_csp
 from ortools.sat.python import cp_model
+
+from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
 import random
 
 
@@ -1494,6 +1496,60 @@ class TestSandwichBoolsCSP:
         self.run_test(variables, a, b, expected_result)
 
 
+class TestSandwichEncodingEquivalence:
+    """sandwich_bools_csp (one scan of the list) against is_sandwiched_csp (memberships for each index)"""
+
+    @pytest.mark.parametrize("n, lb, ub", [(3, 1, 3), (4, 1, 4), (5, 0, 3), (6, 1, 6), (9, 1, 9)])
+    def test_no_difference(self, n: int, lb: int, ub: int):
+        model = cp_model.CpModel()
+        variables = [model.NewIntVar(lb, ub, f"var_{i}") for i in range(n)]
+        a = model.NewIntVar(lb, ub, "a")
+        b = model.NewIntVar(lb, ub, "b")
+
+        linear_bools = sandwich_bools_csp(model, variables, a, b, "linear")
+        quadratic_bools = [is_sandwiched_csp(model, variables, j, a, b, f"quadratic_{j}") for j in range(n)]
+        differences = [xor_csp(model, x, y, f"difference_{j}")
+                       for j, (x, y) in enumerate(zip(linear_bools, quadratic_bools))]
+        model.AddBoolOr(differences)
+
+        solver = cp_model.CpSolver()
+        assert solver.Solve(model) == cp_model.INFEASIBLE
+
+    def test_constant_digits(self):
+        model = PuzzleModel()
+        variables = [model.NewIntVar(1, 4, f"var_{i}") for i in range(4)]
+        model.AddAllDifferent(variables)
+        sum_var = sandwich_sum_csp(model, variables, 1, 4, "")
+        model.Add(sum_var == 5)
+        model.Add(variables[0] == 1)
+
+        solver = cp_model.CpSolver()
+        assert solver.Solve(model) == cp_model.OPTIMAL
+        assert [solver.Value(var) for var in variables] == [1, 2, 3, 4] or \
+            [solver.Value(var) for var in variables] == [1, 3, 2, 4]
+
+
+class TestSeenBeforeBoolsCSP:
+
+    @pytest.mark.parametrize("bools, expected_result", [
+        ([0, 1, 0, 1], [0, 0, 1, 1]),
+        ([1, 0, 0], [0, 1, 1]),
+        ([0, 0, 0], [0, 0, 0]),
+        ([1], [0]),
+    ])
+    def test_manual(self, bools: list[int], expected_result: list[int]):
+        model = cp_model.CpModel()
+        bool_vars = [model.NewBoolVar(f"bool_{i}") for i in range(len(bools))]
+        for var, value in zip(bool_vars, bools):
+            model.Add(var == value)
+
+        result_bools = seen_before_bools_csp(model, bool_vars, "")
+        solver = cp_model.CpSolver()
+        solver.Solve(model)
+
+        assert [solver.Value(var) for var in result_bools] == expected_result
+
+
 class TestFirstXBoolsCSP:
 
     @staticmethod
@@ -1820,3 +1876,83 @@ class TestCountTransitionsCSP:
     @pytest.mark.parametrize("variables, expected_count", generate_random_params())
     def test_random(self, variables: list[int], expected_count: int):
         self.run_test(variables, expected_count)
+
+
+class TestForbidAssignmentCSP:
+
+    @staticmethod
+    def params() -> list[tuple[list[int], list[int], bool]]:
+        return [([1], [1], False), ([1], [2], True),
+                ([1, 2, 3], [1, 2, 3], False), ([1, 2, 3], [1, 2, 4], True),
+                ([5, 5], [4, 4], True), ([0, 1, 0], [0, 1, 1], True)]
+
+    def run_test(self, variables: list[int], values: list[int], feasible: bool):
+        model = cp_model.CpModel()
+        int_vars = [model.NewIntVar(
+            0, 10, f"var_{i}") for i in range(len(variables))]
+        for int_var, value in zip(int_vars, variables):
+            model.Add(int_var == value)
+
+        forbid_assignment_csp(model, int_vars, values, "")
+        solver = cp_model.CpSolver()
+        status = solver.solve(model)
+
+        assert (status in (cp_model.OPTIMAL, cp_model.FEASIBLE)) == feasible
+
+    @pytest.mark.parametrize("variables, values, feasible", params())
+    def test_manual(self, variables: list[int], values: list[int], feasible: bool):
+        self.run_test(variables, values, feasible)
+
+
+class TestDigitIndicatorCache:
+
+    @staticmethod
+    def params() -> list[tuple[list[int], int, int]]:
+        return [([1, 2, 3], 1, 1), ([1, 1, 3], 1, 2), ([4, 5, 6], 1, 0),
+                ([9, 9, 9, 9], 9, 4), ([0, 1, 0], 0, 2)]
+
+    @pytest.mark.parametrize("inputs, val, output", params())
+    def test_count_vars(self, inputs: list[int], val: int, output: int):
+        model = PuzzleModel()
+        variables = [model.NewIntVar(0, 9, f"var_{i}")
+                     for i, _ in enumerate(inputs)]
+        for var, val_input in zip(variables, inputs):
+            model.Add(var == val_input)
+
+        count1 = count_vars(model, variables, val, "count1")
+        n_vars = len(model.Proto().variables)
+        count2 = count_vars(model, variables, val, "count2")
+        # only the second count var is new, the indicators are reused
+        assert len(model.Proto().variables) == n_vars + 1
+
+        solver = cp_model.CpSolver()
+        solver.solve(model)
+        assert solver.value(count1) == output
+        assert solver.value(count2) == output
+
+    def test_same_literal(self):
+        model = PuzzleModel()
+        var = model.NewIntVar(1, 9, "var")
+        b1 = is_equal_csp(model, var, 5, "b1")
+        b2 = is_equal_csp(model, var, 5, "b2")
+        b3 = is_equal_csp(model, var, 6, "b3")
+        assert b1.Index() == b2.Index()
+        assert b1.Index() != b3.Index()
+        # one literal per value in the domain
+        assert model.digit_indicators_count() == 9
+
+    @pytest.mark.parametrize("value, digit", [(3, 3), (3, 4), (0, 0), (5, 10)])
+    def test_indicator_value(self, value: int, digit: int):
+        model = PuzzleModel()
+        var = model.NewIntVar(0, 9, "var")
+        model.Add(var == value)
+        b = is_equal_csp(model, var, digit, "")
+
+        solver = cp_model.CpSolver()
+        solver.solve(model)
+        assert solver.value(b) == int(value == digit)
+
+    def test_bool_var(self):
+        model = PuzzleModel()
+        var = model.NewBoolVar("var")
+        assert is_equal_csp(model, var, 1, "").Index() == var.Index()
@@ -0,0 +1,108 @@
+import pytest
+from ortools.sat.python import cp_model
+
+from puzzlesolver.Puzzle2model.domain_propagation import bounds_mask, mask_max, mask_min, mask_values, \
+    propagate_cell_domains, values_mask
+from puzzlesolver.Puzzle2model.puzzle2model import puzzle2model
+from puzzlesolver.SolvePuzzle import check_unique_solution, SolverOptions
+from conftest import load_puzzle
+
+DIGITS = list(range(1, 10))
+
+
+class TestMasks:
+
+    def test_values(self):
+        mask = values_mask([1, 4, 9], 1, 9)
+        assert mask_values(mask, 1) == [1, 4, 9]
+        assert mask_min(mask, 1) == 1
+        assert mask_max(mask, 1) == 9
+
+    @pytest.mark.parametrize("lb, ub, values", [(3, 5, [3, 4, 5]), (-2, 2, [0, 1, 2]), (8, 12, [8, 9]),
+                                                (6, 5, [])])
+    def test_bounds(self, lb: int, ub: int, values: list[int]):
+        assert mask_values(bounds_mask(lb, ub, 0, 9), 0) == values
+
+
+class TestPropagateCellDomains:
+
+    def test_givens_and_houses(self, tmp_path):
+        givens = {(0, j): j + 1 for j in range(8)}
+        domains = propagate_cell_domains(load_puzzle(tmp_path, givens=givens), 1, 9)
+        assert domains is not None
+        assert domains[(0, 0)] == [1]
+        # the naked single of the row
+        assert domains[(0, 8)] == [9]
+        assert 9 not in domains[(5, 8)]
+        assert 1 not in domains[(1, 1)]
+        assert domains[(4, 4)] == [1, 2, 3, 4, 6, 7, 8, 9]
+
+    def test_hidden_single(self, tmp_path):
+        # 1 is in rows 1, 2 and columns 1, 2: in box 0 only (0, 0) can be 1
+        givens = {(1, 3): 1, (2, 6): 1, (3, 1): 1, (6, 2): 1}
+        domains = propagate_cell_domains(load_puzzle(tmp_path, givens=givens), 1, 9)
+        assert domains is not None
+        assert domains[(0, 0)] == [1]
+
+    def test_killer_cage(self, tmp_path):
+        cages = {'Killer Cage': [{'cells': ['R5C5', 'R5C6'], 'value': '3'},
+                                 {'cells': ['R1C1', 'R1C2', 'R1C3'], 'value': '23'}]}
+        domains = propagate_cell_domains(load_puzzle(tmp_path, local_constraints=cages), 1, 9)
+        assert domains is not None
+        assert domains[(4, 4)] == [1, 2]
+        assert domains[(0, 0)] == [6, 8, 9]
+        # only single values are removed from the other cells of a house, not pairs
+        assert domains[(4, 0)] == DIGITS
+
+    def test_thermometer(self, tmp_path):
+        thermo = {'Thermometer': [{'cells': ['R1C1', 'R1C2', 'R1C3', 'R1C4']}]}
+        domains = propagate_cell_domains(load_puzzle(tmp_path, local_constraints=thermo), 1, 9)
+        assert domains is not None
+        assert domains[(0, 0)] == [1, 2, 3, 4, 5, 6]
+        assert domains[(0, 3)] == [4, 5, 6, 7, 8, 9]
+
+    def test_arrow(self, tmp_path):
+        arrow = {'Arrow': [{'cells': ['R1C1'], 'lines': [['R1C1', 'R1C2', 'R1C3']], 'value': ''}]}
+        domains = propagate_cell_domains(load_puzzle(tmp_path, givens={(0, 1): 6}, local_constraints=arrow), 1, 9)
+        assert domains is not None
+        # circle = 6 + R1C3 and the row has no repeated digits
+        assert domains[(0, 0)] == [7, 8, 9]
+        assert domains[(0, 2)] == [1, 2, 3]
+
+    def test_contradiction(self, tmp_path):
+        cages = {'Killer Cage': [{'cells': ['R1C1', 'R1C2'], 'value': '3'}]}
+        assert propagate_cell_domains(load_puzzle(tmp_path, givens={(0, 0): 5}, local_constraints=cages), 1, 9) is None
+
+    def test_no_sudoku_rules(self, tmp_path):
+        puzzle = load_puzzle(tmp_path, givens={(0, 0): 1},
+                             bool_constraints={'Normal Sudoku Rules Do Not Apply': True})
+        domains = propagate_cell_domains(puzzle, 1, 9)
+        assert domains is not None
+        assert domains[(0, 1)] == DIGITS
+
+
+class TestPropagatedModel:
+
+    def test_cell_domains(self, tmp_path):
+        thermo = {'Thermometer': [{'cells': ['R1C1', 'R1C2', 'R1C3', 'R1C4']}]}
+        puzzle = load_puzzle(tmp_path, local_constraints=thermo)
+        model = puzzle2model(puzzle)
+        assert model.propagation_time > 0
+        cell_var = model.grid_vars_dict['cells_grid_vars'][(0, 0)]
+        assert list(cell_var.Proto().domain) == [1, 6]
+
+        model = puzzle2model(puzzle, propagate_domains=False)
+        cell_var = model.grid_vars_dict['cells_grid_vars'][(0, 0)]
+        assert list(cell_var.Proto().domain) == [1, 9]
+
+    def test_infeasible(self, tmp_path):
+        cages = {'Killer Cage': [{'cells': ['R1C1', 'R1C2'], 'value': '3'}]}
+        model = puzzle2model(load_puzzle(tmp_path, givens={(0, 0): 5}, local_constraints=cages))
+        solver = cp_model.CpSolver()
+        assert solver.solve(model) == cp_model.INFEASIBLE
+
+    def test_phase_times(self):
+        verdict = check_unique_solution('./data/Solved/400kSubscribers_by_PjotrV.json', SolverOptions(max_time=60))
+        assert verdict.verdict == 'unique'
+        assert 0 < verdict.phase_times.propagation_time <= verdict.phase_times.build_time
+        assert 'propagation_time' in verdict.phase_times.to_dict()
@@ -0,0 +1,86 @@
+from puzzlesolver.Puzzle.Coords import GridCoords
+from puzzlesolver.Puzzle.Directions import DIRECTIONS
+from puzzlesolver.Puzzle.Grid import Grid
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+
+
+def coords(cells):
+    return [(cell.row, cell.col) for cell in cells]
+
+
+class TestGridIndexCache:
+
+    def test_cached_tables(self):
+        grid = Grid(9, 9)
+        cell = grid.getCell(4, 4)
+        assert cell is not None
+
+        assert coords(grid.getRegionCells(4)) == [(r, c) for r in range(3, 6) for c in range(3, 6)]
+        assert grid.getUsedRegions() == list(range(9))
+        assert coords(grid.getRow(2)) == [(2, c) for c in range(9)]
+        assert coords(grid.getCol(2)) == [(r, 2) for r in range(9)]
+        assert coords(grid.getOrthogonallyAdjacentCells(cell)) == [(3, 4), (5, 4), (4, 3), (4, 5)]
+        assert len(grid.getNeighbourCells(cell)) == 8
+        assert len(grid.getKnigthMoveCells(cell)) == 8
+        assert coords(grid.getCellsInDirection(cell, DIRECTIONS.SE)) == [(5, 5), (6, 6), (7, 7), (8, 8)]
+        assert grid.getDisjointGroupIdx(cell) == 4
+        assert len(list(grid.genAllPDiagonals())) == 17
+        assert len(list(grid.genAllNDiagonals())) == 17
+
+    def test_returned_lists_are_copies(self):
+        grid = Grid(9, 9)
+        row = grid.getRow(0)
+        row.reverse()
+        row.pop()
+        assert coords(grid.getRow(0)) == [(0, c) for c in range(9)]
+
+    def test_region_edit_invalidates(self):
+        grid = Grid(9, 9)
+        cell = grid.getCell(0, 0)
+        assert cell is not None
+        assert len(grid.getRegionCells(0)) == 9
+
+        cell.region = 9
+        assert len(grid.getRegionCells(0)) == 8
+        assert coords(grid.getRegionCells(9)) == [(0, 0)]
+        assert grid.getUsedRegions() == list(range(10))
+        assert grid.getDisjointGroupIdx(cell) == 0
+
+    def test_outside_edit_invalidates(self):
+        grid = Grid(9, 9)
+        cell = grid.getCell(0, 0)
+        assert cell is not None
+        assert len(grid.getRow(0)) == 9
+
+        cell.outside = True
+        assert len(grid.getRow(0)) == 8
+        assert len(grid.getRow(0, True)) == 9
+        assert (0, 0) not in coords(grid.getAllCells())
+
+    def test_from_json_regions(self):
+        puzzle = Puzzle.fromJSON('./data/Solved/400kSubscribers_by_PjotrV.json')
+        grid = puzzle.grid
+        for region in grid.getUsedRegions():
+            cells = [cell for cell in grid.getAllCells(True) if cell.region == region]
+            assert grid.getRegionCells(region) == cells
+
+
+class TestSlots:
+
+    def test_cell_json_whitelist(self):
+        grid = Grid.fromJSON(2, 2, [[{'value': 1, 'given': True, 'unknown_key': 3}, {}],
+                                    [{'region': 5}, {'outside': True}]])
+        cell = grid.getCell(0, 0)
+        assert cell is not None
+        assert (cell.value, cell.given) == (1, True)
+        assert not hasattr(cell, 'unknown_key')
+        assert not hasattr(cell, '__dict__')
+        assert grid.getUsedRegions() == [5]
+        assert grid.getCell(1, 1) is None
+
+    def test_grid_coords_hash(self):
+        a = GridCoords(1, 2)
+        b = GridCoords(1, 2)
+        assert a == b and hash(a) == hash(b)
+        assert len({a, b, GridCoords(2, 1)}) == 2
+        assert not hasattr(a, '__dict__')
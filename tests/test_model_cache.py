@@ -0,0 +1,71 @@
+import os
+import time
+
+from ortools.sat.python import cp_model
+
+from puzzlesolver.ModelCache import ModelCache, model_cache_key, model_from_bytes, model_to_bytes
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.Puzzle2model.puzzle2model import puzzle2model
+from puzzlesolver.SolvePuzzle import SolverOptions, build_puzzle_model
+
+FILEPATH = './data/Solved/400kSubscribers_by_PjotrV.json'
+
+
+def grid_indices(puzzle_model):
+    return {name: {cell: var.Index() for cell, var in grid_vars.items()}
+            for name, grid_vars in puzzle_model.grid_vars_dict.items()}
+
+
+class TestModelCache:
+
+    def test_round_trip(self):
+        puzzle_model = puzzle2model(Puzzle.fromJSON(FILEPATH))
+        loaded_model = model_from_bytes(model_to_bytes(puzzle_model))
+
+        assert loaded_model.Proto() == puzzle_model.Proto()
+        assert grid_indices(loaded_model) == grid_indices(puzzle_model)
+        assert loaded_model.get_variable_record().keys() == puzzle_model.get_variable_record().keys()
+
+        solver = cp_model.CpSolver()
+        assert solver.Solve(loaded_model) == cp_model.OPTIMAL
+
+    def test_key(self):
+        puzzle = Puzzle.fromJSON(FILEPATH)
+        assert model_cache_key(puzzle, 'tree') == model_cache_key(Puzzle.fromJSON(FILEPATH), 'tree')
+        assert model_cache_key(puzzle, 'tree') != model_cache_key(puzzle, 'floodfill')
+        assert model_cache_key(puzzle, 'tree', propagate_domains=True) != \
+            model_cache_key(puzzle, 'tree', propagate_domains=False)
+
+    def test_build_puzzle_model(self, tmp_path):
+        puzzle = Puzzle.fromJSON(FILEPATH)
+        options = SolverOptions(model_cache_dir=str(tmp_path))
+        cache = ModelCache(str(tmp_path))
+        key = model_cache_key(puzzle, options.connectivity_encoding)
+
+        built_model = build_puzzle_model(puzzle, options)
+        assert cache.get(key) is not None
+        loaded_model = build_puzzle_model(puzzle, options)
+        assert loaded_model is not built_model
+        assert loaded_model.Proto() == built_model.Proto()
+
+    def test_corrupted_entry(self, tmp_path):
+        cache = ModelCache(str(tmp_path))
+        with open(cache.entry_path('key'), 'wb') as file:
+            file.write(b'\x10\x00')
+        assert cache.get('key') is None
+        assert cache.get('key') is None
+
+    def test_lru_eviction(self, tmp_path):
+        cache = ModelCache(str(tmp_path))
+        puzzle_model = puzzle2model(Puzzle.fromJSON(FILEPATH))
+        for key in ('a', 'b', 'c'):
+            cache.put(key, puzzle_model)
+        past = time.time() - 100
+        for i, key in enumerate(('a', 'b', 'c')):
+            os.utime(cache.entry_path(key), (past + i, past + i))
+
+        cache.get('a')
+        cache.max_size = 2 * os.path.getsize(cache.entry_path('a'))
+        cache.put('c', puzzle_model)
+        assert cache.get('b') is None
+        assert cache.get('a') is not None and cache.get('c') is not None
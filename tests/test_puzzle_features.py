@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+from puzzlesolver.ProfileCalibration import CALIBRATION_PROFILES, calibrate, sample_families
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.PuzzleFeatures import DEFAULT_PROFILE_NAME, ProfileTable, PuzzleFeatures
+from puzzlesolver.SolvePuzzle import SolverOptions, apply_solver_profile, select_solver_options
+from conftest import write_puzzle
+
+LINES_PUZZLE = './data/Solved/400kSubscribers_by_PjotrV.json'
+
+
+def make_dir(path):
+    os.makedirs(path)
+    return path
+
+
+def write_cage_puzzle(tmp_path) -> str:
+    return write_puzzle(tmp_path, 4, local_constraints={'Killer Cage': [{'cells': ['R1C1', 'R1C2'], 'value': '3'}]})
+
+
+class TestPuzzleFeatures:
+
+    def test_lines(self):
+        features = PuzzleFeatures.from_puzzle(Puzzle.fromJSON(LINES_PUZZLE))
+        assert (features.n_rows, features.n_cols) == (9, 9)
+        assert features.category == 'lines'
+        assert features.family == 'lines-9x9'
+        assert features.n_local_constraints > 0
+
+    def test_classic(self, tmp_path):
+        features = PuzzleFeatures.from_puzzle(Puzzle.fromJSON(write_puzzle(tmp_path, 4, {(0, 0): 1})))
+        assert features.family == 'classic-4x4'
+        assert features.bool_constraints == frozenset()
+
+    def test_cages(self, tmp_path):
+        features = PuzzleFeatures.from_puzzle(Puzzle.fromJSON(write_cage_puzzle(tmp_path)))
+        assert features.category == 'cages'
+        assert features.tool_constraints == frozenset({'Killer Cage'})
+        assert features.to_dict()['tool_constraints'] == ['Killer Cage']
+
+
+class TestProfileTable:
+
+    def test_select(self):
+        table = ProfileTable({'lines-9x9': 'hard', 'lines': 'enumerate', 'cages': DEFAULT_PROFILE_NAME})
+        features = PuzzleFeatures.from_puzzle(Puzzle.fromJSON(LINES_PUZZLE))
+        assert table.select(features) == 'hard'
+        del table.profiles['lines-9x9']
+        assert table.select(features) == 'enumerate'
+        del table.profiles['lines']
+        assert table.select(features) is None
+
+    def test_save_load(self, tmp_path):
+        filepath = os.path.join(tmp_path, 'profiles.json')
+        ProfileTable({'lines': 'fast-unique'}, {'mode': 'unique'}).save(filepath)
+        table = ProfileTable.load(filepath)
+        assert table.profiles == {'lines': 'fast-unique'}
+        assert table.calibration == {'mode': 'unique'}
+
+    def test_version(self):
+        with pytest.raises(ValueError):
+            ProfileTable.from_dict({'version': 0, 'profiles': {}})
+
+    def test_select_solver_options(self, tmp_path):
+        filepath = os.path.join(tmp_path, 'profiles.json')
+        ProfileTable({'lines': 'hard'}).save(filepath)
+        puzzle = Puzzle.fromJSON(LINES_PUZZLE)
+
+        options = select_solver_options(puzzle, SolverOptions(linearization_level=0, profile_table=filepath))
+        assert options.symmetry_level == 4
+        assert options.linearization_level == 0  # set explicitly, kept
+
+        options = select_solver_options(puzzle, SolverOptions())
+        assert options.symmetry_level is None
+
+    def test_apply_only_unset(self):
+        options = apply_solver_profile(SolverOptions(num_workers=2), 'fast-unique', only_unset=True)
+        assert options.num_workers == 2
+        assert options.presolve_level == 2
+
+
+class TestCalibration:
+
+    def test_sample_families(self, tmp_path):
+        filepaths = [write_puzzle(tmp_path, 4, {(0, 0): 1}), write_cage_puzzle(make_dir(tmp_path / 'cages')), LINES_PUZZLE]
+        families = sample_families(filepaths, 1)
+        assert set(families) == {'classic-4x4', 'cages-4x4', 'lines-9x9'}
+        assert all(len(family_filepaths) == 1 for family_filepaths in families.values())
+
+    def test_calibrate(self, tmp_path):
+        filepath = write_cage_puzzle(tmp_path)
+        table = calibrate([filepath], SolverOptions(max_time=10), 'unique', progress=None)
+        assert set(table.profiles) == {'cages-4x4', 'cages'}
+        assert table.profiles['cages-4x4'] in CALIBRATION_PROFILES
+        times = table.calibration['families']['cages-4x4']['times']
+        assert set(times) == set(CALIBRATION_PROFILES)
+        assert min(times.values()) == times[table.profiles['cages-4x4']]
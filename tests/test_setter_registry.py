@@ -0,0 +1,57 @@
+from puzzlesolver.Puzzle.ConstraintEnums import CageConstraintsE, LineConstraintsE, SimpleGlobalConstraintsE
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.Puzzle2model.BoolConstraints.boolConstraints2csp import BOOL_CONSTRAINT_SETTERS
+from puzzlesolver.Puzzle2model.CageConstraints.SimpleCageConstraints2csp import set_killer_cage_constraints
+from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.SetterRegistry import SetterRegistry, active_tool_keys
+from puzzlesolver.Puzzle2model.constraintTools2csp import TOOL_CONSTRAINT_SETTERS
+
+
+def make_setter(name: str, calls: list[str]):
+    def setter(model: PuzzleModel, puzzle: Puzzle):
+        calls.append(name)
+    setter.__name__ = name
+    return setter
+
+
+class TestSetterRegistry:
+
+    def test_setters_for_keys(self):
+        calls: list[str] = []
+        registry = SetterRegistry([
+            (make_setter('killer', calls), [CageConstraintsE.KILLER_CAGE]),
+            (make_setter('always', calls), []),
+            (make_setter('renban', calls), [LineConstraintsE.RENBAN_LINE,
+                                            SimpleGlobalConstraintsE.ANTIKING]),
+        ])
+
+        names = [setter.__name__ for setter in registry.setters_for_keys(
+            {SimpleGlobalConstraintsE.ANTIKING, CageConstraintsE.KILLER_CAGE})]
+        assert names == ['killer', 'always', 'renban']
+
+        names = [setter.__name__ for setter in registry.setters_for_keys(set())]
+        assert names == ['always']
+
+        assert len(registry.setters_by_key[LineConstraintsE.RENBAN_LINE]) == 1
+
+    def test_merge(self):
+        calls: list[str] = []
+        a = SetterRegistry([(make_setter('a', calls), [])])
+        b = SetterRegistry([(make_setter('b', calls), [])])
+        merged = SetterRegistry.merge([a, b])
+        puzzle = Puzzle.fromJSON('./data/Solved/400kSubscribers_by_PjotrV.json')
+        merged.run(PuzzleModel(), puzzle)
+        assert calls == ['a', 'b']
+
+    def test_tool_registry(self):
+        assert set_killer_cage_constraints in TOOL_CONSTRAINT_SETTERS.setters_by_key[
+            CageConstraintsE.KILLER_CAGE]
+
+    def test_only_active_setters(self):
+        puzzle = Puzzle.fromJSON('./data/Solved/400kSubscribers_by_PjotrV.json')
+        keys = active_tool_keys(puzzle)
+        for registry in (BOOL_CONSTRAINT_SETTERS, TOOL_CONSTRAINT_SETTERS):
+            setters = registry.setters_for_puzzle(puzzle)
+            assert len(setters) < len(registry.entries)
+            for setter, setter_keys in registry.entries:
+                assert (setter in setters) == any(key in keys for key in setter_keys)
@@ -0,0 +1,81 @@
+import errno
+import io
+import sys
+
+import pytest
+from ortools.sat.python import cp_model
+
+import puzzlesolver.Puzzle2model.SolutionLogWriter as SolutionLogWriterModule
+from puzzlesolver.Puzzle2model.SolutionLogWriter import SolutionLogLayout, SolutionLogWriter
+from puzzlesolver.SolvePuzzle import SolverOptions, main, solve_puzzle, solve_puzzle_result
+from conftest import write_puzzle
+
+
+class FullDiskStream(io.StringIO):
+
+    def write(self, text: str) -> int:
+        raise OSError(errno.ENOSPC, 'No space left on device')
+
+
+class TestSolutionLogWriter:
+
+    def test_layout(self):
+        model = cp_model.CpModel()
+        cells = {(0, 0): model.NewIntVar(1, 2, 'a'), (0, 1): model.NewIntVar(1, 2, 'b')}
+        record = {'0 - x': model.NewIntVar(0, 5, 'x')}
+        layout = SolutionLogLayout('title', {'cells_grid_vars': cells}, {}, record)
+
+        assert layout.indices == [cells[(0, 0)].Index(), cells[(0, 1)].Index(), record['0 - x'].Index()]
+        text = layout.format(3, 0.5, (1, 2, 4))
+        assert text.startswith('Solution 3, time = 0.5 s\n[ 1 | 2 ]\n')
+        assert '0 - x = 4\n' in text
+
+    def test_batch_file(self, tmp_path):
+        (tmp_path / 'a').mkdir()
+        (tmp_path / 'b').mkdir()
+        filepath1 = write_puzzle(tmp_path / 'a', 4, {(0, 0): 1})
+        filepath2 = write_puzzle(tmp_path / 'b', 4, {(0, 0): 2})
+        log_filepath = tmp_path / 'batch.sol'
+        options = SolverOptions(max_time=60, max_sols=3, log_solutions=True)
+
+        with SolutionLogWriter(str(log_filepath), max_queue_size=1) as writer:
+            solve_puzzle(filepath1, options, writer)
+            solve_puzzle(filepath2, options, writer)
+
+        assert writer.error is None
+        text = log_filepath.read_text()
+        assert text.count('Puzzle puzzle\n') == 2
+        assert text.count('Solution ') == 6
+
+    def test_failing_stream(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SolutionLogWriterModule, 'open', lambda *args, **kwargs: FullDiskStream(),
+                            raising=False)
+        filepath = write_puzzle(tmp_path, 4, {})
+        writer = SolutionLogWriter(str(tmp_path / 'batch.sol'), max_queue_size=1).start()
+        # the queue is drained after the failed write, the solver doesn't block
+        _, solution_printer = solve_puzzle(filepath, SolverOptions(max_time=60, max_sols=20, log_solutions=True),
+                                           writer)
+        assert solution_printer.solution_count() == 20
+
+        with pytest.raises(OSError):
+            writer.close()
+        assert isinstance(writer.error, OSError)
+
+    def test_failing_log_file(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.setattr(SolutionLogWriterModule, 'open', lambda *args, **kwargs: FullDiskStream(),
+                            raising=False)
+        filepath = write_puzzle(tmp_path, 4, {(0, 0): 1})
+        monkeypatch.setattr(sys, 'argv', ['psolver', filepath, '--log_file', str(tmp_path / 'batch.sol'),
+                                          '--max_sols', '3'])
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+        assert exit_info.value.code != 0
+        assert 'No space left on device' in str(exit_info.value.code)
+
+    def test_failing_async_log(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(SolutionLogWriterModule, 'open', lambda *args, **kwargs: FullDiskStream(),
+                            raising=False)
+        filepath = write_puzzle(tmp_path, 4, {(0, 0): 1})
+        options = SolverOptions(max_time=60, max_sols=3, log_solutions=True, async_log=True)
+        result = solve_puzzle_result(filepath, options)
+        assert result.error is not None and 'No space left on device' in result.error
@@ -1,8 +1,13 @@
+import json
 import pytest
 import random
 import os
 
-from puzzlesolver.SolvePuzzle import SolverOptions, solve_puzzle
+from ortools.sat.python import cp_model
+
+from puzzlesolver.SolvePuzzle import SOLVER_PROFILES, SolverOptions, apply_solver_profile, check_unique_solution, configure_solver, load_solution_hint, make_parser, options_from_args, parse_sat_param, solve_puzzle
+from puzzlesolver.SolverLog import PhaseTimes
+from conftest import write_puzzle
 
 
 class TestSolvePuzzle:
@@ -62,3 +67,172 @@ class TestSolvePuzzle:
     @pytest.mark.parametrize("filepath", generate_all_fp())
     def test_all(self, filepath: str):
         self.run_test(filepath, 1200)
+
+
+class TestCheckUniqueSolution:
+
+    def test_unique(self):
+        filepath = './data/Solved/400kSubscribers_by_PjotrV.json'
+        result = check_unique_solution(filepath, SolverOptions(max_time=60))
+        assert result.verdict == 'unique'
+        assert len(result.solutions) == 1
+
+    def test_multiple(self, tmp_path):
+        filepath = write_puzzle(tmp_path, 4, {})
+        result = check_unique_solution(filepath, SolverOptions(max_time=60))
+        assert result.verdict == 'multiple'
+        assert len(result.solutions) == 2
+        assert result.solutions[0] != result.solutions[1]
+
+    def test_none(self, tmp_path):
+        filepath = write_puzzle(tmp_path, 4, {(0, 0): 1, (0, 1): 1})
+        result = check_unique_solution(filepath, SolverOptions(max_time=60))
+        assert result.verdict == 'none'
+        assert len(result.solutions) == 0
+
+    def test_hint(self):
+        filepath = './data/Solved/400kSubscribers_by_PjotrV.json'
+        solution = check_unique_solution(filepath, SolverOptions(max_time=60)).solutions[0]
+
+        result = check_unique_solution(filepath, SolverOptions(max_time=60), solution)
+        assert result.verdict == 'unique'
+        assert result.solutions == [solution]
+
+        wrong_hint = dict(solution)
+        wrong_hint[(0, 0)] = wrong_hint[(0, 1)]
+        result = check_unique_solution(filepath, SolverOptions(max_time=60), wrong_hint)
+        assert result.verdict == 'unique'
+        assert result.solutions == [solution]
+
+    def test_hint_multiple(self, tmp_path):
+        filepath = write_puzzle(tmp_path, 4, {})
+        hint_filepath = os.path.join(tmp_path, 'hint.json')
+        with open(hint_filepath, 'w') as file:
+            json.dump([[1, 2, 3, 4], [3, 4, 1, 2], [2, 1, 4, 3], [4, 3, None, 1]], file)
+        hint = load_solution_hint(hint_filepath)
+        assert (3, 2) not in hint
+
+        result = check_unique_solution(filepath, SolverOptions(max_time=60), hint)
+        assert result.verdict == 'multiple'
+        assert result.solutions[0][(3, 2)] == 2
+
+
+class TestSolutionStore:
+
+    def test_unique_solutions(self, tmp_path):
+        filepath = write_puzzle(tmp_path, 4, {})
+        _, solution_printer = solve_puzzle(
+            filepath, SolverOptions(max_time=60, max_sols=30))
+        solutions = solution_printer.solution_store()
+        assert solution_printer.unique_solution_count() == 30
+        assert len(solutions) == 30
+        assert len(set(tuple(sorted(s.items())) for s in solutions)) == 30
+
+    def test_max_stored_solutions(self, tmp_path):
+        filepath = write_puzzle(tmp_path, 4, {})
+        _, solution_printer = solve_puzzle(
+            filepath, SolverOptions(max_time=60, max_sols=30, max_stored_solutions=5))
+        assert solution_printer.unique_solution_count() == 30
+        assert len(solution_printer.solution_store()) == 5
+
+    def test_quiet(self, tmp_path, capsys):
+        filepath = write_puzzle(tmp_path, 4, {(0, 0): 1})
+        _, solution_printer = solve_puzzle(
+            filepath, SolverOptions(max_time=60, max_sols=10, max_stored_solutions=3, quiet=True))
+        solutions = solution_printer.solution_store()
+        assert solution_printer.unique_solution_count() == 10
+        assert len(solutions) == 3
+        assert all(solution[(0, 0)] == 1 for solution in solutions)
+        assert capsys.readouterr().out.count('Solution ') == 3
+
+
+class TestSolverParameters:
+
+    def test_configure_solver(self):
+        options = SolverOptions(num_workers=4, presolve_level=1, random_seed=7, symmetry_level=0,
+                                linearization_level=2, sat_params={'search_branching': 'FIXED_SEARCH'})
+        solver = cp_model.CpSolver()
+        configure_solver(solver, options, 30)
+        parameters = solver.parameters
+        assert parameters.max_time_in_seconds == 30
+        assert parameters.num_workers == 4
+        assert parameters.max_presolve_iterations == 1
+        assert parameters.random_seed == 7
+        assert parameters.symmetry_level == 0
+        assert parameters.linearization_level == 2
+        assert parameters.search_branching == parameters.FIXED_SEARCH
+
+    def test_enumeration_single_worker(self):
+        solver = cp_model.CpSolver()
+        configure_solver(solver, SolverOptions(num_workers=4), 30, enumerate_all_solutions=True)
+        assert solver.parameters.enumerate_all_solutions
+        assert solver.parameters.num_workers == 1
+
+    def test_no_presolve(self):
+        solver = cp_model.CpSolver()
+        configure_solver(solver, SolverOptions(presolve_level=0), 30)
+        assert not solver.parameters.cp_model_presolve
+
+    @pytest.mark.parametrize("text", ['num_workers', 'unknown_param=1', 'num_workers=many'])
+    def test_invalid_sat_param(self, text: str):
+        with pytest.raises(ValueError):
+            parse_sat_param(text)
+
+    @pytest.mark.parametrize("profile", SOLVER_PROFILES)
+    def test_profiles(self, tmp_path, profile):
+        options = apply_solver_profile(SolverOptions(max_time=60, max_sols=5), profile)
+        filepath = write_puzzle(tmp_path, 4, {})
+        result = check_unique_solution(filepath, options)
+        assert result.verdict == 'multiple'
+        _, solution_printer = solve_puzzle(filepath, options)
+        assert solution_printer.unique_solution_count() == 5
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            apply_solver_profile(SolverOptions(), 'fastest')  # type: ignore
+
+    def test_args_override_profile(self):
+        args = make_parser().parse_args(['puzzle.json', '--profile', 'hard', '--num_workers', '2',
+                                         '--sat-param', 'random_seed=3', '--sat-param', 'log_search_progress=false'])
+        options = options_from_args(args)
+        assert options.num_workers == 2
+        assert options.symmetry_level == 4
+        assert options.sat_params == {'random_seed': '3', 'log_search_progress': 'false'}
+
+
+class TestPhaseTimes:
+
+    def test_enumerate(self, tmp_path, capsys):
+        filepath = write_puzzle(tmp_path, 4, {(0, 0): 1})
+        phase_times = PhaseTimes()
+        solve_puzzle(filepath, SolverOptions(max_time=60, max_sols=1000, backend='cp-sat'), phase_times=phase_times)
+        assert phase_times.load_time > 0
+        assert phase_times.build_time > 0
+        assert phase_times.presolve_time > 0
+        assert phase_times.first_solution_time is not None
+        assert 0 < phase_times.first_solution_time <= phase_times.solve_time
+        assert phase_times.exhaustion_time == phase_times.solve_time
+        assert 'Phases' in capsys.readouterr().out
+
+    def test_enumerate_stopped(self, tmp_path):
+        filepath = write_puzzle(tmp_path, 4, {})
+        phase_times = PhaseTimes()
+        solve_puzzle(filepath, SolverOptions(max_time=60, max_sols=2, time_presolve=False),
+                     phase_times=phase_times)
+        assert phase_times.first_solution_time is not None
+        assert phase_times.exhaustion_time is None
+        assert phase_times.presolve_time == 0
+
+    def test_unique(self):
+        result = check_unique_solution('./data/Solved/400kSubscribers_by_PjotrV.json', SolverOptions(max_time=60))
+        phase_times = result.phase_times
+        assert phase_times.load_time > 0
+        assert phase_times.first_solution_time is not None
+        assert phase_times.first_solution_time < phase_times.exhaustion_time == result.wall_time
+        assert phase_times.solve_time == result.wall_time
+
+    def test_none(self, tmp_path):
+        filepath = write_puzzle(tmp_path, 4, {(0, 0): 1, (0, 1): 1})
+        phase_times = check_unique_solution(filepath, SolverOptions(max_time=60)).phase_times
+        assert phase_times.first_solution_time is None
+        assert phase_times.exhaustion_time is not None
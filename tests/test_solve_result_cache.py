@@ -0,0 +1,116 @@
+import os
+import time
+
+import puzzlesolver.ModelCache as ModelCache
+from puzzlesolver.Puzzle.Puzzle import Puzzle
+from puzzlesolver.SolvePuzzle import SolverOptions, solve_puzzle
+from puzzlesolver.SolveResultCache import CachedSolutionPrinter, CachedSolveResult, SolveResultCache, puzzle_hash, \
+    result_cache_key
+from conftest import write_puzzle
+
+FILEPATH = './data/Solved/400kSubscribers_by_PjotrV.json'
+
+
+def make_result(solution_count: int, status_name: str = 'FEASIBLE', max_sols: int = 20) -> CachedSolveResult:
+    solutions = [{(0, 0): i, (0, 1): 1} for i in range(solution_count)]
+    return CachedSolveResult('multiple', status_name, max_sols, solution_count, solution_count, solutions)
+
+
+class TestPuzzleHash:
+
+    def test_canonical(self):
+        puzzle = Puzzle.fromJSON(FILEPATH)
+        key = puzzle_hash(puzzle)
+        assert key == puzzle_hash(Puzzle.fromJSON(FILEPATH))
+
+        puzzle.puzzle_meta.title = 'Renamed'
+        assert puzzle_hash(puzzle) == key
+
+        cell = puzzle.grid.getAllCells()[0]
+        cell.value = 9 if cell.value != 9 else 8
+        assert puzzle_hash(puzzle) != key
+
+    def test_result_key(self, monkeypatch):
+        puzzle = Puzzle.fromJSON(FILEPATH)
+        key = result_cache_key(puzzle)
+        assert key == result_cache_key(Puzzle.fromJSON(FILEPATH))
+        # results of an older model builder are not reused
+        monkeypatch.setattr(ModelCache, '_builder_fingerprint', 'other sources')
+        assert result_cache_key(puzzle) != key
+
+
+class TestSolveResultCache:
+
+    def test_round_trip(self, tmp_path):
+        cache = SolveResultCache(str(tmp_path))
+        assert cache.get('key') is None
+
+        cache.put('key', make_result(2, 'OPTIMAL'))
+        result = cache.get('key')
+        assert result is not None
+        assert result.solutions == make_result(2).solutions
+        assert result.covers(1000)
+
+    def test_covers(self):
+        result = make_result(20)
+        assert result.is_cacheable()
+        assert result.covers(10) and not result.covers(30)
+        assert not make_result(3).is_cacheable()
+
+        truncated = result.truncated(5)
+        assert (truncated.solution_count, len(truncated.solutions)) == (5, 5)
+
+    def test_stored_solutions_cut_off(self):
+        result = make_result(20)
+        result.solutions = result.solutions[:5]
+        assert not result.is_cacheable()
+
+    def test_lru_eviction(self, tmp_path):
+        cache = SolveResultCache(str(tmp_path))
+        for key in ('a', 'b', 'c'):
+            cache.put(key, make_result(1, 'OPTIMAL'))
+        past = time.time() - 100
+        for i, key in enumerate(('a', 'b', 'c')):
+            os.utime(cache.entry_path(key), (past + i, past + i))
+
+        cache.get('a')
+        cache.max_size = 2 * os.path.getsize(cache.entry_path('a'))
+        cache.evict()
+        assert cache.get('b') is None
+        assert cache.get('a') is not None and cache.get('c') is not None
+
+    def test_evicted_while_read(self, tmp_path, monkeypatch):
+        cache = SolveResultCache(str(tmp_path))
+        cache.put('key', make_result(1, 'OPTIMAL'))
+
+        def evicted_utime(filepath, times):
+            # another process evicted the entry after it was read
+            raise FileNotFoundError(filepath)
+
+        monkeypatch.setattr(os, 'utime', evicted_utime)
+        assert cache.get('key') is not None
+
+    def test_solve_puzzle(self, tmp_path):
+        filepath = write_puzzle(tmp_path, 4, {(0, 0): 1})
+        options = SolverOptions(max_time=60, max_sols=5, cache_dir=str(tmp_path / 'cache'), backend='cp-sat')
+
+        _, solution_printer = solve_puzzle(filepath, options)
+        solver, cached_printer = solve_puzzle(filepath, options)
+        assert isinstance(cached_printer, CachedSolutionPrinter)
+        assert cached_printer.solution_store() == solution_printer.solution_store()
+        assert solver.StatusName() == 'FEASIBLE'
+
+        options.max_sols = 10
+        _, solution_printer = solve_puzzle(filepath, options)
+        assert not isinstance(solution_printer, CachedSolutionPrinter)
+
+    def test_max_stored_solutions(self, tmp_path):
+        filepath = write_puzzle(tmp_path, 4, {(0, 0): 1})
+        options = SolverOptions(max_time=60, max_sols=5, max_stored_solutions=2, cache_dir=str(tmp_path / 'cache'),
+                                backend='cp-sat')
+        solve_puzzle(filepath, options)
+
+        options.max_stored_solutions = None
+        _, solution_printer = solve_puzzle(filepath, options)
+        assert not isinstance(solution_printer, CachedSolutionPrinter)
+        assert len(solution_printer.solution_store()) == 5
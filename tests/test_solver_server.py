@@ -0,0 +1,157 @@
+import http.client
+import json
+import threading
+import time
+
+import pytest
+
+from puzzlesolver.SolvePuzzle import SolverOptions
+from puzzlesolver.SolverServer import SolverPool, make_server
+from conftest import puzzle_data
+
+PUZZLE_FILEPATH = './data/Solved/400kSubscribers_by_PjotrV.json'
+
+
+def load_puzzle_data(filepath: str = PUZZLE_FILEPATH):
+    with open(filepath) as file:
+        return json.load(file)
+
+
+@pytest.fixture(scope='module')
+def pool():
+    with SolverPool(1) as solver_pool:
+        yield solver_pool
+
+
+@pytest.fixture(scope='module')
+def server(pool: SolverPool):
+    http_server = make_server(pool, port=0)
+    thread = threading.Thread(target=http_server.serve_forever, daemon=True)
+    thread.start()
+    yield http_server
+    http_server.shutdown()
+    http_server.server_close()
+
+
+def request(server, method: str, path: str, body=None):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=60)
+    connection.request(method, path, body=None if body is None else json.dumps(body))
+    response = connection.getresponse()
+    data = json.loads(response.read())
+    connection.close()
+    return response.status, data
+
+
+class TestSolverPool:
+
+    def test_submit(self, pool: SolverPool):
+        job = pool.submit(load_puzzle_data(), SolverOptions(max_time=60, quiet=True))
+        assert job.finished.wait(60)
+        assert job.state == 'done'
+        assert job.result is not None
+        assert job.result['verdict'] == 'unique'
+        assert job.result['solution_count'] == 1
+
+    def test_invalid_puzzle(self, pool: SolverPool):
+        job = pool.submit({'nRows': 9}, SolverOptions(quiet=True))
+        assert job.finished.wait(60)
+        assert job.result is not None
+        assert job.result['error'] is not None
+
+    def test_cancel_running(self, pool: SolverPool):
+        options = SolverOptions(max_time=120, max_sols=10 ** 9, quiet=True)
+        job = pool.submit(puzzle_data(), options)
+        while job.state == 'queued':
+            time.sleep(0.01)
+        time.sleep(0.5)
+
+        start = time.time()
+        pool.cancel(job.id)
+        assert job.finished.wait(30)
+        assert time.time() - start < 10
+        assert job.state == 'cancelled'
+        assert job.result is not None
+        assert job.result['solution_count'] > 0
+
+    def test_cancel_queued(self, pool: SolverPool):
+        options = SolverOptions(max_time=120, max_sols=10 ** 9, quiet=True)
+        running = pool.submit(puzzle_data(), options)
+        queued = pool.submit(load_puzzle_data(), options)
+        assert pool.metrics()['queue_depth'] >= 1
+
+        pool.cancel(queued.id)
+        assert queued.state == 'cancelled'
+        assert queued.result is None
+        pool.cancel(running.id)
+        assert running.finished.wait(30)
+
+    def test_close_running(self):
+        options = SolverOptions(max_time=120, max_sols=10 ** 9, quiet=True)
+        with SolverPool(1) as solver_pool:
+            job = solver_pool.submit(puzzle_data(), options)
+            while job.state == 'queued':
+                time.sleep(0.01)
+        assert job.finished.is_set()
+        assert job.state == 'cancelled'
+
+        late_job = solver_pool.submit(load_puzzle_data(), options)
+        assert late_job.finished.is_set()
+        assert late_job.state == 'cancelled'
+
+    def test_metrics(self, pool: SolverPool):
+        metrics = pool.metrics()
+        assert metrics['workers'] == 1
+        assert metrics['queue_depth'] == 0
+        assert metrics['submitted'] >= metrics['completed'] + metrics['cancelled']
+
+
+class TestSolverServer:
+
+    def test_unix_socket_path(self, pool: SolverPool, tmp_path):
+        filepath = tmp_path / 'notes.txt'
+        filepath.write_text('keep me')
+        with pytest.raises(FileExistsError):
+            make_server(pool, unix_socket=str(filepath))
+        assert filepath.read_text() == 'keep me'
+
+        socket_path = str(tmp_path / 'solver.sock')
+        make_server(pool, unix_socket=socket_path).server_close()
+        make_server(pool, unix_socket=socket_path).server_close()
+
+    def test_solve(self, server):
+        status, job = request(server, 'POST', '/solve?max_time=60&max_sols=5', load_puzzle_data())
+        assert status == 200
+        assert job['state'] == 'done'
+        assert job['max_sols'] == 5
+        assert job['result']['verdict'] == 'unique'
+
+    def test_solve_unique(self, server):
+        status, job = request(server, 'POST', '/solve?mode=unique', load_puzzle_data())
+        assert status == 200
+        assert job['mode'] == 'unique'
+        assert job['result']['verdict'] == 'unique'
+
+    def test_no_wait_and_cancel(self, server):
+        status, job = request(server, 'POST', '/solve?wait=false&max_sols=1000000000', puzzle_data())
+        assert status == 202
+        status, job = request(server, 'DELETE', f"/jobs/{job['id']}")
+        assert status == 200
+        assert job['state'] == 'cancelled'
+        status, job = request(server, 'GET', f"/jobs/{job['id']}")
+        assert job['state'] == 'cancelled'
+
+    def test_bad_request(self, server):
+        status, data = request(server, 'POST', '/solve?mode=fastest', load_puzzle_data())
+        assert status == 400
+        status, data = request(server, 'POST', '/solve?max_time=-1', load_puzzle_data())
+        assert status == 400
+
+    def test_not_found(self, server):
+        assert request(server, 'GET', '/jobs/unknown')[0] == 404
+        assert request(server, 'GET', '/unknown')[0] == 404
+
+    def test_metrics(self, server):
+        status, metrics = request(server, 'GET', '/metrics')
+        assert status == 200
+        assert metrics['workers'] == 1
+        assert 'queue_depth' in metrics
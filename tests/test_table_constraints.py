@@ -0,0 +1,156 @@
+import itertools
+
+import pytest
+from ortools.sat.python import cp_model
+
+from puzzlesolver.Puzzle2model.PuzzleModel import PuzzleModel
+from puzzlesolver.Puzzle2model.custom_constraints import are_consecutive_csp, factors_csp, is_ratio_1_r_csp
+from puzzlesolver.Puzzle2model.table_constraints import MAX_TABLE_SIZE, TABLE_CACHE_SIZE, TABLE_PREDICATES, \
+    add_table_constraint, allowed_tuples, fits_table, table_bool_csp, table_size
+
+
+def count_solutions(model: cp_model.CpModel) -> int:
+    class Counter(cp_model.CpSolverSolutionCallback):
+        def __init__(self):
+            super().__init__()
+            self.count = 0
+
+        def on_solution_callback(self):
+            self.count += 1
+
+    solver = cp_model.CpSolver()
+    solver.parameters.enumerate_all_solutions = True
+    counter = Counter()
+    solver.solve(model, counter)
+    return counter.count
+
+
+class TestAllowedTuples:
+
+    def test_memoized(self):
+        allowed_tuples.cache_clear()
+        domains = (tuple(range(1, 10)), tuple(range(1, 10)))
+        first = allowed_tuples('consecutive', (), domains)
+        second = allowed_tuples('consecutive', (), domains)
+        assert first is second
+        assert allowed_tuples.cache_info().hits == 1
+        assert allowed_tuples.cache_info().maxsize == TABLE_CACHE_SIZE
+        assert len(first) == 16
+
+    def test_reified(self):
+        domains = (tuple(range(1, 10)), tuple(range(1, 10)), (2, 3))
+        table = allowed_tuples('ratio', (), domains, True)
+        assert len(table) == 9 * 9 * 2
+        for a, b, r, value in table:
+            assert value == int(r * a == b or r * b == a)
+
+    @pytest.mark.parametrize("predicate, params, domains", [
+        ('distance', (), ((1, 2, 3, 4), (1, 5, 9), (0, 4))),
+        ('modulo', (1,), ((1, 2, 3, 4, 5), (1, 2, 3, 4, 5))),
+        ('modulo', (0,), ((0, 2, 3), (0, 4, 6))),
+        ('product', (), ((1, 2, 3), (2, 3), (6,))),
+        ('sum_in', (5, 10), ((1, 4, 5, 6), (1, 4, 5, 9))),
+        ('factors', (), ((0, 1, 2, 3), (0, 4, 6))),
+    ])
+    def test_filtered(self, predicate, params, domains):
+        check = TABLE_PREDICATES[predicate]
+        expected = tuple(values for values in itertools.product(*domains) if check(*values, *params))
+        assert allowed_tuples(predicate, params, domains) == expected
+
+    def test_fits_table(self):
+        model = cp_model.CpModel()
+        small = model.NewIntVar(1, 9, "small")
+        big = model.NewIntVar(0, MAX_TABLE_SIZE, "big")
+        assert fits_table([small, small, 3])
+        assert not fits_table([small, big])
+        # counted from the domain intervals, a wide shared variable is not enumerated
+        wide = model.NewIntVarFromDomain(cp_model.Domain.FromIntervals([[0, 10 ** 12], [2 * 10 ** 12, 2 * 10 ** 12]]),
+                                         "wide")
+        assert table_size([small, wide, 3]) == 9 * (10 ** 12 + 2)
+        assert not fits_table([wide])
+
+
+class TestAddTableConstraint:
+
+    @pytest.mark.parametrize("predicate, params, n_solutions", [
+        ('consecutive', (), 16), ('factors', (), 37), ('modulo', (2,), 12), ('sum_in', (5, 10), 13),
+    ])
+    def test_solutions(self, predicate, params, n_solutions):
+        model = cp_model.CpModel()
+        a = model.NewIntVar(1, 9, "a")
+        b = model.NewIntVar(1, 9, "b")
+        add_table_constraint(model, [a, b], predicate, params)
+        check = TABLE_PREDICATES[predicate]
+        assert n_solutions == sum(check(x, y, *params) for x in range(1, 10) for y in range(1, 10))
+        assert count_solutions(model) == n_solutions
+
+    def test_constant_terms(self):
+        # the columns of the constants are projected out, a is 3 (6 / 2) or 12 (out of its domain)
+        model = cp_model.CpModel()
+        a = model.NewIntVar(1, 9, "a")
+        add_table_constraint(model, [a, 6, 2], 'ratio')
+        assert len(model.Proto().constraints[0].table.vars) == 1
+        solver = cp_model.CpSolver()
+        assert solver.solve(model) == cp_model.OPTIMAL
+        assert solver.value(a) == 3
+        assert count_solutions(model) == 1
+
+    @pytest.mark.parametrize("terms, status", [([3, 4], cp_model.OPTIMAL), ([3, 5], cp_model.INFEASIBLE)])
+    def test_all_constant(self, terms, status):
+        model = cp_model.CpModel()
+        add_table_constraint(model, terms, 'consecutive')
+        solver = cp_model.CpSolver()
+        assert solver.solve(model) == status
+
+
+class TestTableBoolCSP:
+
+    @pytest.mark.parametrize("a, b, d", list(itertools.product([1, 4, 9], [1, 5, 8], [0, 3, 4])))
+    def test_distance(self, a: int, b: int, d: int):
+        model = cp_model.CpModel()
+        a_var = model.NewIntVar(1, 9, "a")
+        b_var = model.NewIntVar(1, 9, "b")
+        model.Add(a_var == a)
+        model.Add(b_var == b)
+        is_distance = table_bool_csp(model, [a_var, b_var, d], 'distance', (), "")
+        solver = cp_model.CpSolver()
+        solver.solve(model)
+        assert solver.BooleanValue(is_distance) == (abs(a - b) == d)
+
+    def test_enforced_both_ways(self):
+        # with the bool fixed to false, only the pairs not satisfying the predicate remain
+        model = cp_model.CpModel()
+        a = model.NewIntVar(1, 9, "a")
+        b = model.NewIntVar(1, 9, "b")
+        model.Add(table_bool_csp(model, [a, b], 'consecutive', (), "") == 0)
+        assert count_solutions(model) == 81 - 16
+
+
+class TestTableEncodingEquivalence:
+    """The table encodings of custom_constraints accept the same assignments as the linear ones"""
+
+    @pytest.mark.parametrize("var1, var2, r", list(itertools.product(range(1, 10), range(1, 10), [2, 3])))
+    def test_ratio(self, var1: int, var2: int, r: int):
+        model = PuzzleModel()
+        var1_var = model.NewIntVar(1, 9, "var1")
+        var2_var = model.NewIntVar(1, 9, "var2")
+        model.Add(var1_var == var1)
+        model.Add(var2_var == var2)
+        is_ratio = is_ratio_1_r_csp(model, var1_var, var2_var, r, "")
+        solver = cp_model.CpSolver()
+        solver.solve(model)
+        assert solver.BooleanValue(is_ratio) == (var2 == r * var1 or var1 == r * var2)
+
+    def test_consecutive(self):
+        model = PuzzleModel()
+        var1 = model.NewIntVar(1, 9, "var1")
+        var2 = model.NewIntVar(1, 9, "var2")
+        model.Add(are_consecutive_csp(model, var1, var2, "") == 1)
+        assert count_solutions(model) == 16
+
+    def test_factors(self):
+        model = PuzzleModel()
+        var1 = model.NewIntVar(1, 9, "var1")
+        var2 = model.NewIntVar(1, 9, "var2")
+        factors_csp(model, var1, var2, "")
+        assert count_solutions(model) == sum(a % b == 0 or b % a == 0 for a in range(1, 10) for b in range(1, 10))